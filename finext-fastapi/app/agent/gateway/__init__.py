@@ -4,6 +4,7 @@ import logging
 
 from app.core.config import AGENT_GATEWAY, GATEWAY_EXPLAIN_MODE
 from app.core.database import get_database
+from app.core.query_governor import query_governor
 
 from .executor import MongoGateway
 from .fixture import FixtureGateway
@@ -31,4 +32,4 @@ def build_gateway() -> GatewayProtocol:
         logger.warning("Gateway đang chạy chế độ FIXTURE — chỉ dùng cho dev/test.")
         return FixtureGateway(_policy)
 
-    return MongoGateway(get_database("agent_db"), _policy, explain_mode=GATEWAY_EXPLAIN_MODE)
+    return MongoGateway(get_database("agent_db"), _policy, explain_mode=GATEWAY_EXPLAIN_MODE, governor=query_governor)
@@ -5,10 +5,13 @@ import logging
 import math
 import sys
 import time
+from contextlib import nullcontext
 from typing import Any
 
 from pymongo.errors import OperationFailure, PyMongoError
 
+from app.core.query_governor import LANE_AGENT, QueryGovernor, QueryShedError
+
 from .policy import Policy
 from .stats_compute import (
     INTERNAL_MAX_POINTS,
@@ -23,6 +26,8 @@ logger = logging.getLogger(__name__)
 
 # Lỗi trả cho model khi Motor/pymongo gặp sự cố (timeout maxTimeMS, mất kết nối...) — lỗi "dạy model" sửa.
 _MONGO_ERROR_MSG = "Truy vấn dữ liệu quá thời gian hoặc gặp sự cố, hãy thử thu hẹp phạm vi truy vấn."
+# Governor từ chối (Mongo đang quá tải, lane agent bị cắt trước realtime/REST) — không phải lỗi của query.
+_SHED_ERROR_MSG = "Hệ thống dữ liệu đang quá tải, hãy thử lại sau ít phút; đừng gọi lại ngay cùng truy vấn."
 
 
 def _cap_bytes(docs: list[dict[str, Any]], max_kb: int) -> tuple[list[dict[str, Any]], int, bool]:
@@ -130,10 +135,19 @@ def _strip_id(docs: list[dict[str, Any]]) -> list[dict[str, Any]]:
 
 
 class MongoGateway:
-    def __init__(self, db: Any, policy: Policy, explain_mode: str = "off") -> None:
+    def __init__(self, db: Any, policy: Policy, explain_mode: str = "off", governor: QueryGovernor | None = None) -> None:
         self._db = db
         self._policy = policy
         self._explain_mode = explain_mode
+        self._governor = governor
+
+    def _slot(self) -> Any:
+        """Slot lane agent của governor (core/query_governor.py); không có governor → không giới hạn."""
+        return self._governor.slot(LANE_AGENT) if self._governor is not None else nullcontext()
+
+    def _shed_error(self, ctx: GatewayContext, collection: str) -> GatewayResult:
+        logger.warning("gateway query shed request_id=%s collection=%s", ctx.request_id, collection)
+        return GatewayResult(ok=False, error=_SHED_ERROR_MSG, meta={"collection": collection, "error": True, "shed": True})
 
     async def _is_collscan(self, collection: str, filter: dict[str, Any], projection: dict[str, Any]) -> bool:
         """Chỉ soi winningPlan — rejectedPlans có thể chứa COLLSCAN mà kế hoạch thắng vẫn dùng index."""
@@ -240,14 +254,17 @@ class MongoGateway:
         query_filter = _coerce_in_scalars(query_filter)
         started = time.perf_counter()
         try:
-            rejection = await self._reject_collscan(ctx, collection, query_filter, query_projection)
-            if rejection is not None:
-                return rejection
-            cursor = self._db[collection].find(query_filter, query_projection)
-            if sort:
-                cursor = cursor.sort(sort)
-            cursor = cursor.limit(effective_limit).max_time_ms(self._policy.defaults.max_time_ms)
-            docs = await cursor.to_list(length=effective_limit)
+            async with self._slot():
+                rejection = await self._reject_collscan(ctx, collection, query_filter, query_projection)
+                if rejection is not None:
+                    return rejection
+                cursor = self._db[collection].find(query_filter, query_projection)
+                if sort:
+                    cursor = cursor.sort(sort)
+                cursor = cursor.limit(effective_limit).max_time_ms(self._policy.defaults.max_time_ms)
+                docs = await cursor.to_list(length=effective_limit)
+        except QueryShedError:
+            return self._shed_error(ctx, collection)
         except PyMongoError:
             return self._mongo_error(ctx, collection)
         result = self._ok_result(ctx, collection, docs, started)
@@ -277,8 +294,11 @@ class MongoGateway:
                 stage["$project"] = _fix_find_style_slice(_drop_shadowed_paths(stage["$project"]))
         started = time.perf_counter()
         try:
-            cursor = self._db[collection].aggregate(pipeline, maxTimeMS=self._policy.defaults.max_time_ms)
-            docs = await cursor.to_list(length=self._policy.defaults.max_limit)
+            async with self._slot():
+                cursor = self._db[collection].aggregate(pipeline, maxTimeMS=self._policy.defaults.max_time_ms)
+                docs = await cursor.to_list(length=self._policy.defaults.max_limit)
+        except QueryShedError:
+            return self._shed_error(ctx, collection)
         except PyMongoError:
             return self._mongo_error(ctx, collection)
         result = self._ok_result(ctx, collection, docs, started, suffix=" (aggregate)")
@@ -319,9 +339,12 @@ class MongoGateway:
         projection = {f"series.{sub}": 1, "series.date": 1, "_id": 0}
         started = time.perf_counter()
         try:
-            cursor = self._db[collection].find(query_filter, projection)
-            cursor = cursor.limit(self._policy.defaults.max_limit).max_time_ms(self._policy.defaults.max_time_ms)
-            docs = await cursor.to_list(length=self._policy.defaults.max_limit)
+            async with self._slot():
+                cursor = self._db[collection].find(query_filter, projection)
+                cursor = cursor.limit(self._policy.defaults.max_limit).max_time_ms(self._policy.defaults.max_time_ms)
+                docs = await cursor.to_list(length=self._policy.defaults.max_limit)
+        except QueryShedError:
+            return self._shed_error(ctx, collection)
         except PyMongoError:
             return self._mongo_error(ctx, collection)
 
@@ -136,6 +136,55 @@ R2_BUCKET_NAME = os.getenv("R2_BUCKET_NAME")
 R2_PUBLIC_URL_BASE = os.getenv("R2_PUBLIC_URL_BASE")
 # ---------------------------------
 
+# --- Market SSE ---
+# Fan-out cấp host (core/sse_fanout.py): 1 worker leader poll Mongo, worker khác nhận frame
+# qua Unix socket → mỗi (keyword, ticker) chỉ poll 1 lần / máy thay vì 1 lần / worker.
+SSE_FANOUT_ENABLED = os.getenv("SSE_FANOUT", "off").lower() == "on"  # on | off
+# Push mode (crud/sse/_watcher.py): poller ngủ tới khi collection nguồn đổi thay vì poll cố định.
+# Mongo prod là standalone (không có change stream) → dùng "probe".
+SSE_PUSH_MODE = os.getenv("SSE_PUSH_MODE", "off").lower()  # off | probe | change_stream
+# Lịch poll theo loại dữ liệu + phiên giao dịch VN (crud/sse/_schedule.py). "fixed" = mọi keyword
+# poll đều 3s như trước.
+SSE_POLL_SCHEDULE = os.getenv("SSE_POLL_SCHEDULE", "adaptive").lower()  # adaptive | fixed
+# Ngày nghỉ giao dịch ngoài cuối tuần + lễ dương lịch cố định (Tết âm lịch, Giỗ Tổ, nghỉ bù...),
+# dạng "YYYY-MM-DD,YYYY-MM-DD". Danh sách do HOSE công bố đầu năm.
+MARKET_HOLIDAYS = os.getenv("MARKET_HOLIDAYS", "")
+# Tạo index khai báo trong crud/sse/_indexes.py lúc khởi động (stock_db do pipeline ngoài ghi).
+SSE_ENSURE_INDEXES = os.getenv("SSE_ENSURE_INDEXES", "on").lower() == "on"  # on | off
+# Index advisor lúc boot (crud/sse/_index_advisor.py): explain query đại diện của từng keyword, chạy nền.
+# off | report (chỉ log COLLSCAN/SORT + index đề xuất) | create (tạo luôn index đề xuất còn thiếu).
+SSE_INDEX_ADVISOR = os.getenv("SSE_INDEX_ADVISOR", "off").lower()
+# Trần RAM (MB) cho cache kết quả /sse/rest (crud/sse/_rest_cache.py), mỗi worker. 0 = tắt cache.
+SSE_REST_CACHE_MB = int(os.getenv("SSE_REST_CACHE_MB", "64"))
+# Snapshot in-memory today_stock / today_index / itd_index dùng chung cho mọi keyword
+# (crud/sse/_snapshot.py): mỗi collection đọc tối đa 1 lần / chừng này giây. 0 = tắt, mỗi keyword tự query.
+SSE_SNAPSHOT_MAX_AGE = float(os.getenv("SSE_SNAPSHOT_MAX_AGE", "2"))
+# Mongo lỗi / circuit breaker mở (crud/sse/_breaker.py): vẫn phục vụ kết quả đúng cuối cùng kèm
+# {"stale": true, "age"} nếu không cũ hơn chừng này giây. 0 = tắt, lỗi trả thẳng như trước.
+SSE_STALE_MAX_AGE = float(os.getenv("SSE_STALE_MAX_AGE", "900"))
+# Inverted index in-memory cho search_news / search_reports (crud/sse/_search_index.py): bỏ dấu tiếng Việt,
+# khớp tiền tố, xếp theo độ mới. off = quay về $regex trên title. Bài mới được đọc thêm tối đa 1 lần / MAX_AGE giây.
+SSE_SEARCH_INDEX = os.getenv("SSE_SEARCH_INDEX", "on").lower() == "on"  # on | off
+SSE_SEARCH_INDEX_MAX_AGE = float(os.getenv("SSE_SEARCH_INDEX_MAX_AGE", "30"))
+# Tổng số bài của news_daily / news_report theo bộ lọc (crud/sse/_feed.py): count_documents chỉ chạy lại khi
+# có bài mới (watcher báo / bài đầu trang 1 đổi) hoặc quá TTL giây — cuộn trang không đếm lại mỗi lần.
+SSE_FEED_COUNT_TTL = float(os.getenv("SSE_FEED_COUNT_TTL", "300"))
+# Bộ đếm tin trong ngày của news_count (crud/sse/news_count.py) giữ trong RAM: đọc thêm bài mới tối đa
+# 1 lần / MAX_AGE giây (hoặc ngay khi watcher báo đổi), đếm lại toàn bộ lúc sang ngày giờ VN.
+SSE_NEWS_COUNT_MAX_AGE = float(os.getenv("SSE_NEWS_COUNT_MAX_AGE", "30"))
+# Trần RAM (MB) cho cache nội dung bài viết news_article / report_article theo slug (crud/sse/_article_cache.py),
+# mỗi worker. Lúc khởi động nạp sẵn bài mới nhất hôm nay. 0 = tắt, mỗi lượt xem đọc Mongo.
+SSE_ARTICLE_CACHE_MB = int(os.getenv("SSE_ARTICLE_CACHE_MB", "32"))
+# ---------------------------------
+
+# --- Mongo query governor (core/query_governor.py) ---
+# Trần query Mongo đồng thời / worker, chia lane realtime > interactive > agent > background.
+# Giữ dưới maxPoolSize (50) để lane ưu tiên không phải xếp hàng trong pool của driver. 0 = tắt.
+MONGO_GOVERNOR_LIMIT = int(os.getenv("MONGO_GOVERNOR_LIMIT", "40"))
+# Latency trung bình (EWMA, ms) bắt đầu cắt lane thấp nhất (background); x2 cắt agent, x4 cắt interactive.
+MONGO_SHED_LATENCY_MS = float(os.getenv("MONGO_SHED_LATENCY_MS", "800"))
+# ---------------------------------
+
 
 # Validation đã được thực hiện ở trên thông qua validate_critical_env_vars()
 # Chỉ log thông tin khởi động
@@ -0,0 +1,240 @@
+# finext-fastapi/app/core/query_governor.py
+"""
+Điều phối query Mongo đồng thời giữa các nhóm tải dùng chung 1 AsyncIOMotorClient.
+
+200 poller SSE, REST /sse/rest và agent gateway cùng tranh 50 connection của pool
+(waitQueueTimeoutMS=5000): 1 đợt aggregate của agent có thể bỏ đói poller giá realtime và ngược
+lại. Governor chia query vào các lane theo thứ tự ưu tiên:
+
+    realtime     poller SSE (routers/sse.py)
+    interactive  REST /sse/rest
+    agent        MongoGateway (agent/gateway)
+    background   probe của watcher, job nền
+
+- Mỗi lane có trần riêng (cap) + trọng số; tổng mọi lane ≤ limit. Khi đầy, slot rảnh được trao
+  cho lane đang chờ có (inflight / weight) nhỏ nhất — lane nặng ký hơn được phần lớn hơn nhưng
+  lane thấp không chết đói hẳn.
+- Chờ quá max_wait của lane → QueryShedError (không treo request tới waitQueueTimeout của driver).
+- Shedding: EWMA latency query vượt shed_latency_ms → từ chối ngay lane background; vượt x2 → cả
+  agent; vượt x4 → cả interactive. Realtime không bao giờ bị cắt chủ động.
+- Chỉ bọc ở điểm vào (1 keyword / 1 tool call), không bọc từng query bên trong → không lồng slot.
+
+Counter per-worker, xem qua GET /sse/metrics.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from app.core.config import MONGO_GOVERNOR_LIMIT, MONGO_SHED_LATENCY_MS
+
+LANE_REALTIME = "realtime"
+LANE_INTERACTIVE = "interactive"
+LANE_AGENT = "agent"
+LANE_BACKGROUND = "background"
+# Thứ tự ưu tiên cao → thấp; lane thứ i bị cắt khi áp lực ≥ len(LANES) - i.
+LANES = (LANE_REALTIME, LANE_INTERACTIVE, LANE_AGENT, LANE_BACKGROUND)
+
+_EWMA_ALPHA = 0.2
+# Latency cũ hơn chừng này giây không còn phản ánh tải hiện tại (VD lane bị cắt hết nên không có mẫu mới).
+_LATENCY_WINDOW = 10.0
+
+
+@dataclass(frozen=True)
+class LanePolicy:
+    cap: int          # số query đồng thời tối đa của lane
+    weight: int       # tỉ trọng khi tranh slot
+    max_wait: float   # giây chờ slot tối đa trước khi bị từ chối
+
+
+DEFAULT_LANE_POLICIES: Dict[str, LanePolicy] = {
+    LANE_REALTIME: LanePolicy(cap=24, weight=8, max_wait=5.0),
+    LANE_INTERACTIVE: LanePolicy(cap=16, weight=4, max_wait=5.0),
+    LANE_AGENT: LanePolicy(cap=8, weight=2, max_wait=10.0),
+    LANE_BACKGROUND: LanePolicy(cap=4, weight=1, max_wait=30.0),
+}
+
+
+class QueryShedError(RuntimeError):
+    """Query bị governor từ chối (quá tải hoặc chờ quá lâu) — caller trả 503 / thử lại sau."""
+
+    def __init__(self, lane: str, reason: str) -> None:
+        super().__init__(f"Mongo query shed (lane={lane}, reason={reason})")
+        self.lane = lane
+        self.reason = reason
+
+
+@dataclass
+class _Lane:
+    policy: LanePolicy
+    inflight: int = 0
+    waiters: Deque[asyncio.Future] = field(default_factory=deque)
+    admitted: int = 0
+    shed: int = 0
+    timeouts: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    latency_ewma: Optional[float] = None
+
+
+class QueryGovernor:
+    def __init__(
+        self,
+        limit: int,
+        shed_latency_ms: float = 800.0,
+        policies: Optional[Dict[str, LanePolicy]] = None,
+    ) -> None:
+        self.limit = limit
+        self.shed_latency = shed_latency_ms / 1000.0
+        self._lanes = {name: _Lane(policy) for name, policy in (policies or DEFAULT_LANE_POLICIES).items()}
+        self._inflight = 0
+        self._latency_ewma: Optional[float] = None
+        self._latency_at = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit > 0
+
+    # ------------------------------------------------------------------ #
+    # Áp lực / shedding
+    # ------------------------------------------------------------------ #
+    def pressure(self) -> int:
+        """0 = bình thường; 1 = cắt background; 2 = thêm agent; 3 = thêm interactive."""
+        if self._latency_ewma is None or self.shed_latency <= 0:
+            return 0
+        if time.monotonic() - self._latency_at > _LATENCY_WINDOW:
+            return 0
+        level, threshold = 0, self.shed_latency
+        while level < len(LANES) - 1 and self._latency_ewma > threshold:
+            level += 1
+            threshold *= 2
+        return level
+
+    def _is_shed(self, lane: str) -> bool:
+        level = self.pressure()
+        return level > 0 and LANES.index(lane) >= len(LANES) - level
+
+    def _record_latency(self, lane: _Lane, seconds: float) -> None:
+        self._latency_ewma = seconds if self._latency_ewma is None else (
+            _EWMA_ALPHA * seconds + (1 - _EWMA_ALPHA) * self._latency_ewma
+        )
+        self._latency_at = time.monotonic()
+        lane.latency_ewma = seconds if lane.latency_ewma is None else (
+            _EWMA_ALPHA * seconds + (1 - _EWMA_ALPHA) * lane.latency_ewma
+        )
+
+    # ------------------------------------------------------------------ #
+    # Cấp / trả slot
+    # ------------------------------------------------------------------ #
+    def _can_run(self, lane: _Lane) -> bool:
+        return self._inflight < self.limit and lane.inflight < lane.policy.cap
+
+    def _grant(self, lane: _Lane) -> None:
+        lane.inflight += 1
+        self._inflight += 1
+
+    def _release(self, lane: _Lane) -> None:
+        lane.inflight -= 1
+        self._inflight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Trao slot rảnh cho lane đang chờ có inflight/weight nhỏ nhất (hoà → lane ưu tiên cao hơn)."""
+        while self._inflight < self.limit:
+            best: Optional[_Lane] = None
+            for name in LANES:
+                lane = self._lanes[name]
+                while lane.waiters and lane.waiters[0].done():
+                    lane.waiters.popleft()  # waiter đã timeout/huỷ
+                if not lane.waiters or lane.inflight >= lane.policy.cap:
+                    continue
+                if best is None or lane.inflight / lane.policy.weight < best.inflight / best.policy.weight:
+                    best = lane
+            if best is None:
+                return
+            self._grant(best)
+            best.waiters.popleft().set_result(None)
+
+    async def _acquire(self, name: str, lane: _Lane) -> None:
+        if self._is_shed(name):
+            lane.shed += 1
+            raise QueryShedError(name, "overloaded")
+        started = time.monotonic()
+        # Không ai chờ → chạy ngay; có người chờ → xếp hàng để không chen ngang lane khác.
+        if self._can_run(lane) and not any(self._lanes[n].waiters for n in LANES):
+            self._grant(lane)
+        else:
+            fut = asyncio.get_running_loop().create_future()
+            lane.waiters.append(fut)
+            self._dispatch()
+            try:
+                await asyncio.wait_for(fut, timeout=lane.policy.max_wait)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                if fut.done() and not fut.cancelled():
+                    self._release(lane)  # slot được trao đúng lúc timeout/huỷ → trả lại
+                else:
+                    try:
+                        lane.waiters.remove(fut)
+                    except ValueError:
+                        pass
+                if isinstance(e, asyncio.TimeoutError):
+                    lane.timeouts += 1
+                    raise QueryShedError(name, "wait_timeout") from None
+                raise
+        waited = time.monotonic() - started
+        lane.admitted += 1
+        lane.wait_total += waited
+        lane.wait_max = max(lane.wait_max, waited)
+
+    @asynccontextmanager
+    async def slot(self, name: str) -> AsyncIterator[None]:
+        """`async with governor.slot(LANE_X):` bao quanh 1 đơn vị query. Bị từ chối → QueryShedError."""
+        if not self.enabled:
+            yield
+            return
+        lane = self._lanes[name]
+        await self._acquire(name, lane)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._record_latency(lane, time.monotonic() - started)
+            self._release(lane)
+
+    def clear(self) -> None:
+        for lane in self._lanes.values():
+            lane.admitted = lane.shed = lane.timeouts = 0
+            lane.wait_total = lane.wait_max = 0.0
+            lane.latency_ewma = None
+        self._latency_ewma = None
+
+    def stats(self) -> Dict[str, Any]:
+        def _ms(v: Optional[float]) -> Optional[float]:
+            return None if v is None else round(v * 1000, 1)
+
+        return {
+            "limit": self.limit,
+            "inflight": self._inflight,
+            "latency_ms": _ms(self._latency_ewma),
+            "pressure": self.pressure(),
+            "lanes": {
+                name: {
+                    "cap": lane.policy.cap,
+                    "inflight": lane.inflight,
+                    "waiting": sum(1 for f in lane.waiters if not f.done()),
+                    "admitted": lane.admitted,
+                    "shed": lane.shed,
+                    "timeouts": lane.timeouts,
+                    "wait_avg_ms": _ms(lane.wait_total / lane.admitted) if lane.admitted else None,
+                    "wait_max_ms": _ms(lane.wait_max),
+                    "latency_ms": _ms(lane.latency_ewma),
+                }
+                for name, lane in self._lanes.items()
+            },
+        }
+
+
+query_governor = QueryGovernor(MONGO_GOVERNOR_LIMIT, MONGO_SHED_LATENCY_MS)
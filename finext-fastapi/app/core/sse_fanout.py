@@ -0,0 +1,202 @@
+# finext-fastapi/app/core/sse_fanout.py
+"""
+Fan-out SSE cấp host: mỗi (keyword, ticker) chỉ được poll 1 lần / máy, không phải 1 lần / worker.
+
+Với `uvicorn --workers 2`, cache SSE trong routers/sse.py là per-process → mỗi key nóng bị
+poll 2 lần mỗi 3s và MAX_POLLERS thực tế nhân đôi. Module này bầu 1 worker làm "leader"
+bằng fcntl lock (cùng pattern với core/scheduler.py):
+
+    - Leader giữ lock + mở Unix domain socket. Leader chạy poller thật như bình thường.
+    - Worker khác (follower) KHÔNG poll Mongo: poller của follower mở 1 kết nối UDS tới leader
+      cho mỗi key, leader subscribe key đó vào cache của chính nó (follower = 1 subscriber)
+      và đẩy nguyên payload "data: ...\\n\\n" đã serialize sẵn sang → follower broadcast lại.
+    - Leader chết → OS nhả lock, kết nối UDS đứt → poller follower bầu lại: ai acquire được
+      lock thì lên leader, số còn lại kết nối lại tới leader mới.
+
+Frame trên socket: 4 byte độ dài (big-endian) + payload UTF-8. Request của follower là
+1 dòng JSON {"keyword", "ticker"}.
+
+Mặc định TẮT (SSE_FANOUT=off). Trên Windows (dev, 1 worker) luôn tắt vì không có fcntl.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from app.core.config import SSE_FANOUT_ENABLED
+
+_IS_WINDOWS = sys.platform == "win32"
+if not _IS_WINDOWS:
+    import fcntl  # type: ignore[import-not-found]
+
+logger = logging.getLogger(__name__)
+
+_FANOUT_LOCK_PATH = "/tmp/finext_sse_fanout.lock"
+_FANOUT_SOCKET_PATH = "/tmp/finext_sse_fanout.sock"
+_HANDSHAKE_TIMEOUT = 5.0  # giây chờ follower gửi dòng subscribe
+_FRAME_HEADER_BYTES = 4
+_MAX_FRAME_BYTES = 64 * 1024 * 1024  # chặn header rác làm follower cấp phát vô hạn
+
+SubscribeFn = Callable[[str, Optional[str]], Awaitable[Tuple[str, Any]]]
+UnsubscribeFn = Callable[[str, Any], Awaitable[None]]
+
+
+class SseFanout:
+    """Leader election + kênh UDS giữa các worker trên cùng host."""
+
+    def __init__(self, lock_path: str, socket_path: str, enabled: bool = False) -> None:
+        self.lock_path = lock_path
+        self.socket_path = socket_path
+        self.enabled = enabled and not _IS_WINDOWS
+        self._lock_fd: Optional[int] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._subscribe: Optional[SubscribeFn] = None
+        self._unsubscribe: Optional[UnsubscribeFn] = None
+        self._conns: set[asyncio.StreamWriter] = set()
+
+    def bind(self, subscribe: SubscribeFn, unsubscribe: UnsubscribeFn) -> None:
+        """Gắn hàm subscribe/unsubscribe của cache SSE (router gọi lúc import)."""
+        self._subscribe = subscribe
+        self._unsubscribe = unsubscribe
+
+    @property
+    def is_leader(self) -> bool:
+        return self._lock_fd is not None
+
+    # ------------------------------------------------------------------ #
+    # Leader election
+    # ------------------------------------------------------------------ #
+    def _try_acquire_lock(self) -> bool:
+        try:
+            fd = os.open(self.lock_path, os.O_CREAT | os.O_WRONLY, 0o644)
+        except OSError:
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (OSError, BlockingIOError):
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def _release_lock(self) -> None:
+        if self._lock_fd is None:
+            return
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            os.close(self._lock_fd)
+        except OSError:
+            pass
+        self._lock_fd = None
+
+    async def should_relay(self) -> bool:
+        """True nếu worker này nên nhận frame từ leader thay vì tự poll Mongo.
+
+        Gọi ở đầu mỗi vòng poller: chưa có leader (hoặc leader vừa chết) thì thử lên leader.
+        """
+        if not self.enabled or self.is_leader:
+            return False
+        if not self._try_acquire_lock():
+            return True
+        try:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)  # socket mồ côi của leader cũ
+            self._server = await asyncio.start_unix_server(self._handle_follower, path=self.socket_path)
+            logger.info(f"SSE fan-out leader on PID {os.getpid()} ({self.socket_path})")
+        except OSError as e:
+            # Giữ lock nhưng không có server → follower không kết nối được và tự poll
+            # trực tiếp (hành vi cũ). Leader vẫn poll bình thường.
+            logger.error(f"SSE fan-out: cannot start leader socket: {e}")
+        return False
+
+    # ------------------------------------------------------------------ #
+    # Follower side
+    # ------------------------------------------------------------------ #
+    async def relay(self, keyword: str, ticker: Optional[str], on_frame: Callable[[str], None]) -> bool:
+        """Nhận frame của (keyword, ticker) từ leader và gọi on_frame cho tới khi mất kết nối.
+
+        Returns:
+            True nếu đã relay được ít nhất 1 frame rồi mất kết nối (leader chết) → caller bầu
+            lại ngay. False nếu không kết nối được hoặc leader từ chối (chạm trần) → caller tự
+            poll 1 vòng rồi thử lại, tránh vòng lặp kết nối-bị-từ-chối liên tục.
+        """
+        try:
+            reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        except OSError:
+            return False
+        received = False
+        try:
+            writer.write(json.dumps({"keyword": keyword, "ticker": ticker}).encode() + b"\n")
+            await writer.drain()
+            while True:
+                header = await reader.readexactly(_FRAME_HEADER_BYTES)
+                size = int.from_bytes(header, "big")
+                if size > _MAX_FRAME_BYTES:
+                    logger.error(f"SSE fan-out: oversized frame ({size} bytes), dropping connection")
+                    return received
+                on_frame((await reader.readexactly(size)).decode("utf-8"))
+                received = True
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            return received
+        finally:
+            writer.close()
+
+    # ------------------------------------------------------------------ #
+    # Leader side
+    # ------------------------------------------------------------------ #
+    async def _handle_follower(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self._subscribe is None or self._unsubscribe is None:
+            writer.close()
+            return
+        try:
+            line = await asyncio.wait_for(reader.readline(), timeout=_HANDSHAKE_TIMEOUT)
+            req = json.loads(line)
+            key, queue = await self._subscribe(req["keyword"], req.get("ticker"))
+        except Exception as e:
+            # Keyword/ticker sai hoặc chạm trần → đóng kết nối, follower tự xử lý.
+            logger.warning(f"SSE fan-out: rejected follower subscription: {e}")
+            writer.close()
+            return
+
+        self._conns.add(writer)
+        # EOF từ follower = poller follower đã dừng (hết subscriber) → unsubscribe phía leader.
+        eof_task = asyncio.create_task(reader.read())
+        try:
+            while True:
+                get_task = asyncio.create_task(queue.get())
+                done, _ = await asyncio.wait({get_task, eof_task}, return_when=asyncio.FIRST_COMPLETED)
+                if get_task not in done:
+                    get_task.cancel()
+                    break
+                frame = get_task.result().payload.encode("utf-8")
+                writer.write(len(frame).to_bytes(_FRAME_HEADER_BYTES, "big") + frame)
+                await writer.drain()
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            # CancelledError: leader đang shutdown — kết nối chết theo, không cần báo lỗi.
+            pass
+        finally:
+            eof_task.cancel()
+            self._conns.discard(writer)
+            await self._unsubscribe(key, queue)
+            writer.close()
+
+    async def close(self) -> None:
+        """Dừng server + nhả lock (gọi lúc shutdown) để worker khác take over ngay."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            # Đóng cả kết nối đang mở → follower thấy EOF và bầu lại ngay.
+            for writer in list(self._conns):
+                writer.close()
+            self._conns.clear()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+        self._release_lock()
+
+
+fanout = SseFanout(_FANOUT_LOCK_PATH, _FANOUT_SOCKET_PATH, enabled=SSE_FANOUT_ENABLED)
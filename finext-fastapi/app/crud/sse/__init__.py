@@ -6,7 +6,7 @@ Module này re-export execute_sse_query và get_available_keywords
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Import tất cả keyword functions từ các sub-modules
 from app.crud.sse.home_itd_index import home_itd_index
@@ -51,98 +51,450 @@ from app.crud.sse.news_report_categories import news_report_categories
 from app.crud.sse.report_article import report_article
 from app.crud.sse.screener_stock_data import screener_stock_data
 from app.crud.sse.screener_stock_meta import screener_stock_meta
+from app.crud.sse.screener_query import screener_query
 # Search keywords
 from app.crud.sse.search_stocks import search_stocks
 from app.crud.sse.search_index import search_index
 from app.crud.sse.search_news import search_news
 from app.crud.sse.search_reports import search_reports
+from app.crud.sse.suggest import suggest
 # Market meta keywords
 from app.crud.sse.market_update_time import market_update_time
 # Other Ticker (Commodities, World, Crypto)
 from app.crud.sse.latest_other_ticker import latest_other_ticker
 from app.crud.sse.other_ticker import other_ticker
 from app.crud.sse.chat_suggestions import chat_suggestions as fetch_chat_suggestions
+from app.crud.sse._breaker import mongo_breaker
+from app.crud.sse._schedule import REFRESH_EOD, REFRESH_MINUTELY, REFRESH_REALTIME, REFRESH_STATIC
+from app.crud.sse._spec import SAMPLE, KeywordSpec, QueryProbe, normalize_params
 
 logger = logging.getLogger(__name__)
 
 # ==============================================================================
-# REGISTRY - Đăng ký các keyword và hàm query tương ứng
+# REGISTRY - Khai báo từng keyword (crud/sse/_spec.py): hàm query, collection nguồn ("db.collection"),
+# refresh class (_schedule.py), delta key, allowlist sort, index cần có...
+# Poller, REST cache/ETag và startup index đều đọc từ đây.
 # ==============================================================================
 
-SSE_QUERY_REGISTRY: Dict[str, Any] = {
+_TODAY_STOCK = "stock_db.today_stock"
+_TODAY_INDEX = "stock_db.today_index"
+_HISTORY_STOCK = "stock_db.history_stock"
+_HISTORY_INDEX = "stock_db.history_index"
+_NEWS_DAILY = "stock_db.news_daily"
+_NEWS_REPORT = "stock_db.news_report"
+
+# Endpoint public: sort trên field bất kỳ = sort không index, đốt CPU/RAM mỗi request.
+_NEWS_SORTABLE = frozenset({"created_at", "updated_at"})
+_OTHER_TICKER_SORTABLE = frozenset(
+    {"date", "ticker", "close", "pct_change", "w_pct", "m_pct", "q_pct", "y_pct", "cat_order"}
+)
+
+KEYWORD_SPECS: Dict[str, KeywordSpec] = {
     # Index queries
-    "home_today_index": home_today_index,
-    "home_itd_index": home_itd_index,
-    "home_itd_stock": home_itd_stock,
-    "home_hist_index": home_hist_index,
+    "home_today_index": KeywordSpec(
+        home_today_index,
+        sources=(_TODAY_INDEX,),
+        refresh_class=REFRESH_REALTIME,
+        delta_keys=("ticker",),
+        snapshot=True,
+    ),
+    "home_itd_index": KeywordSpec(
+        home_itd_index,
+        sources=("stock_db.itd_index",),
+        refresh_class=REFRESH_REALTIME,
+        delta_keys=("ticker", "date"),
+        snapshot=True,
+    ),
+    "home_itd_stock": KeywordSpec(
+        home_itd_stock,
+        sources=("stock_db.itd_stock",),
+        refresh_class=REFRESH_REALTIME,
+        delta_keys=("ticker", "date"),
+        probes=(QueryProbe("stock_db.itd_stock", {"ticker": SAMPLE}),),
+    ),
+    "home_hist_index": KeywordSpec(
+        home_hist_index,
+        sources=(_HISTORY_INDEX,),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe(_HISTORY_INDEX, {"ticker": SAMPLE}, sort=(("date", -1),)),),
+    ),
     # Stock queries
-    "home_hist_stock": home_hist_stock,
-    "home_today_stock": home_today_stock,
-    "home_nn_stock": home_nn_stock,
-    "nntd_stock": nntd_stock,
-    "nntd_index": nntd_index,
+    "home_hist_stock": KeywordSpec(
+        home_hist_stock,
+        sources=(_HISTORY_STOCK,),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe(_HISTORY_STOCK, {"ticker": SAMPLE}, sort=(("date", -1),)),),
+    ),
+    "home_today_stock": KeywordSpec(
+        home_today_stock,
+        sources=(_TODAY_STOCK,),
+        refresh_class=REFRESH_REALTIME,
+        delta_keys=("ticker",),
+        snapshot=True,
+    ),
+    "home_nn_stock": KeywordSpec(
+        home_nn_stock,
+        sources=("ref_db.date_series", "stock_db.nntd_stock"),
+        refresh_class=REFRESH_MINUTELY,
+        delta_keys=("ticker",),
+        probes=(
+            QueryProbe("ref_db.date_series", sort=(("date", -1),), limit=1),
+            QueryProbe("stock_db.nntd_stock", {"type": "NN", "date": SAMPLE}),
+        ),
+    ),
+    "nntd_stock": KeywordSpec(
+        nntd_stock,
+        sources=("stock_db.nntd_stock",),
+        refresh_class=REFRESH_MINUTELY,
+        probes=(QueryProbe("stock_db.nntd_stock", {"ticker": SAMPLE, "type": SAMPLE}),),
+    ),
+    "nntd_index": KeywordSpec(
+        nntd_index,
+        sources=("stock_db.nntd_index",),
+        refresh_class=REFRESH_MINUTELY,
+        probes=(QueryProbe("stock_db.nntd_index", {"ticker": SAMPLE, "type": SAMPLE}),),
+    ),
     # Industry queries
-    "home_today_industry": home_today_industry,
-    "home_hist_industry": home_hist_industry,
+    "home_today_industry": KeywordSpec(
+        home_today_industry,
+        sources=(_TODAY_INDEX,),
+        refresh_class=REFRESH_REALTIME,
+        delta_keys=("ticker",),
+        snapshot=True,
+    ),
+    "home_hist_industry": KeywordSpec(
+        home_hist_industry,
+        sources=(_HISTORY_INDEX,),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe(_HISTORY_INDEX, {"type": "industry", "ticker": SAMPLE}),),
+    ),
     # Phase signal
-    "phase_signal": phase_signal,
+    "phase_signal": KeywordSpec(
+        phase_signal,
+        sources=("stock_db.phase_signal",),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe("stock_db.phase_signal", {"ticker": SAMPLE}),),
+    ),
     # Giai đoạn thị trường (page phase)
-    "phase_daily": phase_daily,
-    "phase_comment": phase_comment,
-    "phase_perf": phase_perf,
-    "phase_basket": phase_basket,
-    "phase_rank": phase_rank,
-    "phase_comment_basket": phase_comment_basket,
-    "phase_trading": phase_trading,
-    "phase_industry": phase_industry,
-    "phase_comment_indicator": phase_comment_indicator,
+    "phase_daily": KeywordSpec(
+        phase_daily,
+        sources=("stock_db.phase_daily",),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe("stock_db.phase_daily", sort=(("date", 1),)),),
+    ),
+    "phase_comment": KeywordSpec(
+        phase_comment,
+        sources=("stock_db.phase_comment",),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe("stock_db.phase_comment", sort=(("date", -1),), limit=1),),
+    ),
+    "phase_perf": KeywordSpec(
+        phase_perf,
+        sources=("stock_db.phase_perf",),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe("stock_db.phase_perf", sort=(("date", 1), ("product", 1))),),
+    ),
+    "phase_basket": KeywordSpec(
+        phase_basket,
+        sources=("stock_db.phase_basket",),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe("stock_db.phase_basket", sort=(("date", -1),), limit=60),),
+    ),
+    "phase_rank": KeywordSpec(
+        phase_rank,
+        sources=("stock_db.phase_rank",),
+        refresh_class=REFRESH_EOD,
+        probes=(
+            QueryProbe("stock_db.phase_rank", distinct="date"),
+            QueryProbe("stock_db.phase_rank", {"date": {"$gte": SAMPLE}}, sort=(("date", -1),)),
+        ),
+    ),
+    "phase_comment_basket": KeywordSpec(
+        phase_comment_basket,
+        sources=("stock_db.phase_comment_basket",),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe("stock_db.phase_comment_basket", sort=(("date", -1),), limit=3),),
+    ),
+    "phase_trading": KeywordSpec(
+        phase_trading,
+        sources=("stock_db.phase_trading",),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe("stock_db.phase_trading", sort=(("entry_date", -1),)),),
+    ),
+    "phase_industry": KeywordSpec(
+        phase_industry,
+        sources=("stock_db.phase_industry",),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe("stock_db.phase_industry", sort=(("date", 1),)),),
+    ),
+    "phase_comment_indicator": KeywordSpec(
+        phase_comment_indicator,
+        sources=("stock_db.phase_comment_indicator",),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe("stock_db.phase_comment_indicator", sort=(("date", -1),), limit=15),),
+    ),
     # Trend queries
-    "home_history_trend": home_history_trend,
-    "home_today_trend": home_today_trend,
+    "home_history_trend": KeywordSpec(
+        home_history_trend,
+        sources=("stock_db.history_trend",),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe("stock_db.history_trend", {"ticker": SAMPLE}),),
+    ),
+    "home_today_trend": KeywordSpec(
+        home_today_trend,
+        sources=("stock_db.today_trend",),
+        refresh_class=REFRESH_REALTIME,
+        probes=(QueryProbe("stock_db.today_trend", {"ticker": SAMPLE}),),
+    ),
     # Chart queries
-    "chart_history_data": chart_history_data,
-    "chart_today_data": chart_today_data,
-    "chart_ticker": chart_ticker,
+    # chart_* chọn collection theo loại ticker → khai báo cả 2, thừa 1 lần đánh thức vẫn rẻ hơn poll.
+    "chart_history_data": KeywordSpec(
+        chart_history_data,
+        sources=(_HISTORY_INDEX, _HISTORY_STOCK),
+        refresh_class=REFRESH_EOD,
+        columnar=True,
+        indexes=((_HISTORY_STOCK, [("ticker", 1), ("date", 1)]), (_HISTORY_INDEX, [("ticker", 1), ("date", 1)])),
+        probes=(QueryProbe(_HISTORY_STOCK, {"ticker": SAMPLE}, sort=(("date", -1),), limit=500),),
+    ),
+    "chart_today_data": KeywordSpec(
+        chart_today_data,
+        sources=(_TODAY_INDEX, _TODAY_STOCK),
+        refresh_class=REFRESH_REALTIME,
+        delta_keys=("ticker", "date"),
+        snapshot=True,
+        columnar=True,
+    ),
+    "chart_ticker": KeywordSpec(
+        chart_ticker,
+        sources=(_TODAY_INDEX, _TODAY_STOCK),
+        refresh_class=REFRESH_REALTIME,
+        snapshot=True,
+    ),
     # News queries
-    "news_daily": news_daily,
-    "news_categories": news_categories,
-    "news_count": news_count,
-    "news_article": news_article,
+    "news_daily": KeywordSpec(
+        news_daily,
+        sources=(_NEWS_DAILY,),
+        refresh_class=REFRESH_MINUTELY,
+        sortable=_NEWS_SORTABLE,
+        default_sort=(("created_at", -1),),
+        projection=True,
+        indexes=((_NEWS_DAILY, [("created_at", -1), ("article_slug", -1)]),),
+        probes=(QueryProbe(_NEWS_DAILY, {"news_type": SAMPLE}, sort=(("created_at", -1), ("article_slug", -1)), limit=21),),
+        cursor_key="article_slug",
+    ),
+    "news_categories": KeywordSpec(news_categories, sources=(_NEWS_DAILY,), refresh_class=REFRESH_STATIC),
+    "news_count": KeywordSpec(
+        news_count,
+        sources=(_NEWS_DAILY, _NEWS_REPORT),
+        refresh_class=REFRESH_MINUTELY,
+        probes=(
+            QueryProbe(_NEWS_DAILY, {"created_at": {"$gt": SAMPLE}}),
+            QueryProbe(_NEWS_REPORT, {"created_at": {"$gt": SAMPLE}}),
+        ),
+    ),
+    "news_article": KeywordSpec(
+        news_article,
+        sources=(_NEWS_DAILY,),
+        refresh_class=REFRESH_STATIC,
+        projection=True,
+        indexes=((_NEWS_DAILY, [("article_slug", 1)]),),
+        immutable=True,
+        probes=(QueryProbe(_NEWS_DAILY, {"article_slug": SAMPLE}, limit=1),),
+    ),
     # News report queries
-    "news_report": news_report,
-    "news_report_categories": news_report_categories,
-    "report_article": report_article,
+    "news_report": KeywordSpec(
+        news_report,
+        sources=(_NEWS_REPORT,),
+        refresh_class=REFRESH_MINUTELY,
+        sortable=_NEWS_SORTABLE,
+        default_sort=(("created_at", -1),),
+        projection=True,
+        indexes=((_NEWS_REPORT, [("created_at", -1), ("report_slug", -1)]),),
+        probes=(QueryProbe(_NEWS_REPORT, {"report_type": SAMPLE}, sort=(("created_at", -1), ("report_slug", -1)), limit=21),),
+        cursor_key="report_slug",
+    ),
+    "news_report_categories": KeywordSpec(
+        news_report_categories,
+        sources=(_NEWS_REPORT,),
+        refresh_class=REFRESH_STATIC,
+    ),
+    "report_article": KeywordSpec(
+        report_article,
+        sources=(_NEWS_REPORT,),
+        refresh_class=REFRESH_STATIC,
+        indexes=((_NEWS_REPORT, [("report_slug", 1)]),),
+        immutable=True,
+        probes=(QueryProbe(_NEWS_REPORT, {"report_slug": SAMPLE}, limit=1),),
+    ),
     # Finratios queries
-    "finratios_stock": finratios_stock,
-    "finratios_industry": finratios_industry,
-    "finstats_map": finstats_map,
-    "finstats_industry": finstats_industry,
-    "finstats_stock": finstats_stock,
+    "finratios_stock": KeywordSpec(
+        finratios_stock,
+        sources=("stock_db.finratios_stock",),
+        refresh_class=REFRESH_EOD,
+        probes=(QueryProbe("stock_db.finratios_stock", {"ticker": SAMPLE}, sort=(("date", -1),)),),
+    ),
+    "finratios_industry": KeywordSpec(
+        finratios_industry,
+        sources=("stock_db.finratios_industry",),
+        refresh_class=REFRESH_EOD,
+        projection=True,
+        probes=(QueryProbe("stock_db.finratios_industry", {"ticker": SAMPLE}, sort=(("date", -1),)),),
+    ),
+    "finstats_map": KeywordSpec(finstats_map, sources=("ref_db.finstats_map",), refresh_class=REFRESH_STATIC),
+    "finstats_industry": KeywordSpec(
+        finstats_industry,
+        sources=("stock_db.finstats_industry",),
+        refresh_class=REFRESH_EOD,
+        probes=(
+            QueryProbe(
+                "stock_db.finstats_industry",
+                {"industry": SAMPLE, "period": {"$regex": "_[1-4]$"}},
+                sort=(("period", -1),),
+            ),
+        ),
+    ),
+    "finstats_stock": KeywordSpec(
+        finstats_stock,
+        sources=("stock_db.finstats_stock",),
+        refresh_class=REFRESH_EOD,
+        probes=(
+            QueryProbe(
+                "stock_db.finstats_stock",
+                {"ticker": SAMPLE, "period": {"$regex": "_[1-4]$"}},
+                sort=(("period", -1),),
+            ),
+        ),
+    ),
     # Stock info
-    "info_stock": info_stock,
+    "info_stock": KeywordSpec(
+        info_stock,
+        sources=("ref_db.info_stock",),
+        refresh_class=REFRESH_STATIC,
+        probes=(QueryProbe("ref_db.info_stock", {"ticker": SAMPLE}),),
+    ),
     # Ref map (mã → tên đầy đủ ngành/chỉ số)
-    "index_map": index_map,
+    "index_map": KeywordSpec(index_map, sources=("ref_db.index_map",), refresh_class=REFRESH_STATIC),
     # Screener queries
-    "screener_stock_data": screener_stock_data,
-    "screener_stock_meta": screener_stock_meta,
+    "screener_stock_data": KeywordSpec(
+        screener_stock_data,
+        sources=(_TODAY_STOCK,),
+        refresh_class=REFRESH_REALTIME,
+        delta_keys=("ticker",),
+        snapshot=True,
+    ),
+    "screener_stock_meta": KeywordSpec(
+        screener_stock_meta,
+        sources=(_TODAY_STOCK,),
+        refresh_class=REFRESH_EOD,
+        snapshot=True,
+    ),
+    "screener_query": KeywordSpec(
+        screener_query,
+        sources=(_TODAY_STOCK,),
+        refresh_class=REFRESH_REALTIME,
+        delta_keys=("ticker",),
+        snapshot=True,
+        columnar=True,
+    ),
     # Search queries
-    "search_stocks": search_stocks,
-    "search_index": search_index,
-    "search_news": search_news,
-    "search_reports": search_reports,
+    "search_stocks": KeywordSpec(
+        search_stocks,
+        sources=(_TODAY_STOCK,),
+        refresh_class=REFRESH_REALTIME,
+        delta_keys=("ticker",),
+        snapshot=True,
+    ),
+    "search_index": KeywordSpec(
+        search_index,
+        sources=(_TODAY_INDEX,),
+        refresh_class=REFRESH_REALTIME,
+        delta_keys=("ticker",),
+        snapshot=True,
+    ),
+    "suggest": KeywordSpec(
+        suggest,
+        sources=(_TODAY_STOCK, _TODAY_INDEX),
+        refresh_class=REFRESH_REALTIME,
+        snapshot=True,
+    ),
+    "search_news": KeywordSpec(
+        search_news,
+        sources=(_NEWS_DAILY,),
+        refresh_class=REFRESH_MINUTELY,
+        probes=(QueryProbe(_NEWS_DAILY, {"tickers": SAMPLE}, sort=(("created_at", -1),), limit=20),),
+    ),
+    "search_reports": KeywordSpec(
+        search_reports,
+        sources=(_NEWS_REPORT,),
+        refresh_class=REFRESH_MINUTELY,
+        probes=(QueryProbe(_NEWS_REPORT, {"tickers": SAMPLE}, sort=(("created_at", -1),), limit=20),),
+    ),
     # Market meta
-    "market_update_time": market_update_time,
+    "market_update_time": KeywordSpec(
+        market_update_time,
+        sources=("stock_db.itd_index",),
+        refresh_class=REFRESH_REALTIME,
+        snapshot=True,
+    ),
     # Other Ticker
-    "latest_other_ticker": latest_other_ticker,
-    "other_ticker": other_ticker,
-    # Chat — câu hỏi gợi ý (đọc user_db, do app tự sinh)
-    "chat_suggestions": fetch_chat_suggestions,
+    "latest_other_ticker": KeywordSpec(
+        latest_other_ticker,
+        sources=("stock_db.latest_other_ticker",),
+        refresh_class=REFRESH_MINUTELY,
+        delta_keys=("ticker",),
+    ),
+    "other_ticker": KeywordSpec(
+        other_ticker,
+        sources=("stock_db.other_ticker",),
+        refresh_class=REFRESH_EOD,
+        sortable=_OTHER_TICKER_SORTABLE,
+        default_sort=(("date", -1),),
+        indexes=(("stock_db.other_ticker", [("ticker", 1), ("date", -1)]),),
+        probes=(QueryProbe("stock_db.other_ticker", {"ticker": SAMPLE}, sort=(("date", -1),)),),
+    ),
+    # Chat — câu hỏi gợi ý (đọc user_db, do app tự sinh). Bốc ngẫu nhiên mỗi lần gọi → không khai báo
+    # nguồn (giữ poll cố định) và không cache REST.
+    "chat_suggestions": KeywordSpec(fetch_chat_suggestions, refresh_class=REFRESH_MINUTELY, cacheable=False),
 }
 
+# View cũ theo từng thuộc tính — giữ cho code/test đang dùng.
+SSE_QUERY_REGISTRY: Dict[str, Any] = {name: spec.func for name, spec in KEYWORD_SPECS.items()}
+KEYWORD_SOURCES: Dict[str, Tuple[str, ...]] = {name: spec.sources for name, spec in KEYWORD_SPECS.items() if spec.sources}
+KEYWORD_DELTA_KEYS: Dict[str, Tuple[str, ...]] = {
+    name: spec.delta_keys for name, spec in KEYWORD_SPECS.items() if spec.delta_keys
+}
+KEYWORD_REFRESH_CLASS: Dict[str, str] = {name: spec.refresh_class for name, spec in KEYWORD_SPECS.items()}
+
+
+def get_keyword_spec(keyword: str) -> KeywordSpec:
+    """Spec của keyword. Keyword không hợp lệ → ValueError."""
+    spec = KEYWORD_SPECS.get(keyword)
+    if spec is None:
+        available = ", ".join(get_available_keywords())
+        raise ValueError(f"Keyword '{keyword}' không hợp lệ. Các keyword có sẵn: {available}")
+    return spec
+
+
+def normalize_query_params(keyword: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate + chuẩn hoá tham số theo spec của keyword (xem _spec.normalize_params). Sai → ValueError."""
+    return normalize_params(get_keyword_spec(keyword), params)
+
+
+def get_keyword_sources(keyword: str) -> Tuple[str, ...]:
+    """Collection nguồn của keyword (tuple rỗng nếu chưa khai báo)."""
+    spec = KEYWORD_SPECS.get(keyword)
+    return spec.sources if spec else ()
+
+
+def get_refresh_class(keyword: str) -> str:
+    """Refresh class của keyword (mặc định realtime)."""
+    spec = KEYWORD_SPECS.get(keyword)
+    return spec.refresh_class if spec else REFRESH_REALTIME
+
 
 def get_available_keywords() -> List[str]:
     """Lấy danh sách tất cả các keyword có sẵn."""
-    return list(SSE_QUERY_REGISTRY.keys())
+    return list(KEYWORD_SPECS.keys())
 
 
 async def execute_sse_query(
@@ -161,6 +513,11 @@ async def execute_sse_query(
     sort_order: Optional[str] = None,
     projection: Optional[Dict[str, Any]] = None,
     search: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    cursor: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
     **kwargs,
 ) -> Dict[str, Any]:
     """
@@ -179,18 +536,18 @@ async def execute_sse_query(
         limit: Số lượng bản ghi mỗi trang
         sort_by: Tên field để sắp xếp
         sort_order: Thứ tự sắp xếp (asc/desc)
+        fields: Danh sách field cần lấy (chart_*_data)
+        before / after / cursor: Phân trang keyset theo date (chart_history_data); cursor cho feed
+            news_daily / news_report (crud/sse/_feed.py)
+        filters: Điều kiện lọc đã parse (screener_query)
 
     Returns:
         Dict chứa data và pagination info (nếu có)
 
     Raises:
-        ValueError: Nếu keyword không hợp lệ
+        ValueError: Nếu keyword không hợp lệ hoặc tham số sai so với spec (sort_by ngoài allowlist...)
     """
-    if keyword not in SSE_QUERY_REGISTRY:
-        available = ", ".join(get_available_keywords())
-        raise ValueError(f"Keyword '{keyword}' không hợp lệ. Các keyword có sẵn: {available}")
-
-    query_func = SSE_QUERY_REGISTRY[keyword]
+    spec = get_keyword_spec(keyword)
     logger.debug(
         f"Executing SSE query for keyword: {keyword}, ticker: {ticker}, news_type: {news_type}, report_type: {report_type}, categories: {categories}, page: {page}, limit: {limit}"
     )
@@ -211,7 +568,15 @@ async def execute_sse_query(
         "sort_order": sort_order,
         "projection": projection,
         "search": search,
+        "fields": fields,
+        "before": before,
+        "after": after,
+        "cursor": cursor,
+        "filters": filters,
     }
+    # sort_by ngoài allowlist / fields cho keyword không hỗ trợ → ValueError; sort mặc định điền sẵn.
+    query_params = normalize_params(spec, query_params)
 
-    # Gọi hàm query với các params
-    return await query_func(**query_params)
+    # Gọi hàm query với các params — qua circuit breaker (Mongo chập chờn → CircuitOpenError ngay).
+    async with mongo_breaker.guard():
+        return await spec.func(**query_params)
@@ -0,0 +1,173 @@
+# finext-fastapi/app/crud/sse/_article_cache.py
+"""
+Cache nội dung bài viết (news_article / report_article) theo slug — LRU giới hạn bytes, mỗi worker.
+
+Bài đã xuất bản gần như không đổi nhưng mỗi lượt xem vẫn find_one nguyên body (vài chục KB) từ
+Mongo; bài hot được chia sẻ lên mạng xã hội = hàng nghìn lần đọc cùng 1 document. REST cache
+(crud/sse/_rest_cache.py) chỉ giữ 5 phút và tách entry theo từng projection.
+
+- Giữ document đầy đủ (không _id) theo (collection, slug); projection của client áp trong RAM
+  (crud/sse/_snapshot.apply_projection) → mọi biến thể projection dùng chung 1 entry.
+- Trần tổng bytes (SSE_ARTICLE_CACHE_MB, kích thước JSON đã serialize), 1 bài lớn hơn 1/8 trần
+  không được cache. Không tìm thấy → không cache (bài có thể xuất bản ngay sau đó).
+- Entry giữ tối đa ARTICLE_CACHE_MAX_AGE giây (= max-age `immutable` gửi cho trình duyệt/nginx,
+  utils/http_cache.py) để bài bị sửa (đính chính) được đọc lại cùng lúc ở mọi tầng cache.
+- Single-flight: nhiều request cùng slug đang miss chỉ đọc Mongo 1 lần.
+- warm_article_cache: lúc khởi động nạp sẵn các bài mới nhất hôm nay (giờ VN) của từng collection.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import SSE_ARTICLE_CACHE_MB
+from app.core.database import get_database
+from app.core.query_governor import LANE_BACKGROUND, query_governor
+from app.crud.sse._helpers import STOCK_DB, get_collection_records
+from app.utils.fast_json import dumps_json
+from app.utils.http_cache import IMMUTABLE_MAX_AGE
+from app.utils.market_session import VN_TZ
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_CACHE_MAX_AGE = IMMUTABLE_MAX_AGE
+ARTICLE_WARM_LIMIT = 50
+# collection → field slug; dùng chung cho keyword và warm-up.
+ARTICLE_SOURCES: Dict[str, str] = {"news_daily": "article_slug", "news_report": "report_slug"}
+
+
+class ArticleCache:
+    def __init__(self, max_bytes: int, max_entry_ratio: float = 0.125, max_age: float = ARTICLE_CACHE_MAX_AGE) -> None:
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = int(max_bytes * max_entry_ratio)
+        self.max_age = max_age
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Dict[str, Any], int, float]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.warmed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _drop(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def put(self, collection_name: str, slug: str, doc: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        size = len(dumps_json(doc))
+        if size > self.max_entry_bytes:
+            return
+        key = (collection_name, slug)
+        self._drop(key)
+        self._entries[key] = (doc, size, time.monotonic())
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def get(self, collection_name: str, slug: str) -> Optional[Dict[str, Any]]:
+        key = (collection_name, slug)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[2] >= self.max_age:
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    async def get_or_load(
+        self, collection_name: str, slug: str, loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Document đầy đủ của bài (dùng chung — caller KHÔNG sửa tại chỗ); None nếu không có."""
+        if not self.enabled:
+            return await loader()
+        doc = self.get(collection_name, slug)
+        if doc is not None:
+            self.hits += 1
+            return doc
+        self.misses += 1
+        key = (collection_name, slug)
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.create_task(self._load(collection_name, slug, loader))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return await asyncio.shield(task)
+
+    async def _load(self, collection_name: str, slug: str, loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]) -> Optional[Dict[str, Any]]:
+        try:
+            doc = await loader()
+            if doc is not None:
+                self.put(collection_name, slug, doc)
+            return doc
+        finally:
+            self._inflight.pop((collection_name, slug), None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "warmed": self.warmed,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = self.warmed = 0
+
+
+article_cache = ArticleCache(SSE_ARTICLE_CACHE_MB * 1024 * 1024)
+
+
+async def load_article(collection_name: str, slug: str) -> Optional[Dict[str, Any]]:
+    """Document đầy đủ (không _id) của bài theo slug — qua article_cache."""
+    slug_field = ARTICLE_SOURCES[collection_name]
+
+    async def _loader():
+        collection = get_database(STOCK_DB).get_collection(collection_name)
+        return await collection.find_one({slug_field: slug}, {"_id": 0})
+
+    return await article_cache.get_or_load(collection_name, slug, _loader)
+
+
+async def warm_article_cache(limit: int = ARTICLE_WARM_LIMIT) -> None:
+    """Nạp sẵn tối đa `limit` bài mới nhất hôm nay (giờ VN) của mỗi collection (task nền lúc khởi động)."""
+    if not article_cache.enabled:
+        return
+    today_start = datetime.now(VN_TZ).replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+    for collection_name, slug_field in ARTICLE_SOURCES.items():
+        try:
+            async with query_governor.slot(LANE_BACKGROUND):
+                docs = await get_collection_records(
+                    get_database(STOCK_DB),
+                    collection_name,
+                    find_query={"created_at": {"$gte": today_start}},
+                    projection={"_id": 0},
+                    sort=[("created_at", -1)],
+                    limit=limit,
+                )
+        except Exception as e:
+            logger.error(f"Article cache {collection_name}: warm-up lỗi: {e}", exc_info=True)
+            continue
+        for doc in docs:
+            slug = doc.get(slug_field)
+            if isinstance(slug, str):
+                article_cache.put(collection_name, slug, doc)
+                article_cache.warmed += 1
+    logger.info(f"Article cache: nạp sẵn {article_cache.warmed} bài ({article_cache._bytes} bytes)")
@@ -0,0 +1,166 @@
+# finext-fastapi/app/crud/sse/_breaker.py
+"""
+Circuit breaker cho query dữ liệu thị trường (execute_sse_query).
+
+Khi Mongo chập chờn, mỗi poller/REST request vẫn tiếp tục bắn query (kèm retry trong
+get_collection_records) đúng lúc Mongo cần được thở. Breaker đếm lỗi hạ tầng (mất kết nối,
+timeout — kể cả khi helper bọc trong RuntimeError) trong cửa sổ trượt:
+
+    closed     → query bình thường; lỗi ≥ FAILURE_THRESHOLD và tỉ lệ lỗi ≥ FAILURE_RATIO
+                 trong WINDOW giây → open
+    open       → từ chối ngay (CircuitOpenError) trong OPEN_SECONDS, caller phục vụ dữ liệu cũ
+    half_open  → hết OPEN_SECONDS: đúng 1 query thăm dò được chạy, các query khác vẫn bị từ chối;
+                 thăm dò thành công → closed, lỗi → open lại
+
+Lỗi của request (ValueError keyword/tham số sai, ScreenerQueryError, OperationFailure do projection
+sai...), bug của keyword (RuntimeError/TypeError thường) và query bị governor cắt (QueryShedError)
+không tính là Mongo hỏng — breaker dùng chung cả process, vài request xấu không được làm mở nó.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+from pymongo.errors import ConnectionFailure, ExecutionTimeout
+
+from app.core.query_governor import QueryShedError
+
+FAILURE_THRESHOLD = 5
+FAILURE_RATIO = 0.5
+WINDOW_SECONDS = 30.0
+OPEN_SECONDS = 15.0
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Breaker đang mở — không query Mongo, caller phục vụ dữ liệu cũ nếu có."""
+
+
+# Lỗi mạng / timeout. ConnectionFailure gồm AutoReconnect, ServerSelectionTimeoutError, NetworkTimeout.
+_INFRASTRUCTURE_ERRORS = (ConnectionFailure, ExecutionTimeout, asyncio.TimeoutError, TimeoutError, ConnectionError)
+
+
+def is_infrastructure_error(exc: Optional[BaseException]) -> bool:
+    """Lỗi mạng/timeout của Mongo — xét cả chuỗi __cause__ (get_collection_records bọc lỗi trong RuntimeError)."""
+    while exc is not None:
+        if isinstance(exc, (QueryShedError, CircuitOpenError)):
+            return False
+        if isinstance(exc, _INFRASTRUCTURE_ERRORS):
+            return True
+        exc = exc.__cause__
+    return False
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        failure_ratio: float = FAILURE_RATIO,
+        window: float = WINDOW_SECONDS,
+        open_seconds: float = OPEN_SECONDS,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.failure_ratio = failure_ratio
+        self.window = window
+        self.open_seconds = open_seconds
+        self._events: Deque[Tuple[float, bool]] = deque()  # (thời điểm, thành công?)
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            return STATE_HALF_OPEN
+        return self._state
+
+    def retry_in(self) -> float:
+        """Giây tới khi breaker cho phép thăm dò (0 nếu đang đóng)."""
+        if self._state == STATE_CLOSED:
+            return 0.0
+        return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def _record(self, ok: bool) -> None:
+        now = time.monotonic()
+        self._events.append((now, ok))
+        while self._events and now - self._events[0][0] > self.window:
+            self._events.popleft()
+
+    def _should_trip(self) -> bool:
+        failures = sum(1 for _, ok in self._events if not ok)
+        return failures >= self.failure_threshold and failures / len(self._events) >= self.failure_ratio
+
+    def _open(self) -> None:
+        self._state = STATE_OPEN
+        self._opened_at = time.monotonic()
+        self._events.clear()
+        self.trips += 1
+
+    def _enter(self) -> bool:
+        """True nếu lượt này là query thăm dò (half-open). Bị từ chối → CircuitOpenError."""
+        state = self.state
+        if state == STATE_CLOSED:
+            return False
+        if state == STATE_HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        raise CircuitOpenError(f"Mongo circuit open, thử lại sau {self.retry_in():.1f}s")
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        probe = self._enter()
+        try:
+            yield
+        except BaseException as e:
+            if probe:
+                self._probing = False
+            if is_infrastructure_error(e):
+                if probe:
+                    self._open()
+                else:
+                    self._record(False)
+                    if self._state == STATE_CLOSED and self._should_trip():
+                        self._open()
+            raise
+        else:
+            if probe:
+                self._probing = False
+                self._state = STATE_CLOSED
+                self._events.clear()
+            self._record(True)
+
+    def clear(self) -> None:
+        self._events.clear()
+        self._state = STATE_CLOSED
+        self._probing = False
+        self.trips = self.rejected = 0
+
+    def stats(self) -> Dict[str, Any]:
+        failures = sum(1 for _, ok in self._events if not ok)
+        return {
+            "state": self.state,
+            "failures": failures,
+            "calls": len(self._events),
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "retry_in": round(self.retry_in(), 1),
+        }
+
+
+mongo_breaker = CircuitBreaker()
+
+
+def stale_marker(age: float, channel: Optional[str] = None) -> Dict[str, Any]:
+    """Phần đánh dấu dữ liệu cũ gửi kèm khi phục vụ bản cuối cùng lấy được: {"stale": true, "age": giây}."""
+    marker: Dict[str, Any] = {"stale": True, "age": round(age, 1)}
+    if channel is not None:
+        marker["channel"] = channel
+    return marker
@@ -3,6 +3,8 @@
 Module chứa các constants và helper functions liên quan đến ticker classification.
 """
 
+from typing import Dict, List, Optional
+
 # Danh sách các index tickers (dùng để phân biệt query từ collection nào)
 INDEX_TICKERS = {
     "HNX30",
@@ -148,6 +150,30 @@ CHART_DATA_PROJECTION = {
     "y_val": 1,
 }
 
+# Field luôn trả về dù client chọn `fields=` (trục thời gian + định danh).
+CHART_REQUIRED_FIELDS = ("ticker", "date")
+
+
+def parse_chart_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse tham số `fields=` (comma-separated) cho chart_*_data. None/rỗng → None (đủ field).
+    Field lạ (không có trong CHART_DATA_PROJECTION) → ValueError.
+    """
+    if not fields:
+        return None
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in names if CHART_DATA_PROJECTION.get(f) != 1]
+    if unknown:
+        raise ValueError(f"Field không hợp lệ: {', '.join(unknown)}")
+    return list(dict.fromkeys([*CHART_REQUIRED_FIELDS, *names]))
+
+
+def chart_projection(fields: Optional[List[str]] = None) -> Dict[str, int]:
+    """Projection cho chart_*_data: đủ CHART_DATA_PROJECTION, hoặc chỉ các field đã chọn."""
+    if not fields:
+        return CHART_DATA_PROJECTION
+    return {"_id": 0, **{f: 1 for f in fields}}
+
 
 def _is_index_ticker(ticker: str) -> bool:
     """Kiểm tra ticker có phải là index hay stock."""
@@ -0,0 +1,90 @@
+# finext-fastapi/app/crud/sse/_cursor.py
+"""
+Cursor phân trang keyset (opaque) cho các keyword đọc collection theo thứ tự thời gian.
+
+Cursor = base64url(JSON) chứa hướng + giá trị khoá cuối của trang trước, kèm kiểu gốc của giá
+trị (chuỗi hay datetime BSON) để query lại đúng kiểu — Mongo so sánh theo từng kiểu, lệch kiểu
+là không khớp dòng nào. Client chỉ chuyển tiếp nguyên chuỗi, không parse.
+
+Khoá không duy nhất (created_at của tin: nhiều bài cùng giây) mang thêm khoá phụ "k" (slug) —
+trang kế lọc (khoá, khoá phụ) để bài trùng mốc không bị bỏ sót / lặp giữa 2 trang.
+"""
+
+import base64
+import json
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+MAX_CURSOR_LENGTH = 512
+
+
+def encode_cursor(direction: str, value: Any, key: Optional[str] = None) -> str:
+    """Cursor cho trang kế theo hướng direction ("before" | "after") tính từ value (+ khoá phụ key)."""
+    if isinstance(value, datetime):
+        body = {"dir": direction, "v": value.isoformat(), "t": "dt"}
+    else:
+        body = {"dir": direction, "v": value, "t": "s"}
+    if key is not None:
+        body["k"] = key
+    raw = json.dumps(body, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Cursor → {"dir": ..., "v": giá trị đúng kiểu[, "k": khoá phụ]}. Cursor hỏng → ValueError."""
+    if len(cursor) > MAX_CURSOR_LENGTH:
+        raise ValueError("Cursor không hợp lệ")
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        body = json.loads(raw)
+        direction, value, kind, key = body["dir"], body["v"], body["t"], body.get("k")
+        if direction not in ("before", "after") or not isinstance(value, str) or kind not in ("dt", "s"):
+            raise ValueError
+        if key is not None and not isinstance(key, str):
+            raise ValueError
+        if kind == "dt":
+            value = datetime.fromisoformat(value)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise ValueError("Cursor không hợp lệ") from None
+    decoded = {"dir": direction, "v": value}
+    if key is not None:
+        decoded["k"] = key
+    return decoded
+
+
+def parse_day(value: str) -> datetime:
+    """"YYYY-MM-DD" → datetime 00:00 của ngày đó. Sai định dạng → ValueError."""
+    if not _DATE_RE.match(value):
+        raise ValueError(f"Ngày không hợp lệ: {value} (định dạng YYYY-MM-DD)")
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def day_bound_filter(field: str, before: Optional[str] = None, after: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Filter cho before=/after= dạng ngày: before=D → field < D, after=D → field >= D+1 (không gồm D).
+
+    Không biết trước field lưu chuỗi ISO hay datetime → $or 2 nhánh cùng mốc; mỗi nhánh vẫn
+    dùng được index (ticker, field). Với chuỗi "D" < "DT00:00:00" nên mốc ngày so đúng cả 2 kiểu.
+    """
+    if before is not None:
+        op, day = "$lt", parse_day(before)
+    elif after is not None:
+        op, day = "$gte", parse_day(after) + timedelta(days=1)
+    else:
+        return {}
+    return {"$or": [{field: {op: day.strftime("%Y-%m-%d")}}, {field: {op: day}}]}
+
+
+def cursor_filter(field: str, decoded: Dict[str, Any], key_field: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Filter chính xác theo khoá cuối trong cursor (đúng kiểu gốc → 1 nhánh, 1 index range).
+
+    Có khoá phụ (key_field + "k" trong cursor) → field vượt mốc, hoặc bằng mốc và key_field vượt
+    khoá phụ; sort (field, key_field) cùng chiều thì cả 2 nhánh đều là range trên index ghép.
+    """
+    op = "$lt" if decoded["dir"] == "before" else "$gt"
+    if key_field is None or decoded.get("k") is None:
+        return {field: {op: decoded["v"]}}
+    return {"$or": [{field: {op: decoded["v"]}}, {field: decoded["v"], key_field: {op: decoded["k"]}}]}
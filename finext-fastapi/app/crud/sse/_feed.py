@@ -0,0 +1,224 @@
+# finext-fastapi/app/crud/sse/_feed.py
+"""
+Đọc 1 trang feed tin (news_daily / news_report): phân trang keyset + tổng số bài có cache.
+
+Trước đây mỗi trang chạy count_documents(filter) (quét cả index theo filter) rồi
+sort(created_at).skip((page-1)*limit) — trang càng sâu càng chậm, cuộn trang nào cũng đếm lại.
+
+- Keyset: sort (created_at, slug) cùng chiều, trang kế lọc theo (created_at, slug) của bài cuối
+  (crud/sse/_cursor.py, slug làm khoá phụ cho bài trùng giây) → chi phí không phụ thuộc độ sâu.
+  `next_cursor` trả cả ở chế độ page (trang 1 nối tiếp bằng cursor được).
+- has_next: đọc limit+1 bài, không suy ra từ total.
+- Tổng số bài: cache theo (collection, filter) trong FeedCountCache; đếm lại khi watcher báo
+  collection đổi, khi bài đầu trang 1 (created_at, slug) khác lần trước — tức có bài mới — hoặc
+  quá SSE_FEED_COUNT_TTL. Trang cuối của chế độ page tự biết tổng chính xác → ghi thẳng, không đếm.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import SSE_FEED_COUNT_TTL
+from app.crud.sse._cursor import cursor_filter, decode_cursor, encode_cursor
+from app.crud.sse._helpers import OPERATION_TIMEOUT_MS, STOCK_DB
+from app.crud.sse._watcher import watcher
+
+FEED_SORT_FIELD = "created_at"
+FEED_DEFAULT_LIMIT = 20
+FEED_COUNT_MAX_ENTRIES = 1024
+
+# Bài đầu trang 1 không biết (request không đọc trang 1 mới nhất trước) → không dùng để so.
+_UNKNOWN = object()
+
+
+def _direction(sort_order: Optional[str]) -> str:
+    return "before" if (sort_order or "desc") == "desc" else "after"
+
+
+def parse_feed_cursor(cursor: Optional[str], sort_by: Optional[str], sort_order: Optional[str]) -> Optional[Dict[str, Any]]:
+    """cursor= của feed → cursor đã decode (None nếu không dùng). Sai / lệch sort → ValueError (router trả 400)."""
+    if cursor is None:
+        return None
+    if (sort_by or FEED_SORT_FIELD) != FEED_SORT_FIELD:
+        raise ValueError(f"cursor chỉ hỗ trợ sort_by={FEED_SORT_FIELD}")
+    decoded = decode_cursor(cursor)
+    if decoded["dir"] != _direction(sort_order) or "k" not in decoded:
+        raise ValueError("Cursor không khớp sort_order")
+    return decoded
+
+
+def category_filter(find_query: Dict[str, Any], categories: Optional[str]) -> None:
+    """categories="a,b" → category $in; 1 giá trị → so bằng."""
+    if not categories:
+        return
+    category_list = [c.strip() for c in categories.split(",") if c.strip()]
+    if len(category_list) == 1:
+        find_query["category"] = category_list[0]
+    elif len(category_list) > 1:
+        find_query["category"] = {"$in": category_list}
+
+
+@dataclass
+class _CountEntry:
+    total: int
+    seen: Tuple[int, ...]
+    head: Any
+    counted_at: float
+
+
+class FeedCountCache:
+    """Tổng số bài theo (collection, filter) — LRU giới hạn số entry (filter theo ticker rất nhiều tổ hợp)."""
+
+    def __init__(self, ttl: float, max_entries: int = FEED_COUNT_MAX_ENTRIES) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _CountEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.exact = 0
+
+    @staticmethod
+    def _key(collection_name: str, find_query: Dict[str, Any]) -> str:
+        return json.dumps([collection_name, find_query], sort_keys=True, separators=(",", ":"), default=str)
+
+    def _fresh_entry(self, key: str, seen: Tuple[int, ...], head: Any) -> Optional[_CountEntry]:
+        """Entry còn dùng được (đã cập nhật head + vị trí LRU); None → phải đếm lại."""
+        entry = self._entries.get(key)
+        if entry is None or entry.seen != seen or time.monotonic() - entry.counted_at >= self.ttl:
+            return None
+        if head is not _UNKNOWN and entry.head is not _UNKNOWN and head != entry.head:
+            return None  # bài mới nhất đổi → có bài mới (hoặc bài bị xoá) → đếm lại
+        if head is not _UNKNOWN:
+            entry.head = head
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, total: int, seen: Tuple[int, ...], head: Any) -> _CountEntry:
+        entry = self._entries[key] = _CountEntry(total, seen, head, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    async def total(self, db: AsyncIOMotorDatabase, collection_name: str, find_query: Dict[str, Any], head: Any = _UNKNOWN) -> int:
+        key = self._key(collection_name, find_query)
+        seen = watcher.versions((f"{STOCK_DB}.{collection_name}",))
+        entry = self._fresh_entry(key, seen, head)
+        if entry is not None:
+            self.hits += 1
+            return entry.total
+        self.misses += 1
+        total = await db.get_collection(collection_name).count_documents(find_query)
+        return self._store(key, total, seen, head).total
+
+    def record(self, collection_name: str, find_query: Dict[str, Any], total: int, head: Any = _UNKNOWN) -> None:
+        """Tổng đã biết chính xác (trang cuối của chế độ page) → ghi thẳng, lần sau khỏi đếm."""
+        self.exact += 1
+        self._store(self._key(collection_name, find_query), total, watcher.versions((f"{STOCK_DB}.{collection_name}",)), head)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "exact": self.exact, "ttl": self.ttl}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = self.exact = 0
+
+
+feed_counts = FeedCountCache(SSE_FEED_COUNT_TTL)
+
+
+def _projection_with_keys(projection: Optional[Dict[str, Any]], key_field: str) -> Tuple[Dict[str, Any], List[str]]:
+    """Projection chắc chắn có created_at + slug (để tạo cursor) và danh sách field thêm vào — bỏ đi trước khi trả."""
+    if projection is None:
+        return {"_id": 0}, []
+    out = dict(projection)
+    inclusion = any(v for k, v in out.items() if k != "_id")
+    added = []
+    for f in (FEED_SORT_FIELD, key_field):
+        if inclusion and not out.get(f):
+            out[f] = 1
+            added.append(f)
+        elif not inclusion and f in out:
+            out.pop(f)
+            added.append(f)
+    return out, added
+
+
+async def read_feed(
+    db: AsyncIOMotorDatabase,
+    collection_name: str,
+    key_field: str,
+    find_query: Dict[str, Any],
+    page: Optional[int] = None,
+    limit: Optional[int] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = None,
+    projection: Optional[Dict[str, Any]] = None,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    1 trang feed: {"items", "pagination": {page, limit, total, total_pages, has_next, has_prev, next_cursor}}.
+
+    cursor → đọc tiếp sau bài cuối của trang trước (page bị bỏ qua, pagination.page = None);
+    không cursor → skip theo page như cũ. next_cursor chỉ có khi sort theo created_at và còn trang sau.
+    """
+    decoded = parse_feed_cursor(cursor, sort_by, sort_order)
+    limit = limit or FEED_DEFAULT_LIMIT
+    page = None if decoded is not None else (page or 1)
+    sort_field = sort_by or FEED_SORT_FIELD
+    sort_direction = -1 if (sort_order or "desc") == "desc" else 1
+    keyset = sort_field == FEED_SORT_FIELD
+
+    # Filter của feed chỉ có tickers / news_type / report_type / category → ghép thẳng với filter cursor.
+    page_query = {**find_query, **cursor_filter(FEED_SORT_FIELD, decoded, key_field)} if decoded is not None else find_query
+    read_projection, added = _projection_with_keys(projection, key_field) if keyset else (projection or {"_id": 0}, [])
+
+    find_cursor = db.get_collection(collection_name).find(page_query, read_projection)
+    # Khoá phụ slug cùng chiều → thứ tự ổn định giữa các trang, khớp index (created_at, slug).
+    find_cursor.sort([(sort_field, sort_direction), (key_field, sort_direction)] if keyset else [(sort_field, sort_direction)])
+    if page is not None and page > 1:
+        find_cursor.skip((page - 1) * limit)
+    find_cursor.limit(limit + 1)
+    find_cursor.max_time_ms(OPERATION_TIMEOUT_MS)
+    docs = await find_cursor.to_list(length=limit + 1)
+
+    has_next = len(docs) > limit
+    docs = docs[:limit]
+    next_cursor = None
+    if keyset and has_next:
+        last_value, last_key = docs[-1].get(FEED_SORT_FIELD), docs[-1].get(key_field)
+        if isinstance(last_value, str) or hasattr(last_value, "isoformat"):
+            next_cursor = encode_cursor(_direction(sort_order), last_value, key=last_key if isinstance(last_key, str) else None)
+
+    # Trang 1 mới nhất trước: bài đầu = dấu hiệu có bài mới cho cache tổng số.
+    head = _UNKNOWN
+    if page == 1 and keyset and sort_direction < 0:
+        head = (docs[0].get(FEED_SORT_FIELD), docs[0].get(key_field)) if docs else None
+    if page is not None and not has_next and (docs or page == 1):
+        total = (page - 1) * limit + len(docs)
+        feed_counts.record(collection_name, find_query, total, head)
+    else:
+        total = await feed_counts.total(db, collection_name, find_query, head)
+
+    if added:
+        for doc in docs:
+            for f in added:
+                doc.pop(f, None)
+
+    total_pages = (total + limit - 1) // limit if limit > 0 else 1
+    return {
+        "items": docs,
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "total_pages": total_pages,
+            "has_next": has_next,
+            "has_prev": page is None or page > 1,
+            "next_cursor": next_cursor,
+        },
+    }
@@ -7,7 +7,7 @@ import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pymongo.errors import PyMongoError, ExecutionTimeout
+from pymongo.errors import PyMongoError, ExecutionTimeout, OperationFailure
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +51,7 @@ async def get_collection_records(
         limit: Giới hạn số lượng records (mặc định None = không giới hạn).
 
     Raises:
+        OperationFailure: Mongo từ chối query (projection/filter sai, không đủ quyền) — không retry.
         RuntimeError: Nếu không thể lấy dữ liệu sau MAX_RETRIES lần thử.
     """
     if find_query is None:
@@ -77,6 +78,9 @@ async def get_collection_records(
             # Chạy lại 3 lần chỉ nhân 3 tải lên Mongo đúng lúc Mongo đang ngộp.
             logger.warning(f"Query timeout for '{collection_name}' (bỏ retry): {e}")
             raise RuntimeError(f"Query timeout for '{collection_name}': {e}") from e
+        except OperationFailure:
+            # Lỗi do chính query (VD projection trộn include/exclude) — chạy lại vẫn lỗi y vậy.
+            raise
         except PyMongoError as e:
             last_exception = e
             logger.error(f"MongoDB error for '{collection_name}' (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
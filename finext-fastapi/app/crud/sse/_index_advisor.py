@@ -0,0 +1,249 @@
+# finext-fastapi/app/crud/sse/_index_advisor.py
+"""
+Index advisor cho query dữ liệu thị trường (stock_db / ref_db do pipeline ngoài ghi).
+
+Lúc khởi động chỉ user_db có index do app tạo (connect_to_mongo) + vài index khai báo trong
+KeywordSpec.indexes. Advisor chạy `explain` (executionStats) cho query đại diện của từng keyword
+(KeywordSpec.probes — find/sort/limit hoặc distinct) rồi báo:
+
+    - winning plan (chuỗi stage, index dùng), docs/keys examined so với số dòng trả về
+    - COLLSCAN khi query có filter/sort, SORT trong RAM (không có index phục vụ sort)
+    - index compound đề xuất theo thứ tự ESR: field bằng (equality) → field sort → field khoảng
+      (range/regex); distinct → index trên key
+
+create=True tạo luôn index đề xuất còn thiếu. Chạy qua POST /sse/indexes/advise (admin) hoặc lúc
+boot khi SSE_INDEX_ADVISOR=report|create (chạy nền, không chặn khởi động).
+
+Filter của probe dùng giá trị SAMPLE lấy từ 1 document mới nhất của collection để explain sát
+thực tế (mã/ngày có tồn tại). Probe không lấy được mẫu (collection rỗng) bị bỏ qua.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.database import get_database
+from app.core.query_governor import LANE_BACKGROUND, query_governor
+from app.crud.sse import KEYWORD_SPECS
+from app.crud.sse._spec import SAMPLE, IndexKeys, QueryProbe, probes_for
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_NEEDS_INDEX = "needs_index"
+STATUS_FULL_READ = "full_read"  # query đọc cả collection (không filter/sort) — index không giúp
+STATUS_SKIPPED = "skipped"
+STATUS_ERROR = "error"
+
+_RANGE_OPS = {"$gt", "$gte", "$lt", "$lte", "$regex", "$ne", "$nin", "$exists"}
+
+
+# ---------------------------------------------------------------------------
+# Đọc kết quả explain
+# ---------------------------------------------------------------------------
+def plan_stages(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Các stage của winning plan từ gốc xuống lá (hỗ trợ cả dạng SBE có `queryPlan`)."""
+    if "queryPlan" in plan:
+        plan = plan["queryPlan"]
+    stages: List[Dict[str, Any]] = []
+    todo = [plan]
+    while todo:
+        node = todo.pop(0)
+        stages.append(node)
+        if "inputStage" in node:
+            todo.append(node["inputStage"])
+        todo.extend(node.get("inputStages", []))
+    return stages
+
+
+def summarize_explain(explain: Dict[str, Any]) -> Dict[str, Any]:
+    stages = plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+    names = [s.get("stage", "?") for s in stages]
+    indexes = [s["indexName"] for s in stages if s.get("indexName")]
+    stats = explain.get("executionStats", {})
+    return {
+        "plan": " → ".join(f"{n}({s['indexName']})" if s.get("indexName") else n for n, s in zip(names, stages)),
+        "index": indexes[0] if indexes else None,
+        "collscan": "COLLSCAN" in names,
+        "in_memory_sort": "SORT" in names,
+        "docs_examined": stats.get("totalDocsExamined"),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "returned": stats.get("nReturned"),
+        "millis": stats.get("executionTimeMillis"),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Đề xuất index
+# ---------------------------------------------------------------------------
+def _is_range(value: Any) -> bool:
+    return isinstance(value, dict) and any(op in _RANGE_OPS for op in value)
+
+
+def suggest_index(probe: QueryProbe) -> Optional[IndexKeys]:
+    """Index compound theo ESR cho probe; None nếu query không có gì để index ($or, đọc cả bảng)."""
+    if "$or" in probe.filter:
+        return None
+    keys: IndexKeys = []
+
+    def _add(name: str, direction: int) -> None:
+        if name != "_id" and all(k != name for k, _ in keys):
+            keys.append((name, direction))
+
+    for name, value in probe.filter.items():
+        if not _is_range(value):
+            _add(name, 1)
+    if probe.distinct:
+        _add(probe.distinct, 1)
+    for name, direction in probe.sort:
+        _add(name, direction)
+    for name, value in probe.filter.items():
+        if _is_range(value):
+            _add(name, 1)
+    return keys or None
+
+
+def _covered_by(keys: IndexKeys, existing: Iterable[IndexKeys]) -> bool:
+    """Index hiện có nhận `keys` làm tiền tố (cùng hướng hoặc đảo toàn bộ) thì đã đủ."""
+    flipped = [(k, -d) for k, d in keys]
+    for idx in existing:
+        prefix = list(idx)[: len(keys)]
+        if prefix == keys or prefix == flipped:
+            return True
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Chạy probe
+# ---------------------------------------------------------------------------
+async def _sample_filter(collection, probe: QueryProbe) -> Optional[Dict[str, Any]]:
+    """Thay SAMPLE trong filter bằng giá trị thật của document mới nhất; None nếu không lấy được."""
+    fields = {k for k, v in probe.filter.items() if v == SAMPLE}
+    fields |= {k for k, v in probe.filter.items() if isinstance(v, dict) and SAMPLE in v.values()}
+    if not fields:
+        return dict(probe.filter)
+    doc = await collection.find_one({k: {"$exists": True} for k in fields}, {k: 1 for k in fields}, sort=[("_id", -1)])
+    if not doc:
+        return None
+    resolved: Dict[str, Any] = {}
+    for name, value in probe.filter.items():
+        sample = doc.get(name)
+        if isinstance(sample, list):
+            sample = sample[0] if sample else None  # field mảng (VD tickers) → lọc theo 1 phần tử
+        if value == SAMPLE:
+            resolved[name] = sample
+        elif isinstance(value, dict):
+            resolved[name] = {op: sample if v == SAMPLE else v for op, v in value.items()}
+        else:
+            resolved[name] = value
+    return resolved
+
+
+def _explain_command(collection_name: str, probe: QueryProbe, query: Dict[str, Any]) -> Dict[str, Any]:
+    if probe.distinct:
+        inner: Dict[str, Any] = {"distinct": collection_name, "key": probe.distinct, "query": query}
+    else:
+        inner = {"find": collection_name, "filter": query}
+        if probe.sort:
+            inner["sort"] = dict(probe.sort)
+        if probe.limit:
+            inner["limit"] = probe.limit
+    return {"explain": inner, "verbosity": "executionStats"}
+
+
+async def run_probe(keyword: str, probe: QueryProbe, db_getter=get_database) -> Dict[str, Any]:
+    db_name, collection_name = probe.source.split(".", 1)
+    report: Dict[str, Any] = {
+        "keyword": keyword,
+        "source": probe.source,
+        "sort": [list(s) for s in probe.sort],
+        "distinct": probe.distinct,
+    }
+    try:
+        db = db_getter(db_name)
+        collection = db.get_collection(collection_name)
+        async with query_governor.slot(LANE_BACKGROUND):
+            query = await _sample_filter(collection, probe)
+            if query is None:
+                return {**report, "status": STATUS_SKIPPED, "error": "collection rỗng, không lấy được giá trị mẫu"}
+            explain = await db.command(_explain_command(collection_name, probe, query))
+    except Exception as e:
+        logger.warning(f"Index advisor: explain lỗi ({keyword} trên {probe.source}): {e}")
+        return {**report, "status": STATUS_ERROR, "error": str(e)}
+
+    summary = summarize_explain(explain)
+    report.update(filter=query, **summary)
+    full_read = not probe.filter and not probe.sort and not probe.distinct
+    if full_read:
+        report["status"] = STATUS_FULL_READ
+    elif summary["collscan"] or summary["in_memory_sort"]:
+        report["status"] = STATUS_NEEDS_INDEX
+        report["suggestion"] = suggest_index(probe)
+    else:
+        report["status"] = STATUS_OK
+    return report
+
+
+async def advise_indexes(
+    create: bool = False,
+    keywords: Optional[Iterable[str]] = None,
+    db_getter=get_database,
+) -> Dict[str, Any]:
+    """Explain probe của các keyword (mặc định tất cả) → báo cáo + index đề xuất (tạo luôn nếu create)."""
+    names = list(keywords) if keywords is not None else list(KEYWORD_SPECS)
+    unknown = [n for n in names if n not in KEYWORD_SPECS]
+    if unknown:
+        raise ValueError(f"Keyword không hợp lệ: {', '.join(unknown)}")
+
+    reports: List[Dict[str, Any]] = []
+    for name in names:
+        for probe in probes_for(KEYWORD_SPECS[name]):
+            reports.append(await run_probe(name, probe, db_getter))
+
+    # Gộp đề xuất trùng (nhiều keyword cùng cần 1 index).
+    wanted: Dict[Tuple[str, Tuple[Tuple[str, int], ...]], List[str]] = {}
+    for r in reports:
+        if r.get("suggestion"):
+            wanted.setdefault((r["source"], tuple(map(tuple, r["suggestion"]))), []).append(r["keyword"])
+
+    suggestions: List[Dict[str, Any]] = []
+    for (source, keys), users in wanted.items():
+        item: Dict[str, Any] = {"source": source, "keys": [list(k) for k in keys], "keywords": users, "created": False}
+        if create:
+            item.update(await _create_index(source, list(keys), db_getter))
+        suggestions.append(item)
+
+    counts: Dict[str, int] = {}
+    for r in reports:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    return {"probes": reports, "suggestions": suggestions, "summary": counts}
+
+
+async def _create_index(source: str, keys: IndexKeys, db_getter) -> Dict[str, Any]:
+    db_name, collection_name = source.split(".", 1)
+    try:
+        collection = db_getter(db_name).get_collection(collection_name)
+        existing = [info["key"] for info in (await collection.index_information()).values()]
+        if _covered_by(keys, existing):
+            return {"created": False, "note": "đã có index tương đương"}
+        name = await collection.create_index(keys)
+        logger.info(f"Index advisor: đã tạo index {name} trên {source}")
+        return {"created": True, "name": name}
+    except Exception as e:
+        logger.error(f"Index advisor: lỗi tạo index {source} {keys}: {e}", exc_info=True)
+        return {"created": False, "error": str(e)}
+
+
+async def run_boot_advisor(mode: str) -> None:
+    """Chạy advisor lúc boot (task nền): log các query cần index; mode=create thì tạo luôn."""
+    try:
+        result = await advise_indexes(create=mode == "create")
+    except Exception as e:
+        logger.error(f"Index advisor lỗi: {e}", exc_info=True)
+        return
+    for r in result["probes"]:
+        if r["status"] == STATUS_NEEDS_INDEX:
+            logger.warning(
+                f"Index advisor: {r['keyword']} trên {r['source']} — {r['plan']} "
+                f"(examined {r['docs_examined']}, returned {r['returned']}), đề xuất {r.get('suggestion')}"
+            )
+    logger.info(f"Index advisor: {result['summary']}, {len(result['suggestions'])} index đề xuất")
@@ -0,0 +1,37 @@
+# finext-fastapi/app/crud/sse/_indexes.py
+"""
+Index cần cho các query SSE trên stock_db / ref_db (dữ liệu do pipeline ngoài ghi vào).
+
+Index hint khai báo theo keyword (KeywordSpec.indexes trong crud/sse/__init__.py), gộp theo
+collection tại đây; lúc khởi động app đảm bảo chúng tồn tại (create_index idempotent: index đã có
+thì Mongo bỏ qua). SSE_ENSURE_INDEXES=off khi pipeline tự quản index.
+"""
+
+import logging
+from typing import Dict, List
+
+from app.core.database import get_database
+from app.crud.sse import KEYWORD_SPECS
+from app.crud.sse._spec import IndexKeys, collect_indexes
+
+logger = logging.getLogger(__name__)
+
+# "db.collection" → danh sách index (mỗi index là list (field, hướng)).
+SSE_INDEXES: Dict[str, List[IndexKeys]] = collect_indexes(KEYWORD_SPECS.values())
+
+
+async def ensure_sse_indexes() -> None:
+    """Tạo các index đã khai báo. Lỗi từng index chỉ log — không chặn app khởi động."""
+    for source, indexes in SSE_INDEXES.items():
+        db_name, collection_name = source.split(".", 1)
+        try:
+            collection = get_database(db_name).get_collection(collection_name)
+        except RuntimeError as e:
+            logger.warning(f"Bỏ qua index SSE cho {source}: {e}")
+            continue
+        for keys in indexes:
+            try:
+                await collection.create_index(keys)
+            except Exception as e:
+                logger.error(f"Lỗi tạo index SSE {source} {keys}: {e}", exc_info=True)
+    logger.info("Đã đảm bảo các indexes cho SSE queries")
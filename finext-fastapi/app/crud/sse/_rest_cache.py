@@ -0,0 +1,167 @@
+# finext-fastapi/app/crud/sse/_rest_cache.py
+"""
+Cache in-process cho /sse/rest/{keyword}: single-flight + TTL ngắn theo keyword + LRU giới hạn bytes.
+
+- Key = keyword + toàn bộ tham số đã chuẩn hoá (bỏ None, sort key) → 2 request khác nhau ở bất
+  kỳ tham số nào không bao giờ dùng chung kết quả.
+- Single-flight: nhiều request trùng key cùng miss chỉ chạy 1 query, các request còn lại await
+  chung kết quả (chống stampede khi 500 user mở trang cùng lúc). Query lỗi → mọi waiter nhận
+  lỗi, KHÔNG cache lỗi.
+- TTL theo refresh class của keyword (crud/sse/_schedule.py): giá realtime 1s, tin tức 15s,
+  dữ liệu cuối ngày 60s, danh mục/bài viết 5 phút.
+- LRU theo tổng bytes (kích thước JSON đã serialize); 1 kết quả lớn hơn max_entry_bytes không
+  được cache để không đẩy hết phần còn lại ra ngoài.
+- Stale-if-error: entry hết TTL vẫn được giữ (trong trần bytes) thêm stale_max_age giây; query
+  lỗi / circuit breaker mở → get_stale trả bản cuối cùng kèm tuổi để router phục vụ `stale: true`.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import SSE_REST_CACHE_MB, SSE_STALE_MAX_AGE
+from app.crud.sse._schedule import REFRESH_EOD, REFRESH_MINUTELY, REFRESH_REALTIME, REFRESH_STATIC
+
+REST_CACHE_TTLS: Dict[str, float] = {
+    REFRESH_REALTIME: 1.0,
+    REFRESH_MINUTELY: 15.0,
+    REFRESH_EOD: 60.0,
+    REFRESH_STATIC: 300.0,
+}
+
+
+def rest_cache_key(keyword: str, params: Dict[str, Any]) -> str:
+    """Key chuẩn hoá: tham số None bị bỏ, thứ tự tham số không ảnh hưởng."""
+    normalized = {k: v for k, v in params.items() if v is not None}
+    return json.dumps([keyword, normalized], sort_keys=True, separators=(",", ":"), default=str)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float
+    stored_at: float
+
+
+class RestCache:
+    def __init__(self, max_bytes: int, max_entry_ratio: float = 0.25, stale_max_age: float = 0.0) -> None:
+        self.max_bytes = max_bytes
+        self.stale_max_age = stale_max_age
+        self.max_entry_bytes = int(max_bytes * max_entry_ratio)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.stale_served = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _lookup(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        now = time.monotonic()
+        if entry.expires_at <= now:
+            if entry.expires_at + self.stale_max_age <= now:
+                self._drop(key)  # quá cả hạn stale → bỏ hẳn; còn hạn stale → giữ cho get_stale
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry.value
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _store(self, key: str, value: Any, size: int, ttl: float) -> None:
+        if ttl <= 0 or size > self.max_entry_bytes:
+            return
+        self._drop(key)
+        now = time.monotonic()
+        self._entries[key] = _Entry(value, size, now + ttl, now)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    async def get_or_load(self, key: str, ttl: float, loader: Callable[[], Awaitable[Tuple[Any, int]]]) -> Any:
+        """
+        Trả giá trị cache còn hạn, hoặc chạy loader (trả (value, size_bytes)) đúng 1 lần cho mọi
+        request trùng key đang chờ. Giá trị trả về dùng chung — caller KHÔNG được sửa tại chỗ.
+        """
+        if not self.enabled:
+            value, _ = await loader()
+            return value
+
+        found, value = self._lookup(key)
+        if found:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # Query chạy trong task riêng: request khởi xướng bị huỷ (client ngắt) không kéo
+            # theo query mà các request khác đang chờ chung.
+            task = asyncio.create_task(self._load(key, ttl, loader))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, ttl: float, loader: Callable[[], Awaitable[Tuple[Any, int]]]) -> Any:
+        try:
+            value, size = await loader()
+            self._store(key, value, size, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_stale(self, key: str) -> Optional[Tuple[Any, float]]:
+        """(giá trị, tuổi giây) của bản cuối cùng lấy được cho key — kể cả đã hết TTL — nếu chưa quá stale_max_age."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if entry.expires_at + self.stale_max_age <= now:
+            return None
+        self.stale_served += 1
+        return entry.value, now - entry.stored_at
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self.hits = self.misses = self.coalesced = self.evictions = self.stale_served = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "stale_served": self.stale_served,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else None,
+            "inflight": len(self._inflight),
+        }
+
+
+rest_cache = RestCache(SSE_REST_CACHE_MB * 1024 * 1024, stale_max_age=SSE_STALE_MAX_AGE)
+
+
+def rest_cache_ttl(refresh_class: str) -> float:
+    return REST_CACHE_TTLS.get(refresh_class, REST_CACHE_TTLS[REFRESH_REALTIME])
@@ -0,0 +1,51 @@
+# finext-fastapi/app/crud/sse/_schedule.py
+"""
+Lịch poll SSE theo loại dữ liệu (refresh class) + phiên giao dịch VN.
+
+Mỗi keyword khai báo 1 refresh class trong KeywordSpec (KEYWORD_SPECS, crud/sse/__init__.py):
+    realtime : giá/chỉ số trong phiên (today_*, itd_*)
+    minutely : đổi vài lần / giờ (khối ngoại, tin tức, giá hàng hoá)
+    eod      : chốt cuối ngày (history_*, phase_*, finratios) — đổi sau đóng cửa
+    static   : gần như không đổi (danh mục, map tên, bài viết đã đăng)
+
+Nhịp poll (giây) phụ thuộc pha thị trường (utils/market_session.py). Ngoài phiên, nhịp dài
+bị cắt tại giờ mở phiên kế tiếp → poller không ngủ quên qua giờ mở cửa. Mỗi nhịp cộng jitter
+±POLL_JITTER_RATIO để poller tạo dồn cùng lúc (VD: sau deploy, client reconnect hàng loạt)
+không đập Mongo đúng cùng 1 tick.
+"""
+
+import random
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.utils.market_session import PHASE_CLOSED, PHASE_OFF_HOURS, PHASE_SESSION, market_phase, seconds_until_session
+
+REFRESH_REALTIME = "realtime"
+REFRESH_MINUTELY = "minutely"
+REFRESH_EOD = "eod"
+REFRESH_STATIC = "static"
+
+# refresh class → {pha thị trường → nhịp poll (giây)}.
+# eod poll dày hơn sau đóng cửa (off_hours) — lúc pipeline cuối ngày ghi dữ liệu.
+POLL_INTERVALS: Dict[str, Dict[str, float]] = {
+    REFRESH_REALTIME: {PHASE_SESSION: 3.0, PHASE_OFF_HOURS: 300.0, PHASE_CLOSED: 1800.0},
+    REFRESH_MINUTELY: {PHASE_SESSION: 60.0, PHASE_OFF_HOURS: 600.0, PHASE_CLOSED: 1800.0},
+    REFRESH_EOD: {PHASE_SESSION: 900.0, PHASE_OFF_HOURS: 600.0, PHASE_CLOSED: 3600.0},
+    REFRESH_STATIC: {PHASE_SESSION: 3600.0, PHASE_OFF_HOURS: 3600.0, PHASE_CLOSED: 3600.0},
+}
+POLL_JITTER_RATIO = 0.1
+_rng = random.Random()
+
+
+def next_poll_delay(refresh_class: str, now: Optional[datetime] = None, rng: Optional[random.Random] = None) -> float:
+    """Số giây tới lần poll kế của 1 keyword thuộc refresh_class (đã cộng jitter)."""
+    rng = rng or _rng
+    intervals = POLL_INTERVALS.get(refresh_class, POLL_INTERVALS[REFRESH_REALTIME])
+    phase = market_phase(now)
+    delay = intervals[phase] * rng.uniform(1 - POLL_JITTER_RATIO, 1 + POLL_JITTER_RATIO)
+    if phase != PHASE_SESSION:
+        until_open = seconds_until_session(now)
+        if until_open is not None and until_open < delay:
+            # Thức dậy ngay khi mở phiên, rải đều trong 1 nhịp trong-phiên để không dồn tick.
+            delay = until_open + rng.uniform(0, intervals[PHASE_SESSION] * POLL_JITTER_RATIO * 2)
+    return delay
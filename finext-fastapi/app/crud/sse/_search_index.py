@@ -0,0 +1,342 @@
+# finext-fastapi/app/crud/sse/_search_index.py
+"""
+Inverted index in-memory cho search_news / search_reports.
+
+Trước đây mỗi lần gõ phím là 1 `$regex` không neo, không phân biệt hoa thường trên `title` —
+không dùng được index nên quét cả collection — và "ngan hang" không khớp "ngân hàng". Giờ mỗi
+worker giữ 1 inverted index cho news_daily / news_report:
+
+- Token hoá title + tickers sau khi bỏ dấu tiếng Việt (fold_text: NFD bỏ dấu, đ → d, chữ thường).
+- Mọi token của câu tìm đều phải khớp (AND); token khớp nguyên từ hoặc là tiền tố của từ (gõ dở
+  "ngan ha" vẫn ra "ngân hàng"). Từ điển sắp xếp → mở rộng tiền tố bằng bisect.
+- Xếp hạng = chất lượng khớp (khớp nguyên từ 1.0, chỉ khớp tiền tố PREFIX_WEIGHT) × độ mới
+  (giảm một nửa sau mỗi SEARCH_HALF_LIFE_DAYS ngày so với bài mới nhất). Doc id tăng theo
+  created_at nên duyệt ứng viên từ mới → cũ và dừng ngay khi bài tiếp theo (dù khớp hoàn hảo)
+  không thể vào top-k → top-k trong dưới 1ms kể cả khi hàng chục nghìn bài khớp.
+- Dựng nền lúc khởi động (warm_search_indexes), sau đó mỗi lần dùng mà đã quá
+  SSE_SEARCH_INDEX_MAX_AGE giây (hoặc watcher báo collection đổi) chỉ đọc thêm bài có
+  created_at mới hơn mốc đã có. Sửa/xoá bài cũ được cập nhật ở lần dựng lại toàn bộ
+  (SEARCH_REBUILD_INTERVAL, chạy nền, bản cũ vẫn phục vụ trong lúc dựng).
+- Chưa dựng xong / SSE_SEARCH_INDEX=off → search_* tự rơi về query regex như cũ.
+"""
+
+import asyncio
+import bisect
+import heapq
+import logging
+import re
+import time
+import unicodedata
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import SSE_SEARCH_INDEX, SSE_SEARCH_INDEX_MAX_AGE
+from app.core.database import get_database
+from app.core.query_governor import LANE_BACKGROUND, query_governor
+from app.crud.sse._helpers import STOCK_DB, get_collection_records
+from app.crud.sse._watcher import watcher
+
+logger = logging.getLogger(__name__)
+
+PREFIX_WEIGHT = 0.6            # token chỉ khớp tiền tố của từ (chưa gõ hết) so với khớp nguyên từ
+MIN_PREFIX_LENGTH = 2          # token 1 ký tự chỉ khớp nguyên từ (tiền tố 1 ký tự khớp gần hết từ điển)
+SEARCH_HALF_LIFE_DAYS = 7.0    # độ mới: bài cũ hơn bài mới nhất chừng này ngày bị nhân 0.5
+SEARCH_REBUILD_INTERVAL = 3600.0  # giây giữa 2 lần dựng lại toàn bộ (bắt sửa/xoá bài cũ)
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+_HALF_LIFE_SECONDS = SEARCH_HALF_LIFE_DAYS * 86400
+
+
+def fold_text(text: str) -> str:
+    """Bỏ dấu tiếng Việt + chữ thường: "Ngân hàng Đông Á" → "ngan hang dong a"."""
+    # đ/Đ không tách được bằng NFD → thay tay (replace nhanh hơn translate với bảng dict).
+    decomposed = unicodedata.normalize("NFD", text.replace("đ", "d").replace("Đ", "D"))
+    return decomposed.encode("ascii", "ignore").decode("ascii").lower()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall(fold_text(text)) if text else []
+
+
+def _epoch(value: Any) -> float:
+    """created_at (datetime hoặc chuỗi ISO) → giây epoch; không đọc được → 0 (coi là rất cũ)."""
+    if isinstance(value, datetime):
+        return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+    if isinstance(value, str):
+        try:
+            return _epoch(datetime.fromisoformat(value.replace("Z", "+00:00")))
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+class TextIndex:
+    """Inverted index của 1 collection. Doc phải được add theo created_at tăng dần (doc id = thứ tự add)."""
+
+    def __init__(self, key_field: str, fields: Sequence[str]) -> None:
+        self.key_field = key_field
+        self.fields = tuple(fields)
+        self._rows: List[Optional[Dict[str, Any]]] = []   # None = bài đã được add lại (bản mới ở id lớn hơn)
+        self._terms: List[Tuple[str, ...]] = []           # token (đã fold, không trùng) của title + tickers
+        self._recency: List[float] = []
+        self._newest = 0.0
+        self._postings: Dict[str, List[int]] = {}
+        self._by_ticker: Dict[str, List[int]] = {}
+        self._vocab: List[str] = []                       # sắp xếp, cho mở rộng tiền tố
+        self._by_key: Dict[Any, int] = {}
+        self.watermark: Any = None                        # created_at lớn nhất đã add (mốc đọc thêm)
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def add(self, doc: Dict[str, Any]) -> None:
+        row = {f: doc[f] for f in self.fields if f in doc}
+        tickers = [t for t in (doc.get("tickers") or []) if isinstance(t, str)]
+        terms = tuple(dict.fromkeys(tokenize(doc.get("title")) + [t.lower() for t in tickers]))
+        doc_id = len(self._rows)
+        key = doc.get(self.key_field)
+        if key is not None:
+            old = self._by_key.get(key)
+            if old is not None:
+                self._rows[old] = None
+            self._by_key[key] = doc_id
+        self._rows.append(row)
+        self._terms.append(terms)
+        recency = _epoch(doc.get("created_at"))
+        self._recency.append(recency)
+        self._newest = max(self._newest, recency)
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                self._postings[term] = posting = []
+                bisect.insort(self._vocab, term)
+            posting.append(doc_id)
+        for ticker in dict.fromkeys(tickers):
+            self._by_ticker.setdefault(ticker, []).append(doc_id)
+        created_at = doc.get("created_at")
+        if created_at is not None and (self.watermark is None or type(created_at) is type(self.watermark) and created_at > self.watermark):
+            self.watermark = created_at
+
+    def extend(self, docs: Iterable[Dict[str, Any]]) -> None:
+        for doc in docs:
+            self.add(doc)
+
+    def _expand(self, token: str) -> List[str]:
+        """Các từ trong từ điển khớp token: chính nó + (nếu đủ dài) các từ nhận nó làm tiền tố."""
+        if len(token) < MIN_PREFIX_LENGTH:
+            return [token] if token in self._postings else []
+        start = bisect.bisect_left(self._vocab, token)
+        end = bisect.bisect_left(self._vocab, token + "\x7f", start)
+        return self._vocab[start:end]
+
+    def _candidates(self, lists: List[List[int]]) -> Iterator[int]:
+        """Doc id trong hợp các posting list, từ lớn (mới) → nhỏ, không trùng."""
+        if len(lists) == 1:
+            yield from reversed(lists[0])
+            return
+        last = -1
+        for doc_id in heapq.merge(*(reversed(p) for p in lists), reverse=True):
+            if doc_id != last:
+                last = doc_id
+                yield doc_id
+
+    def search(self, query: Optional[str], ticker: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """Top `limit` bài khớp mọi token của `query` (và có `ticker` trong tickers nếu truyền), điểm cao trước."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        expansions = [self._expand(t) for t in tokens]
+        if any(not e for e in expansions) or limit <= 0:
+            return []
+
+        # (token, mọi từ token khớp) — kiểm 1 bài bằng phép giao set thay vì startswith từng từ.
+        matchers = [(token, frozenset(expanded)) for token, expanded in zip(tokens, expansions)]
+        # Nguồn ứng viên = điều kiện hẹp nhất; các điều kiện còn lại kiểm trên token của từng bài.
+        sources: List[Tuple[int, List[List[int]]]] = []
+        for expanded in expansions:
+            lists = [self._postings[term] for term in expanded]
+            sources.append((sum(map(len, lists)), lists))
+        if ticker:
+            posting = self._by_ticker.get(ticker, [])
+            sources.append((len(posting), [posting]))
+        if sources:
+            candidates = self._candidates(min(sources, key=lambda s: s[0])[1])
+        else:
+            candidates = iter(range(len(self._rows) - 1, -1, -1))
+
+        newest = self._newest
+        # (điểm, doc id, dòng) — min-heap giữ top-k; doc id duy nhất nên không bao giờ so tới dòng.
+        # Giữ luôn dòng đã kiểm khác None thay vì tra lại _rows (dòng bị add lại là None).
+        heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        for doc_id in candidates:
+            decay = 0.5 ** ((newest - self._recency[doc_id]) / _HALF_LIFE_SECONDS)
+            if len(heap) >= limit and decay <= heap[0][0]:
+                break  # bài cũ hơn dù khớp hoàn hảo cũng không vượt được top-k hiện tại
+            row = self._rows[doc_id]
+            if row is None:
+                continue
+            if ticker and ticker not in (row.get("tickers") or ()):
+                continue
+            quality = self._quality(matchers, self._terms[doc_id])
+            if quality == 0.0:
+                continue
+            item = (quality * decay, doc_id, row)
+            if len(heap) < limit:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        return [dict(row) for _, _, row in sorted(heap, reverse=True)]
+
+    @staticmethod
+    def _quality(matchers: List[Tuple[str, FrozenSet[str]]], terms: Tuple[str, ...]) -> float:
+        """Trung bình điểm từng token: khớp nguyên từ 1.0, chỉ khớp tiền tố PREFIX_WEIGHT, không khớp → 0 (loại)."""
+        if not matchers:
+            return 1.0
+        total = 0.0
+        for token, expanded in matchers:
+            if token in terms:
+                total += 1.0
+            elif not expanded.isdisjoint(terms):
+                total += PREFIX_WEIGHT
+            else:
+                return 0.0
+        return total / len(matchers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"docs": len(self), "terms": len(self._vocab), "watermark": str(self.watermark) if self.watermark is not None else None}
+
+
+class SearchIndexManager:
+    """Giữ TextIndex của 1 collection: dựng nền lần đầu / định kỳ, đọc thêm bài mới khi hết hạn (single-flight)."""
+
+    def __init__(self, collection_name: str, key_field: str, fields: Sequence[str], max_age: float, enabled: bool = True) -> None:
+        self.collection_name = collection_name
+        self.key_field = key_field
+        self.fields = tuple(fields)
+        self.max_age = max_age
+        self.enabled = enabled
+        self._index: Optional[TextIndex] = None
+        self._built_at = 0.0
+        self._refreshed_at = 0.0
+        self._seen: Tuple[int, ...] = ()
+        self._build_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.builds = 0
+        self.refreshes = 0
+        self.fallbacks = 0
+
+    @property
+    def _sources(self) -> Tuple[str]:
+        return (f"{STOCK_DB}.{self.collection_name}",)
+
+    @property
+    def _projection(self) -> Dict[str, int]:
+        return {"_id": 0, **{f: 1 for f in self.fields}}
+
+    async def _read(self, db: AsyncIOMotorDatabase, find_query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return await get_collection_records(
+            db, self.collection_name, find_query=find_query, projection=self._projection, sort=[("created_at", 1)]
+        )
+
+    async def build(self, db: AsyncIOMotorDatabase) -> TextIndex:
+        """Dựng lại toàn bộ rồi mới thay bản cũ (request trong lúc dựng vẫn dùng bản cũ)."""
+        seen = watcher.versions(self._sources)
+        async with query_governor.slot(LANE_BACKGROUND):
+            docs = await self._read(db, {})
+        index = TextIndex(self.key_field, self.fields)
+        index.extend(docs)
+        self._index = index
+        self._built_at = self._refreshed_at = time.monotonic()
+        self._seen = seen
+        self.builds += 1
+        logger.info(f"Search index {self.collection_name}: {len(index)} bài, {len(index._vocab)} từ")
+        return index
+
+    def _start_build(self, db: AsyncIOMotorDatabase) -> None:
+        if self._build_task is not None and not self._build_task.done():
+            return
+
+        async def _run():
+            try:
+                await self.build(db)
+            except Exception as e:
+                logger.error(f"Search index {self.collection_name}: dựng lỗi: {e}", exc_info=True)
+
+        self._build_task = asyncio.create_task(_run())
+
+    async def _refresh(self, db: AsyncIOMotorDatabase, index: TextIndex) -> None:
+        try:
+            seen = watcher.versions(self._sources)
+            find_query = {} if index.watermark is None else {"created_at": {"$gt": index.watermark}}
+            docs = await self._read(db, find_query)
+            if index is self._index:  # bản dựng lại toàn bộ đã thay trong lúc đọc → bỏ
+                index.extend(docs)
+                self._refreshed_at = time.monotonic()
+                self._seen = seen
+                self.refreshes += 1
+        finally:
+            self._refresh_task = None
+
+    async def index(self, db: AsyncIOMotorDatabase) -> Optional[TextIndex]:
+        """Index đã cập nhật bài mới; None nếu tắt hoặc chưa dựng xong lần đầu (caller dùng regex)."""
+        if not self.enabled:
+            return None
+        index = self._index
+        if index is None:
+            self._start_build(db)
+            self.fallbacks += 1
+            return None
+        now = time.monotonic()
+        if now - self._built_at >= SEARCH_REBUILD_INTERVAL:
+            self._start_build(db)
+        if now - self._refreshed_at >= self.max_age or watcher.versions(self._sources) != self._seen:
+            task = self._refresh_task
+            if task is None:
+                task = self._refresh_task = asyncio.create_task(self._refresh(db, index))
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            try:
+                await asyncio.shield(task)
+            except Exception as e:
+                # Đọc thêm lỗi (Mongo chập chờn) → vẫn trả kết quả từ index hiện có.
+                logger.warning(f"Search index {self.collection_name}: cập nhật lỗi, dùng bản hiện có: {e}")
+        return self._index
+
+    def clear(self) -> None:
+        if self._build_task is not None and not self._build_task.done():
+            self._build_task.cancel()
+        self._index = None
+        self._build_task = self._refresh_task = None
+        self._built_at = self._refreshed_at = 0.0
+        self._seen = ()
+        self.builds = self.refreshes = self.fallbacks = 0
+
+    def stats(self) -> Dict[str, Any]:
+        index = self._index
+        return {
+            "enabled": self.enabled,
+            "ready": index is not None,
+            "builds": self.builds,
+            "refreshes": self.refreshes,
+            "fallbacks": self.fallbacks,
+            **(index.stats() if index is not None else {}),
+        }
+
+
+NEWS_FIELDS = ("article_slug", "title", "news_type", "created_at", "tickers")
+REPORT_FIELDS = ("report_slug", "title", "report_type", "created_at", "tickers")
+
+search_indexes: Dict[str, SearchIndexManager] = {
+    "news_daily": SearchIndexManager("news_daily", "article_slug", NEWS_FIELDS, SSE_SEARCH_INDEX_MAX_AGE, SSE_SEARCH_INDEX),
+    "news_report": SearchIndexManager("news_report", "report_slug", REPORT_FIELDS, SSE_SEARCH_INDEX_MAX_AGE, SSE_SEARCH_INDEX),
+}
+
+
+async def warm_search_indexes() -> None:
+    """Dựng index lúc khởi động (task nền) — request tới trước khi xong dùng regex như cũ."""
+    for manager in search_indexes.values():
+        if not manager.enabled:
+            continue
+        try:
+            await manager.build(get_database(STOCK_DB))
+        except Exception as e:
+            logger.error(f"Search index {manager.collection_name}: dựng lúc khởi động lỗi: {e}", exc_info=True)
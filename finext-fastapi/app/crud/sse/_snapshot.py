@@ -0,0 +1,196 @@
+# finext-fastapi/app/crud/sse/_snapshot.py
+"""
+Snapshot in-memory dùng chung cho các collection "nóng" của stock_db (today_stock, today_index,
+itd_index).
+
+Trước đây mỗi keyword (home_today_stock, search_stocks, screener_stock_data, chart_today_data,
+home_today_stock|<ticker>...) tự query cùng 1 collection với projection riêng → N poller = N lần
+đọc full collection mỗi nhịp. Giờ mỗi collection được đọc nguyên bảng (bỏ _id) tối đa 1 lần /
+SSE_SNAPSHOT_MAX_AGE giây vào 1 bảng dùng chung; keyword chỉ còn là filter + sort + projection
+trên bảng đó → N poller tốn 1 lần đọc Mongo.
+
+- Đọc trùng lúc (nhiều poller cùng hết hạn) chỉ chạy 1 query (single-flight). Query lỗi → mọi
+  waiter nhận lỗi, bảng cũ giữ nguyên để lần sau thử lại.
+- Push mode (crud/sse/_watcher.py): collection đổi version → snapshot coi như hết hạn ngay, poller
+  được đánh thức không đọc phải bảng cũ.
+- get_snapshot_records có cùng chữ ký với get_collection_records; filter/projection ngoài phạm vi
+  hỗ trợ (toán tử $, projection biểu thức) tự rơi về query Mongo như cũ.
+- Bảng và các dict dòng là dữ liệu dùng chung — chỉ đọc; kết quả trả về luôn là dict mới.
+"""
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import SSE_SNAPSHOT_MAX_AGE
+from app.crud.sse._helpers import STOCK_DB, get_collection_records
+from app.crud.sse._watcher import watcher
+
+SNAPSHOT_COLLECTIONS = frozenset({"today_stock", "today_index", "itd_index"})
+
+
+@dataclass(frozen=True)
+class SnapshotTable:
+    rows: List[Dict[str, Any]]                # thứ tự tự nhiên của collection, đã bỏ _id
+    by_ticker: Dict[str, List[Dict[str, Any]]]
+    loaded_at: float
+
+    def select(self, find_query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Các dòng khớp filter equality (VD {"ticker": "FPT", "type": "industry"}) — xem _is_simple_filter."""
+        rows = self.rows
+        # by_ticker chỉ có ticker dạng str; ticker khác (VD None = thiếu field) → lọc tuần tự như Mongo.
+        indexed = isinstance(find_query.get("ticker"), str)
+        if indexed:
+            rows = self.by_ticker.get(find_query["ticker"], [])
+        conds = [(k, v) for k, v in find_query.items() if not (indexed and k == "ticker")]
+        if conds:
+            rows = [r for r in rows if all(r.get(k) == v for k, v in conds)]
+        return rows
+
+
+def _build_table(docs: List[Dict[str, Any]]) -> SnapshotTable:
+    by_ticker: Dict[str, List[Dict[str, Any]]] = {}
+    for doc in docs:
+        ticker = doc.get("ticker")
+        if isinstance(ticker, str):  # doc thiếu ticker không gom chung vào 1 nhóm None
+            by_ticker.setdefault(ticker, []).append(doc)
+    return SnapshotTable(rows=docs, by_ticker=by_ticker, loaded_at=time.monotonic())
+
+
+def bson_sort_key(value: Any) -> Tuple[int, Any]:
+    """Khoá sort theo thứ tự so sánh BSON: null < số < chuỗi < object/khác < bool < datetime."""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (8, value)
+    if isinstance(value, (int, float)):
+        return (1, float("-inf") if isinstance(value, float) and math.isnan(value) else value)
+    if isinstance(value, str):
+        return (2, value)
+    if isinstance(value, datetime):
+        return (9, value)
+    return (3, str(value))
+
+
+def sort_rows(rows: List[Dict[str, Any]], sort: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    for field, direction in reversed(sort):
+        rows = sorted(rows, key=lambda r: bson_sort_key(r.get(field)), reverse=direction < 0)
+    return rows
+
+
+def _is_simple_filter(find_query: Optional[Dict[str, Any]]) -> bool:
+    return not find_query or not any(k.startswith("$") or isinstance(v, (dict, list)) for k, v in find_query.items())
+
+
+def _is_simple_projection(projection: Optional[Dict[str, Any]]) -> bool:
+    return projection is None or all(isinstance(v, (bool, int)) for v in projection.values())
+
+
+def apply_projection(rows: List[Dict[str, Any]], projection: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Projection kiểu Mongo (include hoặc exclude, field phẳng), giữ thứ tự field của document."""
+    include = {k for k, v in (projection or {}).items() if v and k != "_id"}
+    if include:
+        return [{k: v for k, v in r.items() if k in include} for r in rows]
+    exclude = {k for k, v in (projection or {}).items() if not v}
+    return [{k: v for k, v in r.items() if k not in exclude} for r in rows]
+
+
+class SnapshotManager:
+    def __init__(self, max_age: float) -> None:
+        self.max_age = max_age
+        self._tables: Dict[str, SnapshotTable] = {}
+        self._seen: Dict[str, Tuple[int, ...]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.loads = 0
+        self.hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age > 0
+
+    @staticmethod
+    def _source(collection_name: str) -> Tuple[str]:
+        return (f"{STOCK_DB}.{collection_name}",)
+
+    def _fresh(self, collection_name: str) -> Optional[SnapshotTable]:
+        table = self._tables.get(collection_name)
+        if table is None or time.monotonic() - table.loaded_at >= self.max_age:
+            return None
+        if watcher.versions(self._source(collection_name)) != self._seen.get(collection_name):
+            return None
+        return table
+
+    async def table(self, db: AsyncIOMotorDatabase, collection_name: str) -> SnapshotTable:
+        table = self._fresh(collection_name)
+        if table is not None:
+            self.hits += 1
+            return table
+        task = self._inflight.get(collection_name)
+        if task is None:
+            task = asyncio.create_task(self._load(db, collection_name))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[collection_name] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, db: AsyncIOMotorDatabase, collection_name: str) -> SnapshotTable:
+        try:
+            # Lấy version TRƯỚC khi đọc → thay đổi trong lúc đọc làm snapshot hết hạn ngay.
+            seen = watcher.versions(self._source(collection_name))
+            docs = await get_collection_records(db, collection_name, find_query={}, projection={"_id": 0})
+            self.loads += 1
+            table = _build_table(docs)
+            self._tables[collection_name] = table
+            self._seen[collection_name] = seen
+            return table
+        finally:
+            self._inflight.pop(collection_name, None)
+
+    def clear(self) -> None:
+        self._tables.clear()
+        self._seen.clear()
+        self.loads = self.hits = 0
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "max_age": self.max_age,
+            "loads": self.loads,
+            "hits": self.hits,
+            "tables": {name: {"rows": len(t.rows), "age": round(now - t.loaded_at, 3)} for name, t in self._tables.items()},
+        }
+
+
+snapshots = SnapshotManager(SSE_SNAPSHOT_MAX_AGE)
+
+
+async def get_snapshot_table(db: AsyncIOMotorDatabase, collection_name: str) -> Optional[SnapshotTable]:
+    """Bảng snapshot của collection; None nếu snapshot tắt hoặc collection không thuộc diện snapshot."""
+    if not snapshots.enabled or collection_name not in SNAPSHOT_COLLECTIONS:
+        return None
+    return await snapshots.table(db, collection_name)
+
+
+async def get_snapshot_records(
+    db: AsyncIOMotorDatabase,
+    collection_name: str,
+    find_query: Optional[Dict[str, Any]] = None,
+    projection: Optional[Dict[str, Any]] = None,
+    sort: Optional[List[tuple]] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Như get_collection_records nhưng đọc từ snapshot dùng chung khi được (xem docstring module)."""
+    if _is_simple_filter(find_query) and _is_simple_projection(projection):
+        table = await get_snapshot_table(db, collection_name)
+        if table is not None:
+            rows = table.select(find_query or {})
+            if sort:
+                rows = sort_rows(rows, sort)
+            if limit:
+                rows = rows[:limit]
+            return apply_projection(rows, projection)
+    return await get_collection_records(db, collection_name, find_query=find_query, projection=projection, sort=sort, limit=limit)
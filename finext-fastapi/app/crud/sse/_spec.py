@@ -0,0 +1,119 @@
+# finext-fastapi/app/crud/sse/_spec.py
+"""
+Khai báo keyword SSE dạng dữ liệu (KeywordSpec) — 1 chỗ duy nhất mô tả keyword đọc gì, đổi nhịp
+nào, sort theo field nào, cần index nào.
+
+Trước đây registry chỉ map tên → hàm; nguồn, refresh class, delta key nằm ở 3 dict riêng còn
+allowlist sort / projection / index mỗi module tự xử lý (news_daily có _SORTABLE_FIELDS, còn
+other_ticker nhận sort_by bất kỳ). Giờ mọi thành phần đọc chung spec:
+
+    poller          sources (push mode), refresh_class (lịch poll), delta_keys (delta frame)
+    REST cache      cacheable, refresh_class (TTL), normalize_params (key chuẩn hoá)
+    ETag / proxy    refresh_class + immutable (Cache-Control), sources (Surrogate-Key)
+    startup index   indexes (crud/sse/_indexes.py)
+    index advisor   probes — query đại diện để explain (crud/sse/_index_advisor.py)
+    validate        sortable/default_sort, projection, columnar, cursor_key → ValueError (400) trước khi query
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from app.crud.sse._feed import parse_feed_cursor
+from app.crud.sse._schedule import REFRESH_REALTIME
+
+IndexKeys = List[Tuple[str, int]]
+SortSpec = Tuple[Tuple[str, int], ...]
+
+# Giá trị filter của probe lấy từ 1 document thật của collection (mã/ngày tồn tại → explain sát thực tế).
+SAMPLE = "$sample"
+
+
+@dataclass(frozen=True)
+class QueryProbe:
+    """Query đại diện của keyword cho index advisor: find(filter).sort(sort).limit(limit) hoặc distinct."""
+
+    source: str
+    filter: Dict[str, Any] = field(default_factory=dict)
+    sort: SortSpec = ()
+    limit: int = 0
+    distinct: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class KeywordSpec:
+    func: Callable[..., Awaitable[Any]]
+    # Collection nguồn ("db.collection") — push mode chỉ đánh thức poller khi nguồn đổi.
+    # Rỗng → giữ nhịp poll cố định.
+    sources: Tuple[str, ...] = ()
+    refresh_class: str = REFRESH_REALTIME
+    # Key định danh dòng cho delta frame (utils/sse_delta.py). Rỗng → client opt-in delta vẫn nhận snapshot.
+    delta_keys: Tuple[str, ...] = ()
+    # Allowlist sort_by. None → keyword không sort theo field (hoặc tự kiểm như screener_query,
+    # finstats_* dùng sort_by làm chế độ kỳ Q/Y) — registry không đụng tới sort_by.
+    sortable: Optional[FrozenSet[str]] = None
+    default_sort: SortSpec = ()
+    # Nhận projection của client (?projection=). False → projection bị bỏ (không lọt vào cache key).
+    projection: bool = False
+    # Hỗ trợ fields= / format=columnar trên /sse/rest.
+    columnar: bool = False
+    # Dựng hoàn toàn từ snapshot in-memory (crud/sse/_snapshot.py) — không query Mongo riêng,
+    # không cần index.
+    snapshot: bool = False
+    # Kết quả xác định theo tham số → REST cache được. False (VD bốc ngẫu nhiên) → luôn query.
+    cacheable: bool = True
+    # Nội dung không đổi sau khi xuất bản (bài viết theo slug) → Cache-Control immutable.
+    immutable: bool = False
+    # Index cần cho query của keyword: (nguồn, keys) — startup đảm bảo tồn tại.
+    indexes: Tuple[Tuple[str, IndexKeys], ...] = ()
+    # Query đại diện cho index advisor. Rỗng → mỗi nguồn 1 probe đọc theo default_sort.
+    probes: Tuple[QueryProbe, ...] = ()
+    # Feed nhận cursor= keyset (crud/sse/_feed.py): field khoá phụ đi cùng created_at (slug bài).
+    # None → keyword không nhận cursor (chart_history_data có keyset riêng theo date).
+    cursor_key: Optional[str] = None
+
+    def resolve_sort(self, sort_by: Optional[str], sort_order: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """sort_by/sort_order đã validate theo allowlist; thiếu → mặc định của keyword."""
+        if self.sortable is None:
+            return sort_by, sort_order
+        if sort_by is None:
+            if not self.default_sort:
+                return None, sort_order
+            field, direction = self.default_sort[0]
+            return field, sort_order or ("desc" if direction < 0 else "asc")
+        if sort_by not in self.sortable:
+            raise ValueError(f"sort_by '{sort_by}' không hỗ trợ. Hỗ trợ: {', '.join(sorted(self.sortable))}")
+        return sort_by, sort_order or "desc"
+
+
+def normalize_params(spec: KeywordSpec, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Tham số query đã chuẩn hoá theo spec (idempotent): sort mặc định điền sẵn, projection bị bỏ
+    nếu keyword không nhận — request tương đương dùng chung 1 entry REST cache. Sai → ValueError."""
+    out = dict(params)
+    if spec.sortable is not None:
+        out["sort_by"], out["sort_order"] = spec.resolve_sort(out.get("sort_by"), out.get("sort_order"))
+    if not spec.projection and out.get("projection") is not None:
+        out["projection"] = None
+    if not spec.columnar and out.get("fields"):
+        raise ValueError("fields/format=columnar không hỗ trợ cho keyword này")
+    if spec.cursor_key is not None and out.get("cursor") is not None:
+        parse_feed_cursor(out["cursor"], out.get("sort_by"), out.get("sort_order"))
+        out["page"] = None  # cursor quyết định vị trí → page không lọt vào cache key
+    return out
+
+
+def probes_for(spec: KeywordSpec) -> Tuple[QueryProbe, ...]:
+    """Probe của keyword; keyword dựng từ snapshot đọc nguyên bảng nên không có gì để explain."""
+    if spec.probes or spec.snapshot:
+        return spec.probes
+    return tuple(QueryProbe(source, sort=spec.default_sort) for source in spec.sources)
+
+
+def collect_indexes(specs: Iterable[KeywordSpec]) -> Dict[str, List[IndexKeys]]:
+    """Gộp index hint của mọi keyword theo nguồn (bỏ trùng, giữ thứ tự khai báo)."""
+    out: Dict[str, List[IndexKeys]] = {}
+    for spec in specs:
+        for source, keys in spec.indexes:
+            bucket = out.setdefault(source, [])
+            if list(keys) not in bucket:
+                bucket.append(list(keys))
+    return out
@@ -0,0 +1,183 @@
+# finext-fastapi/app/crud/sse/_watcher.py
+"""
+Watcher theo collection cho chế độ push của SSE poller.
+
+Thay vì mỗi poller chạy lại full query mỗi 3s rồi hash để biết "không có gì đổi", poller
+đăng ký các collection nguồn của keyword (KeywordSpec.sources) và ngủ tới khi watcher báo một
+trong số đó đổi version. Mỗi collection chỉ có 1 task theo dõi, dùng chung cho mọi poller.
+
+Backend (SSE_PUSH_MODE):
+    - "change_stream": Mongo change stream (cần replica set). Lỗi (vd standalone không hỗ trợ
+      $changeStream) → tự rơi về probe cho collection đó.
+    - "probe": mỗi SSE_PUSH_PROBE_INTERVAL lấy 1 fingerprint rẻ của collection qua $collStats
+      (bộ đếm insert/update/remove của WiredTiger — bắt được cả update tại chỗ trên standalone),
+      fallback (count, max _id) nếu không đọc được storageStats hoặc user thiếu quyền $collStats
+      (role clusterMonitor). 1 probe / collection thay cho
+      N full query / 3s.
+    - "off": không bật push, poller giữ nhịp cố định như cũ.
+
+Probe có thể bỏ sót thay đổi (vd engine khác WiredTiger) → poller luôn có trần staleness,
+quá thời gian đó vẫn poll lại dù watcher chưa báo.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from pymongo.errors import OperationFailure
+
+from app.core.config import SSE_PUSH_MODE
+from app.core.database import get_database
+from app.core.query_governor import LANE_BACKGROUND, query_governor
+
+logger = logging.getLogger(__name__)
+
+SSE_PUSH_PROBE_INTERVAL = 1.0  # giây giữa 2 lần probe 1 collection
+_WATCH_ERROR_BACKOFF = 5.0     # giây nghỉ khi probe/change stream lỗi
+
+# Source = "db_name.collection_name"
+ProbeFn = Callable[[str], Awaitable[Any]]
+
+# Source mà $collStats bị từ chối (Unauthorized...) — probe thẳng bằng fallback, khỏi thử lại mỗi nhịp.
+_collstats_denied: Set[str] = set()
+
+
+def _split_source(source: str) -> Tuple[str, str]:
+    db_name, _, coll_name = source.partition(".")
+    return db_name, coll_name
+
+
+async def probe_collection_fingerprint(source: str) -> Any:
+    """Fingerprint rẻ của 1 collection: đổi khi có insert/update/delete."""
+    db_name, coll_name = _split_source(source)
+    collection = get_database(db_name).get_collection(coll_name)
+    if source not in _collstats_denied:
+        try:
+            stats = await collection.aggregate([{"$collStats": {"storageStats": {}}}]).to_list(length=1)
+            cursor_stats = stats[0]["storageStats"]["wiredTiger"]["cursor"]
+            return (
+                stats[0]["storageStats"].get("count"),
+                cursor_stats.get("insert calls"),
+                cursor_stats.get("update calls"),
+                cursor_stats.get("remove calls"),
+            )
+        except (KeyError, IndexError):
+            # Không có storageStats WiredTiger (engine khác / view) → chỉ bắt được insert/delete.
+            pass
+        except OperationFailure as e:
+            # User app thiếu quyền $collStats (role clusterMonitor) → dùng fallback từ nay về sau.
+            logger.warning(f"Watcher {source}: $collStats bị từ chối ({e}), dùng count + _id mới nhất")
+            _collstats_denied.add(source)
+    count = await collection.estimated_document_count()
+    newest = await collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+    return count, newest["_id"] if newest else None
+
+
+@dataclass
+class _Watched:
+    version: int = 0
+    refs: int = 0
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+    task: Optional[asyncio.Task] = None
+
+
+class CollectionWatcher:
+    """Giữ version tăng dần cho mỗi collection đang được poller quan tâm."""
+
+    def __init__(self, mode: str = "off", probe: ProbeFn = probe_collection_fingerprint) -> None:
+        self.mode = mode if mode in ("probe", "change_stream") else "off"
+        self._probe = probe
+        self._watched: Dict[str, _Watched] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def watch(self, sources: Iterable[str]) -> None:
+        """Tăng ref-count; collection đầu tiên được quan tâm sẽ bật task theo dõi."""
+        for source in sources:
+            w = self._watched.setdefault(source, _Watched())
+            w.refs += 1
+            if w.task is None or w.task.done():
+                w.task = asyncio.create_task(self._run(source, w))
+
+    def unwatch(self, sources: Iterable[str]) -> None:
+        """Giảm ref-count; không còn poller nào quan tâm thì dừng task + dọn."""
+        for source in sources:
+            w = self._watched.get(source)
+            if w is None:
+                continue
+            w.refs -= 1
+            if w.refs <= 0:
+                if w.task is not None and not w.task.done():
+                    w.task.cancel()
+                self._watched.pop(source, None)
+
+    def versions(self, sources: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._watched[s].version if s in self._watched else 0 for s in sources)
+
+    async def wait_for_change(self, sources: Tuple[str, ...], seen: Tuple[int, ...], timeout: float) -> bool:
+        """Chờ tới khi 1 collection trong sources đổi version so với `seen` (hoặc hết timeout).
+
+        Returns:
+            True nếu có thay đổi, False nếu hết timeout.
+        """
+        if self.versions(sources) != seen:
+            return True
+        events = [self._watched[s].changed for s in sources if s in self._watched]
+        if not events:
+            await asyncio.sleep(timeout)
+            return False
+        waiters = [asyncio.create_task(ev.wait()) for ev in events]
+        try:
+            done, _ = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for t in waiters:
+                t.cancel()
+        return bool(done)
+
+    def _bump(self, w: _Watched) -> None:
+        w.version += 1
+        w.changed.set()
+        w.changed = asyncio.Event()
+
+    async def _run(self, source: str, w: _Watched) -> None:
+        if self.mode == "change_stream":
+            try:
+                await self._run_change_stream(source, w)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"SSE watcher: change stream unavailable for {source} ({e}), falling back to probe")
+        await self._run_probe(source, w)
+
+    async def _run_change_stream(self, source: str, w: _Watched) -> None:
+        db_name, coll_name = _split_source(source)
+        collection = get_database(db_name).get_collection(coll_name)
+        async with collection.watch() as stream:
+            async for _change in stream:
+                self._bump(w)
+
+    async def _run_probe(self, source: str, w: _Watched) -> None:
+        last: Any = None
+        first = True
+        while True:
+            try:
+                async with query_governor.slot(LANE_BACKGROUND):
+                    fp = await self._probe(source)
+                # Lần probe đầu chỉ lấy mốc — poller vừa query xong nên chưa cần đánh thức.
+                if not first and fp != last:
+                    self._bump(w)
+                last, first = fp, False
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"SSE watcher probe error ({source}): {e}")
+                await asyncio.sleep(_WATCH_ERROR_BACKOFF)
+                continue
+            await asyncio.sleep(SSE_PUSH_PROBE_INTERVAL)
+
+
+watcher = CollectionWatcher(SSE_PUSH_MODE)
@@ -1,18 +1,45 @@
 # finext-fastapi/app/crud/sse/chart_history_data.py
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.core.database import get_database
 from app.crud.sse._helpers import STOCK_DB, OPERATION_TIMEOUT_MS
-from app.crud.sse._constants import CHART_DATA_PROJECTION, _is_index_ticker
+from app.crud.sse._constants import _is_index_ticker, chart_projection
+from app.crud.sse._cursor import cursor_filter, day_bound_filter, decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
+# Keyset mode thiếu limit → lấy chừng này bar / trang.
+CHART_PAGE_DEFAULT_LIMIT = 500
+
+
+def parse_history_page(
+    before: Optional[str] = None, after: Optional[str] = None, cursor: Optional[str] = None
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Tham số keyset → (hướng "before"|"after", filter trên date). None nếu không dùng keyset.
+    Tham số sai / dùng cùng lúc nhiều chế độ → ValueError (router đổi thành 400).
+    """
+    if sum(p is not None for p in (before, after, cursor)) > 1:
+        raise ValueError("Chỉ dùng 1 trong before / after / cursor")
+    if cursor is not None:
+        decoded = decode_cursor(cursor)
+        return decoded["dir"], cursor_filter("date", decoded)
+    if before is not None:
+        return "before", day_bound_filter("date", before=before)
+    if after is not None:
+        return "after", day_bound_filter("date", after=after)
+    return None
+
 
 async def chart_history_data(
     ticker: Optional[str] = None,
     skip: Optional[int] = None,
     limit: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    cursor: Optional[str] = None,
     **kwargs,
 ) -> Dict[str, Any]:
     """
@@ -21,15 +48,25 @@ async def chart_history_data(
     - Index tickers (VNINDEX, VN30, ...) → collection: history_index
     - Stock tickers (VNM, FPT, ...) → collection: history_stock
 
-    Hỗ trợ phân trang: skip/limit lấy N bản ghi MỚI NHẤT (sort DESC → skip → limit → reverse).
+    Hỗ trợ phân trang:
+    - Keyset (khuyến nghị): before=YYYY-MM-DD / after=YYYY-MM-DD hoặc cursor từ trang trước.
+      Mongo nhảy thẳng tới mốc date trên index (ticker, date) → chi phí không tăng theo độ sâu.
+      Trả {"data": [...ASC...], "next_cursor": str | None} (None = hết dữ liệu theo hướng đó).
+    - skip/limit (legacy): lấy N bản ghi MỚI NHẤT (sort DESC → skip → limit → reverse);
+      Mongo phải duyệt rồi bỏ `skip` entry → trang càng sâu càng chậm.
 
     Args:
         ticker: Mã ticker (bắt buộc). Mặc định: VNINDEX
         skip: Số bản ghi bỏ qua từ cuối (mới nhất). Dùng cho lazy load.
         limit: Số bản ghi tối đa trả về.
+        fields: Chỉ lấy các field này (đã validate bằng parse_chart_fields). None → đủ field.
+        before: Lấy các phiên TRƯỚC ngày này (không gồm), mới nhất trước khi đảo về ASC.
+        after: Lấy các phiên SAU ngày này (không gồm).
+        cursor: next_cursor của trang trước (giữ nguyên hướng của trang đó).
 
     Returns:
         List[Dict] - dữ liệu OHLCV + indicators theo ticker, sorted by date ASC
+        (keyset mode: {"data": List[Dict], "next_cursor": Optional[str]})
     """
     if not ticker:
         ticker = "VNINDEX"
@@ -47,21 +84,36 @@ async def chart_history_data(
 
     collection = stock_db.get_collection(collection_name)
 
+    page = parse_history_page(before, after, cursor)
+    if page is not None:
+        direction, bound = page
+        limit = limit or CHART_PAGE_DEFAULT_LIMIT
+        cursor_obj = collection.find({**find_query, **bound}, chart_projection(fields))
+        cursor_obj.sort("date", -1 if direction == "before" else 1)
+        cursor_obj.limit(limit)
+        cursor_obj.max_time_ms(OPERATION_TIMEOUT_MS)
+        docs = await cursor_obj.to_list(length=limit)
+        # Trang đủ limit → có thể còn nữa; cursor trỏ tiếp từ bar xa nhất theo hướng đang đi.
+        next_cursor = encode_cursor(direction, docs[-1]["date"]) if len(docs) == limit else None
+        if direction == "before":
+            docs.reverse()
+        return {"data": docs, "next_cursor": next_cursor}
+
     if limit is not None:
         # Lazy load: sort DESC → skip → limit → reverse kết quả về ASC
-        cursor = collection.find(find_query, CHART_DATA_PROJECTION)
-        cursor.sort("date", -1)  # Newest first
+        cursor_obj = collection.find(find_query, chart_projection(fields))
+        cursor_obj.sort("date", -1)  # Newest first
         if skip is not None and skip > 0:
-            cursor.skip(skip)
-        cursor.limit(limit)
-        cursor.max_time_ms(OPERATION_TIMEOUT_MS)
-        docs = await cursor.to_list(length=limit)
+            cursor_obj.skip(skip)
+        cursor_obj.limit(limit)
+        cursor_obj.max_time_ms(OPERATION_TIMEOUT_MS)
+        docs = await cursor_obj.to_list(length=limit)
         docs.reverse()  # Trả về ASC (oldest → newest)
     else:
         # Legacy: load toàn bộ, sort ASC
-        cursor = collection.find(find_query, CHART_DATA_PROJECTION)
-        cursor.sort("date", 1)
-        cursor.max_time_ms(OPERATION_TIMEOUT_MS)
-        docs = await cursor.to_list(length=None)
+        cursor_obj = collection.find(find_query, chart_projection(fields))
+        cursor_obj.sort("date", 1)
+        cursor_obj.max_time_ms(OPERATION_TIMEOUT_MS)
+        docs = await cursor_obj.to_list(length=None)
 
     return docs
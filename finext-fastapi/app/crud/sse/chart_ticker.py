@@ -3,7 +3,8 @@ import asyncio
 from typing import Any, Dict
 
 from app.core.database import get_database
-from app.crud.sse._helpers import get_collection_records, STOCK_DB
+from app.crud.sse._helpers import STOCK_DB
+from app.crud.sse._snapshot import get_snapshot_records
 from app.crud.sse._constants import INDEX_TICKERS, _is_industry_ticker
 
 
@@ -23,8 +24,8 @@ async def chart_ticker(**kwargs) -> Dict[str, Any]:
 
     # Query cả today_index và today_stock song song
     index_records, stock_records = await asyncio.gather(
-        get_collection_records(stock_db, "today_index", find_query={}, projection=ticker_projection),
-        get_collection_records(stock_db, "today_stock", find_query={}, projection=ticker_projection),
+        get_snapshot_records(stock_db, "today_index", find_query={}, projection=ticker_projection),
+        get_snapshot_records(stock_db, "today_stock", find_query={}, projection=ticker_projection),
     )
 
     # Dedup theo ticker — index ưu tiên (insert trước). Dùng dict để giữ thứ tự + dedupe O(N).
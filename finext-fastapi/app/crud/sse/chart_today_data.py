@@ -1,25 +1,27 @@
 # finext-fastapi/app/crud/sse/chart_today_data.py
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from app.core.database import get_database
-from app.crud.sse._helpers import STOCK_DB, OPERATION_TIMEOUT_MS
-from app.crud.sse._constants import CHART_DATA_PROJECTION, _is_index_ticker
+from app.crud.sse._helpers import STOCK_DB
+from app.crud.sse._snapshot import get_snapshot_records
+from app.crud.sse._constants import _is_index_ticker, chart_projection
 
 logger = logging.getLogger(__name__)
 
 
-async def chart_today_data(ticker: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+async def chart_today_data(ticker: Optional[str] = None, fields: Optional[List[str]] = None, **kwargs) -> Dict[str, Any]:
     """
     Lấy dữ liệu hôm nay cho biểu đồ kỹ thuật.
     Tự động phân biệt index và stock dựa trên ticker.
     - Index tickers (VNINDEX, VN30, ...) → collection: today_index
     - Stock tickers (VNM, FPT, ...) → collection: today_stock
 
-    Tối ưu: query trực tiếp MongoDB với sort, không qua pandas.
+    Tối ưu: lọc theo ticker + sort trên snapshot today_* dùng chung, không qua pandas.
 
     Args:
         ticker: Mã ticker (bắt buộc). Mặc định: VNINDEX
+        fields: Chỉ lấy các field này (đã validate bằng parse_chart_fields). None → đủ field.
 
     Returns:
         List[Dict] - dữ liệu OHLCV + indicators hôm nay theo ticker, sorted by date ASC
@@ -38,11 +40,7 @@ async def chart_today_data(ticker: Optional[str] = None, **kwargs) -> Dict[str,
 
     logger.debug(f"chart_today_data: ticker={ticker}, collection={collection_name}")
 
-    # Query trực tiếp với sort, không qua pandas DataFrame
-    collection = stock_db.get_collection(collection_name)
-    cursor = collection.find(find_query, CHART_DATA_PROJECTION)
-    cursor.sort("date", 1)  # Sort ascending by date
-    cursor.max_time_ms(OPERATION_TIMEOUT_MS)
-    docs = await cursor.to_list(length=None)
-
-    return docs
+    # Lọc + sort trên snapshot dùng chung của collection (crud/sse/_snapshot.py), không qua pandas
+    return await get_snapshot_records(
+        stock_db, collection_name, find_query=find_query, projection=chart_projection(fields), sort=[("date", 1)]
+    )
@@ -60,7 +60,7 @@ async def finstats_industry(
     else:
         find_query["period"] = {"$regex": "_[1-4]$"}
 
-    # NaN/Inf được xử lý ở tầng response (bson_to_json_str → clean_nan_values) → không cần replace ở đây
+    # NaN/Inf được xử lý ở tầng response (utils/fast_json.py: dumps_json → null) → không cần replace ở đây
     return await get_collection_records(
         stock_db,
         "finstats_industry",
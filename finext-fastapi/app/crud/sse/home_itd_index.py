@@ -2,7 +2,8 @@
 from typing import Any, Dict, Optional
 
 from app.core.database import get_database
-from app.crud.sse._helpers import get_collection_records, STOCK_DB
+from app.crud.sse._helpers import STOCK_DB
+from app.crud.sse._snapshot import get_snapshot_records
 
 
 async def home_itd_index(ticker: Optional[str] = None, **kwargs) -> Dict[str, Any]:
@@ -12,4 +13,4 @@ async def home_itd_index(ticker: Optional[str] = None, **kwargs) -> Dict[str, An
     # ITD chỉ cần close để vẽ line chart, không cần open/high/low
     projection = {"_id": 0, "ticker": 1, "ticker_name": 1, "date": 1, "close": 1, "volume": 1, "diff": 1, "pct_change": 1, "t0_score": 1, "vsi": 1}
     find_query = {"ticker": ticker} if ticker else {}
-    return await get_collection_records(stock_db, "itd_index", find_query=find_query, projection=projection)
+    return await get_snapshot_records(stock_db, "itd_index", find_query=find_query, projection=projection)
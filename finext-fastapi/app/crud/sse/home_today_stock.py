@@ -2,7 +2,8 @@
 from typing import Any, Dict, Optional
 
 from app.core.database import get_database
-from app.crud.sse._helpers import get_collection_records, STOCK_DB
+from app.crud.sse._helpers import STOCK_DB
+from app.crud.sse._snapshot import get_snapshot_records
 
 
 async def home_today_stock(ticker: Optional[str] = None, **kwargs) -> Dict[str, Any]:
@@ -46,4 +47,4 @@ async def home_today_stock(ticker: Optional[str] = None, **kwargs) -> Dict[str,
 
     find_query = {"ticker": ticker} if ticker else {}
 
-    return await get_collection_records(stock_db, "today_stock", find_query=find_query, projection=projection)
+    return await get_snapshot_records(stock_db, "today_stock", find_query=find_query, projection=projection)
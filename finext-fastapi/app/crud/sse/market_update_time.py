@@ -8,11 +8,21 @@ from typing import Any, Dict
 
 from app.core.database import get_database
 from app.crud.sse._helpers import STOCK_DB
+from app.crud.sse._snapshot import bson_sort_key, get_snapshot_table
 
 
 async def market_update_time(**kwargs) -> Dict[str, Any]:
     """Lấy thời gian cập nhật mới nhất của dữ liệu thị trường. Database: stock_db."""
     stock_db = get_database(STOCK_DB)
+
+    # Snapshot itd_index dùng chung (crud/sse/_snapshot.py) → max(date) tính trong RAM
+    table = await get_snapshot_table(stock_db, "itd_index")
+    if table is not None:
+        rows = table.by_ticker.get("HNXINDEX")
+        if not rows:
+            return {"update_time": None}
+        return {"update_time": max((row.get("date") for row in rows), key=bson_sort_key)}
+
     collection = stock_db.get_collection("itd_index")
 
     pipeline = [
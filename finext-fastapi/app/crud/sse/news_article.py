@@ -1,8 +1,8 @@
 # finext-fastapi/app/crud/sse/news_article.py
 from typing import Any, Dict, Optional
 
-from app.core.database import get_database
-from app.crud.sse._helpers import STOCK_DB
+from app.crud.sse._article_cache import load_article
+from app.crud.sse._snapshot import apply_projection
 
 
 async def news_article(
@@ -12,7 +12,7 @@ async def news_article(
 ) -> Dict[str, Any]:
     """
     Lấy thông tin 1 bài viết theo article_slug.
-    Query trực tiếp từ DB theo field article_slug.
+    Document đầy đủ đọc qua cache bài viết theo slug (crud/sse/_article_cache.py), projection áp trong RAM.
     Database: temp_stock.
 
     Args:
@@ -25,17 +25,10 @@ async def news_article(
     if not article_slug:
         return {"article": None, "error": "article_slug is required"}
 
-    stock_db = get_database(STOCK_DB)
-    collection = stock_db.get_collection("news_daily")
-
-    # Sử dụng projection truyền vào hoặc mặc định
-    if projection is None:
-        projection = {"_id": 0}
-
-    # Query trực tiếp theo article_slug
-    doc = await collection.find_one({"article_slug": article_slug}, projection)
+    doc = await load_article("news_daily", article_slug)
 
     if doc:
-        return {"article": doc}
+        # Bản trong cache dùng chung → luôn trả bản sao (projection tạo dict mới).
+        return {"article": apply_projection([doc], projection)[0]}
 
     return {"article": None, "error": "Article not found"}
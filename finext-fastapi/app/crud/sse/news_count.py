@@ -1,12 +1,149 @@
 # finext-fastapi/app/crud/sse/news_count.py
+"""
+Keyword: news_count
+Số tin trong ngày (news_daily, theo news_type) + số bản tin từ hôm qua (news_report), giờ VN.
+
+Trước đây mỗi lần poll chạy tuần tự cho từng news_type 1 count_documents + 1 find_one (debug)
++ đôi khi thêm 1 count toàn collection, rồi count news_report — tới 13 round trip, mỗi cái log INFO.
+
+Giờ bộ đếm nằm trong RAM (NewsCounter), trả thẳng từ bộ nhớ:
+- Đồng bộ đầy đủ = 1 aggregation $group / collection (2 collection chạy song song) tính số bài +
+  created_at lớn nhất từ mốc ngày. Chạy khi sang ngày mới theo giờ VN (bộ đếm về 0), lần đầu,
+  và mỗi NEWS_COUNT_RESYNC_INTERVAL giây (bắt bài bị xoá / trùng mốc created_at).
+- Giữa các lần đó: watcher báo collection đổi hoặc quá SSE_NEWS_COUNT_MAX_AGE giây → chỉ đọc
+  bài có created_at > mốc đã đếm (projection news_type + created_at) và cộng dồn.
+"""
+
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
 
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import SSE_NEWS_COUNT_MAX_AGE
 from app.core.database import get_database
-from app.crud.sse._helpers import STOCK_DB
+from app.crud.sse._helpers import OPERATION_TIMEOUT_MS, STOCK_DB
+from app.crud.sse._watcher import watcher
+from app.utils.market_session import VN_TZ
 
 logger = logging.getLogger(__name__)
 
+NEWS_TYPES = ("thong_cao", "trong_nuoc", "doanh_nghiep", "quoc_te")
+NEWS_COUNT_RESYNC_INTERVAL = 3600
+_SOURCES = (f"{STOCK_DB}.news_daily", f"{STOCK_DB}.news_report")
+
+
+def _vn_now() -> datetime:
+    return datetime.now(VN_TZ)
+
+
+def _day_bounds(now: datetime) -> Tuple[str, str]:
+    """(đầu ngày hôm nay, đầu ngày hôm qua) dạng ISO giờ VN — cùng kiểu chuỗi với created_at."""
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return today_start.isoformat(), (today_start - timedelta(days=1)).isoformat()
+
+
+class NewsCounter:
+    def __init__(self, max_age: float) -> None:
+        self.max_age = max_age
+        self._day: Optional[date] = None
+        self._news: Dict[str, int] = {}
+        self._reports = 0
+        # created_at lớn nhất đã đếm theo collection — lần cộng dồn sau chỉ đọc bài mới hơn.
+        self._watermarks: Dict[str, Any] = {}
+        self._synced_at = 0.0
+        self._refreshed_at = 0.0
+        self._seen: Tuple[int, ...] = ()
+        self._lock = asyncio.Lock()
+        self.resyncs = 0
+        self.increments = 0
+
+    async def _group(self, db: AsyncIOMotorDatabase, collection_name: str, since: str, by: Optional[str]) -> list:
+        pipeline = [
+            {"$match": {"created_at": {"$gte": since}}},
+            {"$group": {"_id": f"${by}" if by else None, "count": {"$sum": 1}, "newest": {"$max": "$created_at"}}},
+        ]
+        cursor = db.get_collection(collection_name).aggregate(pipeline, maxTimeMS=OPERATION_TIMEOUT_MS)
+        return await cursor.to_list(length=None)
+
+    async def resync(self, db: AsyncIOMotorDatabase, now: datetime) -> None:
+        """Đếm lại từ mốc ngày bằng 1 aggregation / collection."""
+        today_start, yesterday_start = _day_bounds(now)
+        seen = watcher.versions(_SOURCES)
+        news_rows, report_rows = await asyncio.gather(
+            self._group(db, "news_daily", today_start, "news_type"),
+            self._group(db, "news_report", yesterday_start, None),
+        )
+        self._news = {row["_id"]: row["count"] for row in news_rows if row["_id"] is not None}
+        self._reports = sum(row["count"] for row in report_rows)
+        self._watermarks = {
+            "news_daily": max((row["newest"] for row in news_rows if row["newest"] is not None), default=None),
+            "news_report": max((row["newest"] for row in report_rows if row["newest"] is not None), default=None),
+        }
+        self._day = now.date()
+        self._synced_at = self._refreshed_at = time.monotonic()
+        self._seen = seen
+        self.resyncs += 1
+
+    async def _read_since(self, db: AsyncIOMotorDatabase, collection_name: str, bound: str) -> list:
+        watermark = self._watermarks.get(collection_name)
+        find_query = {"created_at": {"$gt": watermark}} if watermark is not None else {"created_at": {"$gte": bound}}
+        cursor = db.get_collection(collection_name).find(find_query, {"_id": 0, "news_type": 1, "created_at": 1})
+        cursor.max_time_ms(OPERATION_TIMEOUT_MS)
+        return await cursor.to_list(length=None)
+
+    async def increment(self, db: AsyncIOMotorDatabase, now: datetime) -> None:
+        """Cộng dồn bài mới hơn mốc đã đếm (thường 0–vài bài)."""
+        today_start, yesterday_start = _day_bounds(now)
+        seen = watcher.versions(_SOURCES)
+        news_docs, report_docs = await asyncio.gather(
+            self._read_since(db, "news_daily", today_start),
+            self._read_since(db, "news_report", yesterday_start),
+        )
+        for doc in news_docs:
+            news_type = doc.get("news_type")
+            if news_type is not None:
+                self._news[news_type] = self._news.get(news_type, 0) + 1
+        self._reports += len(report_docs)
+        for collection_name, docs in (("news_daily", news_docs), ("news_report", report_docs)):
+            newest = max((d["created_at"] for d in docs if d.get("created_at") is not None), default=None)
+            if newest is not None:
+                self._watermarks[collection_name] = newest
+        self._refreshed_at = time.monotonic()
+        self._seen = seen
+        self.increments += 1
+
+    async def snapshot(self, db: AsyncIOMotorDatabase) -> Tuple[datetime, Dict[str, int], int]:
+        """(giờ VN hiện tại, số tin theo news_type, số bản tin) — cập nhật trước nếu cần (single-flight)."""
+        async with self._lock:
+            now = _vn_now()
+            mono = time.monotonic()
+            if self._day != now.date() or mono - self._synced_at >= NEWS_COUNT_RESYNC_INTERVAL:
+                await self.resync(db, now)
+            elif mono - self._refreshed_at >= self.max_age or watcher.versions(_SOURCES) != self._seen:
+                await self.increment(db, now)
+            return now, dict(self._news), self._reports
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "day": self._day.isoformat() if self._day else None,
+            "news": sum(self._news.values()),
+            "reports": self._reports,
+            "resyncs": self.resyncs,
+            "increments": self.increments,
+        }
+
+    def clear(self) -> None:
+        self._day = None
+        self._news, self._reports, self._watermarks = {}, 0, {}
+        self._synced_at = self._refreshed_at = 0.0
+        self.resyncs = self.increments = 0
+
+
+news_counter = NewsCounter(SSE_NEWS_COUNT_MAX_AGE)
+
 
 async def news_count(
     type: Optional[str] = None,
@@ -15,100 +152,29 @@ async def news_count(
     """
     Đếm số lượng tin tức theo type.
     - Tin tức (news_daily): đếm ngày hôm nay
-    - Báo cáo (news_report): đếm ngày hôm qua
-    Chỉ lấy các field cần thiết để đếm, không lấy nội dung.
-    Database: temp_stock.
+    - Báo cáo (news_report): đếm từ đầu ngày hôm qua
+    Đọc từ bộ đếm in-memory (NewsCounter), về 0 lúc sang ngày mới theo giờ VN.
+    Database: stock_db.
 
     Args:
-        type: Loại tin tức để filter (VD: thong_cao, trong_nuoc, doanh_nghiep, quoc_te)
+        type: Loại tin tức để filter (VD: thong_cao, trong_nuoc, doanh_nghiep, quoc_te, news_report)
               Nếu không truyền sẽ trả về tất cả types
 
     Returns:
         Dict chứa count theo từng type và tổng
     """
-    from datetime import datetime, timezone, timedelta
-
-    stock_db = get_database(STOCK_DB)
-
-    # Lấy thời gian theo timezone Vietnam (UTC+7)
-    vietnam_offset = timedelta(hours=7)
-    vietnam_tz = timezone(vietnam_offset)
-    now = datetime.now(vietnam_tz)
-
-    # Ngày hôm nay (cho tin tức)
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    today_start_str = today_start.isoformat()
+    now, news, reports = await news_counter.snapshot(get_database(STOCK_DB))
+    today_start, _ = _day_bounds(now)
 
-    # Ngày hôm qua (cho bản tin)
-    yesterday = now - timedelta(days=1)
-    yesterday_start = yesterday.replace(hour=0, minute=0, second=0, microsecond=0)
-    yesterday_start_str = yesterday_start.isoformat()
-
-    logger.info(f"[news_count] Current time (VN): {now.isoformat()}")
-    logger.info(f"[news_count] Today start (VN): {today_start_str}")
-    logger.info(f"[news_count] Yesterday start (VN): {yesterday_start_str}")
+    news_types = [type] if type else list(NEWS_TYPES)
+    sources: Dict[str, int] = {t: news.get(t, 0) for t in news_types if t != "news_report"}
+    if not type or type == "news_report":
+        sources["news_report"] = reports
+    logger.debug(f"[news_count] {now.date()}: {sources}")
 
-    result = {
+    return {
         "date": now.strftime("%Y-%m-%d"),
-        "today_start": today_start_str,
-        "sources": {},
-        "total": 0,
-        "debug": {},
+        "today_start": today_start,
+        "sources": sources,
+        "total": sum(sources.values()),
     }
-
-    # Đếm tin từ news_daily
-    news_collection = stock_db.get_collection("news_daily")
-
-    # Các loại tin cần đếm
-    news_types = ["thong_cao", "trong_nuoc", "doanh_nghiep", "quoc_te"]
-
-    if type:
-        news_types = [type]
-
-    for news_type in news_types:
-        # Query đếm tin trong ngày hôm nay theo news_type (tin tức từ news_daily)
-        count_query = {"news_type": news_type, "created_at": {"$gte": today_start_str}}
-        count = await news_collection.count_documents(count_query)
-        result["sources"][news_type] = count
-        result["total"] += count
-        logger.info(f"[news_count] Type '{news_type}': {count} articles (query: created_at >= {today_start_str})")
-
-        # Debug: lấy tin mới nhất để xem
-        newest_doc = await news_collection.find_one({"news_type": news_type}, {"created_at": 1, "_id": 0}, sort=[("created_at", -1)])
-        if newest_doc:
-            newest_created_at = newest_doc.get("created_at")
-            result["debug"][f"{news_type}_newest"] = newest_created_at
-            logger.info(f"[news_count] Newest article for '{news_type}': {newest_created_at}")
-
-            # Test: đếm tất cả tin có created_at >= newest - 1 ngày
-            if count == 0:
-                # Thử parse và so sánh
-                try:
-                    from datetime import datetime
-
-                    # Parse newest_created_at
-                    if isinstance(newest_created_at, str):
-                        # Thử lấy tổng số tin của news_type này
-                        total_type = await news_collection.count_documents({"news_type": news_type})
-                        logger.info(f"[news_count] Total articles for '{news_type}': {total_type}")
-                except Exception as e:
-                    logger.error(f"[news_count] Error parsing date: {e}")
-
-    # Đếm báo cáo từ news_report - LÙI 1 NGÀY (nếu không filter theo type cụ thể của news_daily)
-    if not type or type == "news_report":
-        report_collection = stock_db.get_collection("news_report")
-        report_count_query = {
-            "created_at": {"$gte": yesterday_start_str}  # Dùng yesterday cho bản tin
-        }
-        report_count = await report_collection.count_documents(report_count_query)
-        result["sources"]["news_report"] = report_count
-        result["total"] += report_count
-        logger.info(f"[news_count] news_report: {report_count} reports (query: created_at >= {yesterday_start_str})")
-
-        # Debug sample
-        if report_count == 0:
-            sample_report = await report_collection.find_one({}, {"created_at": 1, "_id": 0})
-            if sample_report:
-                logger.info(f"[news_count] Sample created_at for 'news_report': {sample_report.get('created_at')}")
-
-    return result
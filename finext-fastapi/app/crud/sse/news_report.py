@@ -2,10 +2,8 @@
 from typing import Any, Dict, Optional
 
 from app.core.database import get_database
-from app.crud.sse._helpers import STOCK_DB, OPERATION_TIMEOUT_MS
-
-# Field được phép sort. Frontend chỉ dùng created_at (reports/types.ts REPORT_SORT_FIELD).
-_SORTABLE_FIELDS = {"created_at", "updated_at"}
+from app.crud.sse._feed import category_filter, read_feed
+from app.crud.sse._helpers import STOCK_DB
 
 
 async def news_report(
@@ -17,6 +15,7 @@ async def news_report(
     sort_by: Optional[str] = None,
     sort_order: Optional[str] = None,
     projection: Optional[Dict[str, Any]] = None,
+    cursor: Optional[str] = None,
     **kwargs,
 ) -> Dict[str, Any]:
     """
@@ -31,12 +30,12 @@ async def news_report(
         limit: Số lượng bản ghi mỗi trang
         sort_by: Tên field để sắp xếp (mặc định: created_at)
         sort_order: Thứ tự sắp xếp: asc hoặc desc (mặc định: desc)
+        cursor: pagination.next_cursor của trang trước — đọc tiếp theo keyset, bỏ qua page (chỉ sort created_at)
 
     Returns:
-        Dict chứa data và pagination info
+        Dict chứa items và pagination info (kèm has_next, next_cursor; xem crud/sse/_feed.py)
     """
     stock_db = get_database(STOCK_DB)
-    collection = stock_db.get_collection("news_report")
 
     # Build query
     find_query = {}
@@ -45,52 +44,20 @@ async def news_report(
         find_query["tickers"] = ticker
     if report_type:
         find_query["report_type"] = report_type
-
     # Hỗ trợ multiple categories với $in operator
-    if categories:
-        # Parse comma-separated string to list
-        category_list = [c.strip() for c in categories.split(",") if c.strip()]
-        if len(category_list) == 1:
-            find_query["category"] = category_list[0]
-        elif len(category_list) > 1:
-            find_query["category"] = {"$in": category_list}
-
-    # Đếm tổng số documents
-    total = await collection.count_documents(find_query)
-
-    # Xử lý pagination defaults
-    page = page or 1
-    limit = limit or 20
-    skip = (page - 1) * limit
-
-    # Xử lý sort - mặc định theo created_at giảm dần (tin mới nhất trước)
-    # Allowlist: endpoint public, sort trên field bất kỳ = sort không index,
-    # đốt CPU/RAM mỗi request. Field ngoài danh sách rơi về mặc định.
-    sort_field = sort_by if sort_by in _SORTABLE_FIELDS else "created_at"
-    sort_direction = -1 if (sort_order or "desc") == "desc" else 1
-
-    # Sử dụng projection truyền vào hoặc mặc định
-    if projection is None:
-        projection = {"_id": 0}
-    cursor = collection.find(find_query, projection)
-    cursor.sort(sort_field, sort_direction)
-    cursor.skip(skip)
-    cursor.limit(limit)
-    cursor.max_time_ms(OPERATION_TIMEOUT_MS)
-
-    docs = await cursor.to_list(length=limit)
-
-    # Tính pagination info
-    total_pages = (total + limit - 1) // limit if limit > 0 else 1
-
-    return {
-        "items": docs,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
-        },
-    }
+    category_filter(find_query, categories)
+
+    # Sort mặc định created_at giảm dần; allowlist sort_by khai báo ở KeywordSpec (crud/sse/__init__.py).
+    # Tổng số bài lấy từ cache (đếm lại khi có bài mới), trang kế đọc theo keyset thay vì skip.
+    return await read_feed(
+        stock_db,
+        "news_report",
+        "report_slug",
+        find_query,
+        page=page,
+        limit=limit,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        projection=projection,
+        cursor=cursor,
+    )
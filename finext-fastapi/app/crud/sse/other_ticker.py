@@ -35,8 +35,9 @@ async def other_ticker(ticker: Optional[str] = None, **kwargs) -> Dict[str, Any]
         find_query["ticker"] = ticker
 
     # Hỗ trợ sorting — convert sort_by/sort_order thành format sort tuples
-    sort_by = kwargs.get("sort_by", "date")
-    sort_order_str = kwargs.get("sort_order", "desc")
+    # (allowlist sort_by khai báo ở KeywordSpec, đã validate trước khi gọi).
+    sort_by = kwargs.get("sort_by") or "date"
+    sort_order_str = kwargs.get("sort_order") or "desc"
     sort_direction = -1 if sort_order_str == "desc" else 1
     sort = [(sort_by, sort_direction)]
 
@@ -1,8 +1,7 @@
 # finext-fastapi/app/crud/sse/report_article.py
 from typing import Any, Dict, Optional
 
-from app.core.database import get_database
-from app.crud.sse._helpers import STOCK_DB
+from app.crud.sse._article_cache import load_article
 
 
 async def report_article(
@@ -11,7 +10,7 @@ async def report_article(
 ) -> Dict[str, Any]:
     """
     Lấy thông tin 1 báo cáo theo report_slug.
-    Query trực tiếp từ DB theo field report_slug.
+    Đọc qua cache bài viết theo slug (crud/sse/_article_cache.py).
     Database: temp_stock.
 
     Args:
@@ -23,16 +22,10 @@ async def report_article(
     if not report_slug:
         return {"report": None, "error": "report_slug is required"}
 
-    stock_db = get_database(STOCK_DB)
-    collection = stock_db.get_collection("news_report")
-
     # Lấy đầy đủ thông tin cho hiển thị
-    projection = {"_id": 0}
-
-    # Query trực tiếp theo report_slug
-    doc = await collection.find_one({"report_slug": report_slug}, projection)
+    doc = await load_article("news_report", report_slug)
 
     if doc:
-        return {"report": doc}
+        return {"report": dict(doc)}
 
     return {"report": None, "error": "Report not found"}
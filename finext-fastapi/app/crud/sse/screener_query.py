@@ -0,0 +1,235 @@
+# finext-fastapi/app/crud/sse/screener_query.py
+"""
+Keyword: screener_query
+Bộ lọc cổ phiếu chạy phía server trên snapshot today_stock (crud/sse/_snapshot.py) dạng cột NumPy.
+
+screener_stock_data gửi nguyên today_stock (~100 cột × ~1600 mã, vài MB) để client tự lọc;
+screener_query chỉ trả các dòng khớp + các cột được chọn.
+
+Tham số (qua /sse/rest/screener_query):
+    filter     : JSON object, mỗi key là 1 cột:
+                   {"pe": {"gte": 5, "lte": 15}}                 khoảng số (gt/gte/lt/lte)
+                   {"industry_name": ["Ngân hàng", "Bảo hiểm"]}   thuộc tập giá trị
+                   {"exchange": "HOSE"}                           bằng 1 giá trị
+                 Các điều kiện AND với nhau; giá trị thiếu/NaN không khớp điều kiện nào.
+    sort_by / sort_order : sắp theo cột bất kỳ (số hoặc chuỗi), thiếu giá trị luôn xếp cuối.
+    limit      : top-N sau khi sort.
+    fields     : cột trả về (comma-separated, luôn kèm ticker). Mặc định: như screener_stock_data.
+
+Bảng cột (ScreenerFrame) dựng 1 lần cho mỗi lần snapshot làm mới (cột dựng lười), dùng chung cho mọi request.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.database import get_database
+from app.crud.sse._helpers import STOCK_DB, get_collection_records
+from app.crud.sse._snapshot import SnapshotTable, get_snapshot_table
+
+# Cột ẩn khỏi kết quả mặc định — khớp screener_stock_data.
+_EXCLUDE_FIELDS = {"_id", "week", "month", "quarter", "year"}
+_RANGE_OPS = ("gt", "gte", "lt", "lte")
+MAX_FILTER_LENGTH = 4096
+MAX_SET_VALUES = 200
+
+
+class ScreenerQueryError(ValueError):
+    """Điều kiện lọc/sort/cột không hợp lệ — lỗi của request (400), không phải lỗi hệ thống."""
+
+
+def parse_screener_filter(raw: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Parse + validate tham số `filter=` (JSON). None/rỗng → None (không lọc). Sai cú pháp → ScreenerQueryError.
+    Chỉ kiểm tra cú pháp — cột có tồn tại hay không được kiểm khi chạy trên snapshot.
+    """
+    if not raw:
+        return None
+    if len(raw) > MAX_FILTER_LENGTH:
+        raise ScreenerQueryError("filter quá dài")
+    try:
+        spec = json.loads(raw)
+    except json.JSONDecodeError:
+        raise ScreenerQueryError("filter phải là JSON object") from None
+    if not isinstance(spec, dict):
+        raise ScreenerQueryError("filter phải là JSON object")
+    for column, cond in spec.items():
+        if isinstance(cond, dict):
+            if not cond or any(op not in _RANGE_OPS for op in cond):
+                raise ScreenerQueryError(f"filter.{column}: chỉ hỗ trợ {', '.join(_RANGE_OPS)}")
+            if any(isinstance(v, bool) or not isinstance(v, (int, float)) for v in cond.values()):
+                raise ScreenerQueryError(f"filter.{column}: giới hạn khoảng phải là số")
+        elif isinstance(cond, list):
+            if not cond or len(cond) > MAX_SET_VALUES or any(not isinstance(v, (str, int, float)) for v in cond):
+                raise ScreenerQueryError(f"filter.{column}: tập giá trị phải gồm 1..{MAX_SET_VALUES} chuỗi/số")
+        elif not isinstance(cond, (str, int, float)):
+            raise ScreenerQueryError(f"filter.{column}: điều kiện không hợp lệ")
+    return spec
+
+
+def parse_screener_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Tham số `fields=` cho screener_query: None/rỗng → None (cột mặc định); luôn kèm ticker."""
+    if not fields:
+        return None
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    return list(dict.fromkeys(["ticker", *names]))
+
+
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _is_number_type(t: type) -> bool:
+    return issubclass(t, (int, float)) and not issubclass(t, bool)
+
+
+class ScreenerFrame:
+    """
+    today_stock dạng cột: cột số → float64 (thiếu = NaN), cột chuỗi → mã hoá category (int32,
+    thiếu = -1). Cột kiểu khác (datetime, bool...) chỉ được trả về, không lọc/sort.
+    Mảng cột dựng lười ở lần đầu 1 cột được lọc/sort rồi giữ lại — request thường chỉ chạm vài cột.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self.rows = rows
+        self.size = len(rows)
+        self.columns: Dict[str, None] = {}
+        for row in rows:
+            for k in row:
+                if k not in self.columns:
+                    self.columns[k] = None
+        self.numeric: Dict[str, np.ndarray] = {}
+        self.codes: Dict[str, np.ndarray] = {}
+        self.categories: Dict[str, Dict[Any, int]] = {}
+        self._opaque: set = set()
+
+    def _materialize(self, column: str) -> None:
+        values = [row.get(column) for row in self.rows]
+        kinds = set(map(type, values)) - {type(None)}
+        if kinds and all(_is_number_type(t) for t in kinds):
+            # dtype float64: None → NaN ngay khi dựng mảng.
+            self.numeric[column] = np.array(values, dtype=np.float64)
+        elif kinds and all(issubclass(t, str) for t in kinds):
+            mapping: Dict[Any, int] = {}
+            self.codes[column] = np.fromiter(
+                (mapping.setdefault(v, len(mapping)) if v is not None else -1 for v in values), dtype=np.int32, count=self.size
+            )
+            self.categories[column] = mapping
+        else:
+            self._opaque.add(column)
+
+    def _require(self, column: str) -> None:
+        if column not in self.columns:
+            raise ScreenerQueryError(f"Cột không tồn tại: {column}")
+        if column not in self.numeric and column not in self.codes and column not in self._opaque:
+            self._materialize(column)
+        if column in self._opaque:
+            raise ScreenerQueryError(f"Cột {column} không hỗ trợ lọc/sắp xếp")
+
+    def _mask(self, column: str, cond: Any) -> np.ndarray:
+        self._require(column)
+        if isinstance(cond, dict):
+            if column not in self.numeric:
+                raise ScreenerQueryError(f"filter.{column}: cột chuỗi không lọc theo khoảng")
+            col = self.numeric[column]
+            mask = np.ones(self.size, dtype=bool)
+            for op, bound in cond.items():
+                # NaN so sánh luôn False → dòng thiếu giá trị tự bị loại.
+                if op == "gt":
+                    mask &= col > bound
+                elif op == "gte":
+                    mask &= col >= bound
+                elif op == "lt":
+                    mask &= col < bound
+                else:
+                    mask &= col <= bound
+            return mask
+        wanted = cond if isinstance(cond, list) else [cond]
+        if column in self.numeric:
+            return np.isin(self.numeric[column], [v for v in wanted if _is_number(v)])
+        mapping = self.categories[column]
+        wanted_codes = [mapping[v] for v in wanted if isinstance(v, str) and v in mapping]
+        return np.isin(self.codes[column], wanted_codes)
+
+    def _order(self, idx: np.ndarray, sort_by: str, descending: bool, limit: Optional[int]) -> np.ndarray:
+        self._require(sort_by)
+        if sort_by in self.numeric:
+            keys = self.numeric[sort_by][idx]
+            missing = np.isnan(keys)
+            keys = np.where(missing, 0.0, -keys if descending else keys)
+        else:
+            # Hạng theo thứ tự chuỗi của category → sort số nguyên thay vì so chuỗi.
+            mapping = self.categories[sort_by]
+            rank = np.empty(len(mapping) + 1, dtype=np.int64)
+            for r, value in enumerate(sorted(mapping)):
+                rank[mapping[value]] = r
+            codes = self.codes[sort_by][idx]
+            missing = codes < 0
+            keys = rank[codes].astype(np.float64)
+            keys = np.where(missing, 0.0, -keys if descending else keys)
+        # Khoá chính: thiếu giá trị xếp cuối; khoá phụ: giá trị; lexsort ổn định giữ thứ tự gốc khi bằng nhau.
+        order = np.lexsort((keys, missing))
+        if limit is not None:
+            order = order[:limit]
+        return idx[order]
+
+    def query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        mask = np.ones(self.size, dtype=bool)
+        for column, cond in (filters or {}).items():
+            mask &= self._mask(column, cond)
+        idx = np.flatnonzero(mask)
+        if sort_by:
+            idx = self._order(idx, sort_by, sort_order == "desc", limit)
+        elif limit is not None:
+            idx = idx[:limit]
+
+        if fields:
+            unknown = [f for f in fields if f not in self.columns]
+            if unknown:
+                raise ScreenerQueryError(f"Cột không tồn tại: {', '.join(unknown)}")
+            wanted = set(fields)
+            return [{k: v for k, v in self.rows[i].items() if k in wanted} for i in idx.tolist()]
+        return [{k: v for k, v in self.rows[i].items() if k not in _EXCLUDE_FIELDS} for i in idx.tolist()]
+
+
+# Frame dựng cho snapshot gần nhất — snapshot làm mới (object bảng mới) thì dựng lại.
+_frame_cache: Tuple[Optional[SnapshotTable], Optional[ScreenerFrame]] = (None, None)
+
+
+def _frame_for(table: SnapshotTable) -> ScreenerFrame:
+    global _frame_cache
+    cached_table, frame = _frame_cache
+    if cached_table is not table or frame is None:
+        frame = ScreenerFrame(table.rows)
+        _frame_cache = (table, frame)
+    return frame
+
+
+async def screener_query(
+    filters: Optional[Dict[str, Any]] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    **kwargs,
+) -> List[Dict[str, Any]]:
+    """
+    Lọc + sắp xếp + top-N today_stock phía server, trả các dòng khớp với cột được chọn.
+    Database: stock_db.
+    Collection: today_stock (qua snapshot dùng chung; snapshot tắt → đọc trực tiếp).
+    """
+    stock_db = get_database(STOCK_DB)
+    table = await get_snapshot_table(stock_db, "today_stock")
+    if table is not None:
+        frame = _frame_for(table)
+    else:
+        frame = ScreenerFrame(await get_collection_records(stock_db, "today_stock", projection={"_id": 0}))
+    return frame.query(filters, sort_by=sort_by, sort_order=sort_order, limit=limit, fields=fields)
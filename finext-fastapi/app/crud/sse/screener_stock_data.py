@@ -2,7 +2,8 @@
 from typing import Any, Dict, List, Optional
 
 from app.core.database import get_database
-from app.crud.sse._helpers import get_collection_records, STOCK_DB
+from app.crud.sse._helpers import STOCK_DB
+from app.crud.sse._snapshot import get_snapshot_records
 
 
 # Fields to exclude from the full projection (internal/redundant)
@@ -34,7 +35,7 @@ async def screener_stock_data(
         direction = -1 if sort_order == "desc" else 1
         sort = [(sort_by, direction)]
 
-    return await get_collection_records(
+    return await get_snapshot_records(
         stock_db,
         "today_stock",
         find_query=find_query,
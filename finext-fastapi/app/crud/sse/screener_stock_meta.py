@@ -3,6 +3,7 @@ from typing import Dict, List
 
 from app.core.database import get_database
 from app.crud.sse._helpers import STOCK_DB
+from app.crud.sse._snapshot import get_snapshot_table
 
 
 async def screener_stock_meta(**kwargs) -> Dict[str, List[str]]:
@@ -18,6 +19,19 @@ async def screener_stock_meta(**kwargs) -> Dict[str, List[str]]:
         - category_name: nhóm đặc biệt
     """
     stock_db = get_database(STOCK_DB)
+
+    # Filter out None/null values and sort
+    def clean_sort(values: List) -> List[str]:
+        return sorted([v for v in values if v is not None and v != ""])
+
+    # Snapshot today_stock dùng chung (crud/sse/_snapshot.py) → distinct tính trong RAM, 0 query
+    table = await get_snapshot_table(stock_db, "today_stock")
+    if table is not None:
+        return {
+            field: clean_sort(list({row.get(field) for row in table.rows}))
+            for field in ("exchange", "industry_name", "marketcap_name", "category_name")
+        }
+
     collection = stock_db.get_collection("today_stock")
 
     # Query distinct values song song
@@ -32,10 +46,6 @@ async def screener_stock_meta(**kwargs) -> Dict[str, List[str]]:
         exchange_task, industry_task, marketcap_task, category_task
     )
 
-    # Filter out None/null values and sort
-    def clean_sort(values: List) -> List[str]:
-        return sorted([v for v in values if v is not None and v != ""])
-
     return {
         "exchange": clean_sort(exchanges),
         "industry_name": clean_sort(industries),
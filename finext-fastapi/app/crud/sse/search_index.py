@@ -8,7 +8,8 @@ FE dùng field `type` để navigate đúng route: /groups/{ticker} hoặc /sect
 from typing import Any, Dict, Optional
 
 from app.core.database import get_database
-from app.crud.sse._helpers import get_collection_records, STOCK_DB
+from app.crud.sse._helpers import STOCK_DB
+from app.crud.sse._snapshot import get_snapshot_records
 
 
 async def search_index(
@@ -37,7 +38,7 @@ async def search_index(
 
     find_query = {"ticker": ticker} if ticker else {}
 
-    return await get_collection_records(
+    return await get_snapshot_records(
         stock_db,
         "today_index",
         find_query=find_query,
@@ -1,14 +1,18 @@
 # finext-fastapi/app/crud/sse/search_reports.py
 """
 Keyword: search_reports
-Tìm kiếm báo cáo theo keyword (regex trên title) + tickers array.
+Tìm kiếm báo cáo theo keyword trên title + tickers array.
 Dùng cho REST endpoint, trả về tối đa 5 kết quả với dữ liệu tối giản.
+
+Tìm trên inverted index in-memory (crud/sse/_search_index.py: bỏ dấu, khớp tiền tố, xếp theo độ mới);
+index chưa dựng xong / SSE_SEARCH_INDEX=off → regex trên Mongo như cũ.
 """
 import re
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from app.core.database import get_database
 from app.crud.sse._helpers import STOCK_DB, OPERATION_TIMEOUT_MS
+from app.crud.sse._search_index import search_indexes
 
 
 async def search_reports(
@@ -16,10 +20,10 @@ async def search_reports(
     search: Optional[str] = None,
     limit: Optional[int] = None,
     **kwargs,
-) -> Dict[str, Any]:
+) -> List[Dict[str, Any]]:
     """
     Tìm kiếm báo cáo theo:
-    - `search`: keyword tìm kiếm trên field `title` (case-insensitive regex)
+    - `search`: keyword tìm kiếm trên field `title` (không dấu, không phân biệt hoa thường, mỗi từ khớp nguyên từ hoặc tiền tố)
     - `ticker`: filter theo mã cổ phiếu trong field `tickers`
     Kết hợp AND nếu cả hai đều có.
 
@@ -30,6 +34,13 @@ async def search_reports(
     Collection: news_report
     """
     stock_db = get_database(STOCK_DB)
+    # Default limit = 5, max = 10
+    result_limit = min(limit or 5, 10)
+
+    index = await search_indexes["news_report"].index(stock_db)
+    if index is not None:
+        return index.search(search, ticker=ticker, limit=result_limit)
+
     collection = stock_db.get_collection("news_report")
 
     # Build query
@@ -49,9 +60,6 @@ async def search_reports(
         # Filter theo element trong mảng tickers (exact match)
         find_query["tickers"] = ticker
 
-    # Default limit = 5, max = 10
-    result_limit = min(limit or 5, 10)
-
     projection = {
         "_id": 0,
         "report_slug": 1,
@@ -7,7 +7,8 @@ Dữ liệu tĩnh (không thay đổi thường xuyên), FE cache và filter cli
 from typing import Any, Dict, Optional
 
 from app.core.database import get_database
-from app.crud.sse._helpers import get_collection_records, STOCK_DB
+from app.crud.sse._helpers import STOCK_DB
+from app.crud.sse._snapshot import get_snapshot_records
 
 
 async def search_stocks(
@@ -36,7 +37,7 @@ async def search_stocks(
 
     find_query = {"ticker": ticker} if ticker else {}
 
-    return await get_collection_records(
+    return await get_snapshot_records(
         stock_db,
         "today_stock",
         find_query=find_query,
@@ -0,0 +1,174 @@
+# finext-fastapi/app/crud/sse/suggest.py
+"""
+Keyword: suggest
+Gợi ý mã cổ phiếu / nhóm / ngành khi gõ (typeahead) — tìm phía server thay vì tải cả danh sách.
+
+search_stocks + search_index trả toàn bộ ~1600 mã + nhóm/ngành (hàng trăm KB) để FE lọc local.
+suggest chỉ trả tối đa 10 dòng khớp cho mỗi nhóm (cổ phiếu / nhóm-ngành): mảng sắp xếp + bisect trên mã và trên từng từ của tên đã
+bỏ dấu (crud/sse/_search_index.tokenize), dựng lại mỗi khi snapshot today_stock / today_index
+dùng chung làm mới (crud/sse/_snapshot.py) → không thêm query Mongo nào.
+
+Xếp hạng: khớp đúng mã → mã bắt đầu bằng chuỗi gõ → tên chứa từ bắt đầu bằng từng từ gõ; cùng
+hạng thì giá trị giao dịch (trading_value) cao trước. Xếp hạng riêng từng nguồn: trading_value của
+nhóm/ngành là tổng cả rổ nên nếu xếp chung, dòng index sẽ chiếm hết chỗ của cổ phiếu.
+"""
+import bisect
+import heapq
+import itertools
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.database import get_database
+from app.crud.sse._helpers import STOCK_DB, get_collection_records
+from app.crud.sse._search_index import MIN_PREFIX_LENGTH, tokenize
+from app.crud.sse._snapshot import SnapshotTable, get_snapshot_table
+
+SUGGEST_LIMIT = 10
+# Nguồn → khoá nhóm trong kết quả keyword.
+SUGGEST_SECTIONS = {"stock": "stocks", "index": "indexes"}
+
+_STOCK_FIELDS = ("ticker", "ticker_name", "exchange", "industry_name", "close", "pct_change")
+_INDEX_FIELDS = ("ticker", "ticker_name", "type", "close", "pct_change")
+
+# Từ của tên (đã bỏ dấu) theo ticker_name — tên gần như không đổi giữa các lần snapshot làm mới.
+_name_words: Dict[str, Tuple[str, ...]] = {}
+
+
+def _words_of(name: Any) -> Tuple[str, ...]:
+    if not isinstance(name, str):
+        return ()
+    words = _name_words.get(name)
+    if words is None:
+        words = _name_words[name] = tuple(dict.fromkeys(tokenize(name)))
+    return words
+
+
+def _trading_value(row: Dict[str, Any]) -> float:
+    value = row.get("trading_value")
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and not math.isnan(value):
+        return float(value)
+    return 0.0
+
+
+def _symbol_key(text: str) -> str:
+    """Mã dạng so khớp: bỏ dấu, chữ thường, bỏ ký tự ngoài chữ/số ("VN-Index" → "vnindex")."""
+    return "".join(tokenize(text))
+
+
+class SuggestIndex:
+    def __init__(self, stock_rows: Sequence[Dict[str, Any]], index_rows: Sequence[Dict[str, Any]]) -> None:
+        self.rows: List[Dict[str, Any]] = []
+        self._value: List[float] = []
+        self._words: List[Tuple[str, ...]] = []
+        self._source: List[str] = []
+        for rows, fields, source in ((stock_rows, _STOCK_FIELDS, "stock"), (index_rows, _INDEX_FIELDS, "index")):
+            for row in rows:
+                if not isinstance(row.get("ticker"), str):
+                    continue
+                out = {f: row[f] for f in fields if f in row}
+                out["source"] = source
+                self.rows.append(out)
+                self._value.append(_trading_value(row))
+                self._words.append(_words_of(row.get("ticker_name")))
+                self._source.append(source)
+
+        # Mảng sắp xếp (khoá, id) cho tìm tiền tố bằng bisect: mã, và từng từ của tên.
+        symbols = sorted((_symbol_key(r["ticker"]), i) for i, r in enumerate(self.rows))
+        self._symbol_keys = [k for k, _ in symbols]
+        self._symbol_ids = [i for _, i in symbols]
+        words = sorted((w, i) for i, ws in enumerate(self._words) for w in ws)
+        self._word_keys = [w for w, _ in words]
+        self._word_ids = [i for _, i in words]
+        self._by_value = sorted(range(len(self.rows)), key=lambda i: -self._value[i])
+        # Thứ hạng theo trading_value (0 = lớn nhất) — khoá sort trong cùng 1 hạng khớp.
+        self._rank = [0] * len(self.rows)
+        for position, doc_id in enumerate(self._by_value):
+            self._rank[doc_id] = position
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+        start = bisect.bisect_left(keys, prefix)
+        return start, bisect.bisect_left(keys, prefix + "\x7f", start)
+
+    def suggest(self, query: Optional[str], limit: int = SUGGEST_LIMIT, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Tối đa `limit` dòng khớp; `source` ("stock" / "index") → chỉ xếp hạng trong nguồn đó."""
+        keep = None if source is None else (lambda i: self._source[i] == source)
+        tokens = tokenize(query)
+        if not tokens:
+            by_value = self._by_value if keep is None else filter(keep, self._by_value)
+            return [dict(self.rows[i]) for i in itertools.islice(by_value, limit)]
+
+        symbol = "".join(tokens)
+        start, end = self._prefix_range(self._symbol_keys, symbol)
+        symbol_ids = self._symbol_ids[start:end]
+        if keep is not None:
+            symbol_ids = [i for i in symbol_ids if keep(i)]
+        exact = {self._symbol_ids[pos] for pos in range(start, end) if self._symbol_keys[pos] == symbol}
+        if keep is not None:
+            exact = {i for i in exact if keep(i)}
+        ranked = sorted(exact, key=self._rank.__getitem__)
+        ranked += heapq.nsmallest(limit, (i for i in symbol_ids if i not in exact), key=self._rank.__getitem__)
+        if len(ranked) < limit and len(tokens[0]) >= MIN_PREFIX_LENGTH:
+            # Tên: mỗi từ gõ khớp tiền tố 1 từ của tên → giao các tập id (phép set chạy trong C).
+            matches = None
+            for token in sorted(set(tokens), key=len, reverse=True):
+                start, end = self._prefix_range(self._word_keys, token)
+                ids = set(self._word_ids[start:end])
+                matches = ids if matches is None else matches & ids
+                if not matches:
+                    break
+            if matches:
+                matches.difference_update(symbol_ids)
+                if keep is not None:
+                    matches = {i for i in matches if keep(i)}
+                ranked += heapq.nsmallest(limit - len(ranked), matches, key=self._rank.__getitem__)
+        return [dict(self.rows[doc_id]) for doc_id in ranked[:limit]]
+
+    def suggest_sections(self, query: Optional[str], limit: int = SUGGEST_LIMIT) -> Dict[str, List[Dict[str, Any]]]:
+        """Top `limit` của từng nguồn: {"stocks": [...], "indexes": [...]}."""
+        return {section: self.suggest(query, limit, source) for source, section in SUGGEST_SECTIONS.items()}
+
+
+# Index dựng cho cặp bảng snapshot gần nhất — snapshot làm mới (object bảng mới) thì dựng lại.
+_index_cache: Tuple[Optional[SnapshotTable], Optional[SnapshotTable], Optional[SuggestIndex]] = (None, None, None)
+
+
+def _index_for(stock_table: SnapshotTable, index_table: SnapshotTable) -> SuggestIndex:
+    global _index_cache
+    cached_stock, cached_index, index = _index_cache
+    if cached_stock is not stock_table or cached_index is not index_table or index is None:
+        index = SuggestIndex(stock_table.rows, index_table.rows)
+        _index_cache = (stock_table, index_table, index)
+    return index
+
+
+async def suggest(
+    search: Optional[str] = None,
+    limit: Optional[int] = None,
+    **kwargs,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    {"stocks": [...], "indexes": [...]} — mỗi nhóm tối đa `limit` (mặc định và tối đa 10) dòng khớp
+    `search`: khớp đúng mã → tiền tố mã → từ trong tên (không dấu, VD "ngan hang"); cùng hạng xếp theo
+    trading_value, xếp riêng từng nhóm. `search` rỗng → các mã giao dịch nhiều nhất của mỗi nhóm.
+
+    Dòng cổ phiếu: ticker, ticker_name, exchange, industry_name, close, pct_change, source="stock".
+    Dòng nhóm/ngành: ticker, ticker_name, type, close, pct_change, source="index"
+    (type == 'industry' → /sectors/{ticker}, còn lại → /groups/{ticker}).
+
+    Database: stock_db
+    Collection: today_stock, today_index (qua snapshot dùng chung; snapshot tắt → đọc trực tiếp)
+    """
+    stock_db = get_database(STOCK_DB)
+    result_limit = min(limit or SUGGEST_LIMIT, SUGGEST_LIMIT)
+
+    stock_table = await get_snapshot_table(stock_db, "today_stock")
+    index_table = await get_snapshot_table(stock_db, "today_index")
+    if stock_table is not None and index_table is not None:
+        index = _index_for(stock_table, index_table)
+    else:
+        index = SuggestIndex(
+            await get_collection_records(stock_db, "today_stock", projection={"_id": 0, "trading_value": 1, **{f: 1 for f in _STOCK_FIELDS}}),
+            await get_collection_records(stock_db, "today_index", projection={"_id": 0, "trading_value": 1, **{f: 1 for f in _INDEX_FIELDS}}),
+        )
+    return index.suggest_sections(search, result_limit)
@@ -1,4 +1,5 @@
 # finext-fastapi/app/main.py
+import asyncio
 import json
 import logging
 from contextlib import asynccontextmanager
@@ -11,11 +12,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.utils.response_wrapper import StandardApiResponse
-from .core.config import ENVIRONMENT
+from .core.config import ENVIRONMENT, SSE_ENSURE_INDEXES, SSE_INDEX_ADVISOR, SSE_SEARCH_INDEX
 from .core.scheduler import start_scheduler, shutdown_scheduler
+from .core.sse_fanout import fanout as sse_fanout
 
 from .core.database import close_mongo_connection, connect_to_mongo, get_database, mongodb
 from .core.seeding import seed_initial_data
+from .crud.sse._article_cache import warm_article_cache
+from .crud.sse._index_advisor import run_boot_advisor
+from .crud.sse._indexes import ensure_sse_indexes
+from .crud.sse._search_index import warm_search_indexes
 from .routers import (
     auth,
     brokers,
@@ -57,13 +63,34 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Lỗi không xác định trong quá trình seeding: {e}", exc_info=True)
 
+    if SSE_ENSURE_INDEXES:
+        await ensure_sse_indexes()
+    advisor_task = None
+    if SSE_INDEX_ADVISOR in ("report", "create"):
+        # Chạy nền: explain ~40 query không được làm chậm khởi động.
+        advisor_task = asyncio.create_task(run_boot_advisor(SSE_INDEX_ADVISOR))
+    search_index_task = None
+    if SSE_SEARCH_INDEX:
+        # Dựng inverted index tin tức / báo cáo nền; search_* dùng regex tới khi xong.
+        search_index_task = asyncio.create_task(warm_search_indexes())
+    # Nạp sẵn bài mới nhất hôm nay vào cache nội dung bài viết (nền, không chặn khởi động).
+    article_warm_task = asyncio.create_task(warm_article_cache())
+
     # KHỞI ĐỘNG SCHEDULER
     await start_scheduler()  #
 
     yield
     logger.info("Ứng dụng FastAPI đang tắt...")
+    if advisor_task is not None and not advisor_task.done():
+        advisor_task.cancel()
+    if search_index_task is not None and not search_index_task.done():
+        search_index_task.cancel()
+    if not article_warm_task.done():
+        article_warm_task.cancel()
     # TẮT SCHEDULER
     await shutdown_scheduler()  #
+    # Nhả quyền leader fan-out SSE → worker khác take over ngay, không chờ OS dọn lock.
+    await sse_fanout.close()
     await close_mongo_connection()
 
 
@@ -7,32 +7,85 @@ Kiến trúc shared in-process cache:
     - Mỗi cặp (keyword, ticker) chỉ có 1 background poller chạy trong worker.
     - Mọi subscriber chia sẻ cùng 1 nguồn dữ liệu → tránh N query DB / 3s khi có N user.
     - Khi không còn subscriber nào, poller tự dừng và cache entry bị xoá.
+    - Nhịp poll theo refresh class của keyword + phiên giao dịch VN (crud/sse/_schedule.py):
+      giá trong phiên 3s, ngoài phiên/cuối tuần lùi về phút/giờ; SSE_POLL_SCHEDULE=fixed tắt.
+    - SSE_PUSH_MODE=probe|change_stream: poller ngủ tới khi collection nguồn của keyword đổi
+      (crud/sse/_watcher.py) thay vì poll cố định mỗi 3s.
+    - `?delta=1`: subscriber nhận snapshot có version rồi chỉ các dòng đổi (utils/sse_delta.py).
+      Delta tính 1 lần / thay đổi trong poller, mọi subscriber dùng chung.
+    - /multiplex: 1 kết nối nhận nhiều channel (keyword, ticker), mỗi channel là 1 subscriber
+      bình thường của cache entry chung; frame gắn `event: <channel>`.
+    - SSE_FANOUT=on: chỉ 1 worker (leader) trên host poll Mongo, worker khác nhận frame
+      đã serialize qua Unix socket (xem core/sse_fanout.py).
+    - `?encoding=deflate`: frame lớn được nén 1 lần / thay đổi (utils/sse_encoding.py) và cache trên
+      frame dùng chung → chi phí nén O(1) theo số subscriber.
+    - Mongo lỗi / circuit breaker mở (crud/sse/_breaker.py): giữ nguyên dữ liệu cuối cùng, gửi
+      `event: stale` kèm tuổi thay cho frame lỗi; /rest trả bản cache cuối cùng kèm `stale: true`.
+    - /stream gắn `id: <epoch>-<version>` cho mỗi frame; client reconnect gửi Last-Event-ID →
+      không đổi thì không gửi gì, delta còn trong ring buffer thì replay đúng phần thiếu, còn lại
+      gửi snapshot (resync) như kết nối mới.
+    - POST /batch: nhiều keyword trong 1 request, mỗi phần đi qua cùng REST cache + single-flight
+      của /rest, chạy song song có giới hạn; `stream=1` trả NDJSON, phần nào xong gửi phần đó.
 """
 
 import asyncio
 import logging
 import json
-import math
 import re
+import secrets
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Dict, Optional, Set
+from typing import Annotated, Any, Deque, Dict, List, Optional, Set, Tuple
 
-from fastapi import APIRouter, Request, HTTPException, status, Query
-from fastapi.responses import StreamingResponse, JSONResponse
-from bson import ObjectId
+from fastapi import APIRouter, Depends, Header, Request, HTTPException, status, Query
+from fastapi.responses import StreamingResponse, JSONResponse, Response
 
-from app.crud.sse import execute_sse_query, get_available_keywords
+from app.core.config import SSE_POLL_SCHEDULE, SSE_STALE_MAX_AGE
+from app.core.query_governor import LANE_INTERACTIVE, LANE_REALTIME, QueryShedError, query_governor
+from app.core.sse_fanout import fanout
+from app.crud.sse import (
+    KEYWORD_SPECS,
+    execute_sse_query,
+    get_available_keywords,
+    get_keyword_sources,
+    get_keyword_spec,
+    get_refresh_class,
+    normalize_query_params,
+)
+from app.auth.access import require_permission
+from app.crud.sse._article_cache import article_cache
+from app.crud.sse._breaker import CircuitOpenError, is_infrastructure_error, mongo_breaker, stale_marker
+from app.crud.sse._constants import parse_chart_fields
+from app.crud.sse._feed import feed_counts
+from app.crud.sse._index_advisor import advise_indexes
+from app.crud.sse._rest_cache import rest_cache, rest_cache_key, rest_cache_ttl
+from app.crud.sse._schedule import next_poll_delay
+from app.crud.sse._search_index import search_indexes
+from app.crud.sse._snapshot import snapshots
+from app.crud.sse.chart_history_data import parse_history_page
+from app.crud.sse.news_count import news_counter
+from app.crud.sse.screener_query import ScreenerQueryError, parse_screener_fields, parse_screener_filter
+from app.crud.sse._watcher import watcher
+from app.schemas.sse import BatchPart, BatchRequest
+from app.utils.fast_json import JSON_MEDIA_TYPE, append_fields, clean_nan_values, default_serializer, dumps_json, loads_json, splice_envelope
+from app.utils.http_cache import cache_control_for, etag_matches, make_etag, payload_digest, surrogate_key_for
 from app.utils.response_wrapper import StandardApiResponse
+from app.utils.sse_delta import build_delta_frame, build_snapshot_frame, compute_row_delta
+from app.utils.sse_encoding import SSE_ENCODINGS, encode_frame, validate_encoding
+from app.utils.wire_format import MSGPACK_MEDIA_TYPE, append_map_fields, encode_msgpack, msgpack_available, to_columnar
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Cấu hình
-SSE_POLL_INTERVAL = 3.0          # giây giữa các lần poll DB
-SSE_SUBSCRIBER_QUEUE_SIZE = 8    # buffer cho mỗi subscriber, slow consumer sẽ bị drop
+SSE_POLL_INTERVAL = 3.0          # giây giữa các lần poll DB (SSE_POLL_SCHEDULE=fixed)
 SSE_CLIENT_TIMEOUT = 10.0        # giây giữa các lần check disconnect
 SSE_ERROR_BACKOFF = 5.0          # giây nghỉ khi query lỗi
+# Push mode: giữa 2 lần query ít nhất MIN_INTERVAL (chặn collection đổi liên tục kéo poller chạy
+# dồn dập); watcher im lặng quá MAX_STALENESS vẫn poll lại phòng probe bỏ sót thay đổi.
+SSE_PUSH_MIN_INTERVAL = 1.0
+SSE_PUSH_MAX_STALENESS = 60.0
 
 # --- Hardening: chống bùng nổ tải (DoS) ---
 # SSE để public (dữ liệu thị trường ai cũng xem) nhưng phải chịu tải an toàn.
@@ -42,38 +95,25 @@ MAX_POLLERS = 200                # trần tổng số poller đồng thời (m
 MAX_SUBSCRIBERS_PER_ENTRY = 1000 # trần subscriber cho 1 ticker "nóng" → bound RAM
 MAX_TICKER_LENGTH = 64           # độ dài tối đa của tham số ticker (kể cả comma list)
 MAX_TICKER_TOKENS = 30           # số mã tối đa trong 1 comma-separated ticker
+MAX_MULTIPLEX_CHANNELS = 20      # số channel tối đa trên 1 kết nối /multiplex
+SSE_REPLAY_FRAMES = 32           # số delta frame gần nhất giữ lại / entry để replay khi client reconnect
+SSE_BATCH_CONCURRENCY = 6        # số phần của 1 /batch chạy song song (trần số phần: MAX_BATCH_PARTS)
 # Ticker hợp lệ = chữ + số (mã CK/chỉ số/ngành VN), độ dài mỗi mã tối đa 20.
 _TICKER_TOKEN_RE = re.compile(r"^[A-Za-z0-9]{1,20}$")
+# Keyword hỗ trợ `format=columnar` + `fields=` trên /rest (utils/wire_format.py) — KeywordSpec.columnar.
+COLUMNAR_KEYWORDS = frozenset(name for name, spec in KEYWORD_SPECS.items() if spec.columnar)
+CURSOR_KEYWORDS = frozenset({"chart_history_data", *(name for name, spec in KEYWORD_SPECS.items() if spec.cursor_key)})
+REST_SUCCESS_MESSAGE = "Truy vấn dữ liệu thành công"
+# Frame lỗi luôn bắt đầu bằng tiền tố này — frame relay từ leader không được nhớ làm last_frame.
+_ERROR_FRAME_PREFIX = 'data: {"error"'
+# Frame báo dữ liệu cũ (named event → EventSource.onmessage của client cũ bỏ qua).
+_STALE_FRAME_PREFIX = "event: stale\n"
 
 
 # --- Helper để chuyển đổi BSON sang JSON ---
-def clean_nan_values(obj: Any) -> Any:
-    """Đệ quy thay thế các giá trị nan/inf bằng None."""
-    if isinstance(obj, dict):
-        return {k: clean_nan_values(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [clean_nan_values(item) for item in obj]
-    elif isinstance(obj, float):
-        if math.isnan(obj) or math.isinf(obj):
-            return None
-        return obj
-    return obj
-
-
 def bson_to_json_str(data: Any) -> str:
-    """Chuyển đổi dữ liệu BSON thành JSON string, xử lý nan/inf."""
-
-    def default_serializer(o):
-        if isinstance(o, (ObjectId, datetime)):
-            return str(o)
-        try:
-            return str(o)
-        except Exception:
-            raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
-
-    # Clean nan/inf values trước khi serialize
-    cleaned_data = clean_nan_values(data)
-    return json.dumps(cleaned_data, default=default_serializer)
+    """Chuyển đổi dữ liệu BSON thành JSON string, xử lý nan/inf (utils/fast_json.py)."""
+    return dumps_json(data).decode("utf-8")
 
 
 # ==============================================================================
@@ -81,12 +121,125 @@ def bson_to_json_str(data: Any) -> str:
 # ==============================================================================
 
 
+@dataclass(eq=False)
+class _Frame:
+    """1 lần đổi dữ liệu của 1 cache entry — mọi subscriber nhận chung 1 object, tự chọn cách render."""
+
+    payload: str                   # "data: <json>\n\n" đầy đủ (giao thức cũ)
+    version: int = 0               # tăng dần theo entry; 0 = frame lỗi, không thuộc chuỗi version
+    delta: Optional[str] = None    # delta frame so với version - 1 (None → subscriber delta nhận snapshot)
+    event_id: Optional[str] = None # "<epoch>-<version>" gửi kèm `id:` (None với frame lỗi)
+    stale_age: Optional[float] = None  # frame báo dữ liệu cũ (Mongo lỗi): tuổi của last_frame, giây
+    # (kind, encoding) → chuỗi đã nén; tính lần đầu có subscriber cần rồi dùng chung cho mọi subscriber.
+    encoded: Dict[Tuple[str, str], str] = field(default_factory=dict, repr=False)
+
+    def snapshot(self, resync: bool = False) -> str:
+        return build_snapshot_frame(self.payload, self.version, resync=resync)
+
+    def render(self, kind: str, encoding: Optional[str] = None) -> str:
+        """kind: payload | delta | snapshot | resync. encoding None → chuỗi gốc."""
+        global _encoded_frames
+        if kind == "payload":
+            text = self.payload
+        elif kind == "delta":
+            text = self.delta
+        else:
+            text = None
+        if encoding is None:
+            return text if text is not None else self.snapshot(resync=kind == "resync")
+        cached = self.encoded.get((kind, encoding))
+        if cached is None:
+            if text is None:
+                text = self.snapshot(resync=kind == "resync")
+            cached = self.encoded[(kind, encoding)] = encode_frame(text, encoding)
+            _encoded_frames += 1
+        return cached
+
+
 @dataclass
 class _CacheEntry:
-    last_payload: Optional[str] = None   # "data: ...\n\n" cuối cùng (dùng cho subscriber mới)
-    last_hash: Optional[int] = None
-    subscribers: Set[asyncio.Queue] = field(default_factory=set)
+    last_frame: Optional[_Frame] = None  # frame cuối cùng (dùng cho subscriber mới)
+    last_hash: Optional[str] = None
+    subscribers: Set[Any] = field(default_factory=set)  # _Mailbox / _ChannelSink
     task: Optional[asyncio.Task] = None
+    version: int = 0
+    # Subscriber opt-in delta (tập con của subscribers). Rỗng → poller bỏ qua việc tính delta.
+    delta_subscribers: Set[Any] = field(default_factory=set)
+    # Định danh vòng đời entry: entry bị xoá rồi tạo lại đếm version từ đầu → event id cũ không
+    # được nhầm là vị trí trong chuỗi mới.
+    epoch: str = field(default_factory=lambda: secrets.token_hex(4))
+    # Frame có delta liên tiếp, kết thúc ở version hiện tại — rỗng khi chuỗi delta bị đứt. Giữ _Frame
+    # (không giữ chuỗi đã render) để backlog render theo encoding của subscriber như frame live.
+    replay: Deque[_Frame] = field(default_factory=lambda: deque(maxlen=SSE_REPLAY_FRAMES))
+    fresh_at: float = 0.0  # monotonic của lần query thành công gần nhất (kể cả không đổi dữ liệu)
+    last_data: Any = None  # payload đã clean của frame cuối, chỉ giữ khi có delta subscriber
+
+
+# Tổng số frame bị thay bằng frame mới hơn trước khi kịp gửi (client chậm hơn nhịp dữ liệu).
+_conflated_frames = 0
+# Số lần nén frame (?encoding=) — tăng theo số thay đổi, không theo số subscriber.
+_encoded_frames = 0
+# Channel của mailbox /stream (không multiplex) — tên channel thật không bao giờ rỗng.
+_SINGLE_CHANNEL = ""
+
+
+class _Mailbox:
+    """
+    Hộp thư conflate của 1 kết nối SSE: mỗi channel chỉ giữ tham chiếu tới frame MỚI NHẤT chưa gửi.
+
+    Client chậm không bao giờ mất trạng thái mới nhất (frame cũ bị thay thế, không phải frame mới
+    bị drop như queue đầy trước đây), RAM O(số channel) / kết nối — frame là object dùng chung.
+    Subscriber delta nhảy version vì conflate tự nhận snapshot resync (_render_delta).
+    Frame không có version (lỗi, báo stale) nằm ô riêng của channel → không đè mất frame dữ liệu đang chờ.
+    Kết nối /stream (1 entry) dùng channel _SINGLE_CHANNEL; /multiplex dùng tên channel (_ChannelSink).
+    """
+
+    __slots__ = ("_slots", "_ready", "conflated", "resume_version", "backlog")
+
+    def __init__(self) -> None:
+        # (channel, là frame đánh dấu?) → frame chờ gửi, theo thứ tự ô có hàng
+        self._slots: Dict[Tuple[str, bool], _Frame] = {}
+        self._ready = asyncio.Event()
+        self.conflated = 0
+        # Resume Last-Event-ID (/stream): version client đang giữ + các frame replay gửi trước tiên.
+        self.resume_version = 0
+        self.backlog: List[_Frame] = []
+
+    def put(self, channel: str, frame: _Frame) -> None:
+        global _conflated_frames
+        slot = (channel, frame.version == 0)
+        if slot in self._slots:
+            self.conflated += 1
+            _conflated_frames += 1
+        self._slots[slot] = frame
+        self._ready.set()
+
+    def put_nowait(self, frame: _Frame) -> None:
+        self.put(_SINGLE_CHANNEL, frame)
+
+    async def get_item(self) -> Tuple[str, _Frame]:
+        """(channel, frame) chờ gửi lâu nhất. Huỷ giữa chừng không làm mất frame."""
+        while not self._slots:
+            self._ready.clear()
+            await self._ready.wait()
+        slot = next(iter(self._slots))
+        return slot[0], self._slots.pop(slot)
+
+    async def get(self) -> _Frame:
+        return (await self.get_item())[1]
+
+
+class _ChannelSink:
+    """Subscriber của 1 channel trong kết nối multiplex: ghi frame vào ô của channel trong mailbox chung."""
+
+    __slots__ = ("channel", "mailbox")
+
+    def __init__(self, channel: str, mailbox: _Mailbox) -> None:
+        self.channel = channel
+        self.mailbox = mailbox
+
+    def put_nowait(self, frame: _Frame) -> None:
+        self.mailbox.put(self.channel, frame)
 
 
 _cache: Dict[str, _CacheEntry] = {}
@@ -116,56 +269,180 @@ def _validate_ticker(ticker: Optional[str]) -> None:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ticker không hợp lệ")
 
 
+def _event_id(entry: _CacheEntry, version: int) -> str:
+    return f"{entry.epoch}-{version}"
+
+
+def _resume_version(entry: _CacheEntry, last_event_id: Optional[str]) -> int:
+    """Version client đang giữ theo Last-Event-ID; 0 nếu không thuộc chuỗi hiện tại của entry."""
+    epoch, _, version = (last_event_id or "").strip().partition("-")
+    if epoch != entry.epoch or not version.isdigit():
+        return 0
+    seen = int(version)
+    return seen if 0 < seen <= entry.version else 0
+
+
+def _apply_resume(entry: _CacheEntry, mailbox: _Mailbox, last_event_id: Optional[str], delta: bool) -> bool:
+    """
+    Chuẩn bị mailbox cho client reconnect. True → đã xử lý (không cần đẩy last_frame):
+    client đã có version mới nhất, hoặc (delta) toàn bộ phần thiếu còn trong ring buffer.
+    """
+    seen = _resume_version(entry, last_event_id)
+    if not seen:
+        return False
+    mailbox.resume_version = seen
+    if seen == entry.version:
+        return True
+    missed = [frame for frame in entry.replay if frame.version > seen]
+    if delta and len(missed) == entry.version - seen:
+        mailbox.backlog = missed
+        mailbox.resume_version = entry.version
+        return True
+    # Subscriber thường: payload mới nhất thay thế mọi frame đã lỡ. Delta thiếu quá nhiều →
+    # last_frame nhảy version → _render_delta gửi snapshot resync.
+    return False
+
+
+def _broadcast(entry: _CacheEntry, frame: _Frame) -> None:
+    """Đẩy 1 frame tới mọi subscriber, non-blocking — subscriber chậm chỉ giữ frame mới nhất (_Mailbox)."""
+    for q in list(entry.subscribers):
+        q.put_nowait(frame)
+
+
+def _publish(entry: _CacheEntry, keyword: str, payload: str, data: Any) -> None:
+    """Tạo frame version mới cho entry (kèm delta nếu có subscriber cần) rồi broadcast."""
+    entry.version += 1
+    delta_frame = None
+    key_fields = get_keyword_spec(keyword).delta_keys
+    if entry.delta_subscribers and key_fields and entry.last_data is not None:
+        delta = compute_row_delta(entry.last_data, data, key_fields)
+        if delta is not None:
+            delta_frame = build_delta_frame(delta, entry.version, default=default_serializer)
+    entry.last_data = data if entry.delta_subscribers else None
+    entry.last_frame = _Frame(payload=payload, version=entry.version, delta=delta_frame, event_id=_event_id(entry, entry.version))
+    if delta_frame is not None:
+        entry.replay.append(entry.last_frame)
+    else:
+        entry.replay.clear()  # chuỗi delta đứt → client cũ hơn version này chỉ resync bằng snapshot
+    _broadcast(entry, entry.last_frame)
+
+
+def _stale_frame(age: float) -> _Frame:
+    return _Frame(payload=f"{_STALE_FRAME_PREFIX}data: {json.dumps(stale_marker(age))}\n\n", stale_age=age)
+
+
+def _render_stale(frame: _Frame, channel: Optional[str] = None) -> str:
+    if channel is None or frame.stale_age is None:
+        return frame.payload
+    return f"{_STALE_FRAME_PREFIX}data: {json.dumps(stale_marker(frame.stale_age, channel))}\n\n"
+
+
+def _serve_stale(entry: _CacheEntry) -> bool:
+    """Query lỗi: còn dữ liệu đúng gần đây → báo stale thay vì frame lỗi (client giữ nguyên giá đang hiển thị)."""
+    if entry.last_frame is None or not entry.last_frame.version or not entry.fresh_at:
+        return False
+    age = time.monotonic() - entry.fresh_at
+    if age > SSE_STALE_MAX_AGE:
+        return False
+    _broadcast(entry, _stale_frame(age))
+    return True
+
+
+def _publish_relayed(entry: Optional[_CacheEntry], keyword: str, payload: str) -> None:
+    """Frame nhận từ leader (fan-out): đã dedupe ở leader nên publish thẳng, không hash lại."""
+    if entry is None:
+        return  # subscriber cuối đã rời, entry bị dọn trước khi relay kịp dừng → bỏ frame
+    if payload.startswith(_ERROR_FRAME_PREFIX):
+        _broadcast(entry, _Frame(payload=payload))
+        return
+    if payload.startswith(_STALE_FRAME_PREFIX):
+        _broadcast(entry, _stale_frame(json.loads(payload[len(_STALE_FRAME_PREFIX) + len("data: ") : -2])["age"]))
+        return
+    # Chỉ parse lại JSON khi có subscriber delta cần diff.
+    data = json.loads(payload[len("data: ") : -2]) if entry.delta_subscribers else None
+    _publish(entry, keyword, payload, data)
+
+
+def _poll_delay(keyword: str) -> float:
+    if SSE_POLL_SCHEDULE != "adaptive":
+        return SSE_POLL_INTERVAL
+    return next_poll_delay(get_refresh_class(keyword))
+
+
+async def _wait_next_poll(keyword: str, sources: tuple[str, ...], seen: tuple[int, ...]) -> None:
+    """Chờ tới vòng poll kế: theo lịch của keyword, hoặc (push mode) tới khi collection nguồn đổi."""
+    delay = _poll_delay(keyword)
+    if not sources:
+        await asyncio.sleep(delay)
+        return
+    # Push mode vẫn thức ngay khi nguồn đổi; lịch chỉ nới trần staleness cho keyword ít đổi.
+    await asyncio.sleep(SSE_PUSH_MIN_INTERVAL)
+    await watcher.wait_for_change(sources, seen, timeout=max(SSE_PUSH_MAX_STALENESS, delay))
+
+
 async def _poller(cache_key: str, keyword: str, ticker: Optional[str]):
     """Background task: poll DB và broadcast tới mọi subscriber của 1 cache entry."""
     logger.info(f"SSE poller started: {cache_key}")
+    sources = get_keyword_sources(keyword) if watcher.enabled else ()
+    watching = False
     try:
         while True:
             entry = _cache.get(cache_key)
             if entry is None or not entry.subscribers:
                 break
 
+            # Fan-out cấp host: worker follower nhận frame từ leader thay vì tự poll Mongo.
+            # relay() chỉ trả về khi mất leader → quay lại đầu vòng để bầu lại.
+            if await fanout.should_relay():
+                if await fanout.relay(keyword, ticker, lambda payload: _publish_relayed(_cache.get(cache_key), keyword, payload)):
+                    continue
+                # Chưa kết nối được leader (đang bầu lại / bị từ chối) → tự poll 1 vòng.
+
+            # Chỉ đăng ký watcher khi thật sự tự query (follower relay không cần probe).
+            if sources and not watching:
+                watcher.watch(sources)
+                watching = True
+            # Lấy version TRƯỚC khi query → thay đổi xảy ra trong lúc query vẫn được bắt.
+            seen = watcher.versions(sources)
+
             try:
-                data = await execute_sse_query(keyword, ticker)
-                payload_str = bson_to_json_str(data)
-                payload_hash = hash(payload_str)
+                async with query_governor.slot(LANE_REALTIME):
+                    result = await execute_sse_query(keyword, ticker)
+                payload = dumps_json(result)
+                payload_hash = payload_digest(payload)
 
                 if payload_hash != entry.last_hash:
                     entry.last_hash = payload_hash
-                    entry.last_payload = f"data: {payload_str}\n\n"
-                    # Broadcast non-blocking — slow subscriber sẽ bị drop frame
-                    for q in list(entry.subscribers):
-                        try:
-                            q.put_nowait(entry.last_payload)
-                        except asyncio.QueueFull:
-                            logger.debug(f"Subscriber queue full, dropping frame: {cache_key}")
+                    # Bản Python đã làm sạch NaN chỉ cần cho delta — không có subscriber delta thì bỏ qua.
+                    data = clean_nan_values(result) if entry.delta_subscribers else None
+                    _publish(entry, keyword, f"data: {payload.decode('utf-8')}\n\n", data)
+                entry.fresh_at = time.monotonic()
             except ValueError as ve:
                 # Invalid keyword — phát error 1 lần và terminate poller
-                err_payload = f"data: {json.dumps({'error': str(ve), 'type': 'invalid_keyword'})}\n\n"
-                for q in list(entry.subscribers):
-                    try:
-                        q.put_nowait(err_payload)
-                    except asyncio.QueueFull:
-                        pass
+                _broadcast(entry, _Frame(payload=f"data: {json.dumps({'error': str(ve), 'type': 'invalid_keyword'})}\n\n"))
                 logger.warning(f"SSE poller stopping due to invalid keyword: {ve}")
                 break
             except Exception as e:
-                logger.error(f"SSE poller query error ({cache_key}): {e}", exc_info=True)
+                if is_infrastructure_error(e) or isinstance(e, (QueryShedError, CircuitOpenError)):
+                    # Mongo chậm/lỗi, breaker mở hoặc governor cắt: giữ giá cuối cùng kèm `event: stale`.
+                    logger.warning(f"SSE poller query failed ({cache_key}): {e}")
+                    served_stale = _serve_stale(entry)
+                else:
+                    logger.error(f"SSE poller query error ({cache_key}): {e}", exc_info=True)
+                    served_stale = False
                 # KHÔNG lộ chi tiết exception ra client — chỉ log nội bộ.
-                err_payload = f"data: {json.dumps({'error': 'Database query failed', 'type': 'query_error'})}\n\n"
-                for q in list(entry.subscribers):
-                    try:
-                        q.put_nowait(err_payload)
-                    except asyncio.QueueFull:
-                        pass
+                if not served_stale:
+                    _broadcast(entry, _Frame(payload=f"data: {json.dumps({'error': 'Database query failed', 'type': 'query_error'})}\n\n"))
                 await asyncio.sleep(SSE_ERROR_BACKOFF)
                 continue
 
-            await asyncio.sleep(SSE_POLL_INTERVAL)
+            await _wait_next_poll(keyword, sources, seen)
     except asyncio.CancelledError:
         logger.info(f"SSE poller cancelled: {cache_key}")
         raise
     finally:
+        if watching:
+            watcher.unwatch(sources)
         # Cleanup cache entry nếu không còn subscriber
         async with _cache_lock:
             entry = _cache.get(cache_key)
@@ -174,10 +451,17 @@ async def _poller(cache_key: str, keyword: str, ticker: Optional[str]):
         logger.info(f"SSE poller stopped: {cache_key}")
 
 
-async def _subscribe(keyword: str, ticker: Optional[str]) -> tuple[str, asyncio.Queue]:
-    """Đăng ký subscriber mới. Trả về (cache_key, queue)."""
+async def _subscribe(
+    keyword: str, ticker: Optional[str], delta: bool = False, queue: Any = None, last_event_id: Optional[str] = None
+) -> tuple[str, Any]:
+    """
+    Đăng ký subscriber mới. Trả về (cache_key, queue). delta=True: subscriber nhận delta frame.
+    queue: đích nhận frame có sẵn (VD: _ChannelSink của /multiplex); None → tạo _Mailbox riêng.
+    last_event_id: resume kết nối /stream (chỉ áp dụng cho _Mailbox tạo tại đây).
+    """
     key = _cache_key(keyword, ticker)
-    queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_SUBSCRIBER_QUEUE_SIZE)
+    if queue is None:
+        queue = _Mailbox()
 
     async with _cache_lock:
         entry = _cache.get(key)
@@ -201,13 +485,14 @@ async def _subscribe(keyword: str, ticker: Optional[str]) -> tuple[str, asyncio.
             )
 
         entry.subscribers.add(queue)
+        if delta:
+            entry.delta_subscribers.add(queue)
 
-        # Đẩy ngay payload cache cuối (nếu có) → subscriber mới không phải chờ 3s
-        if entry.last_payload is not None:
-            try:
-                queue.put_nowait(entry.last_payload)
-            except asyncio.QueueFull:
-                pass
+        # Đẩy ngay frame cache cuối (nếu có) → subscriber mới không phải chờ 3s
+        if entry.last_frame is not None:
+            resumed = last_event_id is not None and isinstance(queue, _Mailbox) and _apply_resume(entry, queue, last_event_id, delta)
+            if not resumed:
+                queue.put_nowait(entry.last_frame)
 
         # Start poller nếu chưa chạy
         if entry.task is None or entry.task.done():
@@ -216,13 +501,14 @@ async def _subscribe(keyword: str, ticker: Optional[str]) -> tuple[str, asyncio.
     return key, queue
 
 
-async def _unsubscribe(cache_key: str, queue: asyncio.Queue):
+async def _unsubscribe(cache_key: str, queue: Any):
     """Huỷ subscriber. Nếu không còn subscriber nào, cancel poller + dọn entry."""
     async with _cache_lock:
         entry = _cache.get(cache_key)
         if entry is None:
             return
         entry.subscribers.discard(queue)
+        entry.delta_subscribers.discard(queue)
         if not entry.subscribers:
             if entry.task and not entry.task.done():
                 entry.task.cancel()
@@ -231,24 +517,63 @@ async def _unsubscribe(cache_key: str, queue: asyncio.Queue):
             _cache.pop(cache_key, None)
 
 
+async def _fanout_subscribe(keyword: str, ticker: Optional[str]) -> tuple[str, _Mailbox]:
+    """Subscribe thay mặt 1 worker follower (core/sse_fanout.py) — validate y như endpoint."""
+    if keyword not in get_available_keywords():
+        raise ValueError(f"Invalid keyword '{keyword}'")
+    _validate_ticker(ticker)
+    return await _subscribe(keyword, ticker)
+
+
+fanout.bind(_fanout_subscribe, _unsubscribe)
+
+
 # --- SSE Event Generator (per-client) ---
-async def sse_event_generator(request: Request, cache_key: str, queue: asyncio.Queue):
+def _render_delta(frame: _Frame, last_version: int, encoding: Optional[str] = None) -> tuple[Optional[str], int]:
+    """Render frame cho subscriber delta. Trả (chuỗi cần gửi hoặc None, version client đang giữ)."""
+    if frame.version == 0:
+        return frame.render("payload", encoding), last_version  # frame lỗi — gửi nguyên
+    if frame.version <= last_version:
+        return None, last_version  # frame cũ hơn version client đang giữ
+    if last_version and frame.delta is not None and frame.version == last_version + 1:
+        return frame.render("delta", encoding), frame.version
+    # Lần đầu, hoặc tụt nhịp (mailbox conflate frame) / không diff được → snapshot.
+    return frame.render("resync" if last_version else "snapshot", encoding), frame.version
+
+
+async def sse_event_generator(
+    request: Request, cache_key: str, queue: _Mailbox, delta: bool = False, encoding: Optional[str] = None
+):
     """
-    Per-client generator: yield payload từ queue đã subscribe sẵn.
+    Per-client generator: yield payload từ mailbox đã subscribe sẵn.
     Subscribe (kèm validate + cap) được thực hiện ở endpoint TRƯỚC khi stream mở,
     để lỗi 400/503 trở thành HTTP response thật thay vì lỗi giữa dòng stream.
     DB không được poll trực tiếp ở đây — poller chung lo phần đó.
     """
     logger.info(f"SSE client subscribed: {cache_key}")
+    last_version = queue.resume_version
 
     try:
+        # Resume: delta client lỡ nhịp nhận lại đúng các frame còn thiếu trước frame mới,
+        # render cùng encoding với frame live.
+        for frame in queue.backlog:
+            yield f"id: {frame.event_id}\n{frame.render('delta', encoding)}"
+        queue.backlog = []
         while True:
             if await request.is_disconnected():
                 logger.info(f"SSE client disconnected: {cache_key}")
                 break
             try:
-                payload = await asyncio.wait_for(queue.get(), timeout=SSE_CLIENT_TIMEOUT)
-                yield payload
+                frame = await asyncio.wait_for(queue.get(), timeout=SSE_CLIENT_TIMEOUT)
+                if frame.stale_age is not None:
+                    yield _render_stale(frame)
+                    continue
+                if not delta:
+                    out = frame.render("payload", encoding)
+                else:
+                    out, last_version = _render_delta(frame, last_version, encoding)
+                if out is not None:
+                    yield f"id: {frame.event_id}\n{out}" if frame.event_id else out
             except asyncio.TimeoutError:
                 # Heartbeat — giữ connection alive khi không có dữ liệu mới
                 yield ": heartbeat\n\n"
@@ -266,6 +591,65 @@ async def sse_event_generator(request: Request, cache_key: str, queue: asyncio.Q
         logger.info(f"SSE client closed: {cache_key}")
 
 
+async def sse_multiplex_generator(
+    request: Request,
+    subs: list[tuple[str, _ChannelSink]],
+    queue: _Mailbox,
+    delta: bool = False,
+    encoding: Optional[str] = None,
+):
+    """Per-client generator của /multiplex: 1 mailbox chung (1 ô / channel), frame gắn `event: <channel>`."""
+    logger.info(f"SSE multiplex client subscribed: {len(subs)} channels")
+    last_versions: Dict[str, int] = {}
+
+    try:
+        while True:
+            if await request.is_disconnected():
+                logger.info("SSE multiplex client disconnected")
+                break
+            try:
+                channel, frame = await asyncio.wait_for(queue.get_item(), timeout=SSE_CLIENT_TIMEOUT)
+                if frame.stale_age is not None:
+                    yield _render_stale(frame, channel)
+                    continue
+                if not delta:
+                    yield f"event: {channel}\n{frame.render('payload', encoding)}"
+                    continue
+                out, last_versions[channel] = _render_delta(frame, last_versions.get(channel, 0), encoding)
+                if out is not None:
+                    yield f"event: {channel}\n{out}"
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+    except asyncio.CancelledError:
+        logger.info("SSE multiplex client cancelled")
+    except Exception as e:
+        logger.error(f"SSE multiplex client error: {e}", exc_info=True)
+        try:
+            yield f"data: {json.dumps({'error': 'Stream error', 'type': 'stream_error'})}\n\n"
+        except Exception:
+            pass
+    finally:
+        for cache_key, sink in subs:
+            await _unsubscribe(cache_key, sink)
+        logger.info("SSE multiplex client closed")
+
+
+def _parse_encoding(encoding: Optional[str]) -> Optional[str]:
+    try:
+        return validate_encoding(encoding)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def _parse_channel(spec: str) -> tuple[str, Optional[str]]:
+    """Channel "keyword" hoặc "keyword:ticker" → (keyword, ticker). Sai → 400 (không tạo poller)."""
+    keyword, _, ticker = spec.partition(":")
+    if keyword not in get_available_keywords():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid keyword '{keyword}'")
+    _validate_ticker(ticker or None)
+    return keyword, ticker or None
+
+
 # ==============================================================================
 # API ENDPOINTS
 # ==============================================================================
@@ -281,6 +665,9 @@ async def sse_stream_endpoint(
     request: Request,
     keyword: str = Query(..., description="Từ khóa xác định loại dữ liệu cần lấy"),
     ticker: Optional[str] = Query(None, description="Mã ticker (VD: VNINDEX, VN30, ...)"),
+    delta: bool = Query(False, description="Bật giao thức delta: snapshot có version rồi chỉ gửi các dòng đổi"),
+    last_event_id: Annotated[Optional[str], Header(description="Event id cuối client đã nhận (EventSource tự gửi khi reconnect)")] = None,
+    encoding: Annotated[Optional[str], Query(description=f"Nén frame lớn: {', '.join(SSE_ENCODINGS)}")] = None,
 ):
     """Endpoint SSE chính - sử dụng keyword để xác định loại dữ liệu."""
     available_keywords = get_available_keywords()
@@ -291,15 +678,67 @@ async def sse_stream_endpoint(
 
     # Validate ticker FORMAT trước → ticker sai KHÔNG tạo poller (trả 400).
     _validate_ticker(ticker)
+    encoding = _parse_encoding(encoding)
 
     logger.info(f"Client connecting to SSE stream - keyword: {keyword}, ticker: {ticker}")
 
     # Subscribe TRƯỚC khi mở stream: cap poller/subscriber sẽ trả 503 như HTTP response
     # thật (thay vì lỗi giữa dòng stream nếu subscribe nằm trong generator).
-    cache_key, queue = await _subscribe(keyword, ticker)
+    cache_key, queue = await _subscribe(keyword, ticker, delta=delta, last_event_id=last_event_id)
 
     return StreamingResponse(
-        sse_event_generator(request, cache_key, queue),
+        sse_event_generator(request, cache_key, queue, delta=delta, encoding=encoding),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.get(
+    "/multiplex",
+    summary="SSE Multiplex - Nhiều channel trên 1 kết nối",
+    description=(
+        "Mở 1 kết nối SSE nhận dữ liệu của nhiều channel. Mỗi `ch` là `keyword` hoặc `keyword:ticker`; "
+        "frame của channel nào gửi kèm `event: <ch>` (client dùng addEventListener theo channel). "
+        "Đổi tập channel = mở lại kết nối với danh sách mới."
+    ),
+    tags=["sse"],
+)
+async def sse_multiplex_endpoint(
+    request: Request,
+    ch: list[str] = Query(..., description="Channel: keyword hoặc keyword:ticker (lặp lại param cho nhiều channel)"),
+    delta: bool = Query(False, description="Bật giao thức delta cho mọi channel"),
+    encoding: Annotated[Optional[str], Query(description=f"Nén frame lớn: {', '.join(SSE_ENCODINGS)}")] = None,
+):
+    """Endpoint SSE gộp nhiều (keyword, ticker) — giảm số kết nối/slot trình duyệt mỗi trang."""
+    channels = list(dict.fromkeys(c.strip() for c in ch if c.strip()))  # bỏ trùng, giữ thứ tự
+    if not channels or len(channels) > MAX_MULTIPLEX_CHANNELS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cần 1–{MAX_MULTIPLEX_CHANNELS} channel",
+        )
+    # Validate TOÀN BỘ trước khi subscribe → channel sai không để lại poller mồ côi.
+    parsed = [(c, *_parse_channel(c)) for c in channels]
+    encoding = _parse_encoding(encoding)
+
+    queue = _Mailbox()
+    subs: list[tuple[str, _ChannelSink]] = []
+    try:
+        for channel, keyword, ticker in parsed:
+            sink = _ChannelSink(channel, queue)
+            cache_key, _ = await _subscribe(keyword, ticker, delta=delta, queue=sink)
+            subs.append((cache_key, sink))
+    except BaseException:
+        # Chạm cap giữa chừng → trả các channel đã đăng ký rồi mới báo 503.
+        for cache_key, sink in subs:
+            await _unsubscribe(cache_key, sink)
+        raise
+
+    logger.info(f"Client connecting to SSE multiplex - channels: {channels}")
+    return StreamingResponse(
+        sse_multiplex_generator(request, subs, queue, delta=delta, encoding=encoding),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -323,6 +762,51 @@ async def get_keywords():
     )
 
 
+@router.get(
+    "/metrics",
+    summary="Số liệu vận hành SSE/REST của worker hiện tại (admin)",
+    tags=["sse"],
+    dependencies=[Depends(require_permission("permission", "manage"))],
+)
+async def get_sse_metrics():
+    """Metrics in-process của worker nhận request (mỗi uvicorn worker có bộ đếm riêng)."""
+    response_data = {
+        "pollers": len(_cache),
+        "subscribers": sum(len(e.subscribers) for e in _cache.values()),
+        "conflated_frames": _conflated_frames,
+        "encoded_frames": _encoded_frames,
+        "rest_cache": rest_cache.stats(),
+        "snapshots": snapshots.stats(),
+        "governor": query_governor.stats(),
+        "breaker": mongo_breaker.stats(),
+        "search_indexes": {name: m.stats() for name, m in search_indexes.items()},
+        "feed_counts": feed_counts.stats(),
+        "news_count": news_counter.stats(),
+        "article_cache": article_cache.stats(),
+    }
+    return JSONResponse(content=StandardApiResponse(status=200, message="Lấy metrics SSE thành công", data=response_data).model_dump())
+
+
+@router.post(
+    "/indexes/advise",
+    summary="Explain query đại diện của từng keyword, báo COLLSCAN / sort trong RAM + index đề xuất (admin)",
+    tags=["sse"],
+    dependencies=[Depends(require_permission("permission", "manage"))],
+)
+async def advise_sse_indexes(
+    create: Annotated[bool, Query(description="Tạo luôn các index đề xuất còn thiếu")] = False,
+    keyword: Annotated[Optional[List[str]], Query(description="Chỉ chạy cho các keyword này (mặc định tất cả)")] = None,
+):
+    """Index advisor (crud/sse/_index_advisor.py) — chạy explain trên Mongo thật, vài giây với đủ keyword."""
+    try:
+        result = await advise_indexes(create=create, keywords=keyword or None)
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve))
+    # Filter mẫu có thể chứa datetime/ObjectId → encode bằng encoder chung thay vì json.dumps.
+    body = splice_envelope(dumps_json(result), status=200, message="Phân tích index thành công")
+    return Response(content=body, media_type=JSON_MEDIA_TYPE)
+
+
 @router.get(
     "/rest/{keyword}",
     summary="REST Query - Lấy dữ liệu một lần (không stream)",
@@ -343,19 +827,95 @@ async def rest_query_endpoint(
     page: Optional[int] = Query(None, ge=1, description="Số trang (bắt đầu từ 1)"),
     limit: Optional[int] = Query(None, ge=1, le=5000, description="Số lượng bản ghi (tối đa 5000)"),
     skip: Optional[int] = Query(None, ge=0, description="Số bản ghi bỏ qua từ cuối (dùng cho lazy load chart)"),
-    sort_by: Optional[str] = Query(None, description="Tên field để sắp xếp"),
-    sort_order: Optional[str] = Query(None, regex="^(asc|desc)$", description="Thứ tự sắp xếp: asc hoặc desc"),
+    sort_by: Annotated[Optional[str], Query(description="Tên field để sắp xếp (theo allowlist của keyword)")] = None,
+    sort_order: Annotated[Optional[str], Query(pattern="^(asc|desc)$", description="Thứ tự sắp xếp: asc hoặc desc")] = None,
     projection: Optional[str] = Query(None, description='MongoDB projection dạng JSON (VD: {"title":1,"sapo":1})'),
     search: Optional[str] = Query(None, description="Từ khóa tìm kiếm text (dùng cho search_news, search_reports)"),
+    fields: Annotated[
+        Optional[str], Query(description="Chỉ lấy các field này, comma-separated (chart_*_data; luôn kèm ticker, date)")
+    ] = None,
+    wire_format: Annotated[
+        Optional[str],
+        Query(alias="format", pattern="^(rows|columnar)$", description="rows (mặc định) hoặc columnar: tên cột 1 lần + mảng giá trị theo cột (chart_*_data)"),
+    ] = None,
+    encoding: Annotated[
+        Optional[str], Query(pattern="^(json|msgpack)$", description="json (mặc định) hoặc msgpack")
+    ] = None,
+    before: Annotated[Optional[str], Query(description="Keyset: các phiên trước ngày YYYY-MM-DD (chart_history_data)")] = None,
+    after: Annotated[Optional[str], Query(description="Keyset: các phiên sau ngày YYYY-MM-DD (chart_history_data)")] = None,
+    cursor: Annotated[Optional[str], Query(description="Keyset: next_cursor của trang trước (chart_history_data, news_daily, news_report)")] = None,
+    screener_filter: Annotated[
+        Optional[str],
+        Query(alias="filter", description='Điều kiện lọc JSON cho screener_query (VD: {"pe":{"gte":5,"lte":15},"exchange":["HOSE"]})'),
+    ] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
     """
     REST endpoint để query dữ liệu một lần.
     Dùng cho các trường hợp cần polling hoặc fetch đơn lẻ thay vì SSE stream.
 
-    Hỗ trợ tất cả các keyword trong SSE_QUERY_REGISTRY.
+    Hỗ trợ tất cả các keyword trong KEYWORD_SPECS (sort_by theo allowlist của từng keyword → sai trả 400).
     Hỗ trợ pagination với page, limit, sort_by, sort_order.
     Hỗ trợ filter nhiều categories với param 'categories' (comma-separated).
+    chart_*_data, screener_query hỗ trợ thêm `fields=` và `format=columnar`; mọi keyword hỗ trợ `encoding=msgpack`.
+    screener_query lọc/sắp xếp today_stock phía server theo `filter=` + sort_by/sort_order/limit.
+    Response có ETag (hash payload, cùng hash poller SSE dùng để dedupe) → If-None-Match khớp trả 304;
+    Cache-Control / Surrogate-Key theo refresh class của keyword cho proxy cache phía trước.
     """
+    return await _rest_query(
+        keyword,
+        ticker=ticker,
+        nntd_type=nntd_type,
+        news_type=news_type,
+        categories=categories,
+        report_type=report_type,
+        article_slug=article_slug,
+        report_slug=report_slug,
+        page=page,
+        limit=limit,
+        skip=skip,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        projection=projection,
+        search=search,
+        fields=fields,
+        wire_format=wire_format,
+        encoding=encoding,
+        before=before,
+        after=after,
+        cursor=cursor,
+        screener_filter=screener_filter,
+        if_none_match=if_none_match,
+    )
+
+
+async def _rest_query(
+    keyword: str,
+    *,
+    ticker: Optional[str] = None,
+    nntd_type: Optional[str] = None,
+    news_type: Optional[str] = None,
+    categories: Optional[str] = None,
+    report_type: Optional[str] = None,
+    article_slug: Optional[str] = None,
+    report_slug: Optional[str] = None,
+    page: Optional[int] = None,
+    limit: Optional[int] = None,
+    skip: Optional[int] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = None,
+    projection: Optional[str] = None,
+    search: Optional[str] = None,
+    fields: Optional[str] = None,
+    wire_format: Optional[str] = None,
+    encoding: Optional[str] = None,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    cursor: Optional[str] = None,
+    screener_filter: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+) -> Response:
+    """Thân của GET /rest/{keyword} — dùng chung cho /batch (mỗi phần 1 lần gọi, cùng cache + single-flight)."""
     # Validate keyword trước
     available_keywords = get_available_keywords()
     if keyword not in available_keywords:
@@ -363,6 +923,34 @@ async def rest_query_endpoint(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid keyword '{keyword}'. Available: {', '.join(available_keywords)}",
         )
+    if (fields or wire_format == "columnar") and keyword not in COLUMNAR_KEYWORDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"fields/format=columnar chỉ hỗ trợ: {', '.join(sorted(COLUMNAR_KEYWORDS))}",
+        )
+    if screener_filter is not None and keyword != "screener_query":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="filter chỉ hỗ trợ screener_query")
+    try:
+        if keyword == "screener_query":
+            parsed_fields = parse_screener_fields(fields)
+            parsed_filter = parse_screener_filter(screener_filter)
+        else:
+            parsed_fields = parse_chart_fields(fields)
+            parsed_filter = None
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve))
+    if (before is not None or after is not None) and keyword != "chart_history_data":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="before/after chỉ hỗ trợ chart_history_data")
+    if cursor is not None and keyword not in CURSOR_KEYWORDS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"cursor chỉ hỗ trợ: {', '.join(sorted(CURSOR_KEYWORDS))}")
+    if keyword == "chart_history_data":
+        # Cursor của feed tin validate trong normalize_query_params (cần sort đã chuẩn hoá).
+        try:
+            parse_history_page(before, after, cursor)
+        except ValueError as ve:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve))
+    if encoding == "msgpack" and not msgpack_available():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="encoding=msgpack chưa được hỗ trợ trên server")
 
     try:
         # Parse projection từ JSON string
@@ -401,19 +989,167 @@ async def rest_query_endpoint(
             "sort_order": sort_order,
             "projection": parsed_projection,
             "search": search,
+            "fields": parsed_fields,
+            "before": before,
+            "after": after,
+            "cursor": cursor,
+            "filters": parsed_filter,
         }
+        try:
+            # Allowlist sort_by / sort mặc định / bỏ projection keyword không nhận — theo KeywordSpec,
+            # trước khi tính cache key để request tương đương dùng chung 1 entry.
+            query_params = normalize_query_params(keyword, query_params)
+        except ValueError as ve:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve))
+        spec = get_keyword_spec(keyword)
 
-        result = await execute_sse_query(keyword, **query_params)
-        # Serialize data với custom encoder để xử lý ObjectId, datetime, nan
-        serialized_data = json.loads(bson_to_json_str(result))
+        async def _load():
+            async with query_governor.slot(LANE_INTERACTIVE):
+                result = await execute_sse_query(keyword, **query_params)
+            if wire_format == "columnar":
+                if isinstance(result, list):
+                    result = to_columnar(result)
+                elif isinstance(result, dict) and isinstance(result.get("data"), list):
+                    result = {**result, "data": to_columnar(result["data"])}  # trang keyset
+            # Encode 1 lần (NaN/ObjectId/datetime xử lý trong encoder) rồi ghép thẳng vào envelope.
+            payload = dumps_json(result)
+            if encoding == "msgpack":
+                envelope = {"status": 200, "message": REST_SUCCESS_MESSAGE, "data": loads_json(payload)}
+                body = encode_msgpack(envelope)
+            else:
+                body = splice_envelope(payload, status=200, message=REST_SUCCESS_MESSAGE)
+            # Bài viết không tìm thấy ({"error": ...}) có thể xuất bản ngay sau → không gắn immutable.
+            immutable = spec.immutable and not (isinstance(result, dict) and result.get("error"))
+            return (body, payload_digest(payload), immutable), len(body)
 
-        return JSONResponse(
-            content=StandardApiResponse(status=200, message="Truy vấn dữ liệu thành công", data=serialized_data).model_dump()
-        )
+        # Cache chung theo toàn bộ tham số query + biểu diễn: request trùng trong TTL / đang chờ
+        # cùng query không chạm Mongo và không serialize lại — cache giữ nguyên body response.
+        refresh_class = spec.refresh_class
+        cache_params = {**query_params, "format": wire_format, "encoding": encoding}
+        cache_key = rest_cache_key(keyword, cache_params)
+        stale_age: Optional[float] = None
+        try:
+            if spec.cacheable:
+                body, digest, immutable = await rest_cache.get_or_load(cache_key, rest_cache_ttl(refresh_class), _load)
+            else:
+                (body, digest, immutable), _ = await _load()
+        except (HTTPException, ValueError):
+            raise
+        except Exception as e:
+            # Mongo lỗi / breaker mở / governor cắt: còn bản đúng gần đây thì trả kèm stale thay vì lỗi.
+            stale = rest_cache.get_stale(cache_key)
+            if stale is None:
+                raise
+            (body, digest, immutable), stale_age = stale
+            logger.warning(f"REST serving stale data (keyword: {keyword}, age: {stale_age:.1f}s): {e}")
+        headers = {
+            "ETag": make_etag(digest, f"{wire_format or 'rows'}.{encoding or 'json'}"),
+            "Cache-Control": cache_control_for(refresh_class, immutable=immutable) if spec.cacheable else "no-store",
+            "Surrogate-Key": surrogate_key_for(keyword, refresh_class, spec.sources),
+        }
+        if stale_age is not None:
+            # Bản stale không được proxy giữ lại như bản mới.
+            headers["Cache-Control"] = "no-store"
+            headers["Age"] = str(int(stale_age))
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        if stale_age is not None:
+            marker = stale_marker(stale_age)
+            body = append_map_fields(body, marker) if encoding == "msgpack" else append_fields(body, marker)
+        media_type = MSGPACK_MEDIA_TYPE if encoding == "msgpack" else JSON_MEDIA_TYPE
+        return Response(content=body, media_type=media_type, headers=headers)
     except HTTPException:
         # Lỗi validate đã có status/detail rõ ràng (VD: projection JSON sai) — giữ nguyên.
         raise
+    except ScreenerQueryError as se:
+        # Cột lọc/sort không tồn tại chỉ biết được khi chạy trên snapshot.
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(se))
+    except (QueryShedError, CircuitOpenError) as qe:
+        logger.warning(f"REST query rejected (keyword: {keyword}): {qe}")
+        retry_after = max(2, int(mongo_breaker.retry_in() + 0.999))
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Hệ thống dữ liệu đang quá tải, vui lòng thử lại sau.",
+            headers={"Retry-After": str(retry_after)},
+        )
     except Exception as e:
         logger.error(f"REST query error (keyword: {keyword}): {e}", exc_info=True)
         # KHÔNG lộ chi tiết exception ra client — chỉ log nội bộ.
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Đã xảy ra lỗi khi truy vấn dữ liệu.")
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _batch_part_kwargs(part: BatchPart) -> Dict[str, Any]:
+    """Tham số của 1 phần → kwargs của _rest_query (projection/filter dạng object được encode lại JSON)."""
+    params = part.params.model_dump(exclude_none=True)
+    for name in ("projection", "filter"):
+        if isinstance(params.get(name), dict):
+            params[name] = json.dumps(params[name])
+    if "format" in params:
+        params["wire_format"] = params.pop("format")
+    if "filter" in params:
+        params["screener_filter"] = params.pop("filter")
+    return params
+
+
+async def _run_batch_part(part: BatchPart, semaphore: asyncio.Semaphore) -> bytes:
+    """Body envelope JSON của 1 phần; lỗi (400/503/...) gói thành envelope lỗi, không làm hỏng phần khác."""
+    async with semaphore:
+        try:
+            response = await _rest_query(part.keyword, **_batch_part_kwargs(part))
+            return bytes(response.body)
+        except HTTPException as he:
+            return dumps_json({"status": he.status_code, "message": he.detail, "data": None})
+
+
+@router.post(
+    "/batch",
+    summary="REST Batch - Nhiều keyword trong 1 request",
+    description=(
+        "Chạy nhiều query (keyword + params như /rest) song song có giới hạn, trả 1 envelope với data "
+        "là object {id: response của phần đó}. `stream=1` (hoặc Accept: application/x-ndjson) trả NDJSON: "
+        "mỗi dòng {\"id\", \"status\", \"message\", \"data\"} gửi ngay khi phần đó xong."
+    ),
+    tags=["sse"],
+)
+async def rest_batch_endpoint(
+    batch: BatchRequest,
+    stream: Annotated[bool, Query(description="Trả NDJSON, mỗi phần 1 dòng theo thứ tự hoàn thành")] = False,
+    accept: Annotated[Optional[str], Header()] = None,
+):
+    """
+    Mỗi phần gọi cùng thân với GET /rest/{keyword} (validate, REST cache, single-flight, governor,
+    stale) — phần trùng với request REST khác dùng chung entry cache. Lỗi của 1 phần (keyword sai,
+    sort_by ngoài allowlist, Mongo quá tải...) chỉ nằm trong phần đó: {"status": 4xx/5xx, "message", "data": null}.
+    Phần luôn là JSON (không hỗ trợ encoding=msgpack trong batch).
+    """
+    semaphore = asyncio.Semaphore(SSE_BATCH_CONCURRENCY)
+
+    if stream or (accept and NDJSON_MEDIA_TYPE in accept):
+
+        async def _tagged(part: BatchPart) -> Tuple[str, bytes]:
+            return part.id, await _run_batch_part(part, semaphore)
+
+        async def _lines():
+            tasks = [asyncio.ensure_future(_tagged(part)) for part in batch.requests]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    part_id, body = await next_done
+                    yield b'{"id":' + dumps_json(part_id) + b"," + body[1:] + b"\n"
+            finally:
+                # Client ngắt giữa chừng → huỷ các phần chưa xong.
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(
+            _lines(),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    bodies = await asyncio.gather(*(_run_batch_part(part, semaphore) for part in batch.requests))
+    data = b"{" + b",".join(dumps_json(part.id) + b":" + body for part, body in zip(batch.requests, bodies)) + b"}"
+    body = splice_envelope(data, status=200, message=REST_SUCCESS_MESSAGE)
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers={"Cache-Control": "no-store"})
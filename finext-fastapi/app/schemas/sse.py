@@ -0,0 +1,62 @@
+# finext-fastapi/app/schemas/sse.py
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+MAX_BATCH_PARTS = 20
+
+
+class BatchPartParams(BaseModel):
+    """Tham số của 1 phần — cùng tên/ràng buộc với query string của GET /sse/rest/{keyword}."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    ticker: Optional[str] = None
+    nntd_type: Optional[str] = None
+    news_type: Optional[str] = None
+    categories: Optional[str] = None
+    report_type: Optional[str] = None
+    article_slug: Optional[str] = None
+    report_slug: Optional[str] = None
+    page: Optional[int] = Field(None, ge=1)
+    limit: Optional[int] = Field(None, ge=1, le=5000)
+    skip: Optional[int] = Field(None, ge=0)
+    sort_by: Optional[str] = None
+    sort_order: Optional[Literal["asc", "desc"]] = None
+    projection: Optional[Union[str, Dict[str, Any]]] = Field(None, description="JSON string hoặc object")
+    search: Optional[str] = None
+    fields: Optional[str] = None
+    format: Optional[Literal["rows", "columnar"]] = None
+    before: Optional[str] = None
+    after: Optional[str] = None
+    cursor: Optional[str] = None
+    filter: Optional[Union[str, Dict[str, Any]]] = Field(None, description="Điều kiện lọc screener_query (JSON string hoặc object)")
+
+
+class BatchPart(BaseModel):
+    id: str = Field(..., min_length=1, max_length=64, description="Khoá của phần này trong response.")
+    keyword: str
+    params: BatchPartParams = Field(default_factory=lambda: BatchPartParams.model_validate({}))
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchPart] = Field(..., min_length=1, max_length=MAX_BATCH_PARTS)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "requests": [
+                    {"id": "daily", "keyword": "phase_daily"},
+                    {"id": "rank", "keyword": "phase_rank"},
+                    {"id": "news", "keyword": "news_daily", "params": {"limit": 10, "news_type": "trong_nuoc"}},
+                ]
+            }
+        }
+    )
+
+    @model_validator(mode="after")
+    def _unique_ids(self) -> "BatchRequest":
+        ids = [part.id for part in self.requests]
+        if len(set(ids)) != len(ids):
+            raise ValueError("id của các phần trong batch phải khác nhau")
+        return self
@@ -0,0 +1,87 @@
+# finext-fastapi/app/utils/fast_json.py
+"""
+Serialize dữ liệu Mongo (BSON) ra JSON bytes trong 1 lượt — dùng chung cho SSE poller và /sse/rest.
+
+Đường cũ: clean_nan_values (đệ quy copy toàn bộ payload) → json.dumps → json.loads →
+StandardApiResponse.model_dump() → JSONResponse dumps lần nữa: ~4 lượt trên payload có thể vài MB
+(screener_stock_data). Đường mới:
+
+    dumps_json(data)              : 1 lượt; NaN/Inf → null, ObjectId/datetime → str ngay trong encoder
+    splice_envelope(data_bytes)   : ghép bytes đã encode vào {"status","message","data"} — không
+                                    serialize lại phần data
+
+Dùng orjson (khai báo trong pyproject.toml / uv.lock); môi trường thiếu (chạy script lẻ, venv cũ)
+thì fallback json chuẩn (chậm hơn, cùng kết quả).
+Giữ nguyên wire format cũ: datetime dạng str(dt) ("2026-10-16 00:00:00", không phải ISO "T"),
+numpy int → chuỗi, float subclass (numpy.float64) → số.
+"""
+
+import json
+import math
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # fallback json chuẩn
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def clean_nan_values(obj: Any) -> Any:
+    """Đệ quy thay thế các giá trị nan/inf bằng None."""
+    if isinstance(obj, dict):
+        return {k: clean_nan_values(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [clean_nan_values(item) for item in obj]
+    elif isinstance(obj, float):
+        if math.isnan(obj) or math.isinf(obj):
+            return None
+        return obj
+    return obj
+
+
+def default_serializer(o: Any) -> Any:
+    # orjson không tự encode subclass của float (numpy.float64) — json chuẩn thì coi là số.
+    if isinstance(o, float):
+        return None if math.isnan(o) or math.isinf(o) else float(o)
+    try:
+        return str(o)
+    except Exception:
+        raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    # PASSTHROUGH_DATETIME: datetime đi qua default → str(dt), giữ đúng định dạng client đang parse.
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _dumps_stdlib(data: Any) -> bytes:
+    return json.dumps(clean_nan_values(data), default=default_serializer, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_json(data: Any) -> bytes:
+    """Dữ liệu query → JSON bytes (UTF-8, compact)."""
+    if orjson is None:
+        return _dumps_stdlib(data)
+    try:
+        return orjson.dumps(data, default=default_serializer, option=_ORJSON_OPTIONS)
+    except TypeError:
+        # orjson từ chối số nguyên > 64 bit, dict lồng quá sâu... — hiếm, để json chuẩn xử lý.
+        return _dumps_stdlib(data)
+
+
+def loads_json(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def splice_envelope(data_json: bytes, status: int = 200, message: Optional[str] = None) -> bytes:
+    """Body StandardApiResponse {"status","message","data"} với data đã encode sẵn (cùng thứ tự field)."""
+    head = json.dumps({"status": status, "message": message}, ensure_ascii=False, separators=(",", ":"))
+    return head[:-1].encode("utf-8") + b',"data":' + data_json + b"}"
+
+
+def append_fields(body: bytes, fields: Dict[str, Any]) -> bytes:
+    """Thêm field vào cuối 1 JSON object đã encode (VD đánh dấu stale) — không serialize lại phần còn lại."""
+    extra = json.dumps(fields, ensure_ascii=False, separators=(",", ":"))
+    return body[:-1] + b"," + extra[1:].encode("utf-8")
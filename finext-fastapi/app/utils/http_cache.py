@@ -0,0 +1,72 @@
+# finext-fastapi/app/utils/http_cache.py
+"""
+Validator + header cache HTTP cho dữ liệu thị trường public (/sse/rest).
+
+- payload_digest: hash nội dung ổn định giữa các worker/process (blake2b) — dùng chung cho
+  dedupe frame của SSE poller và ETag của REST. KHÔNG dùng hash() built-in: bị salt ngẫu nhiên
+  mỗi process nên 2 worker sau nginx sẽ trả 2 ETag khác nhau cho cùng 1 payload.
+- etag_matches: so If-None-Match theo weak comparison (RFC 9110 §13.1.2) — chấp nhận danh sách,
+  tiền tố W/ và "*".
+- cache_control_for / surrogate_key_for: header theo refresh class để nginx proxy_cache
+  micro-cache trước worker Python, purge theo keyword/collection nguồn qua Surrogate-Key.
+  Nội dung không đổi sau khi xuất bản (bài viết theo slug) → `immutable`, trình duyệt/CDN giữ
+  IMMUTABLE_MAX_AGE (6 giờ) — bằng tuổi tối đa của cache bài viết in-process, bài đính chính không bị
+  proxy giữ lâu hơn.
+"""
+
+from hashlib import blake2b
+from typing import Dict, Iterable, Optional, Union
+
+_DIGEST_SIZE = 16
+
+# refresh class → (max-age, stale-while-revalidate) giây. max-age khớp TTL cache in-process
+# (crud/sse/_rest_cache.py) — proxy giữ lâu hơn cũng không mới hơn.
+CACHE_CONTROL_POLICY: Dict[str, tuple] = {
+    "realtime": (1, 2),
+    "minutely": (15, 30),
+    "eod": (60, 300),
+    "static": (300, 3600),
+}
+# Cũng là tuổi tối đa của cache bài viết in-process (crud/sse/_article_cache.py).
+IMMUTABLE_MAX_AGE = 6 * 3600
+
+
+def payload_digest(payload: Union[str, bytes]) -> str:
+    """Hex digest 128-bit của payload đã serialize."""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    return blake2b(payload, digest_size=_DIGEST_SIZE).hexdigest()
+
+
+def make_etag(digest: str, variant: str = "") -> str:
+    """Strong ETag; variant phân biệt các biểu diễn của cùng dữ liệu (format/encoding)."""
+    return f'"{digest}-{variant}"' if variant else f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def cache_control_for(refresh_class: str, immutable: bool = False) -> str:
+    if immutable:
+        return f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    max_age, swr = CACHE_CONTROL_POLICY.get(refresh_class, CACHE_CONTROL_POLICY["realtime"])
+    return f"public, max-age={max_age}, stale-while-revalidate={swr}"
+
+
+def surrogate_key_for(keyword: str, refresh_class: str, sources: Iterable[str] = ()) -> str:
+    """Key purge cho proxy: keyword, refresh class và các collection nguồn (cách nhau bởi dấu cách)."""
+    keys = [f"kw:{keyword}", f"class:{refresh_class}"]
+    keys.extend(f"src:{s}" for s in sources)
+    return " ".join(keys)
@@ -0,0 +1,83 @@
+# finext-fastapi/app/utils/market_session.py
+"""
+Lịch phiên giao dịch chứng khoán VN (HOSE/HNX) theo giờ Asia/Ho_Chi_Minh.
+
+Phiên khớp lệnh 09:00–11:30 và 13:00–15:00 (gồm ATC), nghỉ trưa 11:30–13:00; nghỉ thứ 7,
+chủ nhật, lễ dương lịch cố định và các ngày khai trong env MARKET_HOLIDAYS (Tết âm lịch,
+Giỗ Tổ, nghỉ bù — thay đổi theo năm nên không hard-code).
+
+    market_phase(now)  → "session" | "off_hours" | "closed"
+        session   : đang trong phiên (cộng SESSION_GRACE sau mỗi lần đóng để hứng dữ liệu chốt muộn)
+        off_hours : ngày giao dịch nhưng ngoài phiên (sáng sớm, nghỉ trưa, sau đóng cửa)
+        closed    : cả ngày nghỉ (cuối tuần / lễ)
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import FrozenSet, Optional
+from zoneinfo import ZoneInfo
+
+from app.core.config import MARKET_HOLIDAYS
+
+VN_TZ = ZoneInfo("Asia/Ho_Chi_Minh")
+SESSION_WINDOWS = ((time(9, 0), time(11, 30)), (time(13, 0), time(15, 0)))
+SESSION_GRACE = timedelta(minutes=10)
+# Lễ dương lịch cố định: Tết dương lịch, 30/4, 1/5, 2/9.
+_FIXED_HOLIDAYS = {(1, 1), (4, 30), (5, 1), (9, 2)}
+# Tìm phiên kế tiếp tối đa chừng này ngày (dài hơn kỳ nghỉ Tết dài nhất).
+_MAX_LOOKAHEAD_DAYS = 30
+
+PHASE_SESSION = "session"
+PHASE_OFF_HOURS = "off_hours"
+PHASE_CLOSED = "closed"
+
+
+def _parse_holidays(raw: str) -> FrozenSet[date]:
+    days = set()
+    for part in raw.split(","):
+        part = part.strip()
+        if part:
+            days.add(date.fromisoformat(part))
+    return frozenset(days)
+
+
+HOLIDAYS = _parse_holidays(MARKET_HOLIDAYS)
+
+
+def _vn_now(now: Optional[datetime]) -> datetime:
+    if now is None:
+        return datetime.now(VN_TZ)
+    if now.tzinfo is None:
+        return now.replace(tzinfo=VN_TZ)
+    return now.astimezone(VN_TZ)
+
+
+def is_trading_day(d: date) -> bool:
+    return d.weekday() < 5 and (d.month, d.day) not in _FIXED_HOLIDAYS and d not in HOLIDAYS
+
+
+def market_phase(now: Optional[datetime] = None) -> str:
+    now = _vn_now(now)
+    if not is_trading_day(now.date()):
+        return PHASE_CLOSED
+    for start, end in SESSION_WINDOWS:
+        opened = datetime.combine(now.date(), start, tzinfo=VN_TZ)
+        closed = datetime.combine(now.date(), end, tzinfo=VN_TZ) + SESSION_GRACE
+        if opened <= now < closed:
+            return PHASE_SESSION
+    return PHASE_OFF_HOURS
+
+
+def seconds_until_session(now: Optional[datetime] = None) -> Optional[float]:
+    """Số giây tới lúc mở phiên (hoặc mở lại sau nghỉ trưa) kế tiếp; 0 nếu đang trong phiên."""
+    now = _vn_now(now)
+    if market_phase(now) == PHASE_SESSION:
+        return 0.0
+    for offset in range(_MAX_LOOKAHEAD_DAYS + 1):
+        d = now.date() + timedelta(days=offset)
+        if not is_trading_day(d):
+            continue
+        for start, _ in SESSION_WINDOWS:
+            opened = datetime.combine(d, start, tzinfo=VN_TZ)
+            if opened > now:
+                return (opened - now).total_seconds()
+    return None
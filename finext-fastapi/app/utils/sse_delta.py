@@ -0,0 +1,89 @@
+# finext-fastapi/app/utils/sse_delta.py
+"""
+Giao thức delta cho SSE (opt-in `?delta=1` trên /sse/stream).
+
+Frame đầu (và mỗi khi client tụt nhịp) là snapshot đầy đủ kèm version; các frame sau chỉ
+chứa những dòng đổi, định danh bằng key của keyword (VD: ticker):
+
+    {"type": "snapshot", "version": 7, "data": [...]}                 # "resync": true khi gửi lại
+    {"type": "delta", "version": 8, "base": 7, "key": ["ticker"],
+     "upsert": [{...dòng mới/đổi...}], "remove": [{"ticker": "XYZ"}],
+     "order": ["AAA", ...]}                                           # order chỉ có khi thứ tự đổi
+
+Client áp delta khi `base` == version đang giữ; lệch thì chờ snapshot kế tiếp (server tự gửi).
+Delta chỉ tính được khi payload là list[dict] và key duy nhất trên mọi dòng; ngược lại (hoặc
+khi đổi quá nửa số dòng — snapshot rẻ hơn) trả None và subscriber nhận snapshot.
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Đổi nhiều hơn tỉ lệ này số dòng thì gửi snapshot luôn (delta không còn nhỏ hơn đáng kể).
+DELTA_MAX_CHANGED_RATIO = 0.5
+
+
+def _row_key(row: Dict[str, Any], key_fields: Sequence[str]) -> Any:
+    if len(key_fields) == 1:
+        return row[key_fields[0]]
+    return tuple(row[f] for f in key_fields)
+
+
+def _index_rows(rows: Any, key_fields: Sequence[str]) -> Optional[Tuple[List[Any], Dict[Any, Dict[str, Any]]]]:
+    """(danh sách key theo thứ tự, map key → dòng); None nếu không diff được."""
+    if not isinstance(rows, list):
+        return None
+    order: List[Any] = []
+    index: Dict[Any, Dict[str, Any]] = {}
+    for row in rows:
+        if not isinstance(row, dict):
+            return None
+        try:
+            k = _row_key(row, key_fields)
+            hash(k)
+        except (KeyError, TypeError):
+            return None
+        if k in index:
+            return None  # key trùng → không định danh được dòng
+        order.append(k)
+        index[k] = row
+    return order, index
+
+
+def compute_row_delta(prev: Any, curr: Any, key_fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+    """Diff 2 payload list[dict] theo key. None nếu không diff được hoặc snapshot rẻ hơn."""
+    prev_idx = _index_rows(prev, key_fields)
+    curr_idx = _index_rows(curr, key_fields)
+    if prev_idx is None or curr_idx is None:
+        return None
+    prev_order, prev_rows = prev_idx
+    curr_order, curr_rows = curr_idx
+
+    upsert = [row for k, row in curr_rows.items() if prev_rows.get(k) != row]
+    removed = [k for k in prev_order if k not in curr_rows]
+    if curr_order and len(upsert) + len(removed) > DELTA_MAX_CHANGED_RATIO * len(curr_order):
+        return None
+
+    delta: Dict[str, Any] = {"key": list(key_fields), "upsert": upsert, "remove": [_key_obj(k, key_fields) for k in removed]}
+    # Thứ tự client tự suy ra: dòng cũ giữ chỗ, dòng mới nối cuối. Lệch thì gửi kèm order.
+    implied = [k for k in prev_order if k in curr_rows] + [k for k in curr_order if k not in prev_rows]
+    if implied != curr_order:
+        delta["order"] = [k if len(key_fields) == 1 else _key_obj(k, key_fields) for k in curr_order]
+    return delta
+
+
+def _key_obj(k: Any, key_fields: Sequence[str]) -> Any:
+    if len(key_fields) == 1:
+        return {key_fields[0]: k}
+    return dict(zip(key_fields, k))
+
+
+def build_delta_frame(delta: Dict[str, Any], version: int, default: Callable[[Any], Any]) -> str:
+    body = {"type": "delta", "version": version, "base": version - 1, **delta}
+    return f"data: {json.dumps(body, default=default)}\n\n"
+
+
+def build_snapshot_frame(payload_frame: str, version: int, resync: bool = False) -> str:
+    """Bọc frame đầy đủ "data: <json>\\n\\n" thành snapshot — nối chuỗi, không serialize lại."""
+    data_json = payload_frame[len("data: ") : -2]
+    resync_part = ', "resync": true' if resync else ""
+    return f'data: {{"type": "snapshot", "version": {version}{resync_part}, "data": {data_json}}}\n\n'
@@ -0,0 +1,53 @@
+# finext-fastapi/app/utils/sse_encoding.py
+"""
+Nén frame SSE (opt-in `?encoding=deflate` trên /sse/stream và /sse/multiplex).
+
+nginx tắt gzip cho /api/v1/sse/ (nén streaming buffer làm vỡ stream), nên frame lớn
+(screener_stock_data, home_today_stock...) trước đây đi nguyên văn tới từng subscriber. Giờ phần
+data của frame được nén 1 lần / thay đổi rồi gửi chung cho mọi subscriber đã chọn encoding:
+
+    data: {"type": "compressed", "encoding": "deflate", "data": "<base64>"}
+
+base64 giải ra bytes zlib (DecompressionStream("deflate") trên trình duyệt), giải nén ra đúng
+JSON của frame gốc (payload, snapshot hoặc delta). Frame nhỏ hơn COMPRESS_MIN_BYTES gửi nguyên văn
+(nén không lợi) → client phải chấp nhận cả 2 dạng.
+
+Chỉ dùng zlib (stdlib) — brotli/zstd không có sẵn trong môi trường và cũng không có
+DecompressionStream native trên trình duyệt.
+"""
+
+import base64
+import zlib
+from typing import Optional
+
+SSE_ENCODINGS = ("deflate",)
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_LEVEL = 6
+
+
+def validate_encoding(encoding: Optional[str]) -> Optional[str]:
+    """Chuẩn hoá tham số encoding; None/rỗng → None (không nén). Không hỗ trợ → ValueError."""
+    if not encoding:
+        return None
+    encoding = encoding.strip().lower()
+    if encoding not in SSE_ENCODINGS:
+        raise ValueError(f"encoding không hỗ trợ: {encoding} (hỗ trợ: {', '.join(SSE_ENCODINGS)})")
+    return encoding
+
+
+def encode_frame(frame: str, encoding: str) -> str:
+    """Frame "data: <json>\\n\\n" → frame nén; giữ nguyên nếu nhỏ hơn COMPRESS_MIN_BYTES."""
+    data_json = frame[len("data: ") : -2]
+    if len(data_json) < COMPRESS_MIN_BYTES:
+        return frame
+    packed = base64.b64encode(zlib.compress(data_json.encode("utf-8"), COMPRESS_LEVEL)).decode("ascii")
+    return f'data: {{"type": "compressed", "encoding": "{encoding}", "data": "{packed}"}}\n\n'
+
+
+def decode_frame(frame: str) -> str:
+    """Ngược lại encode_frame (dùng cho test/bench): frame nén → frame gốc; frame thường giữ nguyên."""
+    prefix = 'data: {"type": "compressed", "encoding": "deflate", "data": "'
+    if not frame.startswith(prefix):
+        return frame
+    raw = zlib.decompress(base64.b64decode(frame[len(prefix) : -len('"}\n\n')]))
+    return f"data: {raw.decode('utf-8')}\n\n"
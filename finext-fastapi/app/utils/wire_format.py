@@ -0,0 +1,53 @@
+# finext-fastapi/app/utils/wire_format.py
+"""
+Định dạng wire gọn cho dữ liệu dạng bảng (chart_*_data qua /sse/rest, `format=columnar`).
+
+Dạng dòng (mặc định) lặp lại tên key ở mỗi bar — với ~90 field/bar, phần lớn payload là
+tên key. Dạng cột gửi tên cột 1 lần, mỗi cột là 1 mảng giá trị (column-major):
+
+    {"columns": ["ticker", "date", "close"], "values": [["FPT", "FPT"], ["2026-10-15", "2026-10-16"], [97.1, 98.0]]}
+
+Dòng thiếu field → None ở cột đó. Thứ tự cột theo thứ tự xuất hiện đầu tiên.
+
+MessagePack (`encoding=msgpack`): package `msgpack` khai báo trong pyproject.toml / uv.lock; môi trường
+thiếu package (venv cũ) thì encoding=msgpack trả 400.
+"""
+
+from typing import Any, Dict, List, cast
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None  # encoding=msgpack trả 400 khi thiếu package
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+def to_columnar(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """list[dict] → {"columns": [...], "values": [[...cột 1...], ...]}."""
+    columns: Dict[str, None] = {}
+    for row in rows:
+        for k in row:
+            if k not in columns:
+                columns[k] = None
+    names = list(columns)
+    return {"columns": names, "values": [[row.get(name) for row in rows] for name in names]}
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def encode_msgpack(obj: Any) -> bytes:
+    if msgpack is None:
+        raise RuntimeError("msgpack chưa được cài")
+    return cast(bytes, msgpack.packb(obj, use_bin_type=True))
+
+
+def append_map_fields(body: bytes, fields: Dict[str, Any]) -> bytes:
+    """Thêm field vào cuối 1 map msgpack đã encode (fixmap ≤ 15 key) mà không decode phần còn lại."""
+    size = body[0] - 0x80
+    if not 0 <= size <= 15 or size + len(fields) > 15:
+        raise ValueError("Chỉ hỗ trợ fixmap msgpack")
+    tail = b"".join(encode_msgpack(k) + encode_msgpack(v) for k, v in fields.items())
+    return bytes([0x80 + size + len(fields)]) + body[1:] + tail
@@ -0,0 +1,79 @@
+"""Benchmark phân trang chart_history_data: skip/limit (legacy) vs keyset (before=/cursor).
+
+Cần 1 MongoDB thật (mặc định MONGODB_CONNECTION_STRING). Script ghi dữ liệu giả vào database
+tạm `finext_bench_keyset` (xoá khi xong), tạo index (ticker, date) như crud/sse/_indexes.py rồi
+đo từng độ sâu trang: thời gian / query và totalKeysExamined từ explain.
+
+    cd finext-fastapi
+    uv run python scripts/bench_chart_keyset.py                    # 6000 bar/mã, 50 mã, trang 200
+    uv run python scripts/bench_chart_keyset.py --uri mongodb://localhost:27017 --bars 10000
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.crud.sse._cursor import cursor_filter, decode_cursor, encode_cursor
+
+BENCH_DB = "finext_bench_keyset"
+
+
+async def _seed(coll, tickers: int, bars: int) -> None:
+    await coll.drop()
+    start = datetime(2000, 1, 1)
+    for t in range(tickers):
+        docs = [
+            {"ticker": f"T{t:03d}", "date": (start + timedelta(days=i)).strftime("%Y-%m-%dT00:00:00"), "close": float(i), "ma20": float(i)}
+            for i in range(bars)
+        ]
+        await coll.insert_many(docs, ordered=False)
+    await coll.create_index([("ticker", 1), ("date", 1)])
+
+
+async def _measure(coll, find_query, sort_dir, skip, limit, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        cur = coll.find(find_query, {"_id": 0}).sort("date", sort_dir).skip(skip).limit(limit)
+        docs = await cur.to_list(length=limit)
+    ms = (time.perf_counter() - t0) / repeat * 1000
+    plan = await coll.find(find_query, {"_id": 0}).sort("date", sort_dir).skip(skip).limit(limit).explain()
+    return ms, plan["executionStats"]["totalKeysExamined"], docs
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--uri", default=os.getenv("MONGODB_CONNECTION_STRING", "mongodb://localhost:27017"))
+    ap.add_argument("--tickers", type=int, default=50)
+    ap.add_argument("--bars", type=int, default=6000)
+    ap.add_argument("--page", type=int, default=200)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    client = AsyncIOMotorClient(args.uri)
+    coll = client[BENCH_DB]["history_stock"]
+    try:
+        await _seed(coll, args.tickers, args.bars)
+        ticker = {"ticker": "T000"}
+        print(f"{args.tickers} mã x {args.bars} bar, trang {args.page}")
+        print(f"  {'trang':>6s} {'skip ms':>8s} {'skip keys':>10s} {'keyset ms':>10s} {'keyset keys':>12s}")
+
+        # Đi lùi từ bar mới nhất bằng cursor, so với skip cùng độ sâu.
+        cursor = None
+        for page_no in range(args.bars // args.page):
+            skip = page_no * args.page
+            skip_ms, skip_keys, _ = await _measure(coll, ticker, -1, skip, args.page, args.repeat)
+            keyset_query = {**ticker, **cursor_filter("date", decode_cursor(cursor))} if cursor else ticker
+            ks_ms, ks_keys, docs = await _measure(coll, keyset_query, -1, 0, args.page, args.repeat)
+            cursor = encode_cursor("before", docs[-1]["date"])
+            if page_no in (0, 1, 4, 9) or page_no == args.bars // args.page - 1:
+                print(f"  {page_no + 1:6d} {skip_ms:8.2f} {skip_keys:10d} {ks_ms:10.2f} {ks_keys:12d}")
+    finally:
+        await client.drop_database(BENCH_DB)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
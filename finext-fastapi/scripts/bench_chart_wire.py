@@ -0,0 +1,73 @@
+"""Benchmark wire format cho chart_history_data — kích thước payload + thời gian serialize.
+
+Dữ liệu giả đúng bộ field CHART_DATA_PROJECTION (~90 field/bar), N phiên history_stock.
+So sánh: rows JSON (hiện tại), columnar JSON, columnar + fields=OHLCV+MA; kèm kích thước sau
+gzip (nginx bật gzip cho /api/v1/sse/rest/) và MessagePack nếu môi trường có package msgpack.
+
+    cd finext-fastapi
+    uv run python scripts/bench_chart_wire.py                      # 1500 phiên
+    uv run python scripts/bench_chart_wire.py --bars 5000
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from app.crud.sse._constants import CHART_DATA_PROJECTION, parse_chart_fields
+from app.utils.wire_format import encode_msgpack, msgpack_available, to_columnar
+
+OHLC_MA = "open,high,low,close,volume,ma5,ma20,ma60,ma120,ma240"
+
+
+def _make_bars(n: int, rng: random.Random):
+    names = [k for k, v in CHART_DATA_PROJECTION.items() if v == 1]
+    bars = []
+    for i in range(n):
+        bar = {k: round(rng.uniform(10, 200), 2) for k in names}
+        bar.update(ticker="FPT", ticker_name="CTCP FPT", date=(date(2020, 1, 1) + timedelta(days=i)).isoformat())
+        bars.append(bar)
+    return bars
+
+
+def _time(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return (time.perf_counter() - t0) / repeat * 1000, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--bars", type=int, default=1500)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    bars = _make_bars(args.bars, random.Random(7))
+    subset_fields = parse_chart_fields(OHLC_MA)
+    subset = [{k: b[k] for k in subset_fields} for b in bars]
+
+    cases = [
+        ("rows json", lambda: json.dumps(bars).encode()),
+        ("columnar json", lambda: json.dumps(to_columnar(bars)).encode()),
+        ("columnar json, fields=OHLCV+MA", lambda: json.dumps(to_columnar(subset)).encode()),
+    ]
+    if msgpack_available():
+        cases += [
+            ("rows msgpack", lambda: encode_msgpack(bars)),
+            ("columnar msgpack", lambda: encode_msgpack(to_columnar(bars))),
+            ("columnar msgpack, fields=OHLCV+MA", lambda: encode_msgpack(to_columnar(subset))),
+        ]
+
+    print(f"{args.bars} bar x {len(bars[0])} field")
+    print(f"  {'format':36s} {'KiB':>9s} {'gzip KiB':>9s} {'ms':>7s}")
+    for name, fn in cases:
+        ms, out = _time(fn, args.repeat)
+        print(f"  {name:36s} {len(out) / 1024:9.1f} {len(gzip.compress(out, 6)) / 1024:9.1f} {ms:7.2f}")
+    if not msgpack_available():
+        print("  (msgpack chưa cài — bỏ qua các dòng msgpack)")
+
+
+if __name__ == "__main__":
+    main()
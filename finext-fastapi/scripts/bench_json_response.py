@@ -0,0 +1,79 @@
+"""Benchmark đường serialize response /sse/rest trên payload screener_stock_data đầy đủ.
+
+Dữ liệu giả mô phỏng today_stock: N mã × bộ field CHART_DATA_PROJECTION (~90 field số), kèm
+ObjectId, datetime, chuỗi tiếng Việt và ~5% NaN (chỉ số tài chính thiếu).
+So sánh:
+    legacy : clean_nan_values → json.dumps → json.loads → model_dump → JSONResponse.render
+    fast   : dumps_json (orjson nếu có) → splice_envelope (ghép bytes vào envelope)
+
+    cd finext-fastapi
+    uv run python scripts/bench_json_response.py                   # 1600 mã
+    uv run python scripts/bench_json_response.py --rows 3000 --repeat 10
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+from app.crud.sse._constants import CHART_DATA_PROJECTION
+from app.utils import fast_json
+from app.utils.fast_json import clean_nan_values, dumps_json, splice_envelope
+from app.utils.response_wrapper import StandardApiResponse
+
+MESSAGE = "Truy vấn dữ liệu thành công"
+
+
+def _make_rows(n: int, rng: random.Random):
+    names = [k for k, v in CHART_DATA_PROJECTION.items() if v == 1]
+    rows = []
+    for i in range(n):
+        row = {"_id": ObjectId(), "ticker": f"T{i:04d}", "ticker_name": f"CTCP Đầu tư Phát triển {i}"}
+        row.update({k: (float("nan") if rng.random() < 0.05 else round(rng.uniform(-50, 500), 4)) for k in names})
+        row.update(date=datetime(2026, 10, 16), industry_name="Ngân hàng", exchange="HOSE")
+        rows.append(row)
+    return rows
+
+
+def _legacy(rows) -> bytes:
+    payload = json.dumps(clean_nan_values(rows), default=str)
+    body = StandardApiResponse(status=200, message=MESSAGE, data=json.loads(payload)).model_dump()
+    return JSONResponse(content=body).body
+
+
+def _fast(rows) -> bytes:
+    return splice_envelope(dumps_json(rows), status=200, message=MESSAGE)
+
+
+def _time(fn, rows, repeat: int):
+    fn(rows)  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(rows)
+    return (time.perf_counter() - t0) / repeat * 1000, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1600)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    rows = _make_rows(args.rows, random.Random(7))
+    legacy_ms, legacy_body = _time(_legacy, rows, args.repeat)
+    fast_ms, fast_body = _time(_fast, rows, args.repeat)
+    assert json.loads(legacy_body) == json.loads(fast_body), "hai đường cho kết quả khác nhau"
+
+    encoder = "orjson" if fast_json.orjson is not None else "json (fallback)"
+    print(f"{args.rows} dòng × {len(rows[0])} field, encoder: {encoder}")
+    print(f"{'đường':<10}{'ms/response':>14}{'body KiB':>12}")
+    print(f"{'legacy':<10}{legacy_ms:>14.1f}{len(legacy_body) / 1024:>12.0f}")
+    print(f"{'fast':<10}{fast_ms:>14.1f}{len(fast_body) / 1024:>12.0f}")
+    print(f"nhanh hơn {legacy_ms / fast_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
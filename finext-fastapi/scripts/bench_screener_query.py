@@ -0,0 +1,80 @@
+"""Benchmark screener_query (lọc phía server bằng NumPy) so với tải nguyên screener_stock_data.
+
+Dữ liệu giả mô phỏng today_stock: N mã × ~90 cột số (CHART_DATA_PROJECTION) + sàn/ngành/vốn hoá,
+~5% NaN. Đo trên 1 worker, không tính Mongo (cả 2 đường đọc cùng snapshot):
+    full download : projection bỏ cột nội bộ + dumps_json toàn bộ bảng (client tự lọc)
+    screener_query: filter ngành + khoảng P/E + sàn, top-N theo vốn hoá, 8 cột
+Kèm chi phí request đầu tiên sau khi snapshot làm mới (dựng ScreenerFrame + các cột được lọc/sort) và kích thước sau gzip.
+
+    cd finext-fastapi
+    uv run python scripts/bench_screener_query.py                  # 1600 mã
+    uv run python scripts/bench_screener_query.py --rows 3000 --top 100
+"""
+import argparse
+import gzip
+import random
+import time
+from datetime import datetime
+
+from app.crud.sse._constants import CHART_DATA_PROJECTION
+from app.crud.sse._snapshot import apply_projection
+from app.crud.sse.screener_query import ScreenerFrame, parse_screener_fields
+from app.utils.fast_json import dumps_json
+
+EXCHANGES = ["HOSE", "HNX", "UPCOM"]
+INDUSTRIES = ["Ngân hàng", "Chứng khoán", "Bất động sản", "Thép", "Bán lẻ", "Công nghệ", "Dầu khí", "Bảo hiểm"]
+COLUMNS = "ticker_name,exchange,industry_name,close,pct_change,pe,marketcap,vsi"
+
+
+def _make_rows(n: int, rng: random.Random):
+    names = [k for k, v in CHART_DATA_PROJECTION.items() if v == 1 and k not in ("ticker", "ticker_name", "date")]
+    rows = []
+    for i in range(n):
+        row = {"ticker": f"T{i:04d}", "ticker_name": f"CTCP {i}", "date": datetime(2026, 10, 16)}
+        row.update({k: (float("nan") if rng.random() < 0.05 else round(rng.uniform(-50, 500), 4)) for k in names})
+        row.update(exchange=rng.choice(EXCHANGES), industry_name=rng.choice(INDUSTRIES), pe=rng.uniform(2, 40),
+                   marketcap=rng.uniform(1, 500), week=42, month=10, quarter=4, year=2026)
+        rows.append(row)
+    return rows
+
+
+def _time(fn, repeat: int):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return (time.perf_counter() - t0) / repeat * 1000, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1600)
+    ap.add_argument("--top", type=int, default=50)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    rows = _make_rows(args.rows, random.Random(7))
+    exclude = {"week": 0, "month": 0, "quarter": 0, "year": 0}
+    filters = {"industry_name": ["Ngân hàng", "Chứng khoán"], "pe": {"gte": 5, "lte": 15}, "exchange": ["HOSE", "HNX"]}
+    fields = parse_screener_fields(COLUMNS)
+
+    def _cold():
+        frame = ScreenerFrame(rows)
+        frame.query(filters, sort_by="marketcap", sort_order="desc", limit=args.top, fields=fields)
+        return frame
+
+    build_ms, frame = _time(_cold, max(1, args.repeat // 4))
+    full_ms, full_body = _time(lambda: dumps_json(apply_projection(rows, exclude)), args.repeat)
+    query_ms, query_body = _time(
+        lambda: dumps_json(frame.query(filters, sort_by="marketcap", sort_order="desc", limit=args.top, fields=fields)), args.repeat
+    )
+
+    print(f"{args.rows} mã × {len(rows[0])} cột; filter={filters}, top {args.top} theo marketcap, {len(fields)} cột")
+    print(f"{'đường':<16}{'ms/request':>12}{'body KiB':>11}{'gzip KiB':>11}")
+    for name, ms, body in (("full download", full_ms, full_body), ("screener_query", query_ms, query_body)):
+        print(f"{name:<16}{ms:>12.2f}{len(body) / 1024:>11.1f}{len(gzip.compress(body, 5)) / 1024:>11.1f}")
+    print(f"request đầu sau mỗi lần snapshot làm mới (dựng ScreenerFrame + cột dùng tới): {build_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
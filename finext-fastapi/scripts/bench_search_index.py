@@ -0,0 +1,87 @@
+"""Benchmark inverted index search_news (crud/sse/_search_index.py) so với đường $regex cũ.
+
+Corpus giả mô phỏng news_daily: N bài, title tiếng Việt có dấu ghép từ ~60 từ thị trường + mã CK,
+created_at rải đều 3 năm. Không có Mongo: đường regex được đo bằng re (IGNORECASE) quét toàn bộ title
++ tickers rồi sort created_at, top 5 — đúng việc Mongo làm với COLLSCAN, chưa tính I/O nên là cận dưới.
+    regex : `$regex` không neo trên title OR `^term` trên tickers (có dấu như client gõ)
+    index : TextIndex.search (bỏ dấu, AND token, tiền tố, xếp theo độ mới)
+Kèm thời gian dựng index + RAM (tracemalloc).
+
+    cd finext-fastapi
+    uv run python scripts/bench_search_index.py                 # 100k bài
+    uv run python scripts/bench_search_index.py --docs 20000 --repeat 50
+"""
+import argparse
+import random
+import re
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from app.crud.sse._search_index import NEWS_FIELDS, TextIndex
+
+WORDS = (
+    "ngân hàng chứng khoán bất động sản thép dầu khí bảo hiểm bán lẻ công nghệ điện lực cảng biển "
+    "lãi suất tỷ giá lạm phát tín dụng trái phiếu cổ phiếu cổ tức vốn điều lệ lợi nhuận doanh thu quý "
+    "tăng giảm mạnh nhẹ kỷ lục phục hồi điều chỉnh khối ngoại tự doanh mua ròng bán ròng thanh khoản "
+    "VN-Index thị trường nhà đầu tư Chính phủ Bộ Tài chính Ngân hàng Nhà nước xuất khẩu nhập khẩu"
+).split()
+TICKERS = ["VCB", "BID", "CTG", "TCB", "MBB", "ACB", "FPT", "HPG", "VNM", "MSN", "MWG", "VHM", "VIC", "GAS", "SSI", "VND"]
+QUERIES = ["ngân hàng", "ngan hang", "lai suat", "khối ngoại mua", "thep", "ng", "VCB", "co tuc quy", "xyz khong co"]
+
+
+def _corpus(n: int, rng: random.Random):
+    start = datetime(2023, 10, 16)
+    docs = []
+    for i in range(n):
+        tickers = rng.sample(TICKERS, rng.randint(0, 3))
+        title = " ".join(rng.choices(WORDS, k=rng.randint(8, 16)) + tickers)
+        created = start + timedelta(seconds=i * (3 * 365 * 86400 // n))
+        docs.append({"article_slug": f"bai-{i}", "title": title, "news_type": "trong_nuoc", "created_at": created.isoformat(), "tickers": tickers})
+    return docs
+
+
+def _regex_search(docs, term: str, limit: int = 5):
+    title_re = re.compile(re.escape(term), re.IGNORECASE)
+    ticker_re = re.compile("^" + re.escape(term), re.IGNORECASE)
+    hits = [d for d in docs if title_re.search(d["title"]) or any(ticker_re.search(t) for t in d["tickers"])]
+    hits.sort(key=lambda d: d["created_at"], reverse=True)
+    return hits[:limit]
+
+
+def _time(fn, repeat: int):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return (time.perf_counter() - t0) / repeat * 1000, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+
+    docs = _corpus(args.docs, random.Random(11))
+    t0 = time.perf_counter()
+    index = TextIndex("article_slug", NEWS_FIELDS)
+    index.extend(docs)
+    build_ms = (time.perf_counter() - t0) * 1000
+    # Đo RAM bằng 1 lần dựng riêng (tracemalloc làm chậm vài lần, không đo chung với thời gian).
+    tracemalloc.start()
+    TextIndex("article_slug", NEWS_FIELDS).extend(docs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{args.docs} bài, {len(index._vocab)} từ; dựng index {build_ms:.0f} ms, RAM ~{peak / 2**20:.0f} MiB")
+    print(f"{'query':<18}{'regex ms':>10}{'kq':>4}{'index ms':>10}{'kq':>4}{'x':>8}")
+    regex_repeat = max(1, args.repeat // 50)
+    for query in QUERIES:
+        regex_ms, regex_rows = _time(lambda: _regex_search(docs, query), regex_repeat)
+        index_ms, index_rows = _time(lambda: index.search(query, limit=5), args.repeat)
+        print(f"{query:<18}{regex_ms:>10.2f}{len(regex_rows):>4}{index_ms:>10.4f}{len(index_rows):>4}{regex_ms / index_ms:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark nén frame SSE (`?encoding=deflate`) — nén 1 lần / thay đổi so với nén theo subscriber.
+
+Mô phỏng home_today_stock: ~1.600 mã, mỗi tick 1 payload đầy đủ broadcast tới N subscriber.
+So sánh:
+    - none        : gửi nguyên văn (hiện tại, nginx không gzip /api/v1/sse/)
+    - per-client  : mỗi subscriber tự nén (như gzip streaming từng kết nối) → CPU O(N)
+    - shared      : _Frame.render nén 1 lần, mọi subscriber dùng chung chuỗi → CPU O(1)
+
+    cd finext-fastapi
+    uv run python scripts/bench_sse_compress.py                      # 1600 mã, 500 subscriber
+    uv run python scripts/bench_sse_compress.py --subscribers 2000 --ticks 50
+"""
+import argparse
+import json
+import random
+import time
+
+from app.routers.sse import _Frame
+from app.utils.sse_encoding import encode_frame
+
+FIELDS = ("open", "high", "low", "close", "diff", "pct_change", "volume", "value", "vsi", "t0_score")
+
+
+def _payload(n: int, rng: random.Random) -> str:
+    rows = [
+        {"ticker": f"T{i:04d}", "date": "2026-10-16", "industry_name": f"Ngành {i % 24}", "exchange": "HOSE",
+         **{f: round(rng.uniform(1, 100_000), 2) for f in FIELDS}}
+        for i in range(n)
+    ]
+    return f"data: {json.dumps(rows, ensure_ascii=False)}\n\n"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1600)
+    ap.add_argument("--subscribers", type=int, default=500)
+    ap.add_argument("--ticks", type=int, default=20)
+    args = ap.parse_args()
+
+    rng = random.Random(42)
+    payloads = [_payload(args.rows, rng) for _ in range(args.ticks)]
+    n = args.subscribers
+
+    raw_bytes = sum(len(p.encode()) for p in payloads) * n
+
+    t0 = time.perf_counter()
+    per_client_bytes = 0
+    for p in payloads:
+        for _ in range(n):
+            per_client_bytes += len(encode_frame(p, "deflate"))
+    per_client_cpu = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    shared_bytes = 0
+    for v, p in enumerate(payloads, start=1):
+        frame = _Frame(payload=p, version=v)
+        for _ in range(n):
+            shared_bytes += len(frame.render("payload", "deflate"))
+    shared_cpu = time.perf_counter() - t0
+
+    ticks = args.ticks
+    print(f"{args.rows} mã, {n} subscriber, {ticks} tick")
+    print(f"  none       : {raw_bytes / ticks / n / 1024:8.1f} KiB/subscriber/tick")
+    print(f"  per-client : {per_client_bytes / ticks / n / 1024:8.1f} KiB/subscriber/tick, CPU {per_client_cpu / ticks * 1000:8.1f} ms/tick")
+    print(f"  shared     : {shared_bytes / ticks / n / 1024:8.1f} KiB/subscriber/tick, CPU {shared_cpu / ticks * 1000:8.1f} ms/tick")
+
+
+if __name__ == "__main__":
+    main()
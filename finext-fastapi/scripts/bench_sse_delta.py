@@ -0,0 +1,73 @@
+"""Benchmark delta frame SSE — bytes gửi đi và CPU/tick trên snapshot ~1.600 mã.
+
+Mô phỏng home_today_stock: 1.600 dòng, mỗi tick đổi giá ~50 mã (phiên bình thường).
+So sánh frame đầy đủ (json.dumps toàn payload, như luồng hiện tại) với delta
+(json.dumps toàn payload để hash + compute_row_delta + build_delta_frame).
+
+    cd finext-fastapi
+    uv run python scripts/bench_sse_delta.py                       # 1600 mã, 50 đổi/tick
+    uv run python scripts/bench_sse_delta.py --changed 200 --ticks 500
+"""
+import argparse
+import json
+import random
+import time
+
+from app.utils.sse_delta import build_delta_frame, build_snapshot_frame, compute_row_delta
+
+FIELDS = ("open", "high", "low", "close", "diff", "pct_change", "volume", "value", "vsi", "t0_score")
+
+
+def _make_rows(n: int, rng: random.Random):
+    return [
+        {"ticker": f"T{i:04d}", "date": "2026-10-16", "industry_name": f"Ngành {i % 24}", "exchange": "HOSE",
+         **{f: round(rng.uniform(1, 100_000), 2) for f in FIELDS}}
+        for i in range(n)
+    ]
+
+
+def _tick(rows, changed: int, rng: random.Random):
+    rows = list(rows)
+    for i in rng.sample(range(len(rows)), changed):
+        row = dict(rows[i])
+        row["close"] = round(row["close"] * rng.uniform(0.99, 1.01), 2)
+        row["volume"] += rng.randint(100, 10_000)
+        rows[i] = row
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1600)
+    ap.add_argument("--changed", type=int, default=50)
+    ap.add_argument("--ticks", type=int, default=200)
+    args = ap.parse_args()
+
+    rng = random.Random(42)
+    states = [_make_rows(args.rows, rng)]
+    for _ in range(args.ticks):
+        states.append(_tick(states[-1], args.changed, rng))
+
+    full_bytes = delta_bytes = 0
+    t0 = time.perf_counter()
+    for curr in states[1:]:
+        full_bytes += len(f"data: {json.dumps(curr)}\n\n".encode())
+    full_cpu = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for v, (prev, curr) in enumerate(zip(states, states[1:]), start=2):
+        payload = f"data: {json.dumps(curr)}\n\n"
+        delta = compute_row_delta(prev, curr, ("ticker",))
+        frame = build_delta_frame(delta, v, str) if delta is not None else build_snapshot_frame(payload, v)
+        delta_bytes += len(frame.encode())
+    delta_cpu = time.perf_counter() - t0
+
+    n = args.ticks
+    print(f"{args.rows} dòng, {args.changed} đổi/tick, {n} tick")
+    print(f"  full : {full_bytes / n / 1024:8.1f} KiB/tick  {full_cpu / n * 1000:6.2f} ms/tick")
+    print(f"  delta: {delta_bytes / n / 1024:8.1f} KiB/tick  {delta_cpu / n * 1000:6.2f} ms/tick "
+          f"(bytes x{full_bytes / delta_bytes:.1f} nhỏ hơn)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark fan-out SSE cấp host — đếm số query Mongo/giây khi subscriber rải trên nhiều worker.
+
+Mỗi "worker" là 1 process riêng chạy đúng cache + poller của app/routers/sse.py;
+execute_sse_query được thay bằng hàm giả đếm lượt gọi (không cần Mongo thật).
+So sánh 2 chế độ: SSE_FANOUT tắt (mỗi worker tự poll) và bật (chỉ leader poll).
+
+    cd finext-fastapi
+    uv run python scripts/bench_sse_fanout.py                      # 2 worker, 20 key, 400 subscriber
+    uv run python scripts/bench_sse_fanout.py --workers 4 --seconds 10
+"""
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+
+def _worker(idx: int, args: argparse.Namespace, fanout_on: bool, tmpdir: str, counter, ready, go) -> None:
+    import app.routers.sse as sse
+    from app.core.sse_fanout import SseFanout
+
+    async def fake_query(keyword, ticker=None, **kwargs):
+        with counter.get_lock():
+            counter.value += 1
+        await asyncio.sleep(0.005)  # giả lập round-trip Mongo
+        return [{"ticker": ticker, "close": time.time() // sse.SSE_POLL_INTERVAL}]
+
+    async def main() -> None:
+        sse.execute_sse_query = fake_query
+        sse.SSE_POLL_SCHEDULE = "fixed"
+        sse.SSE_POLL_INTERVAL = args.interval
+        f = SseFanout(os.path.join(tmpdir, "bench.lock"), os.path.join(tmpdir, "bench.sock"), enabled=fanout_on)
+        f.bind(sse._fanout_subscribe, sse._unsubscribe)
+        sse.fanout = f
+
+        ready.wait()
+        go.wait()
+        tickers = [f"T{k}" for k in range(args.keys)]
+        subs = []
+        # Subscriber thứ n vào worker n % workers → mọi worker đều có đủ các key nóng
+        # (giống nginx rải kết nối của cùng 1 trang qua các worker).
+        for n in range(idx, args.subscribers, args.workers):
+            subs.append(await sse._subscribe("home_today_index", tickers[(n // args.workers) % args.keys]))
+
+        async def drain(q):
+            while True:
+                await q.get()
+
+        drains = [asyncio.create_task(drain(q)) for _, q in subs]
+        await asyncio.sleep(args.seconds)
+        for t in drains:
+            t.cancel()
+        for key, q in subs:
+            await sse._unsubscribe(key, q)
+        await f.close()
+
+    asyncio.run(main())
+
+
+def run(args: argparse.Namespace, fanout_on: bool) -> float:
+    ctx = mp.get_context("spawn")
+    counter = ctx.Value("i", 0)
+    ready, go = ctx.Event(), ctx.Event()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        procs = [
+            ctx.Process(target=_worker, args=(i, args, fanout_on, tmpdir, counter, ready, go)) for i in range(args.workers)
+        ]
+        for p in procs:
+            p.start()
+        time.sleep(2.0)  # chờ import app xong ở mọi worker
+        ready.set()
+        go.set()
+        for p in procs:
+            p.join()
+    return counter.value / args.seconds
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=2)
+    ap.add_argument("--keys", type=int, default=20)
+    ap.add_argument("--subscribers", type=int, default=400)
+    ap.add_argument("--seconds", type=float, default=6.0)
+    ap.add_argument("--interval", type=float, default=0.5, help="SSE_POLL_INTERVAL thu nhỏ để bench nhanh")
+    args = ap.parse_args()
+
+    off = run(args, fanout_on=False)
+    on = run(args, fanout_on=True)
+    print(f"workers={args.workers} keys={args.keys} subscribers={args.subscribers} interval={args.interval}s")
+    print(f"  SSE_FANOUT=off : {off:8.1f} query/s")
+    print(f"  SSE_FANOUT=on  : {on:8.1f} query/s   ({on / off:.0%} so với off)" if off else "")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark keyword suggest (typeahead phía server) so với tải search_stocks + search_index để FE tự lọc.
+
+Dữ liệu giả mô phỏng today_stock (N mã, tên công ty tiếng Việt có dấu) + today_index (~150 nhóm/ngành).
+Không có Mongo (cả 2 đường đọc cùng snapshot):
+    full list: projection của search_stocks + search_index, dumps_json — payload lần gõ đầu tiên
+    suggest  : SuggestIndex.suggest_sections(query, 10) + dumps_json (top 10 mỗi nhóm)
+Kèm thời gian dựng SuggestIndex (1 lần / mỗi lần snapshot làm mới).
+
+    cd finext-fastapi
+    uv run python scripts/bench_suggest.py
+    uv run python scripts/bench_suggest.py --stocks 3000 --repeat 2000
+"""
+import argparse
+import gzip
+import random
+import string
+import time
+
+from app.crud.sse._snapshot import apply_projection
+from app.crud.sse.suggest import SuggestIndex
+from app.utils.fast_json import dumps_json
+
+NAME_WORDS = (
+    "Ngân hàng TMCP Công ty Cổ phần Chứng khoán Đầu tư Phát triển Xây dựng Thép Dầu khí Bảo hiểm "
+    "Bất động sản Điện lực Cảng Thương mại Dịch vụ Việt Nam Sài Gòn Hà Nội Đông Á Miền Nam Tập đoàn"
+).split()
+QUERIES = ["V", "VCB", "vc", "ngan hang", "Chứng khoán", "thep hoa", "ha noi", "zzz"]
+
+
+def _rows(n_stocks: int, n_indexes: int, rng: random.Random):
+    stocks, seen = [], set()
+    while len(stocks) < n_stocks:
+        ticker = "".join(rng.choices(string.ascii_uppercase, k=3))
+        if ticker in seen:
+            continue
+        seen.add(ticker)
+        stocks.append({"ticker": ticker, "ticker_name": " ".join(rng.choices(NAME_WORDS, k=rng.randint(3, 8))),
+                       "exchange": rng.choice(["HOSE", "HNX", "UPCOM"]), "industry_name": rng.choice(NAME_WORDS),
+                       "close": round(rng.uniform(1, 200), 2), "pct_change": round(rng.uniform(-0.07, 0.07), 4),
+                       "trading_value": rng.expovariate(1 / 50), "vsi": 1.0, "w_pct": 0.01})
+    indexes = [{"ticker": f"NHOM{i}", "ticker_name": " ".join(rng.choices(NAME_WORDS, k=2)), "type": rng.choice(["industry", "index"]),
+                "close": 500.0, "pct_change": 0.0, "trading_value": rng.expovariate(1 / 500)} for i in range(n_indexes)]
+    return stocks, indexes
+
+
+def _time(fn, repeat: int):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return (time.perf_counter() - t0) / repeat * 1000, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--stocks", type=int, default=1600)
+    ap.add_argument("--indexes", type=int, default=150)
+    ap.add_argument("--repeat", type=int, default=1000)
+    args = ap.parse_args()
+
+    stocks, indexes = _rows(args.stocks, args.indexes, random.Random(5))
+    stock_proj = {f: 1 for f in ("ticker", "ticker_name", "exchange", "industry_name", "close", "pct_change")}
+    index_proj = {f: 1 for f in ("ticker", "ticker_name", "type", "close", "pct_change")}
+    full = dumps_json(apply_projection(stocks, stock_proj)) + dumps_json(apply_projection(indexes, index_proj))
+    build_ms, index = _time(lambda: SuggestIndex(stocks, indexes), 20)
+
+    print(f"{args.stocks} mã + {args.indexes} nhóm/ngành; dựng SuggestIndex {build_ms:.1f} ms / lần snapshot làm mới")
+    print(f"full list (search_stocks + search_index): {len(full) / 1024:.1f} KiB, gzip {len(gzip.compress(full, 5)) / 1024:.1f} KiB")
+    print(f"{'query':<14}{'ms':>9}{'kq':>4}{'body B':>8}{'gzip B':>8}")
+    for query in QUERIES:
+        ms, body = _time(lambda: dumps_json(index.suggest_sections(query, 10)), args.repeat)
+        hits = sum(len(rows) for rows in index.suggest_sections(query, 10).values())
+        print(f"{query:<14}{ms:>9.4f}{hits:>4}{len(body):>8}{len(gzip.compress(body, 5)):>8}")
+
+
+if __name__ == "__main__":
+    main()
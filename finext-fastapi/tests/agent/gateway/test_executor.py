@@ -11,6 +11,7 @@ from app.agent.gateway.executor import (
 )
 from app.agent.gateway.policy import Policy
 from app.agent.gateway.types import GatewayContext
+from app.core.query_governor import LANE_AGENT, QueryGovernor
 
 CTX = GatewayContext(request_id="test-req", user_id="test-user")
 
@@ -636,3 +637,16 @@ async def test_find_coerces_in_scalar_to_array_before_mongo():
     )
     assert result.ok is True
     assert collection.last_filter == {"ticker": {"$in": ["VNM"]}}
+
+
+async def test_find_shed_by_governor_returns_retry_later_error():
+    # Mongo đang chậm → governor cắt lane agent trước realtime/REST; gateway trả lỗi "thử lại sau", không chạm Mongo.
+    governor = QueryGovernor(limit=10, shed_latency_ms=100)
+    for _ in range(20):
+        governor._record_latency(governor._lanes[LANE_AGENT], 1.0)
+    collection = FakeCollection([{"ticker": "FPT", "price": 118.5}])
+    gateway = MongoGateway(FakeDB(collection), Policy.load(), governor=governor)
+    result = await gateway.find(CTX, "stock_snapshot", filter={"ticker": "FPT"}, projection={"ticker": 1}, limit=1)
+    assert result.ok is False and result.meta["shed"] is True
+    assert collection.last_filter is None
+    assert governor.stats()["lanes"][LANE_AGENT]["shed"] == 1
@@ -0,0 +1,125 @@
+"""
+Test QueryGovernor (core/query_governor.py).
+
+Bao phủ:
+    - Trần theo lane + trần tổng; slot rảnh trao theo trọng số, lane ưu tiên không bị chen ngang.
+    - Chờ quá max_wait → QueryShedError, slot không bị rò.
+    - Latency tăng → cắt background trước, rồi agent, rồi interactive; realtime không bao giờ bị cắt.
+    - Metrics queue-time theo lane; limit=0 tắt hẳn governor.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.query_governor import (
+    LANE_AGENT,
+    LANE_BACKGROUND,
+    LANE_INTERACTIVE,
+    LANE_REALTIME,
+    LanePolicy,
+    QueryGovernor,
+    QueryShedError,
+)
+
+
+def _policies(cap=2, max_wait=1.0):
+    return {
+        LANE_REALTIME: LanePolicy(cap=cap, weight=4, max_wait=max_wait),
+        LANE_INTERACTIVE: LanePolicy(cap=cap, weight=2, max_wait=max_wait),
+        LANE_AGENT: LanePolicy(cap=cap, weight=1, max_wait=max_wait),
+        LANE_BACKGROUND: LanePolicy(cap=cap, weight=1, max_wait=max_wait),
+    }
+
+
+async def _hold(gov, lane, gate, log):
+    async with gov.slot(lane):
+        log.append(lane)
+        await gate.wait()
+
+
+async def test_lane_cap_and_total_limit():
+    gov = QueryGovernor(limit=3, shed_latency_ms=0, policies=_policies(cap=2))
+    gate, log = asyncio.Event(), []
+    tasks = [asyncio.create_task(_hold(gov, LANE_AGENT, gate, log)) for _ in range(3)]
+    tasks.append(asyncio.create_task(_hold(gov, LANE_REALTIME, gate, log)))
+    await asyncio.sleep(0.01)
+    # Agent chạm cap 2; slot thứ 3 của tổng thuộc về realtime.
+    assert sorted(log) == [LANE_AGENT, LANE_AGENT, LANE_REALTIME]
+    stats = gov.stats()
+    assert stats["inflight"] == 3 and stats["lanes"][LANE_AGENT]["waiting"] == 1
+
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert gov.stats()["inflight"] == 0 and len(log) == 4
+
+
+async def test_freed_slot_goes_to_weighted_lane():
+    gov = QueryGovernor(limit=1, shed_latency_ms=0, policies=_policies(cap=1))
+    gate, log = asyncio.Event(), []
+    first = asyncio.create_task(_hold(gov, LANE_BACKGROUND, gate, log))
+    await asyncio.sleep(0)
+    # Background xếp hàng trước, realtime đến sau nhưng được trao slot trước.
+    waiting = [asyncio.create_task(_hold(gov, LANE_BACKGROUND, gate, log))]
+    await asyncio.sleep(0)
+    waiting.append(asyncio.create_task(_hold(gov, LANE_REALTIME, gate, log)))
+    await asyncio.sleep(0.01)
+    gate.set()
+    await asyncio.gather(first, *waiting)
+    assert log == [LANE_BACKGROUND, LANE_REALTIME, LANE_BACKGROUND]
+    assert gov.stats()["lanes"][LANE_REALTIME]["wait_max_ms"] > 0
+
+
+async def test_wait_timeout_sheds_without_leaking_slot():
+    gov = QueryGovernor(limit=1, shed_latency_ms=0, policies=_policies(cap=1, max_wait=0.02))
+    gate, log = asyncio.Event(), []
+    holder = asyncio.create_task(_hold(gov, LANE_REALTIME, gate, log))
+    await asyncio.sleep(0)
+    with pytest.raises(QueryShedError) as ei:
+        async with gov.slot(LANE_AGENT):
+            pass
+    assert ei.value.reason == "wait_timeout"
+    gate.set()
+    await holder
+    async with gov.slot(LANE_AGENT):
+        assert gov.stats()["inflight"] == 1
+    stats = gov.stats()
+    assert stats["inflight"] == 0 and stats["lanes"][LANE_AGENT]["timeouts"] == 1
+
+
+def _with_latency(gov: QueryGovernor, seconds: float) -> None:
+    lane = gov._lanes[LANE_REALTIME]
+    for _ in range(50):
+        gov._record_latency(lane, seconds)
+
+
+@pytest.mark.parametrize(
+    "latency,shed",
+    [
+        (0.1, set()),
+        (1.2, {LANE_BACKGROUND}),
+        (2.5, {LANE_BACKGROUND, LANE_AGENT}),
+        (10.0, {LANE_BACKGROUND, LANE_AGENT, LANE_INTERACTIVE}),
+    ],
+)
+async def test_shedding_lowest_lane_first(latency, shed):
+    gov = QueryGovernor(limit=10, shed_latency_ms=800, policies=_policies())
+    _with_latency(gov, latency)
+    rejected = set()
+    for lane in (LANE_REALTIME, LANE_INTERACTIVE, LANE_AGENT, LANE_BACKGROUND):
+        try:
+            async with gov.slot(lane):
+                _with_latency(gov, latency)  # mẫu mới giữ nguyên mức áp lực (latency thật ~0 của slot kéo EWMA xuống 0.8x → chọn mức xa ngưỡng)
+        except QueryShedError as e:
+            assert e.reason == "overloaded"
+            rejected.add(lane)
+    assert rejected == shed
+    assert LANE_REALTIME not in rejected
+
+
+async def test_disabled_governor_is_passthrough():
+    gov = QueryGovernor(limit=0)
+    _with_latency(gov, 100.0)
+    async with gov.slot(LANE_BACKGROUND):
+        pass
+    assert gov.stats()["lanes"][LANE_BACKGROUND]["admitted"] == 0
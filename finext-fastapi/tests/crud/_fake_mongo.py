@@ -1,8 +1,9 @@
 """Fake Mongo async cho test crud chuỗi tiền (transactions/subscriptions/promotions).
 
 Mở rộng pattern từ tests/agent/_fake_mongo.py để phủ đủ op mà crud tiền dùng:
-- filter: eq + $gt/$gte/$lt/$lte/$in/$ne/$nin + $or (top-level)
-- ops: insert_one, find_one(sort=/projection=), find, count_documents,
+- filter: eq + $gt/$gte/$lt/$lte/$in/$ne/$nin + $or (top-level); so sánh lệch kiểu → không khớp
+- ops: insert_one, find_one(sort=/projection=), find (projection bỏ qua), count_documents,
+       aggregate ($match + $group với $sum / $max),
        update_one (đánh giá lại filter trên doc đích -> mô phỏng compare-and-set
        nguyên tử của Mongo), update_many, delete_one, delete_many
 - KHÔNG có find_one_and_update (khớp giới hạn Mongo standalone của dự án).
@@ -16,6 +17,13 @@ from bson import ObjectId
 
 
 def _match_op(val: Any, op: str, operand: Any) -> bool:
+    try:
+        return _compare(val, op, operand)
+    except TypeError:
+        return False  # Mongo so sánh theo từng kiểu (str vs datetime) → không khớp
+
+
+def _compare(val: Any, op: str, operand: Any) -> bool:
     if op == "$gte":
         return val is not None and val >= operand
     if op == "$gt":
@@ -64,6 +72,9 @@ class _Cursor:
             self._docs = sorted(self._docs, key=lambda x: (x.get(field) is not None, x.get(field)), reverse=d < 0)
         return self
 
+    def max_time_ms(self, ms: int) -> "_Cursor":
+        return self
+
     def skip(self, n: int) -> "_Cursor":
         self._docs = self._docs[n:]
         return self
@@ -87,6 +98,29 @@ class _Cursor:
             raise StopAsyncIteration
 
 
+def _field(doc: dict, expr: Any) -> Any:
+    return doc.get(expr[1:]) if isinstance(expr, str) and expr.startswith("$") else expr
+
+
+def _group(docs: list[dict], spec: dict) -> list[dict]:
+    groups: dict[Any, dict] = {}
+    for d in docs:
+        key = _field(d, spec["_id"])
+        out = groups.setdefault(key, {"_id": key})
+        for name, acc in spec.items():
+            if name == "_id":
+                continue
+            (op, expr), = acc.items()
+            val = _field(d, expr)
+            if op == "$sum":
+                out[name] = out.get(name, 0) + val
+            elif op == "$max" and val is not None:
+                out[name] = val if out.get(name) is None else max(out[name], val)
+            else:
+                out.setdefault(name, None)
+    return list(groups.values())
+
+
 def _apply_update(target: dict, update: dict) -> None:
     for k, v in update.get("$set", {}).items():
         target[k] = v
@@ -111,13 +145,24 @@ class FakeCollection:
                 docs = sorted(docs, key=lambda x: (x.get(field) is not None, x.get(field)), reverse=direction < 0)
         return dict(docs[0]) if docs else None
 
-    def find(self, flt: dict | None = None) -> _Cursor:
+    def find(self, flt: dict | None = None, projection: Any = None) -> _Cursor:
         flt = flt or {}
         return _Cursor([dict(d) for d in self.docs if _matches(d, flt)])
 
     async def count_documents(self, flt: dict) -> int:
         return sum(1 for d in self.docs if _matches(d, flt))
 
+    def aggregate(self, pipeline: list, **kwargs: Any) -> _Cursor:
+        docs = [dict(d) for d in self.docs]
+        for stage in pipeline:
+            if "$match" in stage:
+                docs = [d for d in docs if _matches(d, stage["$match"])]
+            elif "$group" in stage:
+                docs = _group(docs, stage["$group"])
+            else:
+                raise NotImplementedError(f"FakeCollection.aggregate: {list(stage)}")
+        return _Cursor(docs)
+
     async def update_one(self, flt: dict, update: dict, upsert: bool = False) -> _Result:
         target = next((d for d in self.docs if _matches(d, flt)), None)
         if target is None:
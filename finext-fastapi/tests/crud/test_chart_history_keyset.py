@@ -0,0 +1,103 @@
+"""
+Test phân trang keyset cho chart_history_data (before= / after= / cursor).
+
+Bao phủ:
+    - Cuộn lùi bằng before= rồi next_cursor: các trang nối liền, không trùng/sót bar, ASC trong trang.
+    - after= lấy phiên mới hơn (không gồm ngày mốc); hết dữ liệu → next_cursor None.
+    - date lưu dạng chuỗi ISO hay datetime đều lọc đúng; cursor giữ đúng kiểu gốc.
+    - Đường skip/limit cũ giữ nguyên kết quả.
+    - Tham số sai → ValueError (router trả 400).
+"""
+
+import importlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.crud.sse._cursor import decode_cursor, encode_cursor
+from tests.crud._fake_mongo import FakeDB
+
+# app.crud.sse re-export hàm cùng tên submodule → lấy module qua importlib.
+mod = importlib.import_module("app.crud.sse.chart_history_data")
+
+
+def _bars(n, as_datetime=False):
+    start = datetime(2024, 1, 1)
+    out = []
+    for i in range(n):
+        d = start + timedelta(days=i)
+        out.append({"ticker": "FPT", "date": d if as_datetime else d.strftime("%Y-%m-%dT00:00:00"), "close": float(i)})
+    return out
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeDB()
+    monkeypatch.setattr(mod, "get_database", lambda name: fake)
+    return fake
+
+
+@pytest.mark.parametrize("as_datetime", [False, True])
+async def test_scroll_back_pages_are_contiguous(db, as_datetime):
+    db.history_stock.docs = _bars(25, as_datetime) + [{"ticker": "HPG", "date": _bars(1, as_datetime)[0]["date"], "close": 0}]
+
+    page = await mod.chart_history_data(ticker="FPT", before="2024-01-21", limit=8)  # 20 bar trước 21/1
+    closes = [b["close"] for b in page["data"]]
+    assert closes == [12.0, 13.0, 14.0, 15.0, 16.0, 17.0, 18.0, 19.0]
+
+    seen = list(closes)
+    while page["next_cursor"]:
+        page = await mod.chart_history_data(ticker="FPT", cursor=page["next_cursor"], limit=8)
+        seen = [b["close"] for b in page["data"]] + seen
+    assert seen == [float(i) for i in range(20)]
+
+
+@pytest.mark.parametrize("as_datetime", [False, True])
+async def test_after_excludes_anchor_day(db, as_datetime):
+    db.history_stock.docs = _bars(10, as_datetime)
+    page = await mod.chart_history_data(ticker="FPT", after="2024-01-07", limit=5)
+    assert [b["close"] for b in page["data"]] == [7.0, 8.0, 9.0]
+    assert page["next_cursor"] is None
+
+
+async def test_cursor_keeps_value_type():
+    dt = datetime(2024, 5, 6)
+    assert decode_cursor(encode_cursor("before", dt)) == {"dir": "before", "v": dt}
+    assert decode_cursor(encode_cursor("after", "2024-05-06T00:00:00")) == {"dir": "after", "v": "2024-05-06T00:00:00"}
+
+
+async def test_legacy_skip_path_unchanged(db):
+    db.history_stock.docs = _bars(10)
+    docs = await mod.chart_history_data(ticker="FPT", skip=2, limit=3)
+    assert [b["close"] for b in docs] == [5.0, 6.0, 7.0]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"before": "2024-01-01", "after": "2024-01-01"},
+        {"before": "01/01/2024"},
+        {"cursor": "not-a-cursor"},
+        {"cursor": encode_cursor("sideways", "x")},
+    ],
+)
+def test_invalid_page_params(kwargs):
+    with pytest.raises(ValueError):
+        mod.parse_history_page(**kwargs)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"keyword": "home_hist_stock", "before": "2024-01-01"},
+        {"keyword": "chart_history_data", "cursor": "garbage"},
+    ],
+)
+async def test_rest_rejects_bad_page_params(kwargs):
+    from fastapi import HTTPException
+
+    import app.routers.sse as sse
+
+    with pytest.raises(HTTPException) as exc:
+        await sse.rest_query_endpoint(**kwargs)
+    assert exc.value.status_code == 400
@@ -0,0 +1,112 @@
+"""
+Test keyword screener_query (crud/sse/screener_query.py) + tham số filter= trên /sse/rest.
+
+Bao phủ:
+    - Lọc khoảng số (NaN/thiếu không khớp), tập giá trị chuỗi/số, bằng 1 giá trị; AND giữa các cột.
+    - Sort số/chuỗi asc/desc, thiếu giá trị luôn cuối, top-N; chỉ trả cột được chọn (+ ticker).
+    - Frame dựng 1 lần / snapshot; cột lạ, cú pháp sai → 400.
+"""
+
+import importlib
+import json
+
+import pytest
+from fastapi import HTTPException
+
+import app.crud.sse._snapshot as snap
+import app.routers.sse as sse
+from app.crud.sse._snapshot import SnapshotManager
+from app.crud.sse.screener_query import ScreenerFrame, ScreenerQueryError, parse_screener_fields, parse_screener_filter
+from tests.crud._fake_mongo import FakeDB
+
+_ROWS = [
+    {"ticker": "VCB", "exchange": "HOSE", "industry_name": "Ngân hàng", "pe": 14.0, "marketcap": 500.0, "week": 42},
+    {"ticker": "ACB", "exchange": "HOSE", "industry_name": "Ngân hàng", "pe": 6.5, "marketcap": 110.0, "week": 42},
+    {"ticker": "SHS", "exchange": "HNX", "industry_name": "Chứng khoán", "pe": float("nan"), "marketcap": 12.0, "week": 42},
+    {"ticker": "BVH", "exchange": "HOSE", "industry_name": "Bảo hiểm", "pe": 18.0, "marketcap": 35.0, "week": 42},
+    {"ticker": "XYZ", "exchange": None, "industry_name": None, "marketcap": 1.0, "week": 42},
+]
+
+
+def _tickers(rows):
+    return [r["ticker"] for r in rows]
+
+
+def test_filters():
+    frame = ScreenerFrame(_ROWS)
+    assert _tickers(frame.query({"pe": {"gte": 6, "lte": 15}})) == ["VCB", "ACB"]
+    assert _tickers(frame.query({"pe": {"gt": 14}})) == ["BVH"]
+    assert _tickers(frame.query({"industry_name": ["Ngân hàng", "Bảo hiểm", "Không có"]})) == ["VCB", "ACB", "BVH"]
+    assert _tickers(frame.query({"exchange": "HNX"})) == ["SHS"]
+    assert _tickers(frame.query({"exchange": ["HOSE"], "marketcap": {"lt": 200}})) == ["ACB", "BVH"]
+    assert _tickers(frame.query({"marketcap": [12, 35]})) == ["SHS", "BVH"]
+    assert frame.query({"exchange": "UPCOM"}) == []
+
+
+def test_sort_limit_and_columns():
+    frame = ScreenerFrame(_ROWS)
+    assert _tickers(frame.query(sort_by="pe", sort_order="desc")) == ["BVH", "VCB", "ACB", "SHS", "XYZ"]
+    assert _tickers(frame.query(sort_by="pe")) == ["ACB", "VCB", "BVH", "SHS", "XYZ"]
+    assert _tickers(frame.query(sort_by="industry_name")) == ["BVH", "SHS", "VCB", "ACB", "XYZ"]
+    assert _tickers(frame.query(sort_by="industry_name", sort_order="desc")) == ["VCB", "ACB", "SHS", "BVH", "XYZ"]
+    top = frame.query({"exchange": "HOSE"}, sort_by="marketcap", sort_order="desc", limit=2, fields=parse_screener_fields("marketcap"))
+    assert top == [{"ticker": "VCB", "marketcap": 500.0}, {"ticker": "ACB", "marketcap": 110.0}]
+    assert "week" not in frame.query(limit=1)[0] and len(frame.query(limit=1)) == 1
+
+
+def test_errors():
+    frame = ScreenerFrame(_ROWS)
+    with pytest.raises(ScreenerQueryError):
+        frame.query({"nope": {"gt": 1}})
+    with pytest.raises(ScreenerQueryError):
+        frame.query({"exchange": {"gt": 1}})
+    with pytest.raises(ScreenerQueryError):
+        frame.query(sort_by="nope")
+    with pytest.raises(ScreenerQueryError):
+        frame.query(fields=["ticker", "nope"])
+    for raw in ("[1]", "{bad", '{"pe": {"between": 1}}', '{"pe": {"gt": "1"}}', '{"x": []}', '{"x": {"a": 1}}', '{"x": null}'):
+        with pytest.raises(ScreenerQueryError):
+            parse_screener_filter(raw)
+    assert parse_screener_filter(None) is None
+    assert parse_screener_filter('{"pe": {"lt": 10}, "exchange": ["HOSE"]}') == {"pe": {"lt": 10}, "exchange": ["HOSE"]}
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = FakeDB()
+    fake.get_collection("today_stock").docs = [dict(r) for r in _ROWS]
+    monkeypatch.setattr(importlib.import_module("app.crud.sse.screener_query"), "get_database", lambda _n: fake)
+    monkeypatch.setattr(snap, "snapshots", SnapshotManager(max_age=60.0))
+    return fake
+
+
+async def test_frame_built_once_per_snapshot(fake_db, monkeypatch):
+    mod = importlib.import_module("app.crud.sse.screener_query")
+    built = []
+    real_init = mod.ScreenerFrame.__init__
+
+    def _init(self, rows):
+        built.append(len(rows))
+        real_init(self, rows)
+
+    monkeypatch.setattr(mod.ScreenerFrame, "__init__", _init)
+    assert _tickers(await mod.screener_query(filters={"exchange": "HOSE"})) == ["VCB", "ACB", "BVH"]
+    assert _tickers(await mod.screener_query(sort_by="marketcap", limit=1)) == ["XYZ"]
+    assert built == [5]
+
+
+async def test_rest_endpoint(fake_db):
+    resp = await sse.rest_query_endpoint(
+        keyword="screener_query", projection=None, screener_filter='{"industry_name": ["Ngân hàng"]}',
+        sort_by="pe", sort_order="asc", limit=None, fields="pe", wire_format="columnar",
+    )
+    assert json.loads(resp.body)["data"] == {"columns": ["ticker", "pe"], "values": [["ACB", "VCB"], [6.5, 14.0]]}
+
+    for kwargs in ({"screener_filter": "{bad"}, {"screener_filter": '{"nope": "x"}'}, {"sort_by": "nope"}):
+        with pytest.raises(HTTPException) as ei:
+            await sse.rest_query_endpoint(keyword="screener_query", projection=None, **kwargs)
+        assert ei.value.status_code == 400
+
+    with pytest.raises(HTTPException) as ei:
+        await sse.rest_query_endpoint(keyword="home_today_stock", projection=None, screener_filter='{"pe": {"gt": 1}}')
+    assert ei.value.status_code == 400
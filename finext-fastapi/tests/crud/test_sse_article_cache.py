@@ -0,0 +1,147 @@
+"""
+Test cache nội dung bài viết news_article / report_article (crud/sse/_article_cache.py).
+
+Bao phủ:
+    - LRU theo tổng bytes: vượt trần → bỏ bài ít dùng nhất; bài quá lớn / quá max_age không giữ.
+    - news_article: mọi projection dùng chung 1 lần đọc Mongo, kết quả là bản sao; không tìm thấy → không cache.
+    - Single-flight: nhiều request cùng slug đang miss → 1 lần đọc.
+    - Warm-up nạp bài hôm nay (giờ VN); hit_ratio trong stats.
+    - REST: bài tồn tại → Cache-Control immutable + ETag; không tìm thấy → policy static thường.
+"""
+
+import asyncio
+import importlib
+from datetime import datetime, timedelta
+
+import pytest
+
+import app.crud.sse._article_cache as ac
+import app.routers.sse as sse
+from app.crud.sse._article_cache import ArticleCache
+from app.crud.sse._rest_cache import rest_cache
+from app.utils.market_session import VN_TZ
+from tests.crud._fake_mongo import FakeDB
+
+# app.crud.sse.news_article bị che bởi hàm cùng tên re-export trong crud/sse/__init__.py.
+news_article_module = importlib.import_module("app.crud.sse.news_article")
+report_article_module = importlib.import_module("app.crud.sse.report_article")
+
+
+class _CountingDB(FakeDB):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get_collection(self, name):
+        coll = super().get_collection(name)
+        if not getattr(coll, "_counted", False):
+            db, find_one = self, coll.find_one
+
+            async def _find_one(flt, projection=None, sort=None):
+                db.reads += 1
+                await asyncio.sleep(0)
+                return await find_one(flt, projection, sort)
+
+            coll.find_one, coll._counted = _find_one, True
+        return coll
+
+
+def _article(slug, created_at="2026-10-16T09:00:00+07:00", body="x" * 200):
+    return {"article_slug": slug, "title": f"Tin {slug}", "sapo": "...", "content": body, "created_at": created_at}
+
+
+@pytest.fixture
+def env(monkeypatch):
+    db = _CountingDB()
+    db.get_collection("news_daily").docs = [_article("a"), _article("b")]
+    db.get_collection("news_report").docs = [{"report_slug": "r", "title": "Bản tin", "created_at": "2026-10-16T08:00:00+07:00"}]
+    cache = ArticleCache(64 * 1024)
+    monkeypatch.setattr(ac, "article_cache", cache)
+    monkeypatch.setattr(ac, "get_database", lambda _n: db)
+    rest_cache.clear()
+    yield db, cache
+    rest_cache.clear()
+
+
+def test_lru_is_byte_bounded():
+    cache = ArticleCache(1200, max_entry_ratio=0.5)  # mỗi bài ~500 bytes → giữ được 2
+    cache.put("news_daily", "a", _article("a", body="x" * 400))
+    cache.put("news_daily", "b", _article("b", body="x" * 400))
+    assert cache.get("news_daily", "a") is not None  # a dùng gần nhất → b bị bỏ trước
+    cache.put("news_daily", "c", _article("c", body="x" * 400))
+    assert cache.get("news_daily", "b") is None and cache.get("news_daily", "a") is not None
+    assert cache.stats()["bytes"] <= 1200 and cache.evictions == 1
+    cache.put("news_daily", "big", _article("big", body="x" * 700))  # > 1/2 trần → không giữ
+    assert cache.get("news_daily", "big") is None
+
+
+def test_entries_expire_after_max_age(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ac.time, "monotonic", lambda: now[0])
+    cache = ArticleCache(10_000, max_age=60)
+    cache.put("news_daily", "a", _article("a"))
+    now[0] += 59
+    assert cache.get("news_daily", "a") is not None
+    now[0] += 2
+    assert cache.get("news_daily", "a") is None and cache.stats()["entries"] == 0
+
+
+async def test_projections_share_one_read_and_return_copies(env):
+    db, cache = env
+    full = await news_article_module.news_article(article_slug="a")
+    meta = await news_article_module.news_article(article_slug="a", projection={"_id": 0, "title": 1, "sapo": 1})
+    no_body = await news_article_module.news_article(article_slug="a", projection={"_id": 0, "content": 0})
+    assert full["article"]["content"] == "x" * 200
+    assert meta["article"] == {"title": "Tin a", "sapo": "..."}
+    assert "content" not in no_body["article"] and no_body["article"]["title"] == "Tin a"
+    assert db.reads == 1
+
+    full["article"]["title"] = "sửa"
+    assert (await news_article_module.news_article(article_slug="a"))["article"]["title"] == "Tin a"
+    assert cache.stats()["hit_ratio"] == 0.75
+
+    report = await report_article_module.report_article(report_slug="r")
+    assert report["report"]["title"] == "Bản tin" and db.reads == 2
+
+
+async def test_missing_article_not_cached(env):
+    db, cache = env
+    assert (await news_article_module.news_article(article_slug="new"))["article"] is None
+    db.get_collection("news_daily").docs.append(_article("new"))
+    assert (await news_article_module.news_article(article_slug="new"))["article"]["title"] == "Tin new"
+    assert db.reads == 2
+
+
+async def test_concurrent_misses_read_once(env):
+    db, _ = env
+    results = await asyncio.gather(*(news_article_module.news_article(article_slug="b") for _ in range(10)))
+    assert all(r["article"]["article_slug"] == "b" for r in results) and db.reads == 1
+
+
+async def test_warm_up_loads_todays_articles(env):
+    db, cache = env
+    today = datetime.now(VN_TZ).replace(hour=8, minute=0, second=0, microsecond=0)
+    db.get_collection("news_daily").docs = [
+        _article("today", created_at=today.isoformat()),
+        _article("yesterday", created_at=(today - timedelta(days=1)).isoformat()),
+    ]
+    db.get_collection("news_report").docs = []
+    await ac.warm_article_cache()
+    assert cache.warmed == 1 and cache.get("news_daily", "today") is not None
+    await news_article_module.news_article(article_slug="today")
+    assert db.reads == 0
+
+
+async def test_rest_headers_immutable_only_for_found_articles(env, monkeypatch):
+    db, _ = env
+    monkeypatch.setattr(importlib.import_module("app.crud.sse.news_daily"), "get_database", lambda _n: db)
+    response = await sse._rest_query("news_article", article_slug="a")
+    assert response.headers["Cache-Control"] == f"public, max-age={ac.ARTICLE_CACHE_MAX_AGE}, immutable"
+    assert ac.ARTICLE_CACHE_MAX_AGE == 21600
+    assert response.headers["ETag"]
+    etag = response.headers["ETag"]
+    assert (await sse._rest_query("news_article", article_slug="a", if_none_match=etag)).status_code == 304
+
+    missing = await sse._rest_query("news_article", article_slug="nope")
+    assert "immutable" not in missing.headers["Cache-Control"]
+    assert "immutable" not in (await sse._rest_query("news_daily")).headers["Cache-Control"]
@@ -0,0 +1,155 @@
+"""
+Test circuit breaker cho query dữ liệu thị trường (crud/sse/_breaker.py).
+
+Bao phủ:
+    - Đủ số lỗi + tỉ lệ lỗi trong cửa sổ → open; chưa đủ tỉ lệ → vẫn closed.
+    - Open: từ chối ngay (CircuitOpenError), không chạy query.
+    - Hết OPEN_SECONDS → half-open: đúng 1 query thăm dò; thành công → closed, lỗi → open lại.
+    - Lỗi của request (ValueError, OperationFailure do query sai), RuntimeError thường và query bị
+      governor cắt không tính là Mongo hỏng; timeout/mất kết nối bọc trong RuntimeError vẫn tính.
+    - get_collection_records ném thẳng OperationFailure (không retry, không bọc RuntimeError).
+"""
+
+import asyncio
+
+import pytest
+from pymongo.errors import AutoReconnect, ExecutionTimeout, OperationFailure, ServerSelectionTimeoutError
+
+import app.crud.sse._breaker as br
+from app.core.query_governor import QueryShedError
+from app.crud.sse._breaker import CircuitBreaker, CircuitOpenError, is_infrastructure_error, stale_marker
+from app.crud.sse._helpers import get_collection_records
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(br.time, "monotonic", lambda: now[0])
+    return now
+
+
+async def _run(breaker, exc=None):
+    async with breaker.guard():
+        if exc is not None:
+            raise exc
+
+
+async def _fail(breaker, times=1):
+    for _ in range(times):
+        with pytest.raises(ServerSelectionTimeoutError):
+            await _run(breaker, ServerSelectionTimeoutError("down"))
+
+
+async def test_trips_on_error_rate(clock):
+    b = CircuitBreaker(failure_threshold=3, failure_ratio=0.5, window=30, open_seconds=10)
+    for _ in range(4):
+        await _run(b)
+    await _fail(b, times=3)
+    assert b.state == "closed"  # 3/7 lỗi < 50%
+    await _fail(b)
+    assert b.state == "open" and b.stats()["trips"] == 1
+
+
+async def test_old_failures_leave_the_window(clock):
+    b = CircuitBreaker(failure_threshold=3, window=30)
+    await _fail(b, times=2)
+    clock[0] += 31
+    await _fail(b)
+    assert b.state == "closed" and b.stats()["failures"] == 1
+
+
+async def test_open_rejects_without_running(clock):
+    b = CircuitBreaker(failure_threshold=1, open_seconds=10)
+    await _fail(b)
+    ran = []
+    with pytest.raises(CircuitOpenError):
+        async with b.guard():
+            ran.append(1)
+    assert not ran and b.stats()["rejected"] == 1
+    assert b.retry_in() == 10.0
+
+
+async def test_half_open_allows_single_probe(clock):
+    b = CircuitBreaker(failure_threshold=1, open_seconds=10)
+    await _fail(b)
+    clock[0] += 10
+    assert b.state == "half_open"
+
+    gate = asyncio.Event()
+
+    async def _probe():
+        async with b.guard():
+            await gate.wait()
+
+    probe = asyncio.ensure_future(_probe())
+    await asyncio.sleep(0)
+    with pytest.raises(CircuitOpenError):
+        await _run(b)  # thăm dò đang chạy → các query khác vẫn bị từ chối
+    gate.set()
+    await probe
+    assert b.state == "closed"
+    await _run(b)
+
+
+async def test_failed_probe_reopens(clock):
+    b = CircuitBreaker(failure_threshold=1, open_seconds=10)
+    await _fail(b)
+    clock[0] += 10
+    await _fail(b)
+    assert b.state == "open" and b.stats()["trips"] == 2
+    assert b.retry_in() == 10.0
+
+
+def _wrapped(cause):
+    try:
+        raise RuntimeError("Failed to fetch data") from cause
+    except RuntimeError as e:
+        return e
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        ValueError("bad keyword"),
+        QueryShedError("realtime", "overloaded"),
+        OperationFailure("Cannot do exclusion on field b in inclusion projection", code=2),
+        RuntimeError("bug trong keyword"),
+        _wrapped(OperationFailure("Unauthorized", code=13)),
+    ],
+)
+async def test_request_errors_do_not_count(clock, exc):
+    b = CircuitBreaker(failure_threshold=1)
+    for _ in range(3):
+        with pytest.raises(type(exc)):
+            await _run(b, exc)
+    assert b.state == "closed" and b.stats()["failures"] == 0
+
+
+def test_network_and_timeout_errors_count_even_when_wrapped():
+    assert is_infrastructure_error(AutoReconnect("reset"))
+    assert is_infrastructure_error(asyncio.TimeoutError())
+    assert is_infrastructure_error(_wrapped(ExecutionTimeout("operation exceeded time limit", code=50)))
+    assert is_infrastructure_error(_wrapped(ServerSelectionTimeoutError("down")))
+    assert not is_infrastructure_error(_wrapped(ValueError("x")))
+
+
+async def test_helper_reraises_operation_failure_without_retry():
+    calls = []
+
+    class _Collection:
+        def find(self, *args):
+            calls.append(args)
+            raise OperationFailure("Cannot do exclusion on field b in inclusion projection", code=2)
+
+    class _DB:
+        def get_collection(self, name):
+            return _Collection()
+
+    with pytest.raises(OperationFailure):
+        await get_collection_records(_DB(), "today_stock", projection={"a": 1, "b": 0})
+    assert len(calls) == 1
+
+
+def test_stale_marker():
+    assert stale_marker(12.345) == {"stale": True, "age": 12.3}
+    assert stale_marker(1, "a") == {"stale": True, "age": 1, "channel": "a"}
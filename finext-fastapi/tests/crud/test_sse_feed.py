@@ -0,0 +1,179 @@
+"""
+Test feed news_daily / news_report: phân trang keyset + cache tổng số bài (crud/sse/_feed.py).
+
+Bao phủ:
+    - Cuộn bằng next_cursor: các trang nối liền, bài trùng created_at không trùng/sót (khoá phụ slug),
+      cùng thứ tự với skip/limit; has_next từ limit+1, trang cuối next_cursor None.
+    - Tổng số bài: cuộn trang không đếm lại; bài mới đổi bài đầu trang 1 → đếm lại; trang cuối tự biết tổng.
+    - Projection không có created_at/slug vẫn tạo được cursor, field thêm vào bị bỏ trước khi trả.
+    - Cursor hỏng / lệch sort → ValueError; router trả 400, keyword khác không nhận cursor.
+"""
+
+import importlib
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+import app.routers.sse as sse
+from app.crud.sse._cursor import encode_cursor
+from app.crud.sse._feed import feed_counts
+from app.crud.sse._rest_cache import rest_cache
+from tests.crud._fake_mongo import FakeDB
+
+# app.crud.sse re-export hàm cùng tên submodule → lấy module qua importlib.
+news_daily_module = importlib.import_module("app.crud.sse.news_daily")
+news_report_module = importlib.import_module("app.crud.sse.news_report")
+
+_T0 = datetime(2026, 10, 16, 9, 0)
+
+
+def _article(i, seconds_ago, news_type="trong_nuoc", category="thi-truong"):
+    created = (_T0 - timedelta(seconds=seconds_ago)).isoformat()
+    return {"article_slug": f"bai-{i:03d}", "title": f"Bài {i}", "news_type": news_type, "category": category, "created_at": created}
+
+
+class _CountingDB(FakeDB):
+    def __init__(self):
+        super().__init__()
+        self.counts = 0
+
+    def get_collection(self, name):
+        coll = super().get_collection(name)
+        db = self
+        original = type(coll).count_documents
+
+        async def _count(flt):
+            db.counts += 1
+            return await original(coll, flt)
+
+        coll.count_documents = _count
+        return coll
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = _CountingDB()
+    # 30 bài, cứ 3 bài chung 1 giây (created_at trùng) + 1 bài loại khác.
+    fake.get_collection("news_daily").docs = [_article(i, seconds_ago=i // 3) for i in range(30)]
+    fake.get_collection("news_daily").docs.append(_article(99, 0, news_type="quoc_te"))
+    monkeypatch.setattr(news_daily_module, "get_database", lambda name: fake)
+    monkeypatch.setattr(news_report_module, "get_database", lambda name: fake)
+    feed_counts.clear()
+    yield fake
+    feed_counts.clear()
+
+
+def _slugs(page):
+    return [a["article_slug"] for a in page["items"]]
+
+
+async def test_cursor_pages_match_skip_order_with_ties(db):
+    full = await news_daily_module.news_daily(news_type="trong_nuoc", limit=100)
+    assert len(full["items"]) == 30 and full["pagination"]["next_cursor"] is None
+
+    page = await news_daily_module.news_daily(news_type="trong_nuoc", limit=7)
+    seen = _slugs(page)
+    assert page["pagination"]["has_next"] and page["pagination"]["page"] == 1
+    while page["pagination"]["next_cursor"]:
+        page = await news_daily_module.news_daily(news_type="trong_nuoc", limit=7, cursor=page["pagination"]["next_cursor"])
+        assert page["pagination"]["page"] is None and page["pagination"]["has_prev"]
+        seen += _slugs(page)
+    assert seen == _slugs(full)
+    assert not page["pagination"]["has_next"] and len(page["items"]) == 30 % 7
+
+    skip_page = await news_daily_module.news_daily(news_type="trong_nuoc", limit=7, page=3)
+    assert _slugs(skip_page) == _slugs(full)[14:21]
+
+
+async def test_asc_cursor_and_datetime_created_at(db):
+    for doc in db.get_collection("news_daily").docs:
+        doc["created_at"] = datetime.fromisoformat(doc["created_at"])
+    page = await news_daily_module.news_daily(news_type="trong_nuoc", limit=12, sort_order="asc")
+    seen = _slugs(page)
+    while page["pagination"]["next_cursor"]:
+        page = await news_daily_module.news_daily(news_type="trong_nuoc", limit=12, sort_order="asc", cursor=page["pagination"]["next_cursor"])
+        seen += _slugs(page)
+    assert len(seen) == 30 and len(set(seen)) == 30
+    assert [db.get_collection("news_daily").docs[int(s[4:])]["created_at"] for s in seen] == sorted(
+        d["created_at"] for d in db.get_collection("news_daily").docs if d["news_type"] == "trong_nuoc"
+    )
+
+
+async def test_total_is_cached_until_new_article_lands(db):
+    page = await news_daily_module.news_daily(news_type="trong_nuoc", limit=10)
+    assert page["pagination"]["total"] == 30 and page["pagination"]["total_pages"] == 3 and db.counts == 1
+    page = await news_daily_module.news_daily(news_type="trong_nuoc", limit=10, cursor=page["pagination"]["next_cursor"])
+    await news_daily_module.news_daily(news_type="trong_nuoc", limit=10)
+    assert page["pagination"]["total"] == 30 and db.counts == 1
+
+    db.get_collection("news_daily").docs.append(_article(100, -60))
+    page = await news_daily_module.news_daily(news_type="trong_nuoc", limit=10)
+    assert _slugs(page)[0] == "bai-100" and page["pagination"]["total"] == 31 and db.counts == 2
+    # Bộ lọc khác → entry riêng.
+    await news_daily_module.news_daily(categories="thi-truong", limit=10)
+    assert db.counts == 3
+
+
+async def test_last_page_knows_total_without_counting(db):
+    page = await news_daily_module.news_daily(news_type="quoc_te", limit=10)
+    assert page["pagination"]["total"] == 1 and not page["pagination"]["has_next"]
+    page = await news_daily_module.news_daily(news_type="trong_nuoc", limit=10, page=3)
+    assert page["pagination"]["total"] == 30 and not page["pagination"]["has_next"]
+    assert db.counts == 0 and feed_counts.stats()["exact"] == 2
+
+
+async def test_projection_without_keys_still_paginates(db):
+    full = await news_daily_module.news_daily(news_type="trong_nuoc", limit=10)
+    page = await news_daily_module.news_daily(news_type="trong_nuoc", limit=5, projection={"_id": 0, "title": 1})
+    assert page["pagination"]["next_cursor"] and "created_at" not in page["items"][0] and "article_slug" not in page["items"][0]
+    page = await news_daily_module.news_daily(news_type="trong_nuoc", limit=5, projection={"_id": 0, "title": 1},
+                                              cursor=page["pagination"]["next_cursor"])
+    assert [a["title"] for a in page["items"]] == [a["title"] for a in full["items"][5:10]]
+
+
+async def test_news_report_uses_report_slug(db):
+    db.get_collection("news_report").docs = [
+        {"report_slug": f"r{i}", "report_type": "daily", "created_at": (_T0 - timedelta(days=i // 2)).isoformat()} for i in range(5)
+    ]
+    page = await news_report_module.news_report(report_type="daily", limit=2)
+    seen = [r["report_slug"] for r in page["items"]]
+    while page["pagination"]["next_cursor"]:
+        page = await news_report_module.news_report(report_type="daily", limit=2, cursor=page["pagination"]["next_cursor"])
+        seen += [r["report_slug"] for r in page["items"]]
+    assert seen == ["r1", "r0", "r3", "r2", "r4"]
+
+
+async def test_invalid_cursor_rejected(db):
+    desc_cursor = encode_cursor("before", _T0.isoformat(), key="bai-001")
+    with pytest.raises(ValueError, match="Cursor"):
+        await news_daily_module.news_daily(cursor="not-a-cursor")
+    with pytest.raises(ValueError, match="sort_order"):
+        await news_daily_module.news_daily(cursor=desc_cursor, sort_order="asc")
+    with pytest.raises(ValueError, match="sort_order"):
+        await news_daily_module.news_daily(cursor=encode_cursor("before", _T0.isoformat()))  # thiếu khoá phụ
+    with pytest.raises(ValueError, match="sort_by"):
+        await news_daily_module.news_daily(cursor=desc_cursor, sort_by="updated_at")
+
+
+async def test_rest_validates_cursor(monkeypatch):
+    rest_cache.clear()
+    calls = []
+
+    async def _query(keyword, **kwargs):
+        calls.append(kwargs["page"])
+        return {"items": [], "pagination": {}}
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    try:
+        for keyword, cursor in (("news_daily", "xx"), ("news_daily", encode_cursor("after", "2026-10-16", key="a")),
+                                ("home_today_index", encode_cursor("before", "2026-10-16", key="a"))):
+            with pytest.raises(HTTPException) as ei:
+                await sse._rest_query(keyword, cursor=cursor)
+            assert ei.value.status_code == 400
+        cursor = encode_cursor("before", "2026-10-16T09:00:00", key="bai-001")
+        await sse._rest_query("news_report", cursor=cursor, page=3)
+        await sse._rest_query("news_report", cursor=cursor, page=5)  # page bị bỏ → cùng entry cache
+        assert calls == [None]
+    finally:
+        rest_cache.clear()
@@ -0,0 +1,168 @@
+"""
+Test index advisor (crud/sse/_index_advisor.py).
+
+Bao phủ:
+    - Đọc winning plan (dạng cổ điển lồng inputStage + dạng SBE `queryPlan`): chuỗi stage, index,
+      COLLSCAN, SORT trong RAM, docs examined / returned.
+    - Đề xuất index theo ESR (equality → sort → range), distinct → index trên key, $or → không đề xuất.
+    - Probe thay SAMPLE bằng giá trị của document thật (field mảng → 1 phần tử); collection rỗng → bỏ qua.
+    - advise_indexes: gộp đề xuất trùng giữa keyword, create=True tạo index còn thiếu, lần sau hết COLLSCAN.
+"""
+
+import pytest
+
+from app.crud.sse._index_advisor import (
+    STATUS_ERROR,
+    STATUS_FULL_READ,
+    STATUS_NEEDS_INDEX,
+    STATUS_OK,
+    STATUS_SKIPPED,
+    _covered_by,
+    advise_indexes,
+    run_probe,
+    suggest_index,
+    summarize_explain,
+)
+from app.crud.sse._spec import SAMPLE, QueryProbe
+
+
+def _explain(stage_tree, docs=100, returned=5):
+    return {
+        "queryPlanner": {"winningPlan": stage_tree},
+        "executionStats": {"totalDocsExamined": docs, "totalKeysExamined": 0, "nReturned": returned},
+    }
+
+
+def test_summarize_classic_and_sbe_plans():
+    ixscan = {"stage": "LIMIT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "ticker_1_date_1"}}}
+    out = summarize_explain(_explain(ixscan, docs=5))
+    assert out["plan"] == "LIMIT → FETCH → IXSCAN(ticker_1_date_1)"
+    assert out["index"] == "ticker_1_date_1" and not out["collscan"] and not out["in_memory_sort"]
+
+    sbe = {"queryPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}}
+    out = summarize_explain(_explain(sbe, docs=1000, returned=3))
+    assert out["collscan"] and out["in_memory_sort"] and out["index"] is None
+    assert (out["docs_examined"], out["returned"]) == (1000, 3)
+
+
+@pytest.mark.parametrize(
+    "probe,expected",
+    [
+        (
+            QueryProbe("stock_db.finstats_stock", {"ticker": "FPT", "period": {"$regex": "_[1-4]$"}}, sort=(("period", -1),)),
+            [("ticker", 1), ("period", -1)],
+        ),
+        (QueryProbe("stock_db.nntd_stock", {"ticker": "FPT", "type": "NN"}), [("ticker", 1), ("type", 1)]),
+        (QueryProbe("stock_db.other_ticker", {"ticker": "GOLD"}, sort=(("date", -1),)), [("ticker", 1), ("date", -1)]),
+        (QueryProbe("stock_db.phase_rank", {"date": {"$gte": "2026-01-01"}}, sort=(("date", -1),)), [("date", -1)]),
+        (QueryProbe("stock_db.phase_rank", distinct="date"), [("date", 1)]),
+        (QueryProbe("stock_db.phase_rank", {"$or": [{"a": 1}, {"b": 2}]}), None),
+        (QueryProbe("stock_db.phase_daily"), None),
+    ],
+)
+def test_suggest_index_esr(probe, expected):
+    assert suggest_index(probe) == expected
+
+
+def test_covered_by_prefix_or_reversed():
+    assert _covered_by([("ticker", 1)], [[("ticker", 1), ("date", 1)]])
+    assert _covered_by([("ticker", 1), ("date", 1)], [[("ticker", -1), ("date", -1)]])
+    assert not _covered_by([("ticker", 1), ("date", -1)], [[("ticker", 1), ("date", 1)]])
+    assert not _covered_by([("date", 1)], [[("ticker", 1), ("date", 1)]])
+
+
+class _Collection:
+    def __init__(self, name, docs):
+        self.name, self.docs = name, docs
+        self.indexes = {"_id_": {"key": [("_id", 1)]}}
+
+    async def find_one(self, flt=None, projection=None, sort=None):
+        return self.docs[-1] if self.docs else None
+
+    async def index_information(self):
+        return self.indexes
+
+    async def create_index(self, keys):
+        name = "_".join(f"{k}_{d}" for k, d in keys)
+        self.indexes[name] = {"key": list(keys)}
+        return name
+
+
+class _DB:
+    """Explain giả: dùng IXSCAN nếu có index bắt đầu bằng field đầu tiên của filter/sort, ngược lại COLLSCAN."""
+
+    def __init__(self, collections, fail=False):
+        self.collections, self.fail = collections, fail
+        self.commands = []
+
+    def get_collection(self, name):
+        return self.collections[name]
+
+    async def command(self, cmd):
+        if self.fail:
+            raise RuntimeError("explain not allowed")
+        self.commands.append(cmd)
+        inner = cmd["explain"]
+        coll = self.collections[inner.get("find") or inner.get("distinct")]
+        fields = list(inner.get("filter", inner.get("query", {}))) + list(inner.get("sort", {}))
+        if inner.get("distinct"):
+            fields.append(inner["key"])
+        for name, info in coll.indexes.items():
+            if fields and info["key"][0][0] == fields[0]:
+                return _explain({"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": name}}, docs=1)
+        leaf = {"stage": "COLLSCAN"}
+        return _explain({"stage": "SORT", "inputStage": leaf} if inner.get("sort") else leaf)
+
+
+def _getter(db):
+    return lambda name: db
+
+
+async def test_probe_resolves_sample_values():
+    coll = _Collection("news_daily", [{"tickers": ["FPT", "VNM"], "news_type": "trong_nuoc"}])
+    db = _DB({"news_daily": coll})
+    probe = QueryProbe("stock_db.news_daily", {"tickers": SAMPLE, "news_type": SAMPLE}, sort=(("created_at", -1),), limit=20)
+    report = await run_probe("search_news", probe, _getter(db))
+    assert report["filter"] == {"tickers": "FPT", "news_type": "trong_nuoc"}
+    assert db.commands[0]["explain"]["limit"] == 20 and db.commands[0]["verbosity"] == "executionStats"
+    assert report["status"] == STATUS_NEEDS_INDEX
+    assert report["suggestion"] == [("tickers", 1), ("news_type", 1), ("created_at", -1)]
+
+
+async def test_probe_skips_empty_collection_and_reports_errors():
+    db = _DB({"news_daily": _Collection("news_daily", [])})
+    probe = QueryProbe("stock_db.news_daily", {"news_type": SAMPLE})
+    assert (await run_probe("news_daily", probe, _getter(db)))["status"] == STATUS_SKIPPED
+
+    db = _DB({"phase_daily": _Collection("phase_daily", [{}])}, fail=True)
+    report = await run_probe("phase_daily", QueryProbe("stock_db.phase_daily", sort=(("date", 1),)), _getter(db))
+    assert report["status"] == STATUS_ERROR and "explain not allowed" in report["error"]
+
+
+async def test_full_read_is_not_flagged():
+    db = _DB({"latest_other_ticker": _Collection("latest_other_ticker", [{"ticker": "GOLD"}])})
+    report = await run_probe("latest_other_ticker", QueryProbe("stock_db.latest_other_ticker"), _getter(db))
+    assert report["status"] == STATUS_FULL_READ and "suggestion" not in report
+
+
+async def test_advise_creates_missing_indexes_once():
+    nntd = _Collection("nntd_stock", [{"ticker": "FPT", "type": "NN", "date": "2026-10-16"}])
+    db = _DB({"nntd_stock": nntd})
+
+    report = await advise_indexes(keywords=["nntd_stock"], db_getter=_getter(db))
+    assert report["summary"] == {STATUS_NEEDS_INDEX: 1}
+    assert report["suggestions"] == [
+        {"source": "stock_db.nntd_stock", "keys": [["ticker", 1], ["type", 1]], "keywords": ["nntd_stock"], "created": False}
+    ]
+    assert len(nntd.indexes) == 1  # chỉ báo cáo, không tạo
+
+    created = await advise_indexes(create=True, keywords=["nntd_stock"], db_getter=_getter(db))
+    assert created["suggestions"][0]["created"] is True and "ticker_1_type_1" in nntd.indexes
+
+    again = await advise_indexes(keywords=["nntd_stock"], db_getter=_getter(db))
+    assert again["summary"] == {STATUS_OK: 1} and again["suggestions"] == []
+
+
+async def test_advise_rejects_unknown_keyword():
+    with pytest.raises(ValueError):
+        await advise_indexes(keywords=["nope"])
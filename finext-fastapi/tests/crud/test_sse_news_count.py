@@ -0,0 +1,108 @@
+"""
+Test keyword news_count — bộ đếm tin trong ngày in-memory (crud/sse/news_count.py).
+
+Bao phủ:
+    - Lần đầu: 1 aggregation / collection, đếm tin hôm nay theo news_type + bản tin từ hôm qua.
+    - Trong max_age: trả từ RAM, không query; quá max_age / watcher báo đổi → chỉ đọc bài mới hơn mốc.
+    - Sang ngày mới (giờ VN) → đếm lại từ đầu ngày; type= lọc kết quả.
+"""
+
+import importlib
+from datetime import datetime
+
+import pytest
+
+from app.utils.market_session import VN_TZ
+from tests.crud._fake_mongo import FakeDB
+
+# app.crud.sse.news_count bị che bởi hàm cùng tên re-export trong crud/sse/__init__.py.
+mod = importlib.import_module("app.crud.sse.news_count")
+
+
+def _at(day, hour, minute=0):
+    return datetime(2026, 10, day, hour, minute, tzinfo=VN_TZ).isoformat()
+
+
+class _CountingDB(FakeDB):
+    def __init__(self):
+        super().__init__()
+        self.ops = []
+
+    def get_collection(self, name):
+        coll = super().get_collection(name)
+        if not getattr(coll, "_counted", False):
+            db, find, aggregate = self, coll.find, coll.aggregate
+
+            def _find(flt=None, projection=None):
+                db.ops.append(("find", name, flt))
+                return find(flt, projection)
+
+            def _aggregate(pipeline, **kwargs):
+                db.ops.append(("aggregate", name))
+                return aggregate(pipeline, **kwargs)
+
+            coll.find, coll.aggregate, coll._counted = _find, _aggregate, True
+        return coll
+
+
+@pytest.fixture
+def env(monkeypatch):
+    db = _CountingDB()
+    db.get_collection("news_daily").docs = [
+        {"article_slug": "a", "news_type": "trong_nuoc", "created_at": _at(16, 8)},
+        {"article_slug": "b", "news_type": "trong_nuoc", "created_at": _at(16, 9)},
+        {"article_slug": "c", "news_type": "quoc_te", "created_at": _at(16, 10)},
+        {"article_slug": "old", "news_type": "trong_nuoc", "created_at": _at(15, 23)},
+    ]
+    db.get_collection("news_report").docs = [
+        {"report_slug": "r1", "created_at": _at(15, 18)},
+        {"report_slug": "r0", "created_at": _at(14, 18)},
+    ]
+    now = [datetime(2026, 10, 16, 11, 0, tzinfo=VN_TZ)]
+    counter = mod.NewsCounter(max_age=30)
+    monkeypatch.setattr(mod, "news_counter", counter)
+    monkeypatch.setattr(mod, "get_database", lambda _n: db)
+    monkeypatch.setattr(mod, "_vn_now", lambda: now[0])
+    return db, counter, now
+
+
+async def test_first_call_aggregates_once_per_collection(env):
+    db, counter, _ = env
+    result = await mod.news_count()
+    assert result == {
+        "date": "2026-10-16",
+        "today_start": _at(16, 0),
+        "sources": {"thong_cao": 0, "trong_nuoc": 2, "doanh_nghiep": 0, "quoc_te": 1, "news_report": 1},
+        "total": 4,
+    }
+    assert sorted(db.ops) == [("aggregate", "news_daily"), ("aggregate", "news_report")]
+    await mod.news_count()
+    assert len(db.ops) == 2 and counter.resyncs == 1
+
+
+async def test_new_articles_added_incrementally(env):
+    db, counter, _ = env
+    await mod.news_count()
+    db.get_collection("news_daily").docs.append({"article_slug": "d", "news_type": "doanh_nghiep", "created_at": _at(16, 10, 30)})
+    counter.max_age = 0
+    result = await mod.news_count()
+    assert result["sources"]["doanh_nghiep"] == 1 and result["total"] == 5
+    assert ("find", "news_daily", {"created_at": {"$gt": _at(16, 10)}}) in db.ops
+    assert counter.resyncs == 1 and counter.increments == 1
+    # Không có bài mới → không cộng lặp.
+    assert (await mod.news_count())["total"] == 5
+
+
+async def test_resets_at_vn_day_boundary(env):
+    db, counter, now = env
+    await mod.news_count()
+    now[0] = datetime(2026, 10, 17, 0, 5, tzinfo=VN_TZ)
+    db.get_collection("news_daily").docs.append({"article_slug": "e", "news_type": "thong_cao", "created_at": _at(17, 0, 1)})
+    result = await mod.news_count()
+    assert result["date"] == "2026-10-17" and counter.resyncs == 2
+    assert result["sources"] == {"thong_cao": 1, "trong_nuoc": 0, "doanh_nghiep": 0, "quoc_te": 0, "news_report": 0}
+
+
+async def test_type_filter(env):
+    assert (await mod.news_count(type="trong_nuoc"))["sources"] == {"trong_nuoc": 2}
+    assert (await mod.news_count(type="news_report"))["sources"] == {"news_report": 1}
@@ -0,0 +1,142 @@
+"""
+Test cache kết quả /sse/rest (crud/sse/_rest_cache.py).
+
+Bao phủ:
+    - Key chuẩn hoá: bỏ tham số None, không phụ thuộc thứ tự; khác 1 tham số → khác key.
+    - Single-flight: N request trùng key cùng miss → 1 lần query; lỗi không bị cache.
+    - Request khởi xướng bị huỷ không huỷ query các request khác đang chờ.
+    - TTL hết hạn → query lại; LRU theo bytes + bỏ qua kết quả quá lớn.
+    - Endpoint REST: request trùng trong TTL không gọi lại execute_sse_query.
+"""
+
+import asyncio
+
+import pytest
+
+import app.crud.sse._rest_cache as rc
+import app.routers.sse as sse
+from app.crud.sse._rest_cache import RestCache, rest_cache, rest_cache_key
+
+
+class _Loader:
+    def __init__(self, value="v", size=10, delay=0.0, fail=False):
+        self.calls = 0
+        self.value, self.size, self.delay, self.fail = value, size, delay, fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        return self.value, self.size
+
+
+def test_key_normalization():
+    assert rest_cache_key("k", {"a": 1, "b": None}) == rest_cache_key("k", {"a": 1})
+    assert rest_cache_key("k", {"a": 1, "c": 2}) == rest_cache_key("k", {"c": 2, "a": 1})
+    assert rest_cache_key("k", {"a": 1}) != rest_cache_key("k", {"a": 2})
+    assert rest_cache_key("k", {"p": {"x": 1}}) != rest_cache_key("k2", {"p": {"x": 1}})
+
+
+async def test_single_flight_and_hits():
+    cache = RestCache(1000)
+    loader = _Loader(delay=0.02)
+    results = await asyncio.gather(*(cache.get_or_load("k", 10, loader) for _ in range(50)))
+    assert results == ["v"] * 50 and loader.calls == 1
+    assert await cache.get_or_load("k", 10, loader) == "v" and loader.calls == 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 49, 1)
+
+
+async def test_errors_are_shared_not_cached():
+    cache = RestCache(1000)
+    loader = _Loader(delay=0.01, fail=True)
+    results = await asyncio.gather(*(cache.get_or_load("k", 10, loader) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results) and loader.calls == 1
+    loader.fail = False
+    assert await cache.get_or_load("k", 10, loader) == "v" and loader.calls == 2
+
+
+async def test_cancelled_initiator_does_not_cancel_shared_query():
+    cache = RestCache(1000)
+    loader = _Loader(delay=0.05)
+    first = asyncio.create_task(cache.get_or_load("k", 10, loader))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(cache.get_or_load("k", 10, loader))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "v" and loader.calls == 1
+
+
+async def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rc.time, "monotonic", lambda: now[0])
+    cache = RestCache(1000)
+    loader = _Loader()
+    await cache.get_or_load("k", 5, loader)
+    now[0] += 4.9
+    await cache.get_or_load("k", 5, loader)
+    assert loader.calls == 1
+    now[0] += 0.2
+    await cache.get_or_load("k", 5, loader)
+    assert loader.calls == 2
+
+
+async def test_lru_bounded_by_bytes():
+    cache = RestCache(100)  # max_entry_bytes = 25
+    for key in "abcd":
+        await cache.get_or_load(key, 10, _Loader(size=25))
+    await cache.get_or_load("a", 10, _Loader())  # chạm a → b thành cũ nhất
+    await cache.get_or_load("e", 10, _Loader(size=25))
+    assert set(cache._entries) == {"a", "c", "d", "e"} and cache.stats()["evictions"] == 1
+
+    big = _Loader(size=26)
+    await cache.get_or_load("big", 10, big)
+    await cache.get_or_load("big", 10, big)
+    assert big.calls == 2 and "big" not in cache._entries
+
+
+async def test_disabled_cache_always_loads():
+    cache = RestCache(0)
+    loader = _Loader()
+    await cache.get_or_load("k", 10, loader)
+    await cache.get_or_load("k", 10, loader)
+    assert loader.calls == 2
+
+
+async def test_rest_endpoint_uses_cache(monkeypatch):
+    rest_cache.clear()
+    calls = []
+
+    async def _query(keyword, **kwargs):
+        calls.append(kwargs.get("page"))
+        await asyncio.sleep(0.01)
+        return [{"title": "x"}]
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    try:
+        await asyncio.gather(*(sse.rest_query_endpoint(keyword="news_daily", projection=None, page=1) for _ in range(20)))
+        await sse.rest_query_endpoint(keyword="news_daily", projection=None, page=1)
+        await sse.rest_query_endpoint(keyword="news_daily", projection=None, page=2)
+        assert calls == [1, 2]
+    finally:
+        rest_cache.clear()
+
+
+async def test_get_stale_within_window(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rc.time, "monotonic", lambda: now[0])
+    cache = RestCache(1000, stale_max_age=60)
+    await cache.get_or_load("k", 5, _Loader(value="old"))
+    now[0] += 30  # hết TTL nhưng còn trong hạn stale
+    assert cache.get_stale("k") == ("old", 30.0)
+    assert cache.stats()["stale_served"] == 1
+
+    # Query lại lỗi → entry cũ vẫn còn cho lần get_stale sau.
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("k", 5, _Loader(fail=True))
+    assert cache.get_stale("k")[0] == "old"
+
+    now[0] += 40  # quá expires_at + stale_max_age
+    assert cache.get_stale("k") is None
+    assert cache.get_stale("missing") is None
@@ -0,0 +1,78 @@
+"""
+Test lịch poll SSE theo refresh class + phiên giao dịch VN (crud/sse/_schedule.py, utils/market_session.py).
+
+Bao phủ:
+    - Pha thị trường: trong phiên, nghỉ trưa, sau đóng cửa (+grace), cuối tuần, lễ cố định, MARKET_HOLIDAYS.
+    - Ngoài phiên nhịp dài bị cắt tại giờ mở phiên kế tiếp (không ngủ quên qua 9:00).
+    - Jitter nằm trong ±POLL_JITTER_RATIO và thực sự rải nhịp.
+    - Mọi keyword trong registry đều khai báo refresh class hợp lệ.
+"""
+
+import random
+from datetime import date, datetime
+
+import pytest
+
+import app.utils.market_session as ms
+from app.crud.sse import KEYWORD_REFRESH_CLASS, SSE_QUERY_REGISTRY
+from app.crud.sse._schedule import POLL_INTERVALS, POLL_JITTER_RATIO, next_poll_delay
+
+
+def _vn(y, m, d, hh, mm=0):
+    return datetime(y, m, d, hh, mm, tzinfo=ms.VN_TZ)
+
+
+# 2026-10-16 là thứ 6, 2026-10-17 thứ 7.
+@pytest.mark.parametrize(
+    "now,phase",
+    [
+        (_vn(2026, 10, 16, 8, 59), ms.PHASE_OFF_HOURS),
+        (_vn(2026, 10, 16, 9, 0), ms.PHASE_SESSION),
+        (_vn(2026, 10, 16, 11, 45), ms.PHASE_OFF_HOURS),  # nghỉ trưa (sau grace 10')
+        (_vn(2026, 10, 16, 15, 5), ms.PHASE_SESSION),  # grace hứng dữ liệu ATC chốt muộn
+        (_vn(2026, 10, 16, 15, 30), ms.PHASE_OFF_HOURS),
+        (_vn(2026, 10, 17, 10, 0), ms.PHASE_CLOSED),
+        (_vn(2026, 9, 2, 10, 0), ms.PHASE_CLOSED),  # Quốc khánh
+    ],
+)
+def test_market_phase(now, phase):
+    assert ms.market_phase(now) == phase
+
+
+def test_market_phase_converts_timezone():
+    # 02:00 UTC = 09:00 giờ VN
+    assert ms.market_phase(datetime.fromisoformat("2026-10-16T02:00:00+00:00")) == ms.PHASE_SESSION
+
+
+def test_configured_holidays(monkeypatch):
+    monkeypatch.setattr(ms, "HOLIDAYS", ms._parse_holidays("2026-10-16, 2026-10-19"))
+    assert ms.market_phase(_vn(2026, 10, 16, 10)) == ms.PHASE_CLOSED
+    # Thứ 6 nghỉ + cuối tuần + thứ 2 nghỉ → phiên kế là 9:00 thứ 3.
+    assert ms.seconds_until_session(_vn(2026, 10, 16, 10)) == (_vn(2026, 10, 20, 9) - _vn(2026, 10, 16, 10)).total_seconds()
+    assert ms.is_trading_day(date(2026, 10, 21))
+
+
+def test_off_session_delay_capped_at_next_open():
+    rng = random.Random(0)
+    # 08:58 thứ 6: realtime ngoài phiên là 300s nhưng phải thức lúc 9:00.
+    delay = next_poll_delay("realtime", _vn(2026, 10, 16, 8, 58), rng)
+    assert 120 <= delay <= 120 + POLL_INTERVALS["realtime"][ms.PHASE_SESSION]
+    # Trưa chủ nhật: static 3600s, 9:00 thứ 2 còn xa hơn → giữ nhịp static.
+    delay = next_poll_delay("static", _vn(2026, 10, 18, 12, 0), rng)
+    assert 3600 * (1 - POLL_JITTER_RATIO) <= delay <= 3600 * (1 + POLL_JITTER_RATIO)
+
+
+def test_session_delays_by_class_with_jitter():
+    rng = random.Random(1)
+    now = _vn(2026, 10, 16, 10)
+    delays = [next_poll_delay("realtime", now, rng) for _ in range(200)]
+    assert all(3.0 * (1 - POLL_JITTER_RATIO) <= d <= 3.0 * (1 + POLL_JITTER_RATIO) for d in delays)
+    assert max(delays) - min(delays) > 0.3  # có rải thật, không dồn 1 tick
+    assert next_poll_delay("eod", now, rng) > next_poll_delay("minutely", now, rng) > 3.0 * 1.1
+    # class lạ → coi như realtime
+    assert next_poll_delay("unknown", now, rng) < 3.5
+
+
+def test_registry_keywords_declare_refresh_class():
+    assert set(KEYWORD_REFRESH_CLASS) == set(SSE_QUERY_REGISTRY)
+    assert set(KEYWORD_REFRESH_CLASS.values()) <= set(POLL_INTERVALS)
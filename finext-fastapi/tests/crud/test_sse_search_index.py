@@ -0,0 +1,153 @@
+"""
+Test inverted index cho search_news / search_reports (crud/sse/_search_index.py).
+
+Bao phủ:
+    - Bỏ dấu tiếng Việt (đ → d), tách token; "ngan hang" khớp "Ngân hàng".
+    - Mọi token phải khớp (AND), token ≥ 2 ký tự khớp tiền tố, tìm theo mã trong tickers, lọc ticker.
+    - Xếp hạng khớp nguyên từ × độ mới; dừng sớm cho kết quả giống hệt duyệt toàn bộ.
+    - Bài add lại cùng slug thay bản cũ.
+    - Manager: chưa dựng → None (caller dùng regex) + dựng nền; hết max_age → chỉ đọc bài mới hơn mốc.
+    - search_news đọc từ index khi đã dựng.
+"""
+
+import importlib
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import app.crud.sse._search_index as si
+from app.crud.sse._search_index import NEWS_FIELDS, SearchIndexManager, TextIndex, fold_text, tokenize
+from tests.crud._fake_mongo import FakeDB
+
+# app.crud.sse.search_news bị che bởi hàm cùng tên re-export trong crud/sse/__init__.py.
+search_news_module = importlib.import_module("app.crud.sse.search_news")
+
+_T0 = datetime(2026, 10, 16, 9, 0)
+
+
+def _news(slug, title, hours_ago=0.0, tickers=(), news_type="trong_nuoc"):
+    created = _T0 - timedelta(hours=hours_ago)
+    return {"article_slug": slug, "title": title, "news_type": news_type, "created_at": created.isoformat(), "tickers": list(tickers), "content": "..."}
+
+
+def _index(*docs):
+    index = TextIndex("article_slug", NEWS_FIELDS)
+    index.extend(sorted(docs, key=lambda d: d["created_at"]))
+    return index
+
+
+def _slugs(rows):
+    return [r["article_slug"] for r in rows]
+
+
+def test_fold_and_tokenize():
+    assert fold_text("Ngân hàng Đông Á tăng trưởng") == "ngan hang dong a tang truong"
+    assert tokenize("VN-Index: vượt 1.300 điểm!") == ["vn", "index", "vuot", "1", "300", "diem"]
+    assert tokenize(None) == []
+
+
+def test_diacritics_prefix_and_and_semantics():
+    index = _index(
+        _news("a", "Ngân hàng tăng vốn điều lệ", 1),
+        _news("b", "Ngành thép phục hồi", 2),
+        _news("c", "Lãi suất ngân hàng giảm", 3),
+    )
+    assert _slugs(index.search("ngan hang")) == ["a", "c"]
+    assert _slugs(index.search("NGÂN HÀNG lai")) == ["c"]
+    assert _slugs(index.search("ngan ha")) == ["a", "c"]  # gõ dở
+    assert _slugs(index.search("nga")) == ["a", "b", "c"]  # ngân / ngành
+    assert index.search("ngan hang xyz") == []
+    assert index.search("") != [] and index.search("!!!") != []  # không có token → bài mới nhất
+
+
+def test_ticker_search_and_filter():
+    index = _index(
+        _news("a", "FPT ký hợp đồng", 1, tickers=["FPT"]),
+        _news("b", "Cổ phiếu ngân hàng", 2, tickers=["VCB", "CTG"]),
+        _news("c", "Ngân hàng VCB báo lãi", 3, tickers=["VCB"]),
+    )
+    assert _slugs(index.search("vc")) == ["b", "c"]
+    assert _slugs(index.search("ngan hang", ticker="VCB")) == ["b", "c"]
+    assert _slugs(index.search(None, ticker="FPT")) == ["a"]
+    assert index.search("ngan", ticker="HPG") == []
+    assert index.search("fpt")[0] == {"article_slug": "a", "title": "FPT ký hợp đồng", "news_type": "trong_nuoc",
+                                      "created_at": (_T0 - timedelta(hours=1)).isoformat(), "tickers": ["FPT"]}
+
+
+def test_exact_match_outranks_slightly_newer_prefix_match():
+    index = _index(_news("prefix", "Ngành thép", 1), _news("exact", "Nga tăng xuất khẩu", 24))
+    assert _slugs(index.search("nga")) == ["exact", "prefix"]
+    index = _index(_news("prefix", "Ngành thép", 1), _news("exact", "Nga tăng xuất khẩu", 24 * 30))
+    assert _slugs(index.search("nga")) == ["prefix", "exact"]
+
+
+def test_early_stop_matches_full_scan():
+    rng = random.Random(3)
+    words = ["ngân", "hàng", "ngành", "thép", "lãi", "suất", "chứng", "khoán", "bất", "động", "sản", "dầu", "khí", "vốn"]
+    docs = [_news(f"n{i}", " ".join(rng.choices(words, k=6)), hours_ago=rng.uniform(0, 24 * 90)) for i in range(2000)]
+    index = _index(*docs)
+    for query in ("ngan", "ngan hang", "ng", "lai su", "dau khi von", "nganh thep"):
+        tokens = tokenize(query)
+        scored = []
+        for doc_id, terms in enumerate(index._terms):
+            # Chấm điểm thẳng theo định nghĩa, độc lập với đường tối ưu của search().
+            points = [1.0 if t in terms else si.PREFIX_WEIGHT if any(w.startswith(t) for w in terms) else 0.0 for t in tokens]
+            quality = 0.0 if 0.0 in points else sum(points) / len(points)
+            if quality:
+                decay = 0.5 ** ((index._newest - index._recency[doc_id]) / si._HALF_LIFE_SECONDS)
+                scored.append((quality * decay, doc_id))
+        expected = [index._rows[i]["article_slug"] for _, i in sorted(scored, reverse=True)[:10]]
+        assert _slugs(index.search(query, limit=10)) == expected, query
+
+
+def test_readd_same_slug_replaces_old_version():
+    index = _index(_news("a", "Tin cũ về thép", 5))
+    index.add(_news("a", "Tin đã sửa về ngân hàng", 0))
+    assert len(index) == 1
+    assert index.search("thep") == []
+    assert _slugs(index.search("ngan hang")) == ["a"]
+
+
+@pytest.fixture
+def news_db():
+    db = FakeDB()
+    db.get_collection("news_daily").docs = [_news("a", "Ngân hàng tăng vốn", 2), _news("b", "Giá thép giảm", 1)]
+    return db
+
+
+async def test_manager_builds_in_background_then_refreshes_incrementally(news_db, monkeypatch):
+    manager = SearchIndexManager("news_daily", "article_slug", NEWS_FIELDS, max_age=3600)
+    assert await manager.index(news_db) is None  # chưa dựng → caller dùng regex
+    await manager._build_task
+    index = await manager.index(news_db)
+    assert _slugs(index.search("ngan hang")) == ["a"] and manager.builds == 1
+
+    reads = []
+    original = manager._read
+
+    async def _read(db, find_query):
+        reads.append(find_query)
+        return await original(db, find_query)
+
+    monkeypatch.setattr(manager, "_read", _read)
+    news_db.get_collection("news_daily").docs.append(_news("c", "Ngân hàng giảm lãi suất", 0))
+    assert _slugs((await manager.index(news_db)).search("ngan hang")) == ["a"]  # chưa hết max_age
+    manager.max_age = 0
+    assert _slugs((await manager.index(news_db)).search("ngan hang")) == ["c", "a"]
+    assert reads[-1] == {"created_at": {"$gt": _news("b", "", 1)["created_at"]}}
+    assert manager.stats()["docs"] == 3 and manager.refreshes >= 1
+
+
+async def test_manager_disabled_returns_none(news_db):
+    manager = SearchIndexManager("news_daily", "article_slug", NEWS_FIELDS, max_age=30, enabled=False)
+    assert await manager.index(news_db) is None and manager._build_task is None
+
+
+async def test_search_news_reads_index(news_db, monkeypatch):
+    manager = SearchIndexManager("news_daily", "article_slug", NEWS_FIELDS, max_age=3600)
+    await manager.build(news_db)
+    monkeypatch.setitem(si.search_indexes, "news_daily", manager)
+    monkeypatch.setattr(search_news_module, "get_database", lambda name: news_db)
+    rows = await search_news_module.search_news(search="thep", limit=50)
+    assert _slugs(rows) == ["b"] and "content" not in rows[0]
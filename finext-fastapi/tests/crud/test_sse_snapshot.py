@@ -0,0 +1,218 @@
+"""
+Test snapshot in-memory dùng chung cho today_stock / today_index / itd_index (crud/sse/_snapshot.py).
+
+Bao phủ:
+    - N keyword/ticker đọc cùng collection trong 1 nhịp → 1 lần find Mongo (kể cả gọi đồng thời).
+    - Kết quả giữ đúng ngữ nghĩa query cũ: filter ticker/type, projection include/exclude theo thứ
+      tự field của document, sort kiểu BSON (null trước), distinct, max(date).
+    - Hết max_age hoặc watcher báo collection đổi → đọc lại; snapshot tắt → query Mongo như cũ.
+    - Filter có toán tử / projection biểu thức → rơi về query Mongo.
+    - Doc thiếu ticker không gom vào 1 nhóm chung của by_ticker.
+"""
+
+import asyncio
+import importlib
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+import app.crud.sse._snapshot as snap
+from app.crud.sse._snapshot import SnapshotManager, _build_table, apply_projection, get_snapshot_records, sort_rows
+from tests.crud._fake_mongo import FakeDB
+
+_KEYWORD_MODULES = (
+    "home_today_stock",
+    "search_stocks",
+    "screener_stock_data",
+    "screener_stock_meta",
+    "chart_today_data",
+    "home_today_index",
+    "home_today_industry",
+    "search_index",
+    "chart_ticker",
+    "home_itd_index",
+    "market_update_time",
+)
+
+
+class _CountingDB(FakeDB):
+    def __init__(self) -> None:
+        super().__init__()
+        self.finds: dict = {}
+
+    def get_collection(self, name):
+        coll = super().get_collection(name)
+        if not hasattr(coll, "_counted"):
+            original = coll.find
+
+            def find(flt=None, projection=None, _name=name, _orig=original):
+                self.finds[_name] = self.finds.get(_name, 0) + 1
+                return _orig(flt, projection)
+
+            coll.find = find
+            coll._counted = True
+        return coll
+
+
+def _stock(ticker, close, **extra):
+    return {"_id": ObjectId(), "ticker": ticker, "ticker_name": f"CTCP {ticker}", "exchange": "HOSE",
+            "industry_name": "Ngân hàng", "close": close, "pct_change": 0.5, "date": datetime(2026, 10, 16), "week": 42, **extra}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = _CountingDB()
+    fake.get_collection("today_stock").docs = [
+        _stock("VCB", 90.0, category_name="VN30"),
+        _stock("FPT", 98.0, exchange="HNX", industry_name=None),
+        _stock("ACB", None, marketcap_name="Large"),
+    ]
+    fake.get_collection("today_index").docs = [
+        {"_id": ObjectId(), "ticker": "VNINDEX", "ticker_name": "VN-Index", "type": "index", "close": 1280.0, "date": datetime(2026, 10, 16)},
+        {"_id": ObjectId(), "ticker": "NGANHANG", "ticker_name": "Ngân hàng", "type": "industry", "close": 500.0, "date": datetime(2026, 10, 16)},
+    ]
+    fake.get_collection("itd_index").docs = [
+        {"_id": ObjectId(), "ticker": "HNXINDEX", "date": datetime(2026, 10, 16, 9, 15), "close": 230.0},
+        {"_id": ObjectId(), "ticker": "HNXINDEX", "date": datetime(2026, 10, 16, 14, 45), "close": 231.0},
+        {"_id": ObjectId(), "ticker": "VNINDEX", "date": datetime(2026, 10, 16, 14, 50), "close": 1280.0},
+    ]
+    fake.finds.clear()
+    for name in _KEYWORD_MODULES:
+        monkeypatch.setattr(importlib.import_module(f"app.crud.sse.{name}"), "get_database", lambda _n: fake)
+    manager = SnapshotManager(max_age=60.0)
+    monkeypatch.setattr(snap, "snapshots", manager)
+    return fake
+
+
+def _kw(name):
+    return getattr(importlib.import_module(f"app.crud.sse.{name}"), name)
+
+
+async def test_many_keywords_share_one_read_per_collection(db):
+    results = await asyncio.gather(
+        _kw("home_today_stock")(),
+        _kw("home_today_stock")(ticker="FPT"),
+        _kw("search_stocks")(),
+        _kw("screener_stock_data")(sort_by="close", sort_order="desc"),
+        _kw("screener_stock_meta")(),
+        _kw("chart_today_data")(ticker="VCB"),
+        _kw("home_today_index")(),
+        _kw("home_today_industry")(),
+        _kw("search_index")(),
+        _kw("chart_ticker")(),
+        _kw("home_itd_index")(ticker="HNXINDEX"),
+        _kw("market_update_time")(),
+    )
+    assert db.finds == {"today_stock": 1, "today_index": 1, "itd_index": 1}
+
+    (all_stocks, fpt, search, screener, meta, chart, indexes, industries, search_idx, tickers, itd, update_time) = results
+    assert [r["ticker"] for r in all_stocks] == ["VCB", "FPT", "ACB"]
+    assert [r["ticker"] for r in fpt] == ["FPT"]
+    assert "_id" not in all_stocks[0] and "week" not in all_stocks[0]
+    assert list(search[0]) == ["ticker", "ticker_name", "exchange", "industry_name", "close", "pct_change"]
+    # Sort desc kiểu Mongo: null nhỏ nhất → cuối danh sách; screener bỏ _id + week, giữ field khác.
+    assert [r["ticker"] for r in screener] == ["FPT", "VCB", "ACB"]
+    assert "week" not in screener[0] and screener[0]["exchange"] == "HNX"
+    assert meta == {"exchange": ["HNX", "HOSE"], "industry_name": ["Ngân hàng"], "marketcap_name": ["Large"], "category_name": ["VN30"]}
+    assert [r["ticker"] for r in chart] == ["VCB"]
+    assert [r["ticker"] for r in indexes] == ["VNINDEX", "NGANHANG"]
+    assert [r["ticker"] for r in industries] == ["NGANHANG"]
+    assert [r["ticker"] for r in search_idx] == ["VNINDEX", "NGANHANG"]
+    assert {r["ticker"] for r in tickers} == {"VCB", "FPT", "ACB", "VNINDEX", "NGANHANG"}
+    assert [r["close"] for r in itd] == [230.0, 231.0]
+    assert update_time == {"update_time": datetime(2026, 10, 16, 14, 45)}
+
+    # Kết quả là dict mới — sửa không ảnh hưởng snapshot.
+    all_stocks[0]["close"] = -1
+    assert (await _kw("home_today_stock")(ticker="VCB"))[0]["close"] == 90.0
+    assert db.finds["today_stock"] == 1
+
+
+async def test_expiry_and_watcher_invalidate(db, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(snap.time, "monotonic", lambda: now[0])
+    versions = [(0,)]
+    monkeypatch.setattr(snap.watcher, "versions", lambda sources: versions[0])
+
+    await _kw("home_today_stock")()
+    now[0] += 59
+    await _kw("home_today_stock")()
+    assert db.finds["today_stock"] == 1
+
+    now[0] += 2  # quá max_age
+    await _kw("home_today_stock")()
+    assert db.finds["today_stock"] == 2
+
+    versions[0] = (1,)  # push mode: collection đổi
+    db.get_collection("today_stock").docs[0]["close"] = 91.0
+    assert (await _kw("home_today_stock")(ticker="VCB"))[0]["close"] == 91.0
+    assert db.finds["today_stock"] == 3
+
+
+async def test_disabled_and_unsupported_queries_hit_mongo(db, monkeypatch):
+    monkeypatch.setattr(snap, "snapshots", SnapshotManager(max_age=0))
+    await _kw("home_today_stock")()
+    await _kw("home_today_stock")()
+    assert db.finds["today_stock"] == 2
+
+    monkeypatch.setattr(snap, "snapshots", SnapshotManager(max_age=60))
+    await get_snapshot_records(db, "today_stock", find_query={"close": {"$gt": 1}})
+    await get_snapshot_records(db, "today_stock", projection={"close": {"$round": 1}})
+    assert db.finds["today_stock"] == 4  # không nạp snapshot vô ích
+
+
+async def test_load_retries_then_serves(db, monkeypatch):
+    calls = 0
+    coll = db.get_collection("today_stock")
+    original = coll.find
+
+    def flaky(flt=None, projection=None):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("mongo down")
+        return original(flt, projection)
+
+    coll.find = flaky
+    monkeypatch.setattr("app.crud.sse._helpers.RETRY_DELAY_SECONDS", 0)
+    rows = await _kw("search_stocks")()
+    assert len(rows) == 3 and calls == 2
+
+
+async def test_failed_load_is_shared_and_not_cached(db, monkeypatch):
+    real = snap.get_collection_records
+    down = [True]
+    calls = []
+
+    async def _flaky(*args, **kwargs):
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        if down[0]:
+            raise RuntimeError("mongo down")
+        return await real(*args, **kwargs)
+
+    monkeypatch.setattr(snap, "get_collection_records", _flaky)
+    results = await asyncio.gather(*(_kw("search_stocks")() for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results) and len(calls) == 1
+    down[0] = False
+    assert len(await _kw("search_stocks")()) == 3 and len(calls) == 2
+
+
+def test_projection_and_sort_semantics():
+    rows = [{"a": 1, "b": None, "c": "x"}, {"a": 2, "c": "y"}, {"a": 3, "b": 5, "c": "z"}]
+    assert apply_projection(rows, {"c": 1, "a": 1, "_id": 0}) == [{"a": 1, "c": "x"}, {"a": 2, "c": "y"}, {"a": 3, "c": "z"}]
+    assert apply_projection(rows, {"c": 0}) == [{"a": 1, "b": None}, {"a": 2}, {"a": 3, "b": 5}]
+    assert [r["a"] for r in sort_rows(rows, [("b", 1)])] == [1, 2, 3]
+    assert [r["a"] for r in sort_rows(rows, [("b", -1)])] == [3, 1, 2]
+    mixed = [{"v": datetime(2026, 1, 1)}, {"v": "s"}, {"v": 1.5}, {"v": True}, {"v": float("nan")}]
+    assert [r["v"] for r in sort_rows(mixed, [("v", 1)])][1:] == [1.5, "s", True, datetime(2026, 1, 1)]
+
+
+def test_tickerless_docs_are_not_bucketed():
+    table = _build_table([{"ticker": "FPT", "type": "a"}, {"type": "a"}, {"ticker": None, "type": "b"}, {"ticker": 1}])
+    assert list(table.by_ticker) == ["FPT"]
+    assert table.select({"ticker": "FPT"}) == [{"ticker": "FPT", "type": "a"}]
+    # ticker None khớp doc thiếu field / null như Mongo, kể cả khi không có nhóm by_ticker.
+    assert table.select({"ticker": None, "type": "a"}) == [{"type": "a"}]
+    assert len(table.select({"ticker": None})) == 2
@@ -0,0 +1,121 @@
+"""
+Test KeywordSpec — registry khai báo keyword SSE (crud/sse/_spec.py, crud/sse/__init__.py).
+
+Bao phủ:
+    - Mọi keyword có spec nhất quán: sort mặc định nằm trong allowlist, keyword snapshot chỉ đọc
+      collection snapshot, index hint trỏ vào nguồn của chính keyword.
+    - sort_by: thiếu → mặc định của keyword; ngoài allowlist → ValueError (REST 400).
+    - Projection bị bỏ với keyword không nhận; chuẩn hoá idempotent.
+    - SSE_INDEXES gộp từ spec, bỏ trùng.
+    - REST: keyword cacheable=False luôn query lại, không cho proxy cache.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+import app.routers.sse as sse
+from app.crud.sse import KEYWORD_SPECS, execute_sse_query, normalize_query_params
+from app.crud.sse._indexes import SSE_INDEXES
+from app.crud.sse._rest_cache import rest_cache
+from app.crud.sse._snapshot import SNAPSHOT_COLLECTIONS
+from app.crud.sse._spec import KeywordSpec, collect_indexes, normalize_params
+
+
+@pytest.fixture(autouse=True)
+def _clear_rest_cache():
+    rest_cache.clear()
+    yield
+    rest_cache.clear()
+
+
+async def _noop(**kwargs):
+    return kwargs
+
+
+def test_specs_are_consistent():
+    for name, spec in KEYWORD_SPECS.items():
+        if spec.default_sort:
+            assert spec.sortable is not None and spec.default_sort[0][0] in spec.sortable, name
+        if spec.snapshot:
+            assert spec.sources and {s.split(".", 1)[1] for s in spec.sources} <= SNAPSHOT_COLLECTIONS, name
+        for source, _ in spec.indexes:
+            assert source in spec.sources, name
+
+
+def test_resolve_sort_defaults_and_allowlist():
+    spec = KeywordSpec(_noop, sortable=frozenset({"created_at", "updated_at"}), default_sort=(("created_at", -1),))
+    assert spec.resolve_sort(None, None) == ("created_at", "desc")
+    assert spec.resolve_sort(None, "asc") == ("created_at", "asc")
+    assert spec.resolve_sort("updated_at", None) == ("updated_at", "desc")
+    with pytest.raises(ValueError):
+        spec.resolve_sort("content", "desc")
+    # Không khai báo allowlist → giữ nguyên (module tự diễn giải, VD finstats_* Q/Y).
+    assert KeywordSpec(_noop).resolve_sort("Q", None) == ("Q", None)
+
+
+def test_normalize_drops_projection_and_is_idempotent():
+    params = {"sort_by": None, "sort_order": None, "projection": {"title": 1}, "page": 2}
+    other = normalize_query_params("other_ticker", params)
+    assert other["projection"] is None and other["sort_by"] == "date" and other["sort_order"] == "desc"
+    news = normalize_query_params("news_daily", params)
+    assert news["projection"] == {"title": 1} and news["sort_by"] == "created_at"
+    assert normalize_query_params("news_daily", news) == news
+    with pytest.raises(ValueError):
+        normalize_params(KEYWORD_SPECS["home_today_index"], {"fields": ["close"]})
+
+
+async def test_execute_rejects_unknown_sort_field():
+    with pytest.raises(ValueError, match="sort_by"):
+        await execute_sse_query("news_daily", sort_by="content")
+    with pytest.raises(ValueError, match="không hợp lệ"):
+        await execute_sse_query("nope")
+
+
+def test_indexes_collected_from_specs():
+    assert [("ticker", 1), ("date", 1)] in SSE_INDEXES["stock_db.history_stock"]
+    assert [("article_slug", 1)] in SSE_INDEXES["stock_db.news_daily"]
+    keys = [("a", 1)]
+    merged = collect_indexes([KeywordSpec(_noop, indexes=(("db.c", keys),)), KeywordSpec(_noop, indexes=(("db.c", keys),))])
+    assert merged == {"db.c": [keys]}
+
+
+async def _rest(keyword, **kwargs):
+    kwargs.setdefault("projection", None)
+    return await sse.rest_query_endpoint(keyword=keyword, **kwargs)
+
+
+async def test_rest_rejects_sort_outside_allowlist(monkeypatch):
+    async def _query(keyword, **kwargs):
+        raise AssertionError("không được query")
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    with pytest.raises(HTTPException) as ei:
+        await _rest("news_daily", sort_by="content")
+    assert ei.value.status_code == 400
+
+
+async def test_rest_default_sort_shares_cache_entry(monkeypatch):
+    calls = []
+
+    async def _query(keyword, **kwargs):
+        calls.append((kwargs["sort_by"], kwargs["sort_order"]))
+        return []
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    await _rest("news_daily")
+    await _rest("news_daily", sort_by="created_at", sort_order="desc")
+    assert calls == [("created_at", "desc")]
+
+
+async def test_rest_non_cacheable_keyword_always_queries(monkeypatch):
+    calls = []
+
+    async def _query(keyword, **kwargs):
+        calls.append(keyword)
+        return {"questions": [str(len(calls))]}
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    first = await _rest("chat_suggestions")
+    second = await _rest("chat_suggestions")
+    assert len(calls) == 2 and first.body != second.body
+    assert second.headers["cache-control"] == "no-store"
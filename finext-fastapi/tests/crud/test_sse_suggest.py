@@ -0,0 +1,108 @@
+"""
+Test keyword suggest — typeahead mã / nhóm / ngành phía server (crud/sse/suggest.py).
+
+Bao phủ:
+    - Xếp hạng: khớp đúng mã → tiền tố mã → từ trong tên không dấu; cùng hạng theo trading_value.
+    - Tên nhiều từ (mọi từ gõ phải khớp tiền tố 1 từ của tên), dòng nhóm/ngành có type + source.
+    - Query rỗng → mã giao dịch nhiều nhất; limit tối đa 10.
+    - Keyword xếp hạng riêng cổ phiếu / nhóm-ngành: index (trading_value cả rổ) không chiếm chỗ cổ phiếu.
+    - Index dựng lại khi snapshot làm mới, không thêm lần đọc Mongo.
+"""
+
+import importlib
+import math
+
+import pytest
+
+import app.crud.sse._snapshot as snap
+from app.crud.sse._snapshot import SnapshotManager
+from app.crud.sse.suggest import SuggestIndex
+from tests.crud.test_sse_snapshot import _CountingDB
+
+suggest_module = importlib.import_module("app.crud.sse.suggest")
+
+_STOCKS = [
+    {"ticker": "VCB", "ticker_name": "Ngân hàng TMCP Ngoại thương Việt Nam", "exchange": "HOSE", "industry_name": "Ngân hàng",
+     "close": 90.0, "pct_change": 0.01, "trading_value": 500.0, "vsi": 1.2},
+    {"ticker": "VCBS", "ticker_name": "Chứng khoán Vietcombank", "exchange": "UPCOM", "industry_name": "Chứng khoán",
+     "close": 10.0, "pct_change": 0.0, "trading_value": 1.0},
+    {"ticker": "VCG", "ticker_name": "Vinaconex", "exchange": "HOSE", "industry_name": "Xây dựng",
+     "close": 20.0, "pct_change": -0.02, "trading_value": 900.0},
+    {"ticker": "CTG", "ticker_name": "Ngân hàng TMCP Công thương Việt Nam", "exchange": "HOSE", "industry_name": "Ngân hàng",
+     "close": 35.0, "pct_change": 0.0, "trading_value": 800.0},
+    {"ticker": "NHA", "ticker_name": "Đầu tư Nam Hà Nội", "exchange": "HOSE", "industry_name": "Bất động sản",
+     "close": 15.0, "pct_change": 0.0, "trading_value": float("nan")},
+]
+_INDEXES = [
+    {"ticker": "NGANHANG", "ticker_name": "Ngân hàng", "type": "industry", "close": 500.0, "pct_change": 0.01, "trading_value": 5000.0},
+    {"ticker": "VN30", "ticker_name": "VN30", "type": "index", "close": 1300.0, "pct_change": 0.0, "trading_value": 9000.0},
+]
+
+
+def _tickers(rows):
+    return [r["ticker"] for r in rows]
+
+
+@pytest.fixture
+def index():
+    return SuggestIndex(_STOCKS, _INDEXES)
+
+
+def test_exact_symbol_then_prefix_then_trading_value(index):
+    assert _tickers(index.suggest("vcb")) == ["VCB", "VCBS"]
+    assert _tickers(index.suggest("VC")) == ["VCG", "VCB", "VCBS"]
+
+
+def test_folded_name_match_ranks_after_symbols(index):
+    # "ng": tiền tố mã NGANHANG trước, rồi tên có từ bắt đầu bằng "ng" theo trading_value.
+    assert _tickers(index.suggest("ng")) == ["NGANHANG", "CTG", "VCB"]
+    assert _tickers(index.suggest("Ngân hàng công")) == ["CTG"]
+    assert _tickers(index.suggest("ngan hang")) == ["NGANHANG", "CTG", "VCB"]
+    assert _tickers(index.suggest("ha noi")) == ["NHA"]
+    assert index.suggest("zzz") == []
+
+
+def test_rows_are_minimal_and_tagged(index):
+    vcb = index.suggest("VCB", limit=1)[0]
+    assert vcb == {"ticker": "VCB", "ticker_name": "Ngân hàng TMCP Ngoại thương Việt Nam", "exchange": "HOSE",
+                   "industry_name": "Ngân hàng", "close": 90.0, "pct_change": 0.01, "source": "stock"}
+    assert index.suggest("vn30")[0] == {"ticker": "VN30", "ticker_name": "VN30", "type": "index", "close": 1300.0,
+                                        "pct_change": 0.0, "source": "index"}
+    vcb["close"] = -1  # kết quả là bản sao
+    assert index.suggest("VCB")[0]["close"] == 90.0
+
+
+def test_empty_query_returns_most_traded(index):
+    assert _tickers(index.suggest("", limit=3)) == ["VN30", "NGANHANG", "VCG"]
+    assert not math.isnan(index._value[_tickers(index.rows).index("NHA")])
+
+
+def test_sections_rank_each_source_separately(index):
+    # Xếp chung thì 2 dòng index chiếm hết limit=2; tách nguồn thì cổ phiếu vẫn đủ chỗ.
+    assert _tickers(index.suggest("", limit=2)) == ["VN30", "NGANHANG"]
+    sections = index.suggest_sections("", limit=2)
+    assert _tickers(sections["stocks"]) == ["VCG", "CTG"] and _tickers(sections["indexes"]) == ["VN30", "NGANHANG"]
+    sections = index.suggest_sections("ng", limit=1)
+    assert _tickers(sections["stocks"]) == ["CTG"] and _tickers(sections["indexes"]) == ["NGANHANG"]
+    assert index.suggest("vcb", source="index") == [] and _tickers(index.suggest("ha noi", source="stock")) == ["NHA"]
+
+
+async def test_keyword_reuses_snapshot_and_rebuilds_on_refresh(monkeypatch):
+    db = _CountingDB()
+    db.get_collection("today_stock").docs = [dict(r) for r in _STOCKS]
+    db.get_collection("today_index").docs = [dict(r) for r in _INDEXES]
+    monkeypatch.setattr(suggest_module, "get_database", lambda _n: db)
+    manager = SnapshotManager(max_age=60.0)
+    monkeypatch.setattr(snap, "snapshots", manager)
+
+    result = await suggest_module.suggest(search="vc", limit=50)
+    assert _tickers(result["stocks"]) == ["VCG", "VCB", "VCBS"] and result["indexes"] == []
+    built = suggest_module._index_cache[2]
+    assert _tickers((await suggest_module.suggest(search="ctg"))["stocks"]) == ["CTG"]
+    assert suggest_module._index_cache[2] is built
+    assert db.finds == {"today_stock": 1, "today_index": 1}
+
+    db.get_collection("today_stock").docs.append({"ticker": "VCI", "ticker_name": "Chứng khoán Vietcap", "trading_value": 50.0})
+    manager.clear()
+    assert "VCI" in _tickers((await suggest_module.suggest(search="vc"))["stocks"])
+    assert suggest_module._index_cache[2] is not built
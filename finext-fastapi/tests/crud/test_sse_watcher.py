@@ -0,0 +1,170 @@
+"""
+Test push mode cho SSE poller (crud/sse/_watcher.py).
+
+Bao phủ:
+    - Probe: lần đầu chỉ lấy mốc, fingerprint đổi → version tăng + đánh thức waiter.
+    - Ref-count: collection hết poller quan tâm → task probe bị dừng và dọn.
+    - change_stream lỗi (Mongo standalone) → tự rơi về probe.
+    - $collStats bị từ chối (thiếu quyền clusterMonitor) → fingerprint (count, _id mới nhất), không thử lại.
+    - Poller push mode: chỉ query lại khi collection nguồn đổi, không theo nhịp 3s.
+    - Mọi keyword trong registry (trừ chat_suggestions) đều khai báo nguồn.
+"""
+
+import asyncio
+
+import pytest
+from pymongo.errors import OperationFailure
+
+import app.crud.sse._watcher as watcher_mod
+import app.routers.sse as sse
+from app.crud.sse import KEYWORD_SOURCES, SSE_QUERY_REGISTRY
+from app.crud.sse._watcher import CollectionWatcher
+
+SRC = "stock_db.today_stock"
+
+
+class _FakeProbe:
+    def __init__(self) -> None:
+        self.value = 0
+        self.calls = 0
+
+    async def __call__(self, source: str):
+        self.calls += 1
+        return self.value
+
+
+@pytest.fixture(autouse=True)
+def _fast_probe(monkeypatch):
+    monkeypatch.setattr(watcher_mod, "SSE_PUSH_PROBE_INTERVAL", 0.01)
+
+
+async def test_probe_bumps_version_only_on_change():
+    probe = _FakeProbe()
+    w = CollectionWatcher("probe", probe=probe)
+    w.watch([SRC])
+    try:
+        await asyncio.sleep(0.05)
+        assert w.versions([SRC]) == (0,)  # mốc đầu + không đổi → không bump
+
+        seen = w.versions([SRC])
+        probe.value = 1
+        assert await w.wait_for_change((SRC,), seen, timeout=1.0) is True
+        assert w.versions([SRC]) == (1,)
+    finally:
+        w.unwatch([SRC])
+
+
+async def test_wait_for_change_times_out_when_idle():
+    w = CollectionWatcher("probe", probe=_FakeProbe())
+    w.watch([SRC])
+    try:
+        assert await w.wait_for_change((SRC,), w.versions([SRC]), timeout=0.05) is False
+    finally:
+        w.unwatch([SRC])
+
+
+async def test_unwatch_stops_probe_task():
+    probe = _FakeProbe()
+    w = CollectionWatcher("probe", probe=probe)
+    w.watch([SRC])
+    w.watch([SRC])  # 2 poller cùng quan tâm
+    task = w._watched[SRC].task
+
+    w.unwatch([SRC])
+    assert SRC in w._watched  # còn 1 poller
+    w.unwatch([SRC])
+    assert SRC not in w._watched
+    await asyncio.sleep(0)
+    assert task.cancelled() or task.done()
+
+
+async def test_change_stream_falls_back_to_probe(monkeypatch):
+    probe = _FakeProbe()
+    w = CollectionWatcher("change_stream", probe=probe)
+
+    async def _no_change_stream(source, watched):
+        raise RuntimeError("The $changeStream stage is only supported on replica sets")
+
+    monkeypatch.setattr(w, "_run_change_stream", _no_change_stream)
+    w.watch([SRC])
+    try:
+        await asyncio.sleep(0.05)
+        assert probe.calls > 0
+    finally:
+        w.unwatch([SRC])
+
+
+def test_off_mode_is_disabled():
+    assert CollectionWatcher("off").enabled is False
+    assert CollectionWatcher("garbage").enabled is False
+
+
+def test_registry_keywords_declare_sources():
+    missing = set(SSE_QUERY_REGISTRY) - set(KEYWORD_SOURCES) - {"chat_suggestions"}
+    assert missing == set()
+    assert set(KEYWORD_SOURCES) <= set(SSE_QUERY_REGISTRY)
+
+
+async def test_poller_push_mode_requeries_only_on_change(monkeypatch):
+    sse._cache.clear()
+    probe = _FakeProbe()
+    w = CollectionWatcher("probe", probe=probe)
+    calls = []
+
+    async def _query(keyword, ticker=None, **kwargs):
+        calls.append(keyword)
+        return [{"close": probe.value}]
+
+    monkeypatch.setattr(sse, "watcher", w)
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    monkeypatch.setattr(sse, "SSE_PUSH_MIN_INTERVAL", 0.0)
+    monkeypatch.setattr(sse, "SSE_PUSH_MAX_STALENESS", 30.0)
+
+    key, q = await sse._subscribe("home_today_stock", None)
+    try:
+        assert (await asyncio.wait_for(q.get(), timeout=1.0)).payload == 'data: [{"close":0}]\n\n'
+        await asyncio.sleep(0.1)  # nhiều nhịp probe nhưng dữ liệu không đổi
+        assert len(calls) == 1
+
+        probe.value = 1  # collection nguồn đổi → poller được đánh thức
+        assert (await asyncio.wait_for(q.get(), timeout=1.0)).payload == 'data: [{"close":1}]\n\n'
+        assert len(calls) == 2
+    finally:
+        await sse._unsubscribe(key, q)
+        await asyncio.sleep(0)
+        assert w._watched == {}
+        sse._cache.clear()
+
+
+async def test_fingerprint_falls_back_when_collstats_unauthorized(monkeypatch):
+    class _Cursor:
+        async def to_list(self, length=None):
+            raise OperationFailure("not authorized on stock_db to execute command { aggregate: ... }", code=13)
+
+    class _Collection:
+        def __init__(self):
+            self.aggregates = 0
+            self.docs = [{"_id": 1}, {"_id": 2}]
+
+        def aggregate(self, pipeline):
+            self.aggregates += 1
+            return _Cursor()
+
+        async def estimated_document_count(self):
+            return len(self.docs)
+
+        async def find_one(self, flt, projection=None, sort=None):
+            return max(self.docs, key=lambda d: d["_id"]) if self.docs else None
+
+    coll = _Collection()
+
+    class _DB:
+        def get_collection(self, name):
+            return coll
+
+    monkeypatch.setattr(watcher_mod, "get_database", lambda _n: _DB())
+    monkeypatch.setattr(watcher_mod, "_collstats_denied", set())
+    assert await watcher_mod.probe_collection_fingerprint(SRC) == (2, 2)
+    coll.docs.append({"_id": 3})
+    assert await watcher_mod.probe_collection_fingerprint(SRC) == (3, 3)
+    assert coll.aggregates == 1
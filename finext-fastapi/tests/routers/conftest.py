@@ -0,0 +1,23 @@
+"""Fixture chung cho test router: reset cache kết quả /sse/rest + snapshot collection giữa các test.
+
+rest_cache / snapshots / mongo_breaker / feed_counts là state module-level — không reset thì kết quả của test trước (cùng keyword +
+tham số) bị trả lại cho test sau thay vì gọi execute_sse_query / fake DB đã monkeypatch."""
+import pytest
+
+from app.crud.sse._breaker import mongo_breaker
+from app.crud.sse._feed import feed_counts
+from app.crud.sse._rest_cache import rest_cache
+from app.crud.sse._snapshot import snapshots
+
+
+@pytest.fixture(autouse=True)
+def _reset_sse_state():
+    rest_cache.clear()
+    snapshots.clear()
+    mongo_breaker.clear()
+    feed_counts.clear()
+    yield
+    rest_cache.clear()
+    snapshots.clear()
+    mongo_breaker.clear()
+    feed_counts.clear()
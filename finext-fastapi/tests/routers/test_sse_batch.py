@@ -0,0 +1,136 @@
+"""
+Test POST /sse/batch — nhiều keyword trong 1 request.
+
+Bao phủ:
+    - Envelope gộp: data là object {id: envelope của phần}, giữ nguyên body /rest của từng phần.
+    - Lỗi 1 phần (keyword sai, sort_by ngoài allowlist, Mongo quá tải) không làm hỏng phần khác.
+    - Phần dùng chung REST cache / single-flight với /rest (và với phần trùng trong cùng batch).
+    - Số phần chạy đồng thời bị giới hạn bởi SSE_BATCH_CONCURRENCY.
+    - stream=1 / Accept NDJSON: mỗi dòng 1 phần, theo thứ tự hoàn thành.
+    - Schema: id trùng, tham số lạ, quá MAX_BATCH_PARTS → lỗi validate.
+"""
+
+import asyncio
+import json
+
+import pytest
+from pydantic import ValidationError
+
+import app.routers.sse as sse
+from app.core.query_governor import QueryShedError
+from app.schemas.sse import MAX_BATCH_PARTS, BatchRequest
+
+
+def _batch(*parts):
+    return BatchRequest(requests=[{"id": pid, "keyword": kw, "params": params} for pid, kw, params in parts])
+
+
+async def _read_stream(response):
+    chunks = [chunk async for chunk in response.body_iterator]
+    return [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+
+
+async def test_batch_returns_keyed_envelope(monkeypatch):
+    async def _query(keyword, **kwargs):
+        return [{"keyword": keyword, "ticker": kwargs.get("ticker")}]
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    response = await sse.rest_batch_endpoint(
+        _batch(("a", "phase_daily", {}), ("b", "nntd_stock", {"ticker": "FPT", "nntd_type": "NN"}))
+    )
+    body = json.loads(response.body)
+    assert body["status"] == 200 and list(body["data"]) == ["a", "b"]
+    assert body["data"]["a"] == {"status": 200, "message": sse.REST_SUCCESS_MESSAGE, "data": [{"keyword": "phase_daily", "ticker": None}]}
+    assert body["data"]["b"]["data"] == [{"keyword": "nntd_stock", "ticker": "FPT"}]
+    assert response.headers["cache-control"] == "no-store"
+
+
+async def test_batch_isolates_part_errors(monkeypatch):
+    async def _query(keyword, **kwargs):
+        if keyword == "phase_rank":
+            raise QueryShedError("interactive", "queue_full")
+        return [{"ok": 1}]
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    response = await sse.rest_batch_endpoint(
+        _batch(
+            ("ok", "phase_daily", {}),
+            ("bad_kw", "nope", {}),
+            ("bad_sort", "news_daily", {"sort_by": "content"}),
+            ("shed", "phase_rank", {}),
+        )
+    )
+    data = json.loads(response.body)["data"]
+    assert data["ok"]["data"] == [{"ok": 1}]
+    assert data["bad_kw"]["status"] == 400 and data["bad_kw"]["data"] is None
+    assert data["bad_sort"]["status"] == 400 and "sort_by" in data["bad_sort"]["message"]
+    assert data["shed"]["status"] == 503
+
+
+async def test_batch_shares_rest_cache(monkeypatch):
+    calls = []
+
+    async def _query(keyword, **kwargs):
+        calls.append((keyword, kwargs.get("projection")))
+        await asyncio.sleep(0.01)
+        return [{"n": len(calls)}]
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    projection = {"title": 1}
+    # Thân của GET /rest/{keyword} (gọi trực tiếp endpoint thì tham số Query() không có giá trị mặc định thật).
+    rest = await sse._rest_query("news_daily", projection=json.dumps(projection))
+    response = await sse.rest_batch_endpoint(
+        _batch(("x", "news_daily", {"projection": projection}), ("y", "news_daily", {"projection": json.dumps(projection)}))
+    )
+    data = json.loads(response.body)["data"]
+    assert len(calls) == 1
+    assert data["x"] == data["y"] == json.loads(rest.body)
+
+
+async def test_batch_bounds_concurrency(monkeypatch):
+    running = peak = 0
+
+    async def _query(keyword, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return []
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    monkeypatch.setattr(sse, "SSE_BATCH_CONCURRENCY", 2)
+    parts = [(f"p{i}", "other_ticker", {"ticker": f"T{i}"}) for i in range(6)]
+    response = await sse.rest_batch_endpoint(_batch(*parts))
+    assert len(json.loads(response.body)["data"]) == 6
+    assert peak == 2
+
+
+async def test_batch_streams_ndjson_in_completion_order(monkeypatch):
+    delays = {"phase_daily": 0.05, "phase_rank": 0.0}
+
+    async def _query(keyword, **kwargs):
+        await asyncio.sleep(delays[keyword])
+        return [keyword]
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    batch = _batch(("slow", "phase_daily", {}), ("fast", "phase_rank", {}))
+    response = await sse.rest_batch_endpoint(batch, stream=True)
+    assert response.media_type == sse.NDJSON_MEDIA_TYPE
+    lines = await _read_stream(response)
+    assert [line["id"] for line in lines] == ["fast", "slow"]
+    assert lines[1] == {"id": "slow", "status": 200, "message": sse.REST_SUCCESS_MESSAGE, "data": ["phase_daily"]}
+
+    by_accept = await sse.rest_batch_endpoint(batch, accept="application/x-ndjson")
+    assert by_accept.media_type == sse.NDJSON_MEDIA_TYPE
+
+
+def test_batch_schema_validation():
+    with pytest.raises(ValidationError, match="khác nhau"):
+        _batch(("a", "phase_daily", {}), ("a", "phase_rank", {}))
+    with pytest.raises(ValidationError):
+        _batch(("a", "phase_daily", {"unknown": 1}))
+    with pytest.raises(ValidationError):
+        _batch(*[(str(i), "phase_daily", {}) for i in range(MAX_BATCH_PARTS + 1)])
+    with pytest.raises(ValidationError):
+        BatchRequest(requests=[])
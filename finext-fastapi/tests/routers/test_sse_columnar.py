@@ -0,0 +1,89 @@
+"""
+Test wire format gọn cho chart_*_data qua /sse/rest (`format=columnar`, `fields=`, `encoding=msgpack`).
+
+Bao phủ:
+    - to_columnar: tên cột 1 lần, giá trị theo cột, dòng thiếu field → None.
+    - fields= đi thẳng xuống projection Mongo (luôn kèm ticker, date); field lạ → 400.
+    - format=columnar / fields chỉ cho chart_*_data; keyword khác → 400.
+    - encoding=msgpack: 400 khi server thiếu package, ngược lại trả đúng media type.
+"""
+
+import json
+
+import pytest
+from fastapi import HTTPException
+
+import app.routers.sse as sse
+from app.crud.sse._constants import CHART_DATA_PROJECTION, chart_projection, parse_chart_fields
+from app.utils.wire_format import to_columnar
+
+ROWS = [
+    {"ticker": "FPT", "date": "2026-10-15", "close": 97.1, "ma20": float("nan")},
+    {"ticker": "FPT", "date": "2026-10-16", "close": 98.0},
+]
+
+
+def test_to_columnar_shape():
+    assert to_columnar(ROWS) == {
+        "columns": ["ticker", "date", "close", "ma20"],
+        "values": [["FPT", "FPT"], ["2026-10-15", "2026-10-16"], [97.1, 98.0], [ROWS[0]["ma20"], None]],
+    }
+    assert to_columnar([]) == {"columns": [], "values": []}
+
+
+def test_parse_chart_fields():
+    assert parse_chart_fields(None) is None
+    assert parse_chart_fields("close, ma20,close") == ["ticker", "date", "close", "ma20"]
+    with pytest.raises(ValueError):
+        parse_chart_fields("close,_id")
+    with pytest.raises(ValueError):
+        parse_chart_fields("password")
+    assert chart_projection(None) is CHART_DATA_PROJECTION
+    assert chart_projection(["ticker", "date", "close"]) == {"_id": 0, "ticker": 1, "date": 1, "close": 1}
+
+
+async def test_rest_columnar_with_fields(monkeypatch):
+    seen = {}
+
+    async def _query(keyword, **kwargs):
+        seen.update(kwargs)
+        return ROWS
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    resp = await sse.rest_query_endpoint(keyword="chart_history_data", ticker="FPT", projection=None, fields="close,ma20", wire_format="columnar")
+
+    assert seen["fields"] == ["ticker", "date", "close", "ma20"]
+    data = json.loads(resp.body)["data"]
+    assert data["columns"] == ["ticker", "date", "close", "ma20"]
+    assert data["values"][3] == [None, None]  # NaN đã được clean như payload dạng dòng
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"keyword": "home_today_stock", "wire_format": "columnar"},
+        {"keyword": "home_today_stock", "fields": "close"},
+        {"keyword": "chart_today_data", "fields": "close,not_a_field"},
+    ],
+)
+async def test_rest_columnar_rejects(kwargs):
+    with pytest.raises(HTTPException) as exc:
+        await sse.rest_query_endpoint(**kwargs)
+    assert exc.value.status_code == 400
+
+
+async def test_rest_msgpack(monkeypatch):
+    async def _query(keyword, **kwargs):
+        return ROWS
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    monkeypatch.setattr(sse, "msgpack_available", lambda: False)
+    with pytest.raises(HTTPException) as exc:
+        await sse.rest_query_endpoint(keyword="chart_today_data", projection=None, encoding="msgpack")
+    assert exc.value.status_code == 400
+
+    msgpack = pytest.importorskip("msgpack")
+    monkeypatch.setattr(sse, "msgpack_available", lambda: True)
+    resp = await sse.rest_query_endpoint(keyword="chart_today_data", projection=None, wire_format="columnar", encoding="msgpack")
+    assert resp.media_type == "application/msgpack"
+    assert msgpack.unpackb(resp.body)["data"]["columns"] == ["ticker", "date", "close", "ma20"]
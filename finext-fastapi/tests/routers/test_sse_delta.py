@@ -0,0 +1,127 @@
+"""
+Test giao thức delta cho SSE (utils/sse_delta.py + render trong routers/sse.py).
+
+Bao phủ:
+    - compute_row_delta: chỉ gửi dòng đổi, dòng bị xoá, order khi thứ tự đổi; None khi không
+      diff được (key trùng / không phải list[dict]) hoặc đổi quá nửa.
+    - Snapshot bọc payload bằng nối chuỗi, JSON hợp lệ.
+    - Render per-subscriber: snapshot đầu, delta khi liền version, resync khi tụt nhịp.
+    - Poller chỉ tính delta khi có subscriber delta.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import app.routers.sse as sse
+from app.utils.sse_delta import build_snapshot_frame, compute_row_delta
+
+
+def _rows(n, **overrides):
+    rows = [{"ticker": f"T{i}", "close": float(i)} for i in range(n)]
+    for t, close in overrides.items():
+        next(r for r in rows if r["ticker"] == t)["close"] = close
+    return rows
+
+
+@pytest.fixture(autouse=True)
+def _isolate_cache():
+    sse._cache.clear()
+    yield
+    sse._cache.clear()
+
+
+def test_delta_only_changed_rows():
+    delta = compute_row_delta(_rows(10), _rows(10, T3=99.0), ("ticker",))
+    assert delta == {"key": ["ticker"], "upsert": [{"ticker": "T3", "close": 99.0}], "remove": []}
+
+
+def test_delta_insert_remove_and_order():
+    prev = _rows(10)
+    curr = [r for r in prev if r["ticker"] != "T1"] + [{"ticker": "NEW", "close": 1.0}]
+    delta = compute_row_delta(prev, curr, ("ticker",))
+    assert delta["upsert"] == [{"ticker": "NEW", "close": 1.0}]
+    assert delta["remove"] == [{"ticker": "T1"}]
+    assert "order" not in delta  # dòng mới nối cuối = thứ tự client tự suy ra
+
+    reordered = list(reversed(prev))
+    assert compute_row_delta(prev, reordered, ("ticker",))["order"] == [r["ticker"] for r in reordered]
+
+
+def test_delta_composite_key():
+    prev = [{"ticker": "A", "date": "d1", "close": 1}, {"ticker": "A", "date": "d2", "close": 2}]
+    curr = [prev[0], {"ticker": "A", "date": "d2", "close": 3}]
+    delta = compute_row_delta(prev, curr, ("ticker", "date"))
+    assert delta["upsert"] == [{"ticker": "A", "date": "d2", "close": 3}]
+
+
+@pytest.mark.parametrize(
+    "prev,curr",
+    [
+        ({"a": 1}, {"a": 2}),  # không phải list
+        ([{"ticker": "A"}, {"ticker": "A"}], [{"ticker": "A"}]),  # key trùng
+        ([{"close": 1}], [{"close": 2}]),  # thiếu key
+        (_rows(4), _rows(4, T0=9.0, T1=9.0, T2=9.0)),  # đổi quá nửa → snapshot rẻ hơn
+    ],
+)
+def test_delta_not_applicable(prev, curr):
+    assert compute_row_delta(prev, curr, ("ticker",)) is None
+
+
+def test_snapshot_frame_is_valid_json():
+    frame = build_snapshot_frame('data: [{"a": 1}]\n\n', 7, resync=True)
+    body = json.loads(frame[len("data: ") : -2])
+    assert body == {"type": "snapshot", "version": 7, "resync": True, "data": [{"a": 1}]}
+
+
+def test_render_delta_sequence():
+    f1 = sse._Frame(payload="data: [1]\n\n", version=1)
+    f2 = sse._Frame(payload="data: [2]\n\n", version=2, delta="data: D2\n\n")
+    f3 = sse._Frame(payload="data: [3]\n\n", version=3, delta="data: D3\n\n")
+    f4 = sse._Frame(payload="data: [4]\n\n", version=4, delta="data: D4\n\n")
+
+    out, v = sse._render_delta(f1, 0)
+    assert json.loads(out[6:-2])["type"] == "snapshot" and v == 1
+    out, v = sse._render_delta(f2, v)
+    assert out == "data: D2\n\n" and v == 2
+    # f3 bị drop → f4 không liền version → resync bằng snapshot
+    out, v = sse._render_delta(f4, v)
+    assert json.loads(out[6:-2]) == {"type": "snapshot", "version": 4, "resync": True, "data": [4]}
+    # frame cũ hơn version đang giữ → bỏ qua
+    assert sse._render_delta(f3, v) == (None, 4)
+    # frame lỗi gửi nguyên
+    err = sse._Frame(payload='data: {"error": "x"}\n\n')
+    assert sse._render_delta(err, v) == ('data: {"error": "x"}\n\n', 4)
+
+
+async def test_poller_builds_delta_only_for_delta_subscribers(monkeypatch):
+    state = {"rows": _rows(20)}
+
+    async def _query(keyword, ticker=None, **kwargs):
+        return state["rows"]
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    monkeypatch.setattr(sse, "SSE_POLL_SCHEDULE", "fixed")
+    monkeypatch.setattr(sse, "SSE_POLL_INTERVAL", 0.01)
+
+    key, plain = await sse._subscribe("home_today_stock", None)
+    _, dq = await sse._subscribe("home_today_stock", None, delta=True)
+    try:
+        first = await asyncio.wait_for(dq.get(), timeout=1.0)
+        assert first.version == 1 and first.delta is None
+
+        state["rows"] = _rows(20, T5=123.0)
+        second = await asyncio.wait_for(dq.get(), timeout=1.0)
+        assert second.version == 2
+        body = json.loads(second.delta[6:-2])
+        assert body["type"] == "delta" and body["base"] == 1
+        assert body["upsert"] == [{"ticker": "T5", "close": 123.0}]
+        # Subscriber thường nhận chung frame object; chưa đọc frame 1 → mailbox chỉ giữ frame mới nhất.
+        assert (await plain.get()) is second
+        assert plain.conflated == 1
+
+        await sse._unsubscribe(key, dq)
+        assert not sse._cache[key].delta_subscribers
+    finally:
+        await sse._unsubscribe(key, plain)
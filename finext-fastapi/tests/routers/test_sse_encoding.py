@@ -0,0 +1,79 @@
+"""
+Test `?encoding=deflate` trên /sse/stream và /sse/multiplex.
+
+Bao phủ:
+    - Frame nén 1 lần / thay đổi rồi dùng chung cho mọi subscriber (chuỗi giống hệt, 1 lần nén).
+    - Delta/snapshot/resync nén riêng theo kind, giải nén ra đúng frame gốc.
+    - Encoding không hỗ trợ → 400, không tạo poller.
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+import app.routers.sse as sse
+from app.utils.sse_encoding import decode_frame
+
+
+@pytest.fixture(autouse=True)
+def _isolate_cache(monkeypatch):
+    sse._cache.clear()
+    monkeypatch.setattr(sse, "_encoded_frames", 0)
+    yield
+    sse._cache.clear()
+
+
+def _payload(n: int = 400) -> str:
+    return f"data: {json.dumps([{'ticker': f'T{i}', 'close': float(i)} for i in range(n)])}\n\n"
+
+
+def test_frame_encoded_once_for_all_subscribers():
+    frame = sse._Frame(payload=_payload(), version=1)
+    outs = [frame.render("payload", "deflate") for _ in range(50)]
+    assert all(o is outs[0] for o in outs)
+    assert sse._encoded_frames == 1
+    assert decode_frame(outs[0]) == frame.payload
+    assert frame.render("payload") is frame.payload  # subscriber không chọn encoding vẫn nhận nguyên văn
+
+
+def test_render_delta_encodes_each_kind():
+    delta = f"data: {json.dumps({'type': 'delta', 'rows': list(range(600))})}\n\n"
+    f1 = sse._Frame(payload=_payload(), version=1)
+    f2 = sse._Frame(payload=_payload(), version=2, delta=delta)
+
+    out, v = sse._render_delta(f1, 0, "deflate")
+    assert decode_frame(out) == f1.snapshot() and v == 1
+    out, v = sse._render_delta(f2, v, "deflate")
+    assert decode_frame(out) == delta and v == 2
+    out, _ = sse._render_delta(sse._Frame(payload=_payload(), version=9), 5, "deflate")
+    assert json.loads(decode_frame(out)[6:-2])["resync"] is True
+
+
+class _Request:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+async def test_stream_endpoint_sends_compressed_frames(monkeypatch):
+    async def _query(keyword, ticker=None, **kwargs):
+        return [{"ticker": f"T{i}", "close": float(i)} for i in range(400)]
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    resp = await sse.sse_stream_endpoint(_Request(), keyword="home_today_stock", ticker=None, delta=False, encoding="deflate")
+    out = await asyncio.wait_for(resp.body_iterator.__anext__(), timeout=1.0)
+    event_id, frame = out.split("\n", 1)
+    assert event_id.startswith("id: ")
+    assert json.loads(frame[6:-2])["type"] == "compressed"
+    assert json.loads(decode_frame(frame)[6:-2])[0] == {"ticker": "T0", "close": 0.0}
+    await resp.body_iterator.aclose()
+
+
+async def test_unsupported_encoding_rejected_without_poller():
+    with pytest.raises(HTTPException) as ei:
+        await sse.sse_stream_endpoint(_Request(), keyword="home_today_stock", ticker=None, delta=False, encoding="br")
+    assert ei.value.status_code == 400
+    with pytest.raises(HTTPException):
+        await sse.sse_multiplex_endpoint(_Request(), ch=["home_today_stock"], delta=False, encoding="br")
+    assert sse._cache == {}
@@ -0,0 +1,184 @@
+"""
+Test fan-out SSE cấp host (core/sse_fanout.py).
+
+Bao phủ:
+    - Bầu leader bằng fcntl lock: 1 instance lên leader, instance còn lại relay.
+    - Follower nhận nguyên frame leader đẩy sang; follower dừng → leader unsubscribe.
+    - Leader đóng → follower mất kết nối và take over quyền leader.
+    - Router: poller của follower KHÔNG gọi execute_sse_query, chỉ broadcast frame relay.
+    - Frame relay tới sau khi subscriber cuối rời (entry đã dọn) → bỏ qua, không làm hỏng vòng relay.
+
+Hai "worker" được mô phỏng bằng 2 instance SseFanout trong cùng process — flock gắn với
+open file description nên 2 lần os.open cùng file vẫn loại trừ nhau như 2 process.
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+import app.routers.sse as sse
+from app.core.sse_fanout import SseFanout
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="fan-out cần fcntl + Unix socket")
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "fanout.lock"), str(tmp_path / "fanout.sock")
+
+
+@pytest.fixture(autouse=True)
+def _isolate_cache():
+    sse._cache.clear()
+    yield
+    sse._cache.clear()
+
+
+class _FakeCache:
+    """subscribe/unsubscribe giả phía leader — ghi lại lời gọi, trả queue test tự đẩy frame."""
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.subscribed: list = []
+        self.unsubscribed: list = []
+
+    async def subscribe(self, keyword, ticker):
+        self.subscribed.append((keyword, ticker))
+        return f"{keyword}|{ticker or ''}", self.queue
+
+    async def unsubscribe(self, key, queue):
+        self.unsubscribed.append(key)
+
+
+async def _wait_until(cond, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not cond():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("timeout chờ điều kiện")
+        await asyncio.sleep(0.01)
+
+
+async def test_disabled_never_relays(paths):
+    f = SseFanout(*paths, enabled=False)
+    assert await f.should_relay() is False
+    assert f.is_leader is False
+
+
+async def test_leader_election_single_leader(paths):
+    a = SseFanout(*paths, enabled=True)
+    b = SseFanout(*paths, enabled=True)
+    try:
+        assert await a.should_relay() is False  # a lên leader
+        assert a.is_leader
+        assert await b.should_relay() is True  # b thấy đã có leader
+        assert not b.is_leader
+    finally:
+        await a.close()
+        await b.close()
+
+
+async def test_relay_forwards_frames_and_takeover(paths):
+    leader = SseFanout(*paths, enabled=True)
+    follower = SseFanout(*paths, enabled=True)
+    cache = _FakeCache()
+    leader.bind(cache.subscribe, cache.unsubscribe)
+    try:
+        await leader.should_relay()
+        assert await follower.should_relay() is True
+
+        frames: list[str] = []
+        relay_task = asyncio.create_task(follower.relay("home_today_index", "VNINDEX", frames.append))
+        await _wait_until(lambda: cache.subscribed)
+        assert cache.subscribed == [("home_today_index", "VNINDEX")]
+
+        await cache.queue.put(sse._Frame(payload='data: [{"ticker": "VNINDEX"}]\n\n', version=1))
+        await cache.queue.put(sse._Frame(payload="data: [1]\n\n", version=2))
+        await _wait_until(lambda: len(frames) == 2)
+        assert frames == ['data: [{"ticker": "VNINDEX"}]\n\n', "data: [1]\n\n"]
+
+        # Leader chết → relay trả True (đã nhận frame) → follower bầu lại và lên leader.
+        await leader.close()
+        assert await asyncio.wait_for(relay_task, timeout=2.0) is True
+        assert await follower.should_relay() is False
+        assert follower.is_leader
+    finally:
+        await leader.close()
+        await follower.close()
+
+
+async def test_follower_stop_unsubscribes_on_leader(paths):
+    leader = SseFanout(*paths, enabled=True)
+    follower = SseFanout(*paths, enabled=True)
+    cache = _FakeCache()
+    leader.bind(cache.subscribe, cache.unsubscribe)
+    try:
+        await leader.should_relay()
+        relay_task = asyncio.create_task(follower.relay("home_today_stock", None, lambda f: None))
+        await _wait_until(lambda: cache.subscribed)
+
+        relay_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await relay_task
+        await _wait_until(lambda: cache.unsubscribed)
+        assert cache.unsubscribed == ["home_today_stock|"]
+    finally:
+        await leader.close()
+        await follower.close()
+
+
+async def test_relay_without_leader_returns_false(paths):
+    f = SseFanout(*paths, enabled=True)
+    assert await f.relay("home_today_index", None, lambda frame: None) is False
+
+
+async def test_follower_poller_does_not_query_db(monkeypatch):
+    calls = []
+
+    async def _counting_query(keyword, ticker=None, **kwargs):
+        calls.append(keyword)
+        return []
+
+    class _FollowerFanout:
+        async def should_relay(self):
+            return True
+
+        async def relay(self, keyword, ticker, on_frame):
+            on_frame('data: [{"close": 1}]\n\n')
+            await asyncio.Event().wait()  # giữ kết nối "leader" mãi
+
+    monkeypatch.setattr(sse, "execute_sse_query", _counting_query)
+    monkeypatch.setattr(sse, "fanout", _FollowerFanout())
+
+    key, q = await sse._subscribe("home_today_index", None)
+    frame = await asyncio.wait_for(q.get(), timeout=2.0)
+
+    assert frame.payload == 'data: [{"close": 1}]\n\n'
+    assert sse._cache[key].last_frame is frame
+    assert calls == []
+
+    await sse._unsubscribe(key, q)
+    assert key not in sse._cache
+
+
+async def test_relayed_frame_after_entry_removed_is_dropped(monkeypatch):
+    callbacks = []
+
+    class _FollowerFanout:
+        async def should_relay(self):
+            return True
+
+        async def relay(self, keyword, ticker, on_frame):
+            callbacks.append(on_frame)
+            on_frame('data: [{"close": 1}]\n\n')
+            await asyncio.Event().wait()
+
+    monkeypatch.setattr(sse, "fanout", _FollowerFanout())
+    key, q = await sse._subscribe("home_today_index", None)
+    first = await asyncio.wait_for(q.get(), timeout=2.0)
+    entry = sse._cache[key]
+    await sse._unsubscribe(key, q)
+    assert key not in sse._cache
+
+    callbacks[0]('data: [{"close": 2}]\n\n')  # entry đã dọn → bỏ frame, không AttributeError
+    assert key not in sse._cache and entry.last_frame is first
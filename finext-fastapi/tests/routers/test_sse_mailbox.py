@@ -0,0 +1,82 @@
+"""
+Test _Mailbox — hộp thư conflate latest-value của mỗi kết nối SSE.
+
+Bao phủ:
+    - Consumer chậm chỉ nhận frame mới nhất, không bao giờ mất frame mới nhất.
+    - Đếm số frame bị conflate (theo mailbox và tổng cho /sse/metrics).
+    - Multiplex: mỗi channel 1 ô, thứ tự theo channel có hàng trước.
+    - Subscriber delta bị conflate nhảy version → nhận snapshot resync.
+    - Huỷ get() giữa chừng không làm mất frame.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import app.routers.sse as sse
+
+
+def _frame(version: int, delta: str = None) -> sse._Frame:
+    return sse._Frame(payload=f'data: {{"v":{version}}}\n\n', version=version, delta=delta)
+
+
+async def test_slow_consumer_gets_latest_frame_only(monkeypatch):
+    monkeypatch.setattr(sse, "_conflated_frames", 0)
+    box = sse._Mailbox()
+    frames = [_frame(v) for v in range(1, 6)]
+    for f in frames:
+        box.put_nowait(f)
+
+    assert (await asyncio.wait_for(box.get(), timeout=1.0)) is frames[-1]
+    assert box.conflated == 4
+    assert sse._conflated_frames == 4
+
+    # Hết hàng → get() chờ tới frame kế tiếp.
+    waiter = asyncio.ensure_future(box.get())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    box.put_nowait(frames[0])
+    assert (await asyncio.wait_for(waiter, timeout=1.0)) is frames[0]
+
+
+async def test_multiplex_keeps_one_slot_per_channel():
+    box = sse._Mailbox()
+    a, b = sse._ChannelSink("a", box), sse._ChannelSink("b", box)
+    a.put_nowait(_frame(1))
+    b.put_nowait(_frame(1))
+    latest_a = _frame(2)
+    a.put_nowait(latest_a)  # thay ô của "a", giữ vị trí
+
+    assert (await box.get_item()) == ("a", latest_a)
+    channel, frame = await box.get_item()
+    assert channel == "b" and frame.version == 1
+    assert box.conflated == 1
+
+
+async def test_cancelled_get_does_not_lose_frame():
+    box = sse._Mailbox()
+    waiter = asyncio.ensure_future(box.get())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    f = _frame(1)
+    box.put_nowait(f)
+    assert (await asyncio.wait_for(box.get(), timeout=1.0)) is f
+
+
+async def test_conflated_delta_subscriber_resyncs_with_snapshot():
+    box = sse._Mailbox()
+    box.put_nowait(_frame(1))
+    out, last = sse._render_delta(await box.get(), 0)
+    assert last == 1 and '"type": "snapshot"' in out
+
+    # Client chậm: version 2 bị conflate bởi version 3 → delta (base 2) không áp được, gửi snapshot.
+    box.put_nowait(_frame(2, delta='data: {"type":"delta","base":1}\n\n'))
+    box.put_nowait(_frame(3, delta='data: {"type":"delta","base":2}\n\n'))
+    out, last = sse._render_delta(await box.get(), last)
+    assert last == 3
+    body = json.loads(out[len("data: ") : -2])
+    assert body["type"] == "snapshot" and body["version"] == 3 and body.get("resync") is True
@@ -0,0 +1,98 @@
+"""
+Test endpoint /sse/multiplex (nhiều channel trên 1 kết nối SSE).
+
+Bao phủ:
+    - Mỗi channel dùng lại cache entry/poller chung với /stream — không tạo poller riêng.
+    - Frame gắn `event: <channel>`, delta render riêng theo từng channel.
+    - Channel sai / quá nhiều channel → 400, không để lại poller.
+    - Chạm cap giữa chừng → trả các channel đã đăng ký rồi mới 503.
+    - Client ngắt → unsubscribe mọi channel.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import app.routers.sse as sse
+
+
+@pytest.fixture(autouse=True)
+def _isolate_cache(monkeypatch):
+    sse._cache.clear()
+
+    async def _query(keyword, ticker=None, **kwargs):
+        return [{"ticker": ticker or keyword, "close": 1}]
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    yield
+    sse._cache.clear()
+
+
+class _Request:
+    def __init__(self) -> None:
+        self.disconnected = False
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+async def _next_frames(gen, n):
+    return [await asyncio.wait_for(gen.__anext__(), timeout=1.0) for _ in range(n)]
+
+
+async def test_multiplex_tags_frames_and_shares_pollers():
+    # 1 subscriber /stream có sẵn → channel multiplex cùng key phải dùng chung entry.
+    key, q = await sse._subscribe("home_today_index", "VNINDEX")
+    await asyncio.wait_for(q.get(), timeout=1.0)
+
+    req = _Request()
+    resp = await sse.sse_multiplex_endpoint(req, ch=["home_today_index:VNINDEX", "home_today_stock", "home_today_stock"], delta=False)
+    assert set(sse._cache) == {"home_today_index|VNINDEX", "home_today_stock|"}
+    assert len(sse._cache[key].subscribers) == 2
+
+    frames = await _next_frames(resp.body_iterator, 2)
+    assert sorted(frames) == [
+        'event: home_today_index:VNINDEX\ndata: [{"ticker":"VNINDEX","close":1}]\n\n',
+        'event: home_today_stock\ndata: [{"ticker":"home_today_stock","close":1}]\n\n',
+    ]
+
+    req.disconnected = True
+    await asyncio.wait_for(resp.body_iterator.aclose(), timeout=1.0)
+    assert set(sse._cache) == {key}
+    assert sse._cache[key].subscribers == {q}
+    await sse._unsubscribe(key, q)
+
+
+async def test_multiplex_delta_versions_per_channel():
+    resp = await sse.sse_multiplex_endpoint(_Request(), ch=["home_today_index:VNINDEX", "home_today_stock"], delta=True)
+    frames = await _next_frames(resp.body_iterator, 2)
+    # Mỗi channel bắt đầu bằng snapshot riêng (version theo entry của channel đó).
+    assert all('data: {"type": "snapshot", "version": 1, "data": ' in f for f in frames)
+    await resp.body_iterator.aclose()
+
+
+@pytest.mark.parametrize(
+    "channels",
+    [
+        [],
+        ["bad_keyword"],
+        ["home_today_index:FPT-USD"],
+        ["home_today_stock", "bad_keyword"],
+        [f"home_today_index:T{i}" for i in range(sse.MAX_MULTIPLEX_CHANNELS + 1)],
+    ],
+)
+async def test_multiplex_rejects_invalid_channels(channels):
+    with pytest.raises(HTTPException) as exc:
+        await sse.sse_multiplex_endpoint(_Request(), ch=channels, delta=False)
+    assert exc.value.status_code == 400
+    assert sse._cache == {}
+
+
+async def test_multiplex_rolls_back_on_cap(monkeypatch):
+    monkeypatch.setattr(sse, "MAX_POLLERS", 1)
+    with pytest.raises(HTTPException) as exc:
+        await sse.sse_multiplex_endpoint(_Request(), ch=["home_today_stock", "home_today_index"], delta=False)
+    assert exc.value.status_code == 503
+    await asyncio.sleep(0)
+    assert sse._cache == {}
@@ -0,0 +1,103 @@
+"""
+Test ETag / If-None-Match + Cache-Control / Surrogate-Key trên /sse/rest/{keyword}.
+
+Bao phủ:
+    - ETag ổn định theo nội dung (không phụ thuộc process), đổi khi dữ liệu đổi.
+    - If-None-Match khớp (kể cả dạng W/, danh sách, "*") → 304 rỗng kèm ETag + Cache-Control.
+    - Biểu diễn khác nhau (format/encoding) của cùng dữ liệu có ETag khác nhau.
+    - Cache-Control theo refresh class; Surrogate-Key chứa keyword + collection nguồn.
+"""
+
+import json
+
+import pytest
+from fastapi import HTTPException
+
+import app.routers.sse as sse
+from app.core.query_governor import QueryShedError
+from app.crud.sse._rest_cache import rest_cache
+from app.utils.http_cache import cache_control_for, etag_matches, make_etag, payload_digest
+
+
+def _stub(monkeypatch, rows):
+    async def _query(keyword, **kwargs):
+        return rows
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+
+
+async def _call(keyword="phase_daily", **kwargs):
+    kwargs.setdefault("projection", None)
+    return await sse.rest_query_endpoint(keyword=keyword, **kwargs)
+
+
+def test_digest_is_stable_and_content_based():
+    assert payload_digest('[{"a":1}]') == payload_digest('[{"a":1}]')
+    assert payload_digest('[{"a":1}]') != payload_digest('[{"a":2}]')
+    # Giá trị cố định — hash() built-in bị salt theo process, digest thì không.
+    assert payload_digest("") == "cae66941d9efbd404e4d88758ea67670"
+
+
+def test_etag_matching_rules():
+    etag = make_etag("abc", "rows.json")
+    assert etag == '"abc-rows.json"'
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"x", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"abc"', etag)
+    assert not etag_matches(None, etag)
+
+
+async def test_etag_and_304(monkeypatch):
+    _stub(monkeypatch, [{"date": "2026-10-16", "phase": 1}])
+    first = await _call()
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag.startswith('"')
+
+    not_modified = await _call(if_none_match=etag)
+    assert not_modified.status_code == 304 and not_modified.body == b""
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.headers["cache-control"] == first.headers["cache-control"]
+
+    stale = await _call(if_none_match='"deadbeef-rows.json"')
+    assert stale.status_code == 200 and json.loads(stale.body)["data"] == [{"date": "2026-10-16", "phase": 1}]
+
+
+async def test_etag_changes_with_data(monkeypatch):
+    _stub(monkeypatch, [{"phase": 1}])
+    etag1 = (await _call()).headers["etag"]
+    rest_cache.clear()
+    _stub(monkeypatch, [{"phase": 2}])
+    resp = await _call(if_none_match=etag1)
+    assert resp.status_code == 200 and resp.headers["etag"] != etag1
+
+
+async def test_representations_have_distinct_etags(monkeypatch):
+    _stub(monkeypatch, [{"ticker": "FPT", "date": "2026-10-16", "close": 98.0}])
+    rows = await _call("chart_history_data", ticker="FPT")
+    columnar = await _call("chart_history_data", ticker="FPT", wire_format="columnar")
+    assert rows.headers["etag"] != columnar.headers["etag"]
+    assert (await _call("chart_history_data", ticker="FPT", if_none_match=columnar.headers["etag"])).status_code == 200
+
+
+async def test_cache_headers_by_refresh_class(monkeypatch):
+    _stub(monkeypatch, [])
+    eod = await _call("phase_daily")
+    realtime = await _call("home_today_index")
+    assert eod.headers["cache-control"] == cache_control_for("eod")
+    assert realtime.headers["cache-control"] == cache_control_for("realtime")
+    assert "max-age=60" in eod.headers["cache-control"] and "max-age=1," in realtime.headers["cache-control"]
+
+    keys = eod.headers["surrogate-key"].split()
+    assert "kw:phase_daily" in keys and "class:eod" in keys
+    assert any(k.startswith("src:") for k in keys)
+
+
+async def test_rest_shed_by_governor_returns_503(monkeypatch):
+    async def _query(keyword, **kwargs):
+        raise QueryShedError("interactive", "overloaded")
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    with pytest.raises(HTTPException) as ei:
+        await _call()
+    assert ei.value.status_code == 503 and ei.value.headers["Retry-After"] == "2"
@@ -0,0 +1,138 @@
+"""
+Test resume /sse/stream qua event id + Last-Event-ID.
+
+Bao phủ:
+    - Frame có version gắn `id: <epoch>-<version>`, frame lỗi không có id.
+    - Reconnect với id mới nhất → không gửi lại gì.
+    - Delta client lỡ vài nhịp còn trong ring buffer → replay đúng phần thiếu, rồi nhận tiếp delta.
+    - Replay render theo encoding của subscriber (?encoding=deflate) như frame live.
+    - Lỡ quá ring buffer / chuỗi delta đứt / epoch khác → snapshot (resync) như kết nối mới.
+    - Subscriber thường lỡ nhịp → chỉ nhận payload mới nhất.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import app.routers.sse as sse
+from app.utils.sse_encoding import decode_frame
+
+KEYWORD = "home_today_stock"
+
+
+def _rows(close: float):
+    return [{"ticker": "A", "close": close}, {"ticker": "B", "close": 1.0}, {"ticker": "C", "close": 1.0}]
+
+
+class _Request:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+@pytest.fixture
+async def entry():
+    """Entry có sẵn 1 subscriber delta (để poller tính delta) và 5 version; poller giả không query DB."""
+    sse._cache.clear()
+    key = sse._cache_key(KEYWORD, None)
+    e = sse._CacheEntry(task=asyncio.create_task(asyncio.sleep(3600)))
+    e.delta_subscribers.add(sse._Mailbox())
+    sse._cache[key] = e
+    for close in range(1, 6):
+        rows = _rows(float(close))
+        sse._publish(e, KEYWORD, f"data: {json.dumps(rows)}\n\n", rows)
+    yield e
+    e.task.cancel()
+    sse._cache.clear()
+
+
+async def _first(gen):
+    return await asyncio.wait_for(gen.__anext__(), timeout=1.0)
+
+
+async def test_frames_carry_event_ids(entry):
+    key, box = await sse._subscribe(KEYWORD, None)
+    out = await _first(sse.sse_event_generator(_Request(), key, box))
+    assert out.startswith(f"id: {entry.epoch}-5\ndata: ")
+
+    entry.task.cancel()
+    sse._broadcast(entry, sse._Frame(payload='data: {"error": "x"}\n\n'))
+    assert (await box.get()).event_id is None
+
+
+async def test_resume_up_to_date_sends_nothing(entry):
+    _, box = await sse._subscribe(KEYWORD, None, delta=True, last_event_id=f"{entry.epoch}-5")
+    assert box.resume_version == 5 and not box.backlog
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(box.get(), timeout=0.05)
+
+
+async def test_delta_resume_replays_missed_frames(entry):
+    key, box = await sse._subscribe(KEYWORD, None, delta=True, last_event_id=f"{entry.epoch}-3")
+    gen = sse.sse_event_generator(_Request(), key, box, delta=True)
+    replayed = [await _first(gen), await _first(gen)]
+    assert [r.split("\n", 1)[0] for r in replayed] == [f"id: {entry.epoch}-4", f"id: {entry.epoch}-5"]
+    bodies = [json.loads(r.split("\n", 1)[1][len("data: ") : -2]) for r in replayed]
+    assert [(b["type"], b["base"]) for b in bodies] == [("delta", 3), ("delta", 4)]
+
+    # Sau replay, nhịp mới đến như delta bình thường (không snapshot lại).
+    rows = _rows(6.0)
+    sse._publish(entry, KEYWORD, f"data: {json.dumps(rows)}\n\n", rows)
+    nxt = await _first(gen)
+    assert nxt.startswith(f"id: {entry.epoch}-6\n") and "snapshot" not in nxt
+    await gen.aclose()
+
+
+async def test_delta_resume_replays_with_subscriber_encoding():
+    sse._cache.clear()
+    e = sse._CacheEntry(task=asyncio.create_task(asyncio.sleep(3600)))
+    e.delta_subscribers.add(sse._Mailbox())
+    sse._cache[sse._cache_key(KEYWORD, None)] = e
+    try:
+        for close in range(1, 4):  # 60/300 dòng đổi mỗi nhịp → delta đủ lớn để bị nén
+            rows = [{"ticker": f"T{i:03d}", "close": float(close if i < 60 else 0)} for i in range(300)]
+            sse._publish(e, KEYWORD, f"data: {json.dumps(rows)}\n\n", rows)
+        key, box = await sse._subscribe(KEYWORD, None, delta=True, last_event_id=f"{e.epoch}-1")
+        gen = sse.sse_event_generator(_Request(), key, box, delta=True, encoding="deflate")
+        replayed = [await _first(gen), await _first(gen)]
+        await gen.aclose()
+    finally:
+        e.task.cancel()
+        sse._cache.clear()
+    for version, out in zip((2, 3), replayed):
+        head, frame = out.split("\n", 1)
+        assert head == f"id: {e.epoch}-{version}" and '"type": "compressed"' in frame
+        body = json.loads(decode_frame(frame)[len("data: ") : -2])
+        assert (body["type"], body["version"]) == ("delta", version)
+
+
+@pytest.mark.parametrize("last_event_id", ["bogus-3", "3", "", "xx"])
+async def test_unknown_event_id_is_a_fresh_connection(entry, last_event_id):
+    _, box = await sse._subscribe(KEYWORD, None, delta=True, last_event_id=last_event_id)
+    assert box.resume_version == 0 and not box.backlog
+    assert (await box.get()) is entry.last_frame
+
+
+async def test_gap_beyond_buffer_resyncs_with_snapshot(entry):
+    entry.replay.clear()  # như khi chuỗi delta đứt / quá SSE_REPLAY_FRAMES
+    key, box = await sse._subscribe(KEYWORD, None, delta=True, last_event_id=f"{entry.epoch}-2")
+    out = await _first(sse.sse_event_generator(_Request(), key, box, delta=True))
+    body = json.loads(out.split("\n", 1)[1][len("data: ") : -2])
+    assert body["type"] == "snapshot" and body["version"] == 5 and body["resync"] is True
+
+
+async def test_plain_resume_gets_latest_payload_only(entry):
+    _, box = await sse._subscribe(KEYWORD, None, last_event_id=f"{entry.epoch}-2")
+    assert (await box.get()) is entry.last_frame
+    assert not box.backlog
+
+
+def test_replay_buffer_is_bounded_and_contiguous():
+    e = sse._CacheEntry()
+    e.delta_subscribers.add(sse._Mailbox())
+    for close in range(sse.SSE_REPLAY_FRAMES + 10):
+        rows = _rows(float(close))
+        sse._publish(e, KEYWORD, "data: []\n\n", rows)
+    versions = [frame.version for frame in e.replay]
+    assert len(versions) == sse.SSE_REPLAY_FRAMES
+    assert versions == list(range(e.version - sse.SSE_REPLAY_FRAMES + 1, e.version + 1))
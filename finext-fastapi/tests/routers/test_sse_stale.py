@@ -0,0 +1,133 @@
+"""
+Test phục vụ dữ liệu cũ khi Mongo lỗi (stale-while-revalidate + circuit breaker).
+
+Bao phủ:
+    - Poller: query lỗi sau khi đã có dữ liệu → `event: stale` kèm tuổi, không phát frame lỗi;
+      chưa có dữ liệu hoặc quá SSE_STALE_MAX_AGE → frame query_error như cũ.
+    - Mailbox: frame stale nằm ô riêng, không đè frame dữ liệu đang chờ.
+    - Multiplex: frame stale gắn tên channel trong data.
+    - REST: cache hết TTL + Mongo lỗi → trả bản cuối kèm stale/age, header Age, no-store;
+      breaker mở + không có bản cũ → 503.
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from pymongo.errors import ServerSelectionTimeoutError
+
+import app.crud.sse._rest_cache as rc
+import app.routers.sse as sse
+from app.crud.sse._breaker import CircuitOpenError
+
+KEYWORD = "home_today_index"
+
+
+class _Request:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+@pytest.fixture(autouse=True)
+def _fast_poll(monkeypatch):
+    async def _no_wait(*args):
+        await asyncio.sleep(0)
+
+    monkeypatch.setattr(sse, "_wait_next_poll", _no_wait)
+    monkeypatch.setattr(sse, "SSE_ERROR_BACKOFF", 0.01)
+    sse._cache.clear()
+    yield
+    for entry in sse._cache.values():
+        if entry.task is not None:
+            entry.task.cancel()
+    sse._cache.clear()
+
+
+def _flaky(results):
+    """execute_sse_query giả: trả lần lượt từng phần tử của results; Exception → raise."""
+    it = iter(results)
+
+    async def _query(keyword, ticker=None, **kwargs):
+        item = next(it, results[-1])
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    return _query
+
+
+async def test_poller_serves_stale_instead_of_error(monkeypatch):
+    monkeypatch.setattr(sse, "execute_sse_query", _flaky([[{"close": 1}], ServerSelectionTimeoutError("down")]))
+    key, box = await sse._subscribe(KEYWORD, None)
+    gen = sse.sse_event_generator(_Request(), key, box)
+
+    first = await asyncio.wait_for(gen.__anext__(), timeout=1.0)
+    assert '"close":1' in first
+    stale = await asyncio.wait_for(gen.__anext__(), timeout=1.0)
+    assert stale.startswith("event: stale\ndata: ")
+    body = json.loads(stale.split("data: ", 1)[1])
+    assert body["stale"] is True and body["age"] >= 0
+    await gen.aclose()
+
+
+@pytest.mark.parametrize("max_age", [900, -1])
+async def test_poller_without_fresh_data_sends_error(monkeypatch, max_age):
+    monkeypatch.setattr(sse, "SSE_STALE_MAX_AGE", max_age)
+    results = [RuntimeError("down")] if max_age > 0 else [[{"close": 1}], RuntimeError("down")]
+    monkeypatch.setattr(sse, "execute_sse_query", _flaky(results))
+    _, box = await sse._subscribe(KEYWORD, None)
+    frame = await asyncio.wait_for(box.get(), timeout=1.0)
+    if max_age < 0:
+        frame = await asyncio.wait_for(box.get(), timeout=1.0)
+    assert frame.stale_age is None and '"query_error"' in frame.payload
+
+
+async def test_stale_marker_does_not_overwrite_pending_data():
+    box = sse._Mailbox()
+    data = sse._Frame(payload="data: [1]\n\n", version=1)
+    box.put_nowait(data)
+    box.put_nowait(sse._stale_frame(5.0))
+    assert (await box.get()) is data
+    assert (await box.get()).stale_age == 5.0
+    assert box.conflated == 0
+
+
+def test_multiplex_stale_event_carries_channel():
+    frame = sse._stale_frame(3.25)
+    assert sse._render_stale(frame) == frame.payload
+    out = sse._render_stale(frame, "vnindex")
+    assert out.startswith("event: stale\ndata: ")
+    assert json.loads(out.split("data: ", 1)[1]) == {"stale": True, "age": 3.2, "channel": "vnindex"}
+
+
+async def _rest(**kwargs):
+    kwargs.setdefault("projection", None)
+    return await sse.rest_query_endpoint(keyword="phase_daily", **kwargs)
+
+
+async def test_rest_serves_stale_when_mongo_fails(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rc.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(sse, "execute_sse_query", _flaky([[{"a": 1}], ServerSelectionTimeoutError("down")]))
+    fresh = await _rest()
+    assert fresh.headers["cache-control"] != "no-store"
+
+    # Hết TTL (class eod) nhưng còn trong hạn stale.
+    monkeypatch.setattr(rc.rest_cache, "stale_max_age", 600)
+    now[0] += rc.rest_cache_ttl("eod") + 30
+    resp = await _rest()
+    body = json.loads(resp.body)
+    assert body["stale"] is True and body["age"] > 0
+    assert resp.headers["cache-control"] == "no-store" and resp.headers["age"] == str(int(rc.rest_cache_ttl("eod") + 30))
+    assert resp.headers["etag"] == fresh.headers["etag"]
+
+
+async def test_rest_breaker_open_without_stale_returns_503(monkeypatch):
+    async def _query(keyword, **kwargs):
+        raise CircuitOpenError("open")
+
+    monkeypatch.setattr(sse, "execute_sse_query", _query)
+    with pytest.raises(HTTPException) as ei:
+        await _rest()
+    assert ei.value.status_code == 503 and int(ei.value.headers["Retry-After"]) >= 2
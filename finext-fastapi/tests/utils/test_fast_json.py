@@ -0,0 +1,73 @@
+"""
+Test encoder JSON 1 lượt (app/utils/fast_json.py).
+
+Bao phủ:
+    - Cùng kết quả (sau parse) với đường cũ clean_nan_values + json.dumps(default=str).
+    - NaN/Inf → null; ObjectId/datetime → str (định dạng cũ, không phải ISO "T").
+    - float subclass (numpy.float64) vẫn là số; số nguyên > 64 bit fallback json chuẩn.
+    - splice_envelope khớp StandardApiResponse.model_dump(); fallback khi thiếu orjson.
+"""
+
+import json
+import math
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+import app.utils.fast_json as fj
+from app.utils.fast_json import clean_nan_values, dumps_json, loads_json, splice_envelope
+from app.utils.response_wrapper import StandardApiResponse
+
+
+class _Float(float):
+    pass
+
+
+def _sample():
+    return [
+        {
+            "_id": ObjectId("65f000000000000000000001"),
+            "ticker": "FPT",
+            "name": "CTCP FPT — Công nghệ",
+            "date": datetime(2026, 10, 16, 14, 45),
+            "close": 98.5,
+            "pe": float("nan"),
+            "pb": float("inf"),
+            "ratio": _Float(1.25),
+            "bad": _Float("nan"),
+            "nested": {"vals": [1, float("-inf"), None, "x"]},
+            3: "int key",
+        }
+    ]
+
+
+def _legacy(data):
+    return json.dumps(clean_nan_values(data), default=str)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_matches_legacy_encoding(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(fj, "orjson", None)
+    elif fj.orjson is None:
+        pytest.skip("orjson chưa được cài")
+    out = dumps_json(_sample())
+    assert json.loads(out) == json.loads(_legacy(_sample()))
+    row = loads_json(out)[0]
+    assert row["date"] == "2026-10-16 14:45:00" and row["_id"] == "65f000000000000000000001"
+    assert row["pe"] is None and row["pb"] is None and row["bad"] is None and row["ratio"] == 1.25
+    assert "NaN" not in out.decode("utf-8") and "Công nghệ" in out.decode("utf-8")
+
+
+def test_huge_int_falls_back():
+    assert json.loads(dumps_json({"v": 2**70, "n": math.nan})) == {"v": 2**70, "n": None}
+
+
+def test_splice_envelope_matches_model_dump():
+    data = [{"a": 1, "b": "ư"}]
+    body = splice_envelope(dumps_json(data), status=200, message="Truy vấn dữ liệu thành công")
+    expected = StandardApiResponse(status=200, message="Truy vấn dữ liệu thành công", data=data).model_dump()
+    assert json.loads(body) == expected
+    assert list(json.loads(body)) == list(expected)
+    assert json.loads(splice_envelope(b"null")) == {"status": 200, "message": None, "data": None}
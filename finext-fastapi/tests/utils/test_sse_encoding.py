@@ -0,0 +1,38 @@
+"""Test nén frame SSE (utils/sse_encoding.py)."""
+
+import json
+
+import pytest
+
+from app.utils.sse_encoding import COMPRESS_MIN_BYTES, decode_frame, encode_frame, validate_encoding
+
+
+def _frame(n: int) -> str:
+    rows = [{"ticker": f"T{i:04d}", "industry_name": "Ngân hàng", "close": i * 1.5} for i in range(n)]
+    return f"data: {json.dumps(rows, ensure_ascii=False)}\n\n"
+
+
+def test_large_frame_round_trips_and_shrinks():
+    frame = _frame(500)
+    encoded = encode_frame(frame, "deflate")
+    body = json.loads(encoded[len("data: ") : -2])
+    assert body["type"] == "compressed" and body["encoding"] == "deflate"
+    assert len(encoded) < len(frame) / 3
+    assert decode_frame(encoded) == frame
+
+
+def test_small_frame_sent_as_is():
+    frame = 'data: {"type": "delta", "version": 2}\n\n'
+    assert len(frame) < COMPRESS_MIN_BYTES
+    assert encode_frame(frame, "deflate") is frame
+
+
+@pytest.mark.parametrize("raw,expected", [(None, None), ("", None), ("deflate", "deflate"), (" DEFLATE ", "deflate")])
+def test_validate_encoding(raw, expected):
+    assert validate_encoding(raw) == expected
+
+
+@pytest.mark.parametrize("raw", ["gzip", "br", "zstd"])
+def test_validate_encoding_rejects_unknown(raw):
+    with pytest.raises(ValueError):
+        validate_encoding(raw)
@@ -35,12 +35,14 @@ export interface NewsReport {
 
 /** Pagination info từ API */
 export interface PaginationInfo {
-    page: number;
+    page: number | null; // null khi đọc bằng cursor
     limit: number;
     total: number;
     total_pages: number;
     has_next: boolean;
     has_prev: boolean;
+    /** Truyền lại qua ?cursor= để đọc trang kế (keyset, không skip); null khi hết */
+    next_cursor?: string | null;
 }
 
 /** Response từ news_report API */
@@ -27,7 +27,6 @@ import { Icon } from '@iconify/react';
 import { useRouter } from 'next/navigation';
 import { getResponsiveFontSize, borderRadius, fontWeight, iconSize, shadows } from 'theme/tokens';
 import { apiClient } from 'services/apiClient';
-import { rankByMatch } from 'utils/searchRank';
 
 // ============================================================================
 // TYPES
@@ -50,6 +49,12 @@ interface SearchIndexItem {
     pct_change?: number;
 }
 
+// Kết quả keyword `suggest` (typeahead phía server) — xếp hạng riêng từng nhóm, mỗi nhóm tối đa `limit` dòng
+interface SuggestResult {
+    stocks: (SearchStock & { source: 'stock' })[];
+    indexes: (SearchIndexItem & { source: 'index' })[];
+}
+
 interface SearchNewsItem {
     article_slug: string;
     title: string;
@@ -107,10 +112,6 @@ const DEBOUNCE_MS = 300;
 function useSearchLogic() {
     const search = useCallback(async (query: string): Promise<SearchResults> => {
         const trimmed = query.trim();
-        const q = trimmed.toUpperCase();
-
-        const sortByTicker = <T extends { ticker?: string }>(arr: T[]) =>
-            [...arr].sort((a, b) => (a.ticker ?? '').localeCompare(b.ticker ?? ''));
 
         const sortByDate = <T extends { created_at?: string }>(arr: T[]) =>
             [...arr].sort((a, b) => (b.created_at ?? '').localeCompare(a.created_at ?? ''));
@@ -120,19 +121,14 @@ function useSearchLogic() {
             ? { search: trimmed, limit: MAX_PER_SECTION }
             : { limit: MAX_PER_SECTION };
 
-        // Fetch song song. Stocks/indexes cache 30s vì close+pct_change update realtime.
+        // Fetch song song. Mã/nhóm/ngành: server xếp hạng sẵn (khớp đúng mã → tiền tố mã → tên không dấu,
+        // rồi theo giá trị giao dịch) thay vì tải cả danh sách về lọc local; cache 30s vì close+pct_change realtime.
         // News/reports cache 5min khi query rỗng (latest list ít đổi).
-        const [stocksRes, indexesRes, newsRes, reportsRes] = await Promise.allSettled([
-            apiClient<SearchStock[]>({
-                url: '/api/v1/sse/rest/search_stocks',
-                method: 'GET',
-                requireAuth: false,
-                useCache: true,
-                cacheTtl: 30 * 1000,
-            }),
-            apiClient<SearchIndexItem[]>({
-                url: '/api/v1/sse/rest/search_index',
+        const [suggestRes, newsRes, reportsRes] = await Promise.allSettled([
+            apiClient<SuggestResult>({
+                url: '/api/v1/sse/rest/suggest',
                 method: 'GET',
+                queryParams: trimmed ? { search: trimmed, limit: MAX_PER_SECTION } : { limit: MAX_PER_SECTION },
                 requireAuth: false,
                 useCache: true,
                 cacheTtl: 30 * 1000,
@@ -155,19 +151,14 @@ function useSearchLogic() {
             }),
         ]);
 
-        const allStocks = stocksRes.status === 'fulfilled' && Array.isArray(stocksRes.value.data) ? stocksRes.value.data : [];
-        const allIndexes = indexesRes.status === 'fulfilled' && Array.isArray(indexesRes.value.data) ? indexesRes.value.data : [];
+        const suggestions = suggestRes.status === 'fulfilled' ? suggestRes.value.data : undefined;
         const newsData = newsRes.status === 'fulfilled' && Array.isArray(newsRes.value.data) ? newsRes.value.data : [];
         const reportsData = reportsRes.status === 'fulfilled' && Array.isArray(reportsRes.value.data) ? reportsRes.value.data : [];
 
-        // Filter ticker; rank theo độ khớp khi có query, A→Z khi rỗng
-        const filteredStocks = trimmed
-            ? rankByMatch(allStocks.filter(s => s.ticker?.toUpperCase().includes(q)), q, s => [s.ticker]).slice(0, MAX_PER_SECTION)
-            : sortByTicker(allStocks).slice(0, MAX_PER_SECTION);
-
-        const filteredIndexes = trimmed
-            ? rankByMatch(allIndexes.filter(s => s.ticker?.toUpperCase().includes(q)), q, s => [s.ticker]).slice(0, MAX_PER_SECTION)
-            : sortByTicker(allIndexes).slice(0, MAX_PER_SECTION);
+        const stockRows = suggestions?.stocks;
+        const indexRows = suggestions?.indexes;
+        const filteredStocks: SearchStock[] = Array.isArray(stockRows) ? stockRows.slice(0, MAX_PER_SECTION) : [];
+        const filteredIndexes: SearchIndexItem[] = Array.isArray(indexRows) ? indexRows.slice(0, MAX_PER_SECTION) : [];
 
         return {
             stocks: filteredStocks,